@@ -4,6 +4,7 @@ import ReactMarkdown from 'react-markdown';
 import './index.css';
 
 const BACKEND_ROUTE = "api/routes/chat/";
+const SESSION_KEY = "rag_session_id";
 
 const ChatInterface = () => {
   const [messages, setMessages] = useState([
@@ -33,7 +34,10 @@ const ChatInterface = () => {
         headers: {
           'Content-Type': 'application/json',
         },
-        body: JSON.stringify({ message: text }),
+        body: JSON.stringify({
+          message: text,
+          session_id: sessionStorage.getItem(SESSION_KEY),
+        }),
       });
 
       if (!response.ok) {
@@ -41,6 +45,9 @@ const ChatInterface = () => {
       }
 
       const data = await response.json();
+      if (data.session_id) {
+        sessionStorage.setItem(SESSION_KEY, data.session_id);
+      }
 
       // Check if response contains a transaction preview
       if (data.response.includes('Transaction Preview:')) {
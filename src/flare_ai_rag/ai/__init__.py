@@ -1,23 +1,87 @@
-from .base import AsyncBaseClient, BaseAIProvider, BaseClient
-from .gemini import (
-    EmbeddingTaskType,
-    GeminiDenseEmbedding,
-    GeminiProvider,
-    ModelLateEmbedding,
-    ModelSparseEmbedding,
-)
-from .model import Model
-from .openrouter import OpenRouterClient
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import AsyncBaseClient, BaseAIProvider, BaseClient
+    from .context_cache import (
+        CachedPrefix,
+        ContextCacheManager,
+        GeminiContextCacheBackend,
+        InMemoryContextCacheBackend,
+    )
+    from .gemini import (
+        EmbeddingTaskType,
+        GeminiDenseEmbedding,
+        GeminiProvider,
+        ModelDenseEmbedding,
+        ModelLateEmbedding,
+        ModelSparseEmbedding,
+    )
+    from .model import Model
+    from .openrouter import OpenRouterClient, OpenRouterProvider
+    from .pool import ProviderPool, ProviderPoolConfig
+    from .resilience import (
+        CircuitOpenError,
+        ProviderHTTPError,
+        RetryPolicy,
+        call_with_retry,
+        call_with_retry_async,
+    )
 
 __all__ = [
     "AsyncBaseClient",
     "BaseAIProvider",
     "BaseClient",
+    "CachedPrefix",
+    "CircuitOpenError",
+    "ContextCacheManager",
     "EmbeddingTaskType",
+    "GeminiContextCacheBackend",
     "GeminiDenseEmbedding",
     "GeminiProvider",
+    "InMemoryContextCacheBackend",
     "Model",
+    "ModelDenseEmbedding",
     "ModelLateEmbedding",
     "ModelSparseEmbedding",
     "OpenRouterClient",
+    "OpenRouterProvider",
+    "ProviderHTTPError",
+    "ProviderPool",
+    "ProviderPoolConfig",
+    "RetryPolicy",
+    "call_with_retry",
+    "call_with_retry_async",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".base": ["AsyncBaseClient", "BaseAIProvider", "BaseClient"],
+        ".context_cache": [
+            "CachedPrefix",
+            "ContextCacheManager",
+            "GeminiContextCacheBackend",
+            "InMemoryContextCacheBackend",
+        ],
+        ".gemini": [
+            "EmbeddingTaskType",
+            "GeminiDenseEmbedding",
+            "GeminiProvider",
+            "ModelDenseEmbedding",
+            "ModelLateEmbedding",
+            "ModelSparseEmbedding",
+        ],
+        ".model": ["Model"],
+        ".openrouter": ["OpenRouterClient", "OpenRouterProvider"],
+        ".pool": ["ProviderPool", "ProviderPoolConfig"],
+        ".resilience": [
+            "CircuitOpenError",
+            "ProviderHTTPError",
+            "RetryPolicy",
+            "call_with_retry",
+            "call_with_retry_async",
+        ],
+    },
+)
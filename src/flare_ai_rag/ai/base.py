@@ -1,10 +1,20 @@
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 from typing import Any, Literal, Protocol, TypedDict, runtime_checkable
+from urllib.parse import urlparse
 
 import httpx
 import requests
 
+from flare_ai_rag.ai.resilience import (
+    ProviderHTTPError,
+    call_with_retry,
+    call_with_retry_async,
+    parse_retry_after,
+)
+from flare_ai_rag.concurrency import run_in_executor
+
 
 @dataclass
 class ModelResponse:
@@ -37,16 +47,14 @@ class BaseAIProvider(ABC):
         """
         self.api_key = api_key
         self.model = model
-        self.chat_history: list[Any] = []
 
     @abstractmethod
     def reset(self) -> None:
-        """Reset the conversation history"""
+        """Reset the provider state"""
 
     @abstractmethod
     def reset_model(self, model: str, **kwargs: str) -> None:
-        """Completely reinitialize the generative model with new parameters,
-        and reset the chat session and history."""
+        """Completely reinitialize the generative model with new parameters"""
 
     @abstractmethod
     def generate(
@@ -71,6 +79,9 @@ class BaseAIProvider(ABC):
     def send_message(self, msg: str) -> ModelResponse:
         """Send a message in a conversational context
 
+        Providers are stateless: each call starts a new conversation, so callers
+        include any previous context (e.g. a session's history) in `msg`.
+
         Args:
             msg: Input message text
 
@@ -78,6 +89,40 @@ class BaseAIProvider(ABC):
             ModelResponse containing the response text and metadata
         """
 
+    async def generate_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Asynchronous counterpart of `generate`
+
+        Providers without a native async client run `generate` on the shared
+        executor so the event loop is never blocked.
+
+        Args:
+            prompt: Input text prompt
+            response_mime_type: Expected response format
+            response_schema: Expected response structure schema
+
+        Returns:
+            ModelResponse containing the generated text and metadata
+        """
+        return await run_in_executor(
+            self.generate, prompt, response_mime_type, response_schema
+        )
+
+    async def send_message_async(self, msg: str) -> ModelResponse:
+        """Asynchronous counterpart of `send_message`
+
+        Args:
+            msg: Input message text
+
+        Returns:
+            ModelResponse containing the response text and metadata
+        """
+        return await run_in_executor(self.send_message, msg)
+
 
 class CompletionRequest(TypedDict):
     model: str
@@ -104,6 +149,7 @@ class BaseClient:
         """
         self.base_url = base_url.rstrip("/")  # Ensure no trailing slash
         self.api_key = api_key
+        self.provider = urlparse(self.base_url).hostname or self.base_url
         self.session = requests.Session()
         # Set up headers: include the Authorization header if an API key is provided.
         self.headers = {"accept": "application/json"}
@@ -121,15 +167,16 @@ class BaseClient:
         params = params or {}
 
         url = self.base_url + endpoint
-        response = self.session.get(
-            url=url, params=params, headers=self.headers, timeout=30
+        response = call_with_retry(
+            self.provider,
+            self._checked,
+            self.session.get,
+            url=url,
+            params=params,
+            headers=self.headers,
+            timeout=30,
         )
-
-        success_status = 200
-        if response.status_code == success_status:
-            return response.json()
-        msg = f"Error ({response.status_code}): {response.text}"
-        raise ConnectionError(msg)
+        return response.json()
 
     def _post(
         self,
@@ -145,15 +192,38 @@ class BaseClient:
         :return: JSON response as a dictionary.
         """
         url = self.base_url + endpoint
-        response = self.session.post(
-            url=url, headers=self.headers, json=json_payload, timeout=30
+        response = call_with_retry(
+            self.provider,
+            self._checked,
+            self.session.post,
+            url=url,
+            headers=self.headers,
+            json=json_payload,
+            timeout=30,
         )
+        return response.json()
+
+    @staticmethod
+    def _checked(
+        send: Callable[..., requests.Response], **kwargs: Any
+    ) -> requests.Response:
+        """
+        Send a request and raise ProviderHTTPError unless it succeeded.
+
+        :param send: The session method sending the request.
+        :return: The successful response.
+        """
+        response = send(**kwargs)
 
         success_status = 200
         if response.status_code == success_status:
-            return response.json()
+            return response
         msg = f"Error ({response.status_code}): {response.text}"
-        raise ConnectionError(msg)
+        raise ProviderHTTPError(
+            msg,
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
 
 
 class AsyncBaseClient:
@@ -169,6 +239,7 @@ class AsyncBaseClient:
         """
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        self.provider = urlparse(self.base_url).hostname or self.base_url
         self.client = httpx.AsyncClient(timeout=30.0)
         self.headers = {"accept": "application/json"}
         if self.api_key:
@@ -184,13 +255,15 @@ class AsyncBaseClient:
         """
         params = params or {}
         url = self.base_url + endpoint
-        response = await self.client.get(url, params=params, headers=self.headers)
-
-        success_status = 200
-        if response.status_code == success_status:
-            return response.json()
-        msg = f"Error ({response.status_code}): {response.text}"
-        raise ConnectionError(msg)
+        response = await call_with_retry_async(
+            self.provider,
+            self._checked,
+            self.client.get,
+            url,
+            params=params,
+            headers=self.headers,
+        )
+        return response.json()
 
     async def _post(
         self,
@@ -207,13 +280,37 @@ class AsyncBaseClient:
         :return: JSON response as a dictionary.
         """
         url = self.base_url + endpoint
-        response = await self.client.post(url, headers=self.headers, json=json_payload)
+        response = await call_with_retry_async(
+            self.provider,
+            self._checked,
+            self.client.post,
+            url,
+            headers=self.headers,
+            json=json_payload,
+        )
+        return response.json()
+
+    @staticmethod
+    async def _checked(
+        send: Callable[..., Awaitable[httpx.Response]], *args: Any, **kwargs: Any
+    ) -> httpx.Response:
+        """
+        Send a request and raise ProviderHTTPError unless it succeeded.
+
+        :param send: The client method sending the request.
+        :return: The successful response.
+        """
+        response = await send(*args, **kwargs)
 
         success_status = 200
         if response.status_code == success_status:
-            return response.json()
+            return response
         msg = f"Error ({response.status_code}): {response.text}"
-        raise ConnectionError(msg)
+        raise ProviderHTTPError(
+            msg,
+            status_code=response.status_code,
+            retry_after=parse_retry_after(response.headers.get("Retry-After")),
+        )
 
     async def close(self) -> None:
         """
@@ -0,0 +1,319 @@
+"""
+Context Caching Module
+
+This module lets a provider reuse the stable start of its prompts across requests.
+A prompt prefix (the system instruction plus the static text of a prompt template)
+is stored once as cached content; later requests reference the cached content and
+only send the dynamic remainder of the prompt, saving prefill latency and input
+tokens.
+
+Cache entries expire after a TTL and are refreshed shortly before they do. The
+caching API is called outside the manager's lock, by one caller per prefix;
+meanwhile other callers keep using the current entry, or send the plain prompt if
+there is none. When caching is unavailable (prefix below the model's minimum
+size, unsupported model, API errors), the manager returns no entry and callers
+send the plain prompt.
+"""
+
+import hashlib
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Protocol
+
+import structlog
+from google.generativeai import caching
+
+from flare_ai_rag.concurrency import run_in_executor
+from flare_ai_rag.metrics import registry
+
+logger = structlog.get_logger(__name__)
+
+# Rough character-per-token ratio used to skip prefixes below the minimum size
+CHARS_PER_TOKEN = 4
+
+_cache_lookups = registry.counter(
+    "context_cache_lookups_total",
+    "Context cache lookups, by outcome",
+    ("outcome",),
+)
+
+
+@dataclass(frozen=True)
+class CachedPrefix:
+    """
+    Handle to a cached prompt prefix.
+
+    Attributes:
+        name: Provider-side name of the cached content
+        prefix: Prompt text covered by the cache (after the system instruction)
+        expire_time: Expiry time of the cached content (UNIX timestamp)
+    """
+
+    name: str
+    prefix: str
+    expire_time: float
+
+
+class ContextCacheBackend(Protocol):
+    """Provider API used to create and extend cached content."""
+
+    def create(
+        self,
+        model: str,
+        system_instruction: str | None,
+        prefix: str,
+        ttl_seconds: float,
+    ) -> CachedPrefix: ...
+
+    def refresh(self, entry: CachedPrefix, ttl_seconds: float) -> CachedPrefix: ...
+
+
+class GeminiContextCacheBackend:
+    """Creates cached content with the Gemini caching API."""
+
+    def create(
+        self,
+        model: str,
+        system_instruction: str | None,
+        prefix: str,
+        ttl_seconds: float,
+    ) -> CachedPrefix:
+        """Create cached content holding the system instruction and prefix."""
+        cached = caching.CachedContent.create(
+            model=model,
+            display_name=f"rag-{hashlib.sha256(prefix.encode()).hexdigest()[:16]}",
+            system_instruction=system_instruction,
+            contents=[prefix] if prefix else None,
+            ttl=timedelta(seconds=ttl_seconds),
+        )
+        return CachedPrefix(
+            name=cached.name,
+            prefix=prefix,
+            expire_time=cached.expire_time.timestamp(),
+        )
+
+    def refresh(self, entry: CachedPrefix, ttl_seconds: float) -> CachedPrefix:
+        """Extend the TTL of existing cached content."""
+        cached = caching.CachedContent.get(entry.name)
+        cached.update(ttl=timedelta(seconds=ttl_seconds))
+        return CachedPrefix(
+            name=entry.name,
+            prefix=entry.prefix,
+            expire_time=cached.expire_time.timestamp(),
+        )
+
+
+class InMemoryContextCacheBackend:
+    """
+    Local stand-in for the caching API.
+
+    Mirrors the behaviour the manager relies on: content below `min_tokens` is
+    rejected, entries expire after their TTL, and refreshing an expired entry
+    fails as if it were not found. Used to test caching without API access.
+    """
+
+    def __init__(self, min_tokens: int = 0) -> None:
+        self.min_tokens = min_tokens
+        self.entries: dict[str, tuple[str, str | None, str, float]] = {}
+        self.creates = 0
+        self.refreshes = 0
+        self._lock = threading.Lock()
+
+    def create(
+        self,
+        model: str,
+        system_instruction: str | None,
+        prefix: str,
+        ttl_seconds: float,
+    ) -> CachedPrefix:
+        """Store the content, rejecting it if it is below the minimum size."""
+        tokens = len((system_instruction or "") + prefix) // CHARS_PER_TOKEN
+        if tokens < self.min_tokens:
+            msg = f"Cached content has {tokens} tokens, minimum is {self.min_tokens}"
+            raise ValueError(msg)
+        name = f"cachedContents/{uuid.uuid4().hex}"
+        expire_time = time.time() + ttl_seconds
+        with self._lock:
+            self.entries[name] = (model, system_instruction, prefix, expire_time)
+            self.creates += 1
+        return CachedPrefix(name=name, prefix=prefix, expire_time=expire_time)
+
+    def refresh(self, entry: CachedPrefix, ttl_seconds: float) -> CachedPrefix:
+        """Extend an entry's TTL, failing if it has already expired."""
+        with self._lock:
+            stored = self.entries.get(entry.name)
+            if stored is None or stored[3] <= time.time():
+                self.entries.pop(entry.name, None)
+                msg = f"{entry.name} not found"
+                raise KeyError(msg)
+            expire_time = time.time() + ttl_seconds
+            self.entries[entry.name] = (*stored[:3], expire_time)
+            self.refreshes += 1
+        return CachedPrefix(
+            name=entry.name, prefix=entry.prefix, expire_time=expire_time
+        )
+
+
+class ContextCacheManager:
+    """
+    Maps prompts onto cached prefixes for a single model and system instruction.
+
+    Prefixes are registered up front (e.g. the static text of every prompt
+    template); the empty prefix caches the system instruction alone. A prompt is
+    served from the longest registered prefix it starts with.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        backend: ContextCacheBackend,
+        *,
+        model: str,
+        system_instruction: str | None,
+        prefixes: list[str] | None = None,
+        ttl_seconds: float = 3600.0,
+        refresh_margin_seconds: float = 300.0,
+        retry_after_seconds: float = 600.0,
+        min_tokens: int = 0,
+    ) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            backend: Caching API (Gemini or the in-memory stand-in)
+            model: Model the cached content is created for
+            system_instruction: System instruction included in every cache entry
+            prefixes: Stable prompt prefixes to cache
+            ttl_seconds: TTL of created or refreshed cache entries
+            refresh_margin_seconds: Refresh entries expiring within this margin
+            retry_after_seconds: Time before retrying a prefix whose caching failed
+            min_tokens: Estimated size below which prefixes are not cached
+        """
+        self.backend = backend
+        self.model = model
+        self.system_instruction = system_instruction
+        self.ttl_seconds = ttl_seconds
+        self.refresh_margin_seconds = refresh_margin_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.min_tokens = min_tokens
+        self._prefixes: list[str] = []
+        self._entries: dict[str, CachedPrefix] = {}
+        self._unavailable: dict[str, float] = {}
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self.logger = logger.bind(service="context_cache", model=model)
+        for prefix in ["", *(prefixes or [])]:
+            self.register(prefix)
+
+    def register(self, prefix: str) -> None:
+        """Register a stable prompt prefix, if it is large enough to be cached."""
+        tokens = len((self.system_instruction or "") + prefix) // CHARS_PER_TOKEN
+        if tokens < self.min_tokens:
+            self.logger.debug(
+                "prefix_too_small", tokens=tokens, min_tokens=self.min_tokens
+            )
+            return
+        if prefix not in self._prefixes:
+            self._prefixes.append(prefix)
+            self._prefixes.sort(key=len, reverse=True)
+
+    @property
+    def registered_prefixes(self) -> list[str]:
+        """Prefixes that are cached, longest first."""
+        return list(self._prefixes)
+
+    def _match(self, prompt: str) -> str | None:
+        """Return the longest registered prefix leaving a non-empty remainder."""
+        for prefix in self._prefixes:
+            if len(prompt) > len(prefix) and prompt.startswith(prefix):
+                return prefix
+        return None
+
+    def _fresh(self, prefix: str, now: float) -> CachedPrefix | None:
+        entry = self._entries.get(prefix)
+        if entry is not None and entry.expire_time - now > self.refresh_margin_seconds:
+            return entry
+        return None
+
+    def lookup(self, prompt: str) -> CachedPrefix | None:
+        """
+        Get the cache entry to serve a prompt from, creating or refreshing it.
+
+        This may call the caching API, so it blocks; see `lookup_async`.
+
+        Args:
+            prompt: Full prompt (without the system instruction)
+
+        Returns:
+            CachedPrefix | None: Entry whose prefix the prompt starts with, or None
+                if the prompt has to be sent without a cache
+        """
+        prefix = self._match(prompt)
+        if prefix is None:
+            _cache_lookups.inc(outcome="no_prefix")
+            return None
+
+        now = time.time()
+        with self._lock:
+            entry = self._fresh(prefix, now)
+            if entry is not None:
+                _cache_lookups.inc(outcome="hit")
+                return entry
+            if self._unavailable.get(prefix, 0.0) > now:
+                _cache_lookups.inc(outcome="unavailable")
+                return None
+            stale = self._entries.get(prefix)
+            if stale is not None and stale.expire_time <= now:
+                stale = None
+            if prefix in self._pending:
+                # Another caller is creating or refreshing the entry.
+                _cache_lookups.inc(outcome="pending")
+                return stale
+            self._pending.add(prefix)
+
+        try:
+            if stale is not None:
+                entry = self.backend.refresh(stale, self.ttl_seconds)
+                _cache_lookups.inc(outcome="refresh")
+            else:
+                entry = self.backend.create(
+                    self.model, self.system_instruction, prefix, self.ttl_seconds
+                )
+                _cache_lookups.inc(outcome="create")
+        except Exception as e:  # noqa: BLE001
+            with self._lock:
+                self._entries.pop(prefix, None)
+                self._unavailable[prefix] = now + self.retry_after_seconds
+            _cache_lookups.inc(outcome="error")
+            self.logger.warning("context_cache_unavailable", error=str(e))
+            return None
+        else:
+            with self._lock:
+                self._entries[prefix] = entry
+        finally:
+            with self._lock:
+                self._pending.discard(prefix)
+
+        self.logger.debug(
+            "context_cache_ready", name=entry.name, expire_time=entry.expire_time
+        )
+        return entry
+
+    async def lookup_async(self, prompt: str) -> CachedPrefix | None:
+        """Like `lookup`, calling the caching API on the shared executor."""
+        prefix = self._match(prompt)
+        if prefix is not None:
+            entry = self._fresh(prefix, time.time())
+            if entry is not None:
+                _cache_lookups.inc(outcome="hit")
+                return entry
+        return await run_in_executor(self.lookup, prompt)
+
+    def invalidate(self, entry: CachedPrefix) -> None:
+        """Forget an entry the provider rejected (e.g. deleted or expired early)."""
+        with self._lock:
+            if self._entries.get(entry.prefix) == entry:
+                del self._entries[entry.prefix]
+        self.logger.debug("context_cache_invalidated", name=entry.name)
@@ -6,11 +6,13 @@ with Google's Generative AI service. It handles chat sessions, content generatio
 and message management while maintaining a consistent AI personality.
 """
 
-from typing import Any, override
+import functools
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, Any, override
 
 import numpy.typing as npt
 import structlog
-from fastembed import LateInteractionTextEmbedding, SparseEmbedding, SparseTextEmbedding
+from google.api_core.exceptions import InvalidArgument, NotFound
 from google.generativeai.client import configure
 from google.generativeai.embedding import (
     EmbeddingTaskType,
@@ -18,10 +20,27 @@ from google.generativeai.embedding import (
 from google.generativeai.embedding import (
     embed_content as _embed_content,
 )
-from google.generativeai.generative_models import ChatSession, GenerativeModel
+from google.generativeai.embedding import (
+    embed_content_async as _embed_content_async,
+)
+from google.generativeai.generative_models import GenerativeModel
 from google.generativeai.types import GenerationConfig
 
 from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.ai.context_cache import (
+    CachedPrefix,
+    ContextCacheBackend,
+    ContextCacheManager,
+)
+from flare_ai_rag.ai.local_models import local_model_kwargs, warm_up
+from flare_ai_rag.ai.resilience import call_with_retry, call_with_retry_async
+from flare_ai_rag.concurrency import run_in_executor
+from flare_ai_rag.metrics import TokenUsage, record_usage
+from flare_ai_rag.settings import settings
+
+if TYPE_CHECKING:
+    # fastembed loads onnxruntime; it is imported when a local model is created.
+    from fastembed import SparseEmbedding
 
 logger = structlog.get_logger(__name__)
 
@@ -40,21 +59,83 @@ more engaging - your goal is to be helpful first, entertaining second.
 """
 
 
+def configure_gemini(api_key: str, transport: str | None = None) -> None:
+    """
+    Configure the Gemini SDK's default clients.
+
+    If a Gemini base URL is set (e.g. the local stand-in server of
+    `flare_ai_rag.loadtest.standin`), requests are sent to it over REST instead of
+    to Google's gRPC endpoint.
+
+    Args:
+        api_key (str): Google API key for authentication
+        transport (str | None): "rest" or "grpc" (the SDK's default if None);
+            a process forking server workers must not use gRPC, which is not
+            fork-safe
+    """
+    if settings.gemini_base_url:
+        configure(
+            api_key=api_key,
+            transport="rest",
+            client_options={"api_endpoint": settings.gemini_base_url},
+        )
+    else:
+        configure(api_key=api_key, transport=transport)
+
+
+def _async_call[T](
+    native: Callable[..., Awaitable[T]], blocking: Callable[..., T]
+) -> Callable[..., Awaitable[T]]:
+    """
+    The SDK's native async call, or its blocking counterpart run on the executor.
+
+    The SDK's async clients only support gRPC, so with a REST base URL (see
+    `configure_gemini`) the blocking REST call is offloaded instead.
+    """
+    if settings.gemini_base_url:
+        return functools.partial(run_in_executor, blocking)
+    return native
+
+
+def _record_usage(response: Any, model: str) -> dict[str, int]:
+    """
+    Record the token usage of a Gemini response.
+
+    Returns:
+        dict[str, int]: The usage in the normalized `metadata["usage"]` format
+    """
+    metadata = getattr(response, "usage_metadata", None)
+    if metadata is None:
+        return {}
+    usage = TokenUsage(
+        prompt_tokens=metadata.prompt_token_count,
+        output_tokens=metadata.candidates_token_count,
+        cached_tokens=metadata.cached_content_token_count,
+    )
+    record_usage(model, usage)
+    return usage.as_dict()
+
+
 class GeminiProvider(BaseAIProvider):
     """
     Provider class for Google's Gemini AI service.
 
     This class implements the BaseAIProvider interface to provide AI capabilities
-    through Google's Gemini models. It manages chat sessions, generates content,
-    and maintains conversation history.
+    through Google's Gemini models. The provider is stateless and can be shared by
+    concurrent requests: conversation history is kept per session by the caller.
+
+    Prompts starting with a cached prefix (see `enable_context_cache`) are sent
+    against the cached content, with only the remainder of the prompt as input.
 
     Attributes:
-        chat (generativeai.ChatSession | None): Active chat session
         model (generativeai.GenerativeModel): Configured Gemini model instance
-        chat_history: History of chat interactions
+        context_cache (ContextCacheManager | None): Cache of stable prompt prefixes
         logger (BoundLogger): Structured logger for the provider
     """
 
+    # Name of the circuit breaker shared by all Gemini calls.
+    provider_name = "gemini"
+
     def __init__(self, api_key: str, model: str, **kwargs: str) -> None:
         """
         Initialize the Gemini provider with API credentials and model configuration.
@@ -65,13 +146,15 @@ class GeminiProvider(BaseAIProvider):
             **kwargs (str): Additional configuration parameters including:
                 - system_instruction: Custom system prompt for the AI personality
         """
-        configure(api_key=api_key)
-        self.chat: ChatSession | None = None
+        configure_gemini(api_key)
+        self.model_name = model
+        self.system_instruction = kwargs.get("system_instruction", SYSTEM_INSTRUCTION)
         self.model = GenerativeModel(
             model_name=model,
-            system_instruction=kwargs.get("system_instruction", SYSTEM_INSTRUCTION),
+            system_instruction=self.system_instruction,
         )
-        self.chat_history = []
+        self.context_cache: ContextCacheManager | None = None
+        self._cached_models: dict[str, tuple[str, GenerativeModel]] = {}
         self.logger = logger.bind(service="gemini")
 
     @override
@@ -79,19 +162,14 @@ class GeminiProvider(BaseAIProvider):
         """
         Reset the provider state.
 
-        Clears chat history and terminates active chat session.
+        The provider keeps no conversation state, so there is nothing to clear.
         """
-        self.chat_history = []
-        self.chat = None
-        self.logger.debug(
-            "reset_gemini", chat=self.chat, chat_history=self.chat_history
-        )
+        self.logger.debug("reset_gemini")
 
     @override
     def reset_model(self, model: str, **kwargs: str) -> None:
         """
-        Completely reinitialize the generative model with new parameters,
-        and reset the chat session and history.
+        Completely reinitialize the generative model with new parameters.
 
         Args:
             model (str): New model identifier.
@@ -100,13 +178,20 @@ class GeminiProvider(BaseAIProvider):
         """
         new_system_instruction = kwargs.get("system_instruction", SYSTEM_INSTRUCTION)
         # Reinitialize the generative model.
+        self.model_name = model
+        self.system_instruction = new_system_instruction
         self.model = GenerativeModel(
             model_name=model,
             system_instruction=new_system_instruction,
         )
-        # Reset chat session and history with the new system instruction.
-        self.chat = None
-        self.chat_history = [{"role": "system", "content": new_system_instruction}]
+        # Cached content is bound to the previous model and system instruction.
+        if self.context_cache is not None:
+            self.enable_context_cache(
+                self.context_cache.backend,
+                prefixes=self.context_cache.registered_prefixes,
+                ttl_seconds=self.context_cache.ttl_seconds,
+                min_tokens=self.context_cache.min_tokens,
+            )
         self.logger.debug(
             "reset_model", model=model, system_instruction=new_system_instruction
         )
@@ -133,34 +218,169 @@ class GeminiProvider(BaseAIProvider):
                 - metadata: Additional response information including:
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input prompt
+                    - usage: Prompt, output and cached token counts
         """
-
-        response = self.model.generate_content(
-            prompt,
-            generation_config=GenerationConfig(
-                response_mime_type=response_mime_type, response_schema=response_schema
-            ),
+        generation_config = GenerationConfig(
+            response_mime_type=response_mime_type, response_schema=response_schema
         )
+        entry = self.context_cache.lookup(prompt) if self.context_cache else None
+        response = None
+        if entry is not None:
+            try:
+                response = call_with_retry(
+                    "gemini",
+                    self._cached_model(entry).generate_content,
+                    prompt[len(entry.prefix) :],
+                    generation_config=generation_config,
+                )
+            except (NotFound, InvalidArgument) as e:
+                self._drop_cached_model(entry, e)
+                entry = None
+        if response is None:
+            response = call_with_retry(
+                "gemini",
+                self.model.generate_content,
+                prompt,
+                generation_config=generation_config,
+            )
         # self.logger.debug("generate", prompt=prompt, response_text=response.text)
 
+        usage = _record_usage(response, self.model_name)
         return ModelResponse(
              text=response.text,
              raw_response=response,
              metadata={
                  "candidate_count": len(response.candidates),
                  "prompt_feedback": response.prompt_feedback,
+                 "cached_content": entry.name if entry else None,
+                 "usage": usage,
              },
         )
 
+    @override
+    async def generate_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate content using the Gemini model's native async client.
+
+        Args:
+            prompt (str): Input prompt for content generation
+            response_mime_type (str | None): Expected MIME type for the response
+            response_schema (Any | None): Schema defining the response structure
+
+        Returns:
+            ModelResponse: Generated content with the same metadata as `generate`
+        """
+        generation_config = GenerationConfig(
+            response_mime_type=response_mime_type, response_schema=response_schema
+        )
+        entry = (
+            await self.context_cache.lookup_async(prompt)
+            if self.context_cache
+            else None
+        )
+        response = None
+        if entry is not None:
+            try:
+                cached_model = self._cached_model(entry)
+                response = await call_with_retry_async(
+                    "gemini",
+                    _async_call(
+                        cached_model.generate_content_async,
+                        cached_model.generate_content,
+                    ),
+                    prompt[len(entry.prefix) :],
+                    generation_config=generation_config,
+                )
+            except (NotFound, InvalidArgument) as e:
+                self._drop_cached_model(entry, e)
+                entry = None
+        if response is None:
+            response = await call_with_retry_async(
+                "gemini",
+                _async_call(
+                    self.model.generate_content_async, self.model.generate_content
+                ),
+                prompt,
+                generation_config=generation_config,
+            )
+
+        usage = _record_usage(response, self.model_name)
+        return ModelResponse(
+            text=response.text,
+            raw_response=response,
+            metadata={
+                "candidate_count": len(response.candidates),
+                "prompt_feedback": response.prompt_feedback,
+                "cached_content": entry.name if entry else None,
+                "usage": usage,
+            },
+        )
+
+    def enable_context_cache(
+        self,
+        backend: ContextCacheBackend,
+        prefixes: list[str] | None = None,
+        ttl_seconds: float = 3600.0,
+        min_tokens: int = 0,
+    ) -> None:
+        """
+        Serve prompts starting with a stable prefix from cached content.
+
+        The system instruction is always part of the cached content; `prefixes`
+        adds the static text of prompt templates on top of it.
+
+        Args:
+            backend (ContextCacheBackend): Caching API to create the entries with
+            prefixes (list[str] | None): Stable prompt prefixes to cache
+            ttl_seconds (float): TTL of cache entries, refreshed while in use
+            min_tokens (int): Model's minimum cached content size
+        """
+        self.context_cache = ContextCacheManager(
+            backend,
+            model=self.model_name,
+            system_instruction=self.system_instruction,
+            prefixes=prefixes,
+            ttl_seconds=ttl_seconds,
+            min_tokens=min_tokens,
+        )
+        self._cached_models = {}
+        self.logger.debug(
+            "context_cache_enabled",
+            prefixes=len(self.context_cache.registered_prefixes),
+        )
+
+    def _cached_model(self, entry: CachedPrefix) -> GenerativeModel:
+        """Return the model bound to a cache entry, reusing it while unchanged."""
+        cached = self._cached_models.get(entry.prefix)
+        if cached is None or cached[0] != entry.name:
+            cached = (entry.name, GenerativeModel.from_cached_content(entry.name))
+            self._cached_models[entry.prefix] = cached
+        return cached[1]
+
+    def _drop_cached_model(self, entry: CachedPrefix, error: Exception) -> None:
+        """Forget a cache entry the API rejected so the next call recreates it."""
+        self.logger.warning(
+            "cached_content_rejected", name=entry.name, error=str(error)
+        )
+        self._cached_models.pop(entry.prefix, None)
+        if self.context_cache is not None:
+            self.context_cache.invalidate(entry)
+
     @override
     def send_message(
         self,
         msg: str,
     ) -> ModelResponse:
         """
-        Send a message in a chat session and get the response.
+        Send a message in a new chat session and get the response.
 
-        Initializes a new chat session if none exists, using the current chat history.
+        No chat session is kept between calls, so concurrent requests never share
+        conversation state.
 
         Args:
             msg (str): Message to send to the chat session
@@ -172,45 +392,64 @@ class GeminiProvider(BaseAIProvider):
                 - metadata: Additional response information including:
                     - candidate_count: Number of generated candidates
                     - prompt_feedback: Feedback on the input message
+                    - usage: Prompt, output and cached token counts
         """
-        if not self.chat:
-            self.chat = self.model.start_chat(history=self.chat_history)
-        response = self.chat.send_message(msg)
+        response = call_with_retry(
+            "gemini", lambda: self.model.start_chat().send_message(msg)
+        )
         self.logger.debug("send_message", msg=msg, response_text=response.text)
+        usage = _record_usage(response, self.model_name)
         return ModelResponse(
             text=response.text,
             raw_response=response,
             metadata={
                 "candidate_count": len(response.candidates),
                 "prompt_feedback": response.prompt_feedback,
+                "usage": usage,
             },
         )
 
-    def history_context(self) -> str:
-        # Build Context from response history
-        history_context = f"""
-List of previous {len(self.chat_history)} responses.
-Response 1 is the most recent response, and its tokens should be weighted more heavily.
-As the index of the response increases, its recency decreases, and the weight on its tokens should similarly decrease.
-Here is the list:
+    @override
+    async def send_message_async(self, msg: str) -> ModelResponse:
+        """
+        Send a message in a new chat session using the native async client.
+
+        Args:
+            msg (str): Message to send to the chat session
+
+        Returns:
+            ModelResponse: Response with the same metadata as `send_message`
         """
 
-        for idx, chat in enumerate(self.chat_history, start=1):
-            history_context += f"Response {idx}:\n{chat}\n\n"
+        def send() -> Awaitable[Any]:
+            chat = self.model.start_chat()
+            return _async_call(chat.send_message_async, chat.send_message)(msg)
 
-        return history_context
+        response = await call_with_retry_async("gemini", send)
+        self.logger.debug("send_message", msg=msg, response_text=response.text)
+        usage = _record_usage(response, self.model_name)
+        return ModelResponse(
+            text=response.text,
+            raw_response=response,
+            metadata={
+                "candidate_count": len(response.candidates),
+                "prompt_feedback": response.prompt_feedback,
+                "usage": usage,
+            },
+        )
 
 
 class GeminiDenseEmbedding:
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, transport: str | None = None) -> None:
         """
         Initialize Gemini with API credentials.
         This client uses google.generativeai
 
         Args:
             api_key (str): Google API key for authentication
+            transport (str | None): SDK transport (see `configure_gemini`)
         """
-        configure(api_key=api_key)
+        configure_gemini(api_key, transport)
 
     def embed_content(
         self,
@@ -229,8 +468,45 @@ class GeminiDenseEmbedding:
         Returns:
             list[float]: The generated embedding vector.
         """
-        response = _embed_content(
-            model=embedding_model, content=contents, task_type=task_type, title=title
+        response = call_with_retry(
+            "gemini",
+            _embed_content,
+            model=embedding_model,
+            content=contents,
+            task_type=task_type,
+            title=title,
+        )
+        try:
+            embedding = response["embedding"]
+        except (KeyError, IndexError) as e:
+            msg = "Failed to extract embedding from response."
+            raise ValueError(msg) from e
+        return embedding
+
+    async def embed_content_async(
+        self,
+        embedding_model: str,
+        contents: str,
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> list[float]:
+        """
+        Generate text embeddings using Gemini's native async client.
+
+        Args:
+            model (str): The embedding model to use (e.g., "text-embedding-004").
+            contents (str): The text to be embedded.
+
+        Returns:
+            list[float]: The generated embedding vector.
+        """
+        response = await call_with_retry_async(
+            "gemini",
+            _async_call(_embed_content_async, _embed_content),
+            model=embedding_model,
+            content=contents,
+            task_type=task_type,
+            title=title,
         )
         try:
             embedding = response["embedding"]
@@ -242,12 +518,18 @@ class GeminiDenseEmbedding:
 
 class ModelSparseEmbedding:
     def __init__(self, embedding_model: str) -> None:
-        self.model = SparseTextEmbedding(model_name=embedding_model)
+        from fastembed import SparseTextEmbedding
+
+        self.model = SparseTextEmbedding(
+            model_name=embedding_model, **local_model_kwargs(embedding_model)
+        )
+        if settings.embedding_warm_up:
+            warm_up(embedding_model, self.embed_content)
 
     def embed_content(
         self,
         contents: str,
-    ) -> SparseEmbedding:
+    ) -> "SparseEmbedding":
         """
         Generate sparse text embeddings
 
@@ -262,9 +544,42 @@ class ModelSparseEmbedding:
         return embeddings[0]
 
 
+class ModelDenseEmbedding:
+    def __init__(self, embedding_model: str) -> None:
+        from fastembed import TextEmbedding
+
+        self.model = TextEmbedding(
+            model_name=embedding_model, **local_model_kwargs(embedding_model)
+        )
+        if settings.embedding_warm_up:
+            warm_up(embedding_model, lambda text: self.embed_content([text]))
+
+    def embed_content(
+        self,
+        contents: list[str],
+    ) -> list[npt.NDArray[Any]]:
+        """
+        Generate dense text embeddings locally
+
+        Args:
+            model (str): The embedding model to use (e.g., "BAAI/bge-small-en-v1.5").
+            contents (list[str]): The texts to be embedded.
+
+        Returns:
+            list[npt.NDArray]: One embedding vector per input text.
+        """
+        return list(self.model.embed(contents))
+
+
 class ModelLateEmbedding:
     def __init__(self, embedding_model: str) -> None:
-        self.model = LateInteractionTextEmbedding(embedding_model)
+        from fastembed import LateInteractionTextEmbedding
+
+        self.model = LateInteractionTextEmbedding(
+            model_name=embedding_model, **local_model_kwargs(embedding_model)
+        )
+        if settings.embedding_warm_up:
+            warm_up(embedding_model, self.embed_content)
 
     def embed_content(
         self,
@@ -286,7 +601,7 @@ class ModelLateEmbedding:
 
 class GeminiGeneric(BaseAIProvider):
     def __init__(self, api_key: str, model: str) -> None:
-        configure(api_key=api_key)
+        configure_gemini(api_key)
         self.model = GenerativeModel(
             model_name=model
         )
@@ -313,17 +628,20 @@ class GeminiGeneric(BaseAIProvider):
                 - metadata: Additional response information
         """
 
-        response = self.model.generate_content(
+        response = call_with_retry(
+            "gemini",
+            self.model.generate_content,
             prompt,
             generation_config=GenerationConfig(
                 response_mime_type=response_mime_type, response_schema=response_schema
             ),
         )
 
+        usage = _record_usage(response, self.model.model_name)
         return ModelResponse(
              text=response.text,
              raw_response=response,
-             metadata={},
+             metadata={"usage": usage},
         )
 
     @override
@@ -0,0 +1,229 @@
+"""
+Local (fastembed) embedding models: model cache, ONNX Runtime threads, int8
+variants and warm-up.
+
+fastembed downloads a model the first time it is loaded, by default into a
+temporary directory, so a fresh container downloads its models again at every
+start. The Docker image instead downloads them at build time, into
+`settings.embedding_cache_dir`:
+
+    python -m flare_ai_rag.ai.local_models
+    python -m flare_ai_rag.ai.local_models --quantize
+
+With --quantize, an int8 variant of each model (dynamic quantization of its
+weights, which needs the `onnx` package) is written next to the downloaded
+models; it is used when `settings.embedding_quantized` is set. It is about four
+times smaller and faster on CPU, at a small cost in embedding quality.
+
+A warm-up inference when a model is loaded moves ONNX Runtime's graph
+initialization and first allocations from the first query to startup.
+"""
+
+import argparse
+import shutil
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import structlog
+
+from flare_ai_rag.settings import settings
+
+if TYPE_CHECKING:
+    from fastembed import SparseTextEmbedding, TextEmbedding
+
+logger = structlog.get_logger(__name__)
+
+QUANTIZED_DIR = "int8"
+WARM_UP_TEXT = "What is the Flare Time Series Oracle?"
+
+
+def quantized_model_dir(cache_dir: Path, model_name: str) -> Path:
+    """Directory of the int8 variant of a model in a model cache."""
+    return cache_dir / QUANTIZED_DIR / model_name.replace("/", "--")
+
+
+def local_model_kwargs(model_name: str) -> dict[str, Any]:
+    """
+    Keyword arguments of the fastembed model classes, from the settings.
+
+    fastembed uses the thread count for both the intra-op and the inter-op
+    thread pools of ONNX Runtime; with its sequential execution mode, only the
+    intra-op pool runs.
+
+    Args:
+        model_name: Name of the model loaded
+
+    Returns:
+        dict[str, Any]: Cache directory, threads and, for a quantized model, the
+            directory of its int8 variant
+    """
+    kwargs: dict[str, Any] = {"threads": settings.embedding_threads or None}
+    if not settings.embedding_cache_dir:
+        return kwargs
+    kwargs["cache_dir"] = settings.embedding_cache_dir
+    if settings.embedding_quantized:
+        path = quantized_model_dir(Path(settings.embedding_cache_dir), model_name)
+        if path.is_dir():
+            kwargs["specific_model_path"] = str(path)
+        else:
+            logger.warning("quantized_model_missing", model=model_name, path=str(path))
+    return kwargs
+
+
+def warm_up(model_name: str, embed: Callable[[str], object]) -> None:
+    """Run a first inference of a model, and log how long it took."""
+    started = time.perf_counter()
+    embed(WARM_UP_TEXT)
+    logger.info(
+        "embedding_model_warmed_up",
+        model=model_name,
+        duration_ms=round((time.perf_counter() - started) * 1000, 1),
+    )
+
+
+def quantize_model(source_dir: Path, model_file: str, target_dir: Path) -> Path:
+    """
+    Write the int8 variant of a downloaded model.
+
+    The model's other files (tokenizer, configuration, ...) are copied, so that
+    fastembed loads the variant like the original model.
+
+    Args:
+        source_dir: Directory of the downloaded model
+        model_file: Path of the ONNX model in the directory
+        target_dir: Directory of the variant (replaced if it exists)
+
+    Returns:
+        Path: The quantized ONNX model
+    """
+    # onnxruntime's quantization tools need the onnx package, which the server
+    # does not: they are only used when building the image.
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    shutil.rmtree(target_dir, ignore_errors=True)
+    # Cached files are links to blobs: copy their contents.
+    shutil.copytree(
+        source_dir,
+        target_dir,
+        ignore=shutil.ignore_patterns(Path(model_file).name),
+    )
+    target = target_dir / model_file
+    quantize_dynamic(source_dir / model_file, target, weight_type=QuantType.QInt8)
+    logger.info(
+        "embedding_model_quantized",
+        model=str(source_dir / model_file),
+        size_mb=round((source_dir / model_file).stat().st_size / 2**20, 1),
+        quantized_size_mb=round(target.stat().st_size / 2**20, 1),
+    )
+    return target
+
+
+def _cached_model_files(
+    model_class: "type[TextEmbedding | SparseTextEmbedding]",
+    model_name: str,
+    cache_dir: Path,
+) -> tuple[Path, str]:
+    """
+    Directory and ONNX file of a downloaded model, from fastembed's model list.
+
+    fastembed downloads models from the Hugging Face Hub into the hub's cache
+    layout, so the hub finds the model's snapshot without network access.
+
+    Args:
+        model_class: fastembed class of the model
+        model_name: Name of the model
+        cache_dir: Model cache the model was downloaded into
+
+    Returns:
+        tuple[Path, str]: Model directory and path of the model file in it
+
+    Raises:
+        ValueError: If the model is unknown or not hosted on the Hugging Face Hub
+    """
+    from huggingface_hub import snapshot_download
+
+    description = next(
+        (
+            model
+            for model in model_class.list_supported_models()
+            if model["model"].lower() == model_name.lower()
+        ),
+        None,
+    )
+    repo_id: str | None = description["sources"].get("hf") if description else None
+    if description is None or not repo_id:
+        msg = f"No Hugging Face Hub model files for {model_name}"
+        raise ValueError(msg)
+    model_dir = snapshot_download(
+        repo_id=repo_id, cache_dir=str(cache_dir), local_files_only=True
+    )
+    return Path(model_dir), description["model_file"]
+
+
+def _download(
+    model_class: "type[TextEmbedding | SparseTextEmbedding]",
+    model_name: str,
+    cache_dir: Path,
+    *,
+    quantize: bool,
+) -> None:
+    model = model_class(model_name=model_name, cache_dir=str(cache_dir))
+    warm_up(model_name, lambda text: list(model.embed([text])))
+    if not quantize:
+        return
+    source_dir, model_file = _cached_model_files(model_class, model_name, cache_dir)
+    target_dir = quantized_model_dir(cache_dir, model_name)
+    quantize_model(source_dir, model_file, target_dir)
+    quantized = model_class(
+        model_name=model_name,
+        cache_dir=str(cache_dir),
+        specific_model_path=str(target_dir),
+    )
+    warm_up(f"{model_name} (int8)", lambda text: list(quantized.embed([text])))
+
+
+def main() -> None:
+    from fastembed import SparseTextEmbedding, TextEmbedding
+
+    from flare_ai_rag.retriever.config import RetrieverConfig
+    from flare_ai_rag.router.config import SemanticRouterConfig
+    from flare_ai_rag.utils import load_json
+
+    parser = argparse.ArgumentParser(
+        prog="python -m flare_ai_rag.ai.local_models",
+        description="Download the local embedding models of the input parameters.",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=settings.embedding_cache_dir or None,
+        help="model cache (default: EMBEDDING_CACHE_DIR)",
+    )
+    parser.add_argument(
+        "--quantize", action="store_true", help="also build int8 variants"
+    )
+    args = parser.parse_args()
+    if args.cache_dir is None:
+        parser.error("set EMBEDDING_CACHE_DIR or --cache-dir")
+
+    input_config = load_json(settings.input_path / "input_parameters.json")
+    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
+    semantic_router_config = SemanticRouterConfig.load(input_config["semantic_router"])
+    _download(
+        SparseTextEmbedding,
+        retriever_config.sparse_embedding_model,
+        args.cache_dir,
+        quantize=args.quantize,
+    )
+    _download(
+        TextEmbedding,
+        semantic_router_config.embedding_model,
+        args.cache_dir,
+        quantize=args.quantize,
+    )
+
+
+if __name__ == "__main__":
+    main()
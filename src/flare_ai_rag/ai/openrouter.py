@@ -1,4 +1,13 @@
+from enum import Enum
+from typing import Any, override
+
+import structlog
+
 from flare_ai_rag.ai import AsyncBaseClient, BaseClient
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.metrics import TokenUsage, record_usage
+
+logger = structlog.get_logger(__name__)
 
 
 class OpenRouterClient(BaseClient):
@@ -105,3 +114,160 @@ class AsyncOpenRouterClient(AsyncBaseClient):
         """
         endpoint = "/chat/completions"
         return await self._post(endpoint, payload)
+
+
+class OpenRouterProvider(BaseAIProvider):
+    """
+    Provider adapter exposing OpenRouter chat completions as a BaseAIProvider.
+
+    Lets OpenRouter models stand in for Gemini wherever a provider is expected
+    (e.g. as a member of a ProviderPool). JSON responses are requested through
+    OpenRouter's `response_format`; enum responses (`text/x.enum`) are requested
+    in the prompt and mapped back onto the enum values.
+    """
+
+    def __init__(self, api_key: str, model: str, **kwargs: str) -> None:
+        """
+        Initialize the provider.
+
+        :param api_key: OpenRouter API key.
+        :param model: OpenRouter model identifier (e.g. "google/gemini-2.0-flash-001").
+        :param kwargs: Optional "system_instruction" and "base_url".
+        """
+        self.api_key = api_key
+        self.model = model
+        self.system_instruction = kwargs.get("system_instruction")
+        self.base_url = kwargs.get("base_url")
+        self.client = OpenRouterClient(api_key, self.base_url)
+        self.async_client = AsyncOpenRouterClient(api_key, self.base_url)
+        # Name of the circuit breaker shared with other clients of the same host.
+        self.provider_name = self.client.provider
+        self.logger = logger.bind(service="openrouter", model=model)
+
+    @override
+    def reset(self) -> None:
+        """The provider keeps no conversation state, so there is nothing to clear."""
+        self.logger.debug("reset_openrouter")
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        """
+        Switch to another model.
+
+        :param model: New OpenRouter model identifier.
+        :param kwargs: Optional new "system_instruction".
+        """
+        self.model = model
+        self.system_instruction = kwargs.get(
+            "system_instruction", self.system_instruction
+        )
+        self.logger = logger.bind(service="openrouter", model=model)
+
+    def _payload(
+        self, prompt: str, response_mime_type: str | None, response_schema: Any | None
+    ) -> dict[str, Any]:
+        """Build the chat completion payload for a prompt."""
+        options = _enum_values(response_mime_type, response_schema)
+        if options:
+            prompt += f"\n\nRespond with exactly one of: {', '.join(options)}"
+        messages = [{"role": "user", "content": prompt}]
+        if self.system_instruction:
+            messages.insert(0, {"role": "system", "content": self.system_instruction})
+        payload: dict[str, Any] = {"model": self.model, "messages": messages}
+        if response_mime_type == "application/json":
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+
+    def _response(
+        self,
+        response: dict,
+        response_mime_type: str | None,
+        response_schema: Any | None,
+    ) -> ModelResponse:
+        """Wrap a chat completion in a ModelResponse."""
+        choices = response.get("choices") or [{}]
+        text = choices[0].get("message", {}).get("content") or ""
+        options = _enum_values(response_mime_type, response_schema)
+        if options:
+            # Models sometimes quote or decorate the label; keep the bare value.
+            text = next((o for o in options if o.lower() in text.lower()), text.strip())
+        model = response.get("model", self.model)
+        usage = _usage(response)
+        if usage is not None:
+            record_usage(model, usage)
+        return ModelResponse(
+            text=text,
+            raw_response=response,
+            metadata={
+                "model": model,
+                "finish_reason": choices[0].get("finish_reason"),
+                "usage": usage.as_dict() if usage else {},
+            },
+        )
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """
+        Generate a response with the chat completions endpoint.
+
+        :param prompt: Input prompt.
+        :param response_mime_type: Expected MIME type of the response.
+        :param response_schema: Expected response schema (enums are enforced).
+        :return: The generated text, the raw completion and its usage metadata.
+        """
+        response = self.client.send_chat_completion(
+            self._payload(prompt, response_mime_type, response_schema)
+        )
+        return self._response(response, response_mime_type, response_schema)
+
+    @override
+    async def generate_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Asynchronous counterpart of `generate`, using the async client."""
+        response = await self.async_client.send_chat_completion(
+            self._payload(prompt, response_mime_type, response_schema)
+        )
+        return self._response(response, response_mime_type, response_schema)
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        """Send a message as a new single-turn conversation."""
+        return self.generate(msg)
+
+    @override
+    async def send_message_async(self, msg: str) -> ModelResponse:
+        """Asynchronous counterpart of `send_message`."""
+        return await self.generate_async(msg)
+
+
+def _usage(response: dict) -> TokenUsage | None:
+    """Normalize the OpenAI-style usage of a chat completion, if reported."""
+    usage = response.get("usage")
+    if not usage:
+        return None
+    details = usage.get("prompt_tokens_details") or {}
+    return TokenUsage(
+        prompt_tokens=usage.get("prompt_tokens", 0),
+        output_tokens=usage.get("completion_tokens", 0),
+        cached_tokens=details.get("cached_tokens", 0),
+    )
+
+
+def _enum_values(response_mime_type: str | None, response_schema: Any) -> list[str]:
+    """Allowed values of an enum response schema, if one was requested."""
+    if (
+        response_mime_type == "text/x.enum"
+        and isinstance(response_schema, type)
+        and issubclass(response_schema, Enum)
+    ):
+        return [str(member.value) for member in response_schema]
+    return []
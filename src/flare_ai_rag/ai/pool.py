@@ -0,0 +1,380 @@
+"""
+Provider Pool Module
+
+This module combines several AI providers (e.g. Gemini and OpenRouter) serving the
+same role into a single provider with latency-aware failover and hedged requests.
+
+Every member's recent latencies and outcomes are kept in a sliding window. Calls
+go to the fastest healthy member (lowest median latency); members whose circuit
+breaker is not closed or whose recent error rate is too high are only tried last.
+A failed call falls over to the next member. On the async path, a call that is
+still running after the primary member's tail latency (p95 by default) is hedged:
+the same request is sent to the next member, the first success wins and the
+other request is cancelled.
+
+The pool and hedging are both off unless enabled in the input parameters: a
+hedged call is a second paid request, and a pool fails over to another model.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, override
+
+import numpy as np
+import structlog
+
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.ai.resilience import CircuitState, get_circuit_breaker
+from flare_ai_rag.metrics import registry
+
+logger = structlog.get_logger(__name__)
+
+_pool_calls = registry.counter(
+    "provider_pool_calls_total",
+    "Calls made by provider pools, by pool, member and outcome",
+    ("pool", "member", "outcome"),
+)
+_pool_hedges = registry.counter(
+    "provider_pool_hedges_total",
+    "Hedged requests sent by provider pools, by pool and winner",
+    ("pool", "outcome"),
+)
+
+
+@dataclass(frozen=True)
+class ProviderPoolConfig:
+    enabled: bool
+    hedging: bool
+    hedge_quantile: float
+    hedge_min_delay: float
+    window_size: int
+    min_samples: int
+    max_error_rate: float
+    exploration_rate: float
+    openrouter_model: str
+
+    @staticmethod
+    def load(pool_config: dict[str, Any]) -> "ProviderPoolConfig":
+        """Loads the provider pool config."""
+        return ProviderPoolConfig(
+            enabled=pool_config.get("enabled", False),
+            hedging=pool_config.get("hedging", False),
+            hedge_quantile=pool_config.get("hedge_quantile", 0.95),
+            hedge_min_delay=pool_config.get("hedge_min_delay_ms", 250) / 1000,
+            window_size=pool_config.get("window_size", 200),
+            min_samples=pool_config.get("min_samples", 20),
+            max_error_rate=pool_config.get("max_error_rate", 0.5),
+            exploration_rate=pool_config.get("exploration_rate", 0.05),
+            openrouter_model=pool_config.get(
+                "openrouter_model", "google/gemini-2.0-flash-001"
+            ),
+        )
+
+
+class LatencyTracker:
+    """Sliding window of a member's successful call latencies and outcomes."""
+
+    def __init__(self, window_size: int) -> None:
+        self._latencies: deque[float] = deque(maxlen=window_size)
+        self._outcomes: deque[bool] = deque(maxlen=window_size)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, *, ok: bool) -> None:
+        with self._lock:
+            self._outcomes.append(ok)
+            if ok:
+                self._latencies.append(latency)
+
+    @property
+    def samples(self) -> int:
+        return len(self._outcomes)
+
+    def quantile(self, q: float) -> float | None:
+        """Latency quantile of recent successful calls, None without data."""
+        with self._lock:
+            if not self._latencies:
+                return None
+            return float(np.quantile(np.fromiter(self._latencies, float), q))
+
+    @property
+    def error_rate(self) -> float:
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+
+@dataclass
+class PoolMember:
+    """
+    A provider in a pool.
+
+    Attributes:
+        name: Member name used in logs and metrics (e.g. "gemini")
+        provider: The provider serving the member's calls
+        breaker: Name of the provider's circuit breaker
+        tracker: Recent latencies and outcomes of the member
+    """
+
+    name: str
+    provider: BaseAIProvider
+    breaker: str
+    tracker: LatencyTracker
+
+
+class ProviderPool(BaseAIProvider):
+    """
+    Provider spreading calls over several members with failover and hedging.
+
+    The pool is a BaseAIProvider itself, so routers and responders use it like a
+    single provider. All members should serve the same role (same system
+    instruction and a comparable model).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        members: list[tuple[str, BaseAIProvider]],
+        config: ProviderPoolConfig,
+    ) -> None:
+        """
+        Initialize the pool.
+
+        Args:
+            name: Pool name used in logs and metrics (e.g. "router")
+            members: Member names and providers, in order of preference
+            config: Health, hedging and exploration settings
+        """
+        if not members:
+            msg = "A provider pool needs at least one member"
+            raise ValueError(msg)
+        self.name = name
+        self.config = config
+        self.members = [
+            PoolMember(
+                name=member_name,
+                provider=provider,
+                breaker=getattr(provider, "provider_name", member_name),
+                tracker=LatencyTracker(config.window_size),
+            )
+            for member_name, provider in members
+        ]
+        self.model_name = "+".join(
+            str(getattr(m.provider, "model_name", m.provider.model))
+            for m in self.members
+        )
+        self.model = self.model_name
+        self.logger = logger.bind(service="provider_pool", pool=name)
+
+    @override
+    def reset(self) -> None:
+        """Reset all members."""
+        for member in self.members:
+            member.provider.reset()
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        """
+        Members use different model identifiers, so there is nothing to switch.
+
+        Switch the models of the member providers individually instead.
+        """
+        self.logger.warning("pool_reset_model_ignored", model=model)
+
+    def healthy(self, member: PoolMember) -> bool:
+        """
+        Whether a member's circuit is closed and its error rate acceptable.
+
+        A half-open circuit has its probe in flight and rejects other calls, so
+        the member is unhealthy until the probe closes the circuit.
+        """
+        if get_circuit_breaker(member.breaker).state != CircuitState.CLOSED:
+            return False
+        tracker = member.tracker
+        return (
+            tracker.samples < self.config.min_samples
+            or tracker.error_rate <= self.config.max_error_rate
+        )
+
+    def ranked(self) -> list[PoolMember]:
+        """
+        Members in the order they should be tried.
+
+        Healthy members come first, fastest median latency first; members without
+        latency data yet are tried before measured ones so that they get measured.
+        Occasionally the two best members are swapped to keep the runner-up's
+        statistics fresh.
+        """
+        healthy = [m for m in self.members if self.healthy(m)]
+        unhealthy = [m for m in self.members if m not in healthy]
+        healthy.sort(key=self._median)
+        if (
+            len(healthy) > 1 and random.random() < self.config.exploration_rate  # noqa: S311
+        ):
+            healthy[0], healthy[1] = healthy[1], healthy[0]
+        return healthy + unhealthy
+
+    @staticmethod
+    def _median(member: PoolMember) -> float:
+        median = member.tracker.quantile(0.5)
+        if median is None:
+            # Unmeasured members go first; members that only failed go last.
+            return 0.0 if member.tracker.samples == 0 else float("inf")
+        return median
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Latency percentiles, error rate and health of every member."""
+        return {
+            m.name: {
+                "p50": m.tracker.quantile(0.5),
+                "p95": m.tracker.quantile(0.95),
+                "p99": m.tracker.quantile(0.99),
+                "error_rate": m.tracker.error_rate,
+                "samples": m.tracker.samples,
+                "healthy": self.healthy(m),
+            }
+            for m in self.members
+        }
+
+    def _record(self, member: PoolMember, started: float, outcome: str) -> None:
+        member.tracker.record(time.monotonic() - started, ok=outcome == "success")
+        _pool_calls.inc(pool=self.name, member=member.name, outcome=outcome)
+
+    def _call(self, call: Callable[[BaseAIProvider], ModelResponse]) -> ModelResponse:
+        """Call members in rank order until one succeeds."""
+        error: Exception | None = None
+        for member in self.ranked():
+            started = time.monotonic()
+            try:
+                response = call(member.provider)
+            except Exception as e:  # noqa: BLE001
+                self._record(member, started, "error")
+                self.logger.warning("pool_failover", member=member.name, error=str(e))
+                error = e
+            else:
+                self._record(member, started, "success")
+                response.metadata["pool_member"] = member.name
+                return response
+        assert error is not None  # noqa: S101
+        raise error
+
+    async def _attempt(
+        self,
+        member: PoolMember,
+        call: Callable[[BaseAIProvider], Awaitable[ModelResponse]],
+    ) -> ModelResponse:
+        started = time.monotonic()
+        try:
+            response = await call(member.provider)
+        except asyncio.CancelledError:
+            # Lost a hedge race; the latency says nothing about the member.
+            _pool_calls.inc(pool=self.name, member=member.name, outcome="cancelled")
+            raise
+        except Exception:
+            self._record(member, started, "error")
+            raise
+        self._record(member, started, "success")
+        response.metadata["pool_member"] = member.name
+        return response
+
+    def _hedge_delay(self, member: PoolMember) -> float | None:
+        """Time to wait for a member before hedging, None if not to hedge."""
+        if not self.config.hedging or member.tracker.samples < self.config.min_samples:
+            return None
+        tail = member.tracker.quantile(self.config.hedge_quantile)
+        if tail is None:
+            return None
+        return max(tail, self.config.hedge_min_delay)
+
+    async def _call_async(
+        self, call: Callable[[BaseAIProvider], Awaitable[ModelResponse]]
+    ) -> ModelResponse:
+        """
+        Call members in rank order, hedging slow calls with the next member.
+
+        At most two requests are in flight at a time. The first success is
+        returned and the other request is cancelled, and awaited so that it
+        releases its circuit breaker before the call returns; when both fail,
+        the remaining members are tried in order.
+        """
+        queue = self.ranked()
+        running: dict[asyncio.Task[ModelResponse], PoolMember] = {}
+        hedge: asyncio.Task[ModelResponse] | None = None
+        error: BaseException | None = None
+        try:
+            while queue or running:
+                if not running:
+                    member = queue.pop(0)
+                    running[asyncio.create_task(self._attempt(member, call))] = member
+                    hedge = None
+                delay = None
+                if len(running) == 1 and queue:
+                    delay = self._hedge_delay(next(iter(running.values())))
+                done, _ = await asyncio.wait(
+                    running, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # The primary is slower than its tail latency: hedge it.
+                    member = queue.pop(0)
+                    hedge = asyncio.create_task(self._attempt(member, call))
+                    running[hedge] = member
+                    _pool_hedges.inc(pool=self.name, outcome="sent")
+                    self.logger.debug("pool_hedge", member=member.name, delay=delay)
+                    continue
+                for task in done:
+                    member = running.pop(task)
+                    if task.exception() is None:
+                        if hedge is not None:
+                            outcome = "hedge_won" if task is hedge else "primary_won"
+                            _pool_hedges.inc(pool=self.name, outcome=outcome)
+                        return task.result()
+                    error = task.exception()
+                    self.logger.warning(
+                        "pool_failover", member=member.name, error=str(error)
+                    )
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.wait(running)
+        assert error is not None  # noqa: S101
+        raise error
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Generate with the best member, falling over on errors."""
+        return self._call(
+            lambda p: p.generate(prompt, response_mime_type, response_schema)
+        )
+
+    @override
+    async def generate_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        """Generate with the best member, with failover and hedging."""
+        return await self._call_async(
+            lambda p: p.generate_async(prompt, response_mime_type, response_schema)
+        )
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        """Send a message to the best member, falling over on errors."""
+        return self._call(lambda p: p.send_message(msg))
+
+    @override
+    async def send_message_async(self, msg: str) -> ModelResponse:
+        """Send a message to the best member, with failover and hedging."""
+        return await self._call_async(lambda p: p.send_message_async(msg))
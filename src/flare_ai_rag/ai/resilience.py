@@ -0,0 +1,420 @@
+"""
+Resilience Module
+
+This module provides the retry and circuit breaking policy shared by all calls to
+model providers (Gemini generation and embeddings, OpenRouter HTTP requests).
+
+Transient failures (429, 5xx, timeouts, dropped connections) are retried with
+jittered exponential backoff, honoring the provider's Retry-After hint, within an
+overall per-call deadline. A circuit breaker per provider fails calls fast while
+the provider keeps failing, and lets a single probe through after a cool-down.
+Retries, call outcomes and breaker transitions are counted in the metrics
+registry.
+"""
+
+import asyncio
+import email.utils
+import random
+import threading
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Final
+
+import httpx
+import requests
+import structlog
+from google.api_core.exceptions import GoogleAPICallError
+
+from flare_ai_rag.metrics import registry
+from flare_ai_rag.settings import settings
+from flare_ai_rag.tracing import span
+
+logger = structlog.get_logger(__name__)
+
+RETRYABLE_STATUS_CODES: Final = frozenset({408, 425, 429, 500, 502, 503, 504})
+
+_retries = registry.counter(
+    "provider_retries_total",
+    "Retried provider calls, by provider and reason",
+    ("provider", "reason"),
+)
+_calls = registry.counter(
+    "provider_calls_total",
+    "Provider calls (including all their retries), by provider and outcome",
+    ("provider", "outcome"),
+)
+_transitions = registry.counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state changes, by provider and new state",
+    ("provider", "state"),
+)
+
+
+class ProviderHTTPError(ConnectionError):
+    """
+    Error response from a provider's HTTP API.
+
+    Attributes:
+        status_code: HTTP status code of the response
+        retry_after: Delay requested by the provider's Retry-After header
+    """
+
+    def __init__(
+        self, message: str, status_code: int, retry_after: float | None = None
+    ) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of calling a provider whose circuit breaker is open."""
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header (delay in seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+def classify_error(error: BaseException) -> tuple[bool, str, float | None]:
+    """
+    Decide whether a failed provider call should be retried.
+
+    Returns:
+        tuple: Whether the error is transient, a short reason label, and the
+            delay requested by the provider (if any)
+    """
+    if isinstance(error, ProviderHTTPError):
+        return (
+            error.status_code in RETRYABLE_STATUS_CODES,
+            str(error.status_code),
+            error.retry_after,
+        )
+    if isinstance(error, GoogleAPICallError):
+        code = int(error.code) if error.code is not None else 0
+        retry_after = None
+        for detail in getattr(error, "details", None) or []:
+            delay = getattr(detail, "retry_delay", None)
+            if delay is not None:
+                retry_after = delay.seconds + delay.nanos / 1e9
+        return code in RETRYABLE_STATUS_CODES, str(code), retry_after
+    transient_errors = (
+        requests.ConnectionError,
+        requests.Timeout,
+        httpx.TransportError,
+        TimeoutError,
+    )
+    if isinstance(error, transient_errors):
+        return True, type(error).__name__, None
+    return False, type(error).__name__, None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Retry settings for provider calls.
+
+    Attributes:
+        max_attempts: Maximum number of attempts, including the first one
+        base_delay: Backoff before the first retry (doubled on each retry)
+        max_delay: Upper bound of a single backoff
+        deadline: Overall time budget of a call, including all retries
+        attempt_timeout: Timeout of a single attempt (async calls only)
+    """
+
+    max_attempts: int
+    base_delay: float
+    max_delay: float
+    deadline: float
+    attempt_timeout: float
+
+    @staticmethod
+    def from_settings() -> "RetryPolicy":
+        """Build the default policy from the application settings."""
+        return RetryPolicy(
+            max_attempts=settings.provider_max_attempts,
+            base_delay=settings.provider_backoff_base_seconds,
+            max_delay=settings.provider_backoff_max_seconds,
+            deadline=settings.provider_deadline_seconds,
+            attempt_timeout=settings.provider_attempt_timeout_seconds,
+        )
+
+    def backoff(self, attempt: int, retry_after: float | None) -> float:
+        """Delay before retrying after the given (1-based) failed attempt."""
+        delay = random.uniform(  # noqa: S311
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+
+class CircuitState(StrEnum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast after repeated transient failures of a provider.
+
+    After `failure_threshold` consecutive transient failures the circuit opens and
+    calls are rejected for `reset_timeout` seconds. Then a single probe call is
+    let through: its success closes the circuit, its failure or cancellation
+    opens it again. A probe that never reports back (e.g. a hung call) is given
+    up after `reset_timeout` seconds, and the circuit opens again.
+    """
+
+    def __init__(
+        self, provider: str, failure_threshold: int, reset_timeout: float
+    ) -> None:
+        self.provider = provider
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+
+    def _transition(self, state: CircuitState) -> None:
+        if state != self.state:
+            self.state = state
+            _transitions.inc(provider=self.provider, state=state.value)
+            logger.warning("circuit_breaker", provider=self.provider, state=state)
+
+    def before_call(self) -> bool:
+        """
+        Reject the call if the circuit is open (or a probe is in flight).
+
+        Returns:
+            bool: Whether the call is the circuit's probe, which must end with
+                `record_success`, `record_failure` or `release`
+        """
+        with self._lock:
+            if self.state == CircuitState.CLOSED:
+                return False
+            now = time.monotonic()
+            if (
+                self.state == CircuitState.HALF_OPEN
+                and now - self._probe_started >= self.reset_timeout
+            ):
+                # The probe never reported back: give it up.
+                self._opened_at = now
+                self._transition(CircuitState.OPEN)
+            elif (
+                self.state == CircuitState.OPEN
+                and now - self._opened_at >= self.reset_timeout
+            ):
+                self._probe_started = now
+                self._transition(CircuitState.HALF_OPEN)
+                return True
+        msg = f"Circuit breaker for {self.provider} is {self.state.value}"
+        raise CircuitOpenError(msg)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._transition(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if (
+                self.state == CircuitState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._transition(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """End a probe that failed with a non-transient error or was cancelled."""
+        with self._lock:
+            if self.state == CircuitState.HALF_OPEN:
+                self._opened_at = time.monotonic()
+                self._transition(CircuitState.OPEN)
+
+
+_breakers: dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+_default_policy: RetryPolicy | None = None
+
+
+def get_circuit_breaker(provider: str) -> CircuitBreaker:
+    """Return the circuit breaker shared by all clients of a provider."""
+    with _breakers_lock:
+        if provider not in _breakers:
+            _breakers[provider] = CircuitBreaker(
+                provider,
+                failure_threshold=settings.circuit_breaker_failure_threshold,
+                reset_timeout=settings.circuit_breaker_reset_seconds,
+            )
+        return _breakers[provider]
+
+
+def _policy() -> RetryPolicy:
+    global _default_policy  # noqa: PLW0603
+    if _default_policy is None:
+        _default_policy = RetryPolicy.from_settings()
+    return _default_policy
+
+
+def _next_delay(
+    error: Exception,
+    attempt: int,
+    elapsed: float,
+    breaker: CircuitBreaker,
+    policy: RetryPolicy,
+) -> float | None:
+    """Record a failed attempt and return the backoff, or None to give up."""
+    provider = breaker.provider
+    retryable, reason, retry_after = classify_error(error)
+    if not retryable:
+        breaker.release()
+        _calls.inc(provider=provider, outcome="error")
+        return None
+    breaker.record_failure()
+    delay = policy.backoff(attempt, retry_after)
+    if attempt >= policy.max_attempts or delay >= policy.deadline - elapsed:
+        _calls.inc(provider=provider, outcome="error")
+        logger.warning(
+            "provider_call_failed", provider=provider, attempts=attempt, reason=reason
+        )
+        return None
+    _retries.inc(provider=provider, reason=reason)
+    logger.info(
+        "provider_call_retry",
+        provider=provider,
+        attempt=attempt,
+        reason=reason,
+        delay=round(delay, 3),
+    )
+    return delay
+
+
+def _check_circuit(provider: str, breaker: CircuitBreaker) -> bool:
+    try:
+        return breaker.before_call()
+    except CircuitOpenError:
+        _calls.inc(provider=provider, outcome="circuit_open")
+        raise
+
+
+def call_with_retry[**P, T](
+    provider: str, func: Callable[P, T], /, *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """
+    Call a blocking provider function with retries and circuit breaking.
+
+    The deadline is checked between attempts; the provider client's own timeout
+    bounds a single attempt.
+
+    Args:
+        provider: Provider name, selecting the shared circuit breaker
+        func: The provider call
+        *args: Positional arguments forwarded to ``func``
+        **kwargs: Keyword arguments forwarded to ``func``
+
+    Returns:
+        The return value of ``func``
+
+    Raises:
+        CircuitOpenError: If the provider's circuit breaker is open
+        Exception: The last error once retries are exhausted or not applicable
+    """
+    policy = _policy()
+    breaker = get_circuit_breaker(provider)
+    started = time.monotonic()
+    attempt = 0
+    with span("provider_call", provider=provider) as call_span:
+        while True:
+            probe = _check_circuit(provider, breaker)
+            attempt += 1
+            if call_span is not None:
+                call_span.set(attempts=attempt)
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                elapsed = time.monotonic() - started
+                delay = _next_delay(e, attempt, elapsed, breaker, policy)
+                if delay is None:
+                    raise
+                time.sleep(delay)
+            except BaseException:
+                if probe:
+                    breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                _calls.inc(provider=provider, outcome="success")
+                return result
+
+
+async def call_with_retry_async[**P, T](
+    provider: str,
+    func: Callable[P, Awaitable[T]],
+    /,
+    *args: P.args,
+    **kwargs: P.kwargs,
+) -> T:
+    """
+    Await an async provider function with retries and circuit breaking.
+
+    Each attempt is cancelled after the policy's attempt timeout or when the
+    overall deadline passes, whichever comes first.
+
+    Args:
+        provider: Provider name, selecting the shared circuit breaker
+        func: The async provider call
+        *args: Positional arguments forwarded to ``func``
+        **kwargs: Keyword arguments forwarded to ``func``
+
+    Returns:
+        The result of ``func``
+
+    Raises:
+        CircuitOpenError: If the provider's circuit breaker is open
+        Exception: The last error once retries are exhausted or not applicable
+    """
+    policy = _policy()
+    breaker = get_circuit_breaker(provider)
+    started = time.monotonic()
+    attempt = 0
+    with span("provider_call", provider=provider) as call_span:
+        while True:
+            probe = _check_circuit(provider, breaker)
+            attempt += 1
+            if call_span is not None:
+                call_span.set(attempts=attempt)
+            remaining = policy.deadline - (time.monotonic() - started)
+            try:
+                async with asyncio.timeout(min(policy.attempt_timeout, remaining)):
+                    result = await func(*args, **kwargs)
+            except Exception as e:
+                elapsed = time.monotonic() - started
+                delay = _next_delay(e, attempt, elapsed, breaker, policy)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+            except BaseException:
+                # Cancelled (client disconnect, lost hedge): free the probe slot.
+                if probe:
+                    breaker.release()
+                raise
+            else:
+                breaker.record_success()
+                _calls.inc(provider=provider, outcome="success")
+                return result
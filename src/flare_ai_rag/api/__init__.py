@@ -1,3 +1,27 @@
-from .routes.chat import ChatMessage, ChatRouter, router
+from typing import TYPE_CHECKING
 
-__all__ = ["ChatMessage", "ChatRouter", "router"]
+from flare_ai_rag.lazy import lazy_exports
+
+# Renamed on export, which lazy_exports does not support; the module is light.
+from .routes.metrics import router as metrics_router
+
+if TYPE_CHECKING:
+    from .admission import AdmissionController, AdmissionRejectedError
+    from .routes.chat import ChatMessage, ChatRouter, router
+
+__all__ = [
+    "AdmissionController",
+    "AdmissionRejectedError",
+    "ChatMessage",
+    "ChatRouter",
+    "metrics_router",
+    "router",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".admission": ["AdmissionController", "AdmissionRejectedError"],
+        ".routes.chat": ["ChatMessage", "ChatRouter", "router"],
+    },
+)
@@ -0,0 +1,183 @@
+"""
+Admission control for the chat endpoint.
+
+Every chat request makes several model calls. Without a bound on concurrent
+work, an overload makes every call slower until all clients time out together.
+The AdmissionController caps the number of requests processed at once; excess
+requests wait in a bounded FIFO queue for at most a deadline. Requests that find
+the queue full are rejected immediately with 429, requests whose deadline passes
+while queued are rejected with 503, both with a Retry-After estimate. Admitted
+requests therefore keep a stable latency while excess load is shed quickly.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import NoReturn
+
+import structlog
+
+from flare_ai_rag.metrics import registry
+from flare_ai_rag.tracing import span
+
+logger = structlog.get_logger(__name__)
+
+_in_flight = registry.gauge(
+    "chat_requests_in_flight", "Chat requests currently being processed"
+)
+_queue_depth = registry.gauge(
+    "chat_admission_queue_depth", "Chat requests waiting for admission"
+)
+_queue_wait = registry.histogram(
+    "chat_admission_wait_seconds",
+    "Time chat requests waited for admission, by outcome",
+    ("outcome",),
+)
+_rejections = registry.counter(
+    "chat_admission_rejections_total",
+    "Chat requests rejected by admission control, by reason",
+    ("reason",),
+)
+
+
+class AdmissionRejectedError(Exception):
+    """
+    Raised when a request is not admitted.
+
+    Attributes:
+        status_code: HTTP status to answer with (429 or 503)
+        retry_after: Suggested delay before retrying, in whole seconds
+    """
+
+    def __init__(self, message: str, status_code: int, retry_after: int) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounds concurrent chat requests with a deadline-bounded wait queue.
+
+    The controller is bound to the event loop it is first used on, like the
+    asyncio primitives it is built from.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 64,
+        max_queue: int = 128,
+        queue_timeout: float = 10.0,
+    ) -> None:
+        """
+        Initialize the controller.
+
+        Args:
+            max_in_flight: Maximum number of requests processed concurrently
+            max_queue: Maximum number of requests waiting for admission
+            queue_timeout: Maximum time a request waits for admission (seconds)
+        """
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._in_flight = 0
+        self._waiters: deque[asyncio.Future[None]] = deque()
+        # Moving average of the processing time of admitted requests.
+        self._service_time = 1.0
+        self.logger = logger.bind(service="admission")
+
+    @property
+    def in_flight(self) -> int:
+        """Number of requests currently admitted."""
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """Number of requests waiting for admission."""
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """Estimate when a rejected request could be admitted, in seconds."""
+        backlog = (len(self._waiters) + 1) / max(self.max_in_flight, 1)
+        return max(1, math.ceil(self._service_time * backlog))
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """
+        Hold an admission slot for the duration of the context.
+
+        Raises:
+            AdmissionRejectedError: If the queue is full or the wait deadline
+                passes before a slot frees up
+        """
+        await self._acquire()
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            elapsed = time.monotonic() - started
+            self._service_time = 0.9 * self._service_time + 0.1 * elapsed
+            self._release()
+
+    def _reject(self, reason: str, status_code: int) -> NoReturn:
+        _rejections.inc(reason=reason)
+        retry_after = self.retry_after()
+        self.logger.warning(
+            "request_rejected",
+            reason=reason,
+            in_flight=self._in_flight,
+            queued=len(self._waiters),
+            retry_after=retry_after,
+        )
+        msg = "The server is overloaded, please retry later"
+        raise AdmissionRejectedError(msg, status_code, retry_after)
+
+    async def _acquire(self) -> None:
+        if self._in_flight < self.max_in_flight and not self._waiters:
+            self._take_slot()
+            _queue_wait.observe(0.0, outcome="admitted")
+            return
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full", 429)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        _queue_depth.set(len(self._waiters))
+        started = time.monotonic()
+        try:
+            with span("admission_wait", queued=len(self._waiters)):
+                async with asyncio.timeout(self.queue_timeout):
+                    await waiter
+        except TimeoutError:
+            # A slot may have been handed over just as the deadline passed.
+            if not waiter.done() or waiter.cancelled():
+                _queue_wait.observe(time.monotonic() - started, outcome="timeout")
+                self._reject("queue_timeout", 503)
+        except asyncio.CancelledError:
+            # The client went away; pass on a slot handed to it meanwhile.
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+            _queue_depth.set(len(self._waiters))
+        _queue_wait.observe(time.monotonic() - started, outcome="admitted")
+
+    def _take_slot(self) -> None:
+        self._in_flight += 1
+        _in_flight.set(self._in_flight)
+
+    def _release(self) -> None:
+        """Hand the slot over to the oldest waiter, or free it."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                _queue_depth.set(len(self._waiters))
+                return
+        self._in_flight -= 1
+        _in_flight.set(self._in_flight)
@@ -1,5 +1,36 @@
-from .data_scraper import scrape
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .capture import (
+        CaptureMiddleware,
+        TrafficCapture,
+        anonymize,
+        capture_trace,
+        stage_timings,
+    )
+    from .data_scraper import scrape
 
 __all__ = [
+    "CaptureMiddleware",
+    "TrafficCapture",
+    "anonymize",
+    "capture_trace",
     "scrape",
-]
\ No newline at end of file
+    "stage_timings",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".capture": [
+            "CaptureMiddleware",
+            "TrafficCapture",
+            "anonymize",
+            "capture_trace",
+            "stage_timings",
+        ],
+        ".data_scraper": ["scrape"],
+    },
+)
@@ -0,0 +1,263 @@
+"""
+Capture of chat traffic for replay.
+
+CaptureMiddleware appends a sample of the chat requests to a JSONL file, one
+record per request:
+
+    {"timestamp": 1718000000.12, "message": "What is <address>?",
+     "session": "3f2a...", "status": 200, "duration_ms": 2310.4,
+     "route": "RAG", "stages": {"classification": 512.3, ...}}
+
+Records are anonymized: personal data and secrets in messages (e-mail and IP
+addresses, hex addresses and keys, long numbers) are replaced with placeholders,
+and session IDs are replaced with salted hashes, which keep the turns of a
+session together without revealing the ID. The route and stage timings are taken
+from the request's trace (see `flare_ai_rag.tracing`).
+
+Records are written from a background thread; when its queue is full, new
+records are dropped rather than slowing requests down. Each record is appended
+with a single unbuffered write, so that the workers of a pre-forked server can
+share the file without interleaving their lines. Captures are replayed
+with `python -m flare_ai_rag.loadtest.replay`.
+"""
+
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import secrets
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from flare_ai_rag.tracing import Span
+
+logger = structlog.get_logger(__name__)
+
+CHAT_PATH = "/api/routes/chat/"
+
+# Replacements applied to captured messages, in order
+_PATTERNS = (
+    (re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+"), "<email>"),
+    (re.compile(r"\b0x[0-9a-fA-F]{8,}\b"), "<address>"),
+    (re.compile(r"\b[0-9a-fA-F]{32,}\b"), "<key>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}\b"), "<ip>"),
+    (re.compile(r"\b\d[\d -]{6,}\d\b"), "<number>"),
+)
+
+_captured_trace: ContextVar[list[Span] | None] = ContextVar(
+    "captured_trace", default=None
+)
+
+
+def anonymize(message: str) -> str:
+    """Replace personal data and secrets in a message with placeholders."""
+    for pattern, placeholder in _PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def capture_trace(root: Span) -> None:
+    """
+    Hand the trace of the request being processed to the capture, if any.
+
+    Called by the chat endpoint when it opens the request's trace; the spans are
+    read once the response has been sent, when their durations are final.
+    """
+    slot = _captured_trace.get()
+    if slot is not None:
+        slot.append(root)
+
+
+@contextmanager
+def _trace_slot() -> Iterator[list[Span]]:
+    slot: list[Span] = []
+    token = _captured_trace.set(slot)
+    try:
+        yield slot
+    finally:
+        _captured_trace.reset(token)
+
+
+def stage_timings(root: Span) -> dict[str, float]:
+    """Total duration of the spans of a trace by name, in milliseconds."""
+    timings: dict[str, float] = {}
+    for span in root.walk():
+        if span is not root and span.duration is not None:
+            timings[span.name] = timings.get(span.name, 0.0) + span.duration * 1000
+    return {name: round(duration, 1) for name, duration in timings.items()}
+
+
+class TrafficCapture:
+    """Appends anonymized request records to a JSONL file in the background."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        sample_rate: float = 1.0,
+        salt: str = "",
+        max_queue: int = 10_000,
+    ) -> None:
+        """
+        Initialize the capture and start its writer thread.
+
+        Args:
+            path: JSONL file records are appended to
+            sample_rate: Fraction of requests captured
+            salt: Salt of the session ID hashes (default: random, so hashes do
+                not match across restarts)
+            max_queue: Maximum number of records waiting to be written
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.dropped = 0
+        self._salt = (salt or secrets.token_hex(16)).encode()
+        self._queue: queue.Queue[dict[str, Any] | None] = queue.Queue(maxsize=max_queue)
+        self.logger = logger.bind(service="traffic_capture", path=str(path))
+        self._thread = threading.Thread(
+            target=self._run, name="traffic-capture", daemon=True
+        )
+        self._thread.start()
+
+    def sampled(self) -> bool:
+        return random.random() < self.sample_rate  # noqa: S311
+
+    def session_key(self, session_id: str) -> str:
+        """Salted hash standing in for a session ID."""
+        return hashlib.sha256(self._salt + session_id.encode()).hexdigest()[:16]
+
+    def record(self, record: dict[str, Any]) -> None:
+        """Queue a record, if the queue has room."""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _write(self, records: list[dict[str, Any]]) -> None:
+        written = 0
+        try:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                for record in records:
+                    os.write(fd, (json.dumps(record) + "\n").encode())
+                    written += 1
+            finally:
+                os.close(fd)
+        except OSError as e:
+            self.dropped += len(records) - written
+            self.logger.warning("capture_write_failed", error=str(e))
+
+    def _run(self) -> None:
+        """Write queued records in batches until shut down."""
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch: list[dict[str, Any]] = []
+            try:
+                while True:
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                self._write(batch)
+
+    def shutdown(self) -> None:
+        """Write the remaining queued records and stop the writer thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        if self.dropped:
+            self.logger.warning("capture_records_dropped", dropped=self.dropped)
+
+
+class CaptureMiddleware:
+    """ASGI middleware capturing a sample of the chat requests."""
+
+    def __init__(
+        self, app: ASGIApp, capture: TrafficCapture, path: str = CHAT_PATH
+    ) -> None:
+        self.app = app
+        self.capture = capture
+        self.path = path
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"] != self.path
+            or not self.capture.sampled()
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = bytearray()
+        status = 500
+
+        async def receive_body() -> Message:
+            message = await receive()
+            if message["type"] == "http.request":
+                body.extend(message.get("body", b""))
+            return message
+
+        async def send_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        timestamp, started = time.time(), time.perf_counter()
+        with _trace_slot() as traces:
+            try:
+                await self.app(scope, receive_body, send_status)
+            finally:
+                self._record(
+                    bytes(body),
+                    status,
+                    timestamp,
+                    time.perf_counter() - started,
+                    traces[0] if traces else None,
+                )
+
+    def _record(
+        self,
+        body: bytes,
+        status: int,
+        timestamp: float,
+        duration: float,
+        root: Span | None,
+    ) -> None:
+        try:
+            request = json.loads(body)
+        except ValueError:
+            return
+        if not isinstance(request, dict) or not isinstance(request.get("message"), str):
+            return
+        attributes = root.attributes if root is not None else {}
+        # New sessions get their ID in the response; the trace records it.
+        session_id = attributes.get("session_id") or request.get("session_id")
+        self.capture.record(
+            {
+                "timestamp": round(timestamp, 3),
+                "message": anonymize(request["message"]),
+                "session": (
+                    self.capture.session_key(str(session_id)) if session_id else None
+                ),
+                "status": status,
+                "duration_ms": round(duration * 1000, 1),
+                "route": attributes.get("route"),
+                "stages": stage_timings(root) if root is not None else {},
+            }
+        )
@@ -1,19 +1,76 @@
+import asyncio
+import hashlib
+
 import structlog
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 from pydantic import BaseModel, Field
 
-from flare_ai_rag.ai import GeminiProvider
+from flare_ai_rag.ai import BaseAIProvider
+from flare_ai_rag.api.admission import AdmissionController, AdmissionRejectedError
+from flare_ai_rag.api.middleware import capture_trace, scrape
 from flare_ai_rag.attestation import Vtpm, VtpmAttestationError
+from flare_ai_rag.concurrency import SingleFlight, run_in_executor
+from flare_ai_rag.metrics import (
+    TOKEN_BUCKETS,
+    current_request_usage,
+    current_route,
+    registry,
+    track_request_usage,
+    track_stage,
+    usage_meter,
+)
 from flare_ai_rag.prompts import PromptService, SemanticRouterResponse
 from flare_ai_rag.responder import GeminiResponder
 from flare_ai_rag.retriever import QdrantRetriever
-from flare_ai_rag.router import BaseQueryRouter
-
-from flare_ai_rag.api.middleware import scrape
+from flare_ai_rag.router import (
+    BaseQueryRouter,
+    GeminiFusedRouter,
+    LocalSemanticRouter,
+)
+from flare_ai_rag.session import (
+    HistoryConfig,
+    HistoryManager,
+    Session,
+    SessionStore,
+)
+from flare_ai_rag.tracing import annotate, trace
 
 logger = structlog.get_logger(__name__)
 router = APIRouter()
 
+_speculative_retrievals = registry.counter(
+    "rag_speculative_retrievals_total",
+    "Speculative retrievals started alongside classification, by outcome",
+    ("outcome",),
+)
+_request_tokens = registry.histogram(
+    "llm_request_tokens",
+    "Model tokens (prompt and output) spent per chat request, by semantic route",
+    ("route",),
+    buckets=TOKEN_BUCKETS,
+)
+
+
+def coalescing_key(message: str, history: str) -> str:
+    """
+    Key identifying requests that can share one pipeline execution.
+
+    Messages differing only in case or whitespace, sent with the same rendered
+    history (e.g. the first message of any session), get the same key.
+    """
+    normalized = " ".join(message.casefold().split())
+    history_hash = hashlib.sha256(history.encode()).hexdigest()
+    return hashlib.sha256(f"{normalized}\0{history_hash}".encode()).hexdigest()
+
+
+def _model(component: object) -> str:
+    """Model identifier of a router, responder or provider, for metric labels."""
+    for config_name in ("router_config", "responder_config"):
+        config = getattr(component, config_name, None)
+        if config is not None:
+            return config.model.model_id
+    return str(getattr(component, "model_name", getattr(component, "model", "")))
+
 
 class ChatMessage(BaseModel):
     """
@@ -21,9 +78,12 @@ class ChatMessage(BaseModel):
 
     Attributes:
         message (str): The chat message content, must not be empty
+        session_id (str | None): Session returned by a previous response; a new
+            session is started if omitted or unknown
     """
 
     message: str = Field(..., min_length=1)
+    session_id: str | None = Field(default=None, max_length=128)
 
 
 class ChatRouter:
@@ -37,36 +97,68 @@ class ChatRouter:
     def __init__(  # noqa: PLR0913
         self,
         router: APIRouter,
-        ai: GeminiProvider,
+        ai: BaseAIProvider,
         query_router: BaseQueryRouter,
         query_improvement_router: BaseQueryRouter,
         retriever: QdrantRetriever,
         responder: GeminiResponder,
         attestation: Vtpm,
         prompts: PromptService,
+        *,
+        fused_router: GeminiFusedRouter | None = None,
+        local_router: LocalSemanticRouter | None = None,
+        sessions: SessionStore | None = None,
+        history: HistoryManager | None = None,
+        admission: AdmissionController | None = None,
     ) -> None:
         """
         Initialize the ChatRouter.
 
         Args:
             router (APIRouter): FastAPI router to attach endpoints.
-            ai (GeminiProvider): AI client used by a simple semantic router
+            ai (BaseAIProvider): AI client used by a simple semantic router
                 to determine if an attestation was requested or if RAG
                 pipeline should be used.
             query_router: RAG Component that classifies the query.
+            query_improvement_router: RAG Component that rewrites the query
+                for retrieval.
             retriever: RAG Component that retrieves relevant documents.
             responder: RAG Component that generates a response.
             attestation (Vtpm): Provider for attestation services
             prompts (PromptService): Service for managing prompts
+            fused_router: Optional RAG Component that improves and classifies
+                the query in a single call. When unset, or when its call fails,
+                the query_improvement_router and query_router are used instead.
+            local_router: Optional embedding-based semantic router consulted
+                before the AI provider's semantic routing call.
+            sessions: Store holding each client's conversation history and
+                attestation state (default: an in-memory store).
+            history: Renders session history into prompts and maintains the
+                rolling summary (default: recency-based, without a summarizer).
+            admission: Bounds the number of concurrently processed and queued
+                requests (default: 64 in flight, 128 queued, 10s queue timeout).
         """
         self._router = router
         self.ai = ai
         self.query_router = query_router
         self.query_improvement_router = query_improvement_router
+        self.fused_router = fused_router
+        self.local_router = local_router
         self.retriever = retriever
         self.responder = responder
         self.attestation = attestation
         self.prompts = prompts
+        self.sessions = sessions or SessionStore()
+        self.history = history or HistoryManager(HistoryConfig.load({}))
+        self.admission = admission or AdmissionController()
+        self._background_tasks: set[asyncio.Task[None]] = set()
+        # Identical concurrent requests share one routing call and pipeline run.
+        self._route_flights: SingleFlight[str, SemanticRouterResponse] = (
+            SingleFlight("semantic_route")
+        )
+        self._rag_flights: SingleFlight[str, dict[str, str]] = SingleFlight(
+            "rag_pipeline"
+        )
         self.logger = logger.bind(router="chat")
         self._setup_routes()
 
@@ -76,62 +168,180 @@ class ChatRouter:
         """
 
         @self._router.post("/")
-        async def chat(message: ChatMessage) -> dict[str, str] | None:  # pyright: ignore [reportUnusedFunction]
+        async def chat(  # pyright: ignore [reportUnusedFunction]
+            message: ChatMessage, http_response: Response
+        ) -> dict[str, str] | None:
             """
             Process a chat message through the RAG pipeline.
             Returns a response containing the query classification and the answer.
-            """
-            try:
-                self.logger.debug("Received chat message", message=message.message)
-
-                # If attestation has previously been requested:
-                if self.attestation.attestation_requested:
-                    try:
-                        resp = self.attestation.get_token([message.message])
-                    except VtpmAttestationError as e:
-                        resp = f"The attestation failed with  error:\n{e.args[0]}"
-                    self.attestation.attestation_requested = False
-                    return {"response": resp}
 
-                route = await self.get_semantic_route(message.message)
-                return await self.route_message(route, message.message)
-
-            except Exception as e:
-                self.logger.exception("Chat processing failed", error=str(e))
-                raise HTTPException(status_code=500, detail=str(e)) from e
+            Requests beyond the admission limits are rejected with 429 or 503 and
+            a Retry-After header. Each request is traced (see
+            `flare_ai_rag.tracing`), and slow requests log their span tree. The
+            model tokens and cost of the request are added to the session's
+            totals and, if enabled, reported in X-LLM-Usage debug headers. The
+            trace is handed to the traffic capture, if enabled (see
+            `flare_ai_rag.api.middleware.capture`).
+            """
+            with (
+                trace("chat", message_chars=len(message.message)) as root,
+                track_request_usage() as usage,
+            ):
+                capture_trace(root)
+                try:
+                    async with self.admission.admit():
+                        response = await self.process_message(message)
+                except AdmissionRejectedError as e:
+                    raise HTTPException(
+                        status_code=e.status_code,
+                        detail=str(e),
+                        headers={"Retry-After": str(e.retry_after)},
+                    ) from e
+                except Exception as e:
+                    self.logger.exception("Chat processing failed", error=str(e))
+                    raise HTTPException(status_code=500, detail=str(e)) from e
+                root.set(route=current_route.get(), session_id=response["session_id"])
+                if usage.calls:
+                    _request_tokens.observe(
+                        usage.usage.total_tokens, route=current_route.get()
+                    )
+                if usage_meter.config.debug_headers:
+                    http_response.headers.update(usage.headers())
+                return response
 
     @property
     def router(self) -> APIRouter:
         """Return the underlying FastAPI router with registered endpoints."""
         return self._router
 
-    async def get_semantic_route(self, message: str) -> SemanticRouterResponse:
+    async def process_message(self, message: ChatMessage) -> dict[str, str]:
+        """
+        Answer a chat message within the sender's session.
+
+        Args:
+            message: The validated chat message
+
+        Returns:
+            dict[str, str]: The handler's response and the session ID
+        """
+        self.logger.debug("Received chat message", message=message.message)
+        with track_stage("request"):
+            session = await self.sessions.get(message.session_id)
+
+            # If attestation has previously been requested:
+            if session.attestation_requested:
+                current_route.set("AttestationToken")
+                try:
+                    with track_stage("attestation_token"):
+                        resp = await self.attestation.get_token_async(
+                            [message.message]
+                        )
+                except VtpmAttestationError as e:
+                    resp = f"The attestation failed with  error:\n{e.args[0]}"
+                session.attestation_requested = False
+                response = {"response": resp}
+            else:
+                # Render the history once and share it across all stages.
+                with track_stage("history"):
+                    history = await self.history.render_async(
+                        session, message.message
+                    )
+                route = await self._route_flights.do(
+                    coalescing_key(message.message, history),
+                    self.get_semantic_route,
+                    message.message,
+                    history,
+                )
+                current_route.set(route.value)
+                response = await self.route_message(
+                    route, message.message, session, history
+                )
+
+            usage = current_request_usage()
+            if usage is not None:
+                session.add_usage(
+                    usage.usage.prompt_tokens, usage.usage.output_tokens, usage.cost_usd
+                )
+            await self.sessions.save(session)
+            return {**response, "session_id": session.session_id}
+
+    async def get_semantic_route(
+        self, message: str, history: str
+    ) -> SemanticRouterResponse:
+        """
+        Determine the semantic route for a message.
+
+        Messages confidently matched by the local semantic router are routed
+        without an LLM call. Low-margin matches (and a sampled fraction of
+        confident ones) are routed by the AI provider, and the agreement between
+        both routers is recorded.
+
+        Args:
+            message: Message to route
+            history: Rendered history of the client's session
+
+        Returns:
+            SemanticRouterResponse: Determined route for the message
+        """
+        match = None
+        if self.local_router is not None:
+            try:
+                with track_stage(
+                    "semantic_route_local",
+                    self.local_router.config.embedding_model,
+                ):
+                    match = await self.local_router.classify_async(message)
+            except Exception as e:
+                self.logger.exception("local_routing_failed", error=str(e))
+            else:
+                if match.confident and not self.local_router.should_shadow():
+                    self.local_router.record_decision("local", match.route)
+                    return match.route
+
+        route = await self.get_llm_semantic_route(message, history)
+        if self.local_router is not None:
+            self.local_router.record_decision("llm", route)
+            if match is not None:
+                self.local_router.record_agreement(match, route)
+        return route
+
+    async def get_llm_semantic_route(
+        self, message: str, history: str
+    ) -> SemanticRouterResponse:
         """
         Determine the semantic route for a message using AI provider.
 
         Args:
             message: Message to route
+            history: Rendered history of the client's session
 
         Returns:
             SemanticRouterResponse: Determined route for the message
         """
         try:
             prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-                "semantic_router", user_input=message
-            )
-            prompt = self.responder.client.history_context() + prompt
-            print(prompt)
-            route_response = self.ai.generate(
-                prompt=prompt, response_mime_type=mime_type, response_schema=schema
+                "semantic_router",
+                user_input=message,
+                history_context=history,
             )
-            print(route_response.text)
+            self.logger.debug("semantic_route_prompt", prompt=prompt)
+            with track_stage("semantic_route", _model(self.ai)):
+                annotate(prompt_chars=len(prompt))
+                route_response = await self.ai.generate_async(
+                    prompt=prompt, response_mime_type=mime_type, response_schema=schema
+                )
+            self.logger.debug("semantic_route_response", response=route_response.text)
             return SemanticRouterResponse(route_response.text)
         except Exception as e:
             self.logger.exception("routing_failed", error=str(e))
             return SemanticRouterResponse.CONVERSATIONAL
 
     async def route_message(
-        self, route: SemanticRouterResponse, message: str
+        self,
+        route: SemanticRouterResponse,
+        message: str,
+        session: Session,
+        history: str,
     ) -> dict[str, str]:
         """
         Route a message to the appropriate handler based on semantic route.
@@ -139,6 +349,8 @@ class ChatRouter:
         Args:
             route: Determined semantic route
             message: Original message to handle
+            session: Session of the client that sent the message
+            history: Rendered history of the session
 
         Returns:
             dict[str, str]: Response from the appropriate handler
@@ -154,59 +366,82 @@ class ChatRouter:
         if not handler:
             return {"response": "Unsupported route"}
 
-        return await handler(message)
+        return await handler(message, session, history)
 
-    async def handle_rag_pipeline(self, query: str) -> dict[str, str]:
+    async def handle_rag_pipeline(
+        self, query: str, session: Session, history: str
+    ) -> dict[str, str]:
         """
-        Handle attestation requests.
+        Handle queries about Flare with the RAG pipeline.
+
+        Concurrent identical queries (same normalized text and history) await a
+        single pipeline run and share its result.
 
         Args:
-            _: User query
+            query: User query
+            session: Session of the client that sent the query
+            history: Rendered history of the session
 
         Returns:
-            dict[str, str]: Response containing attestation request
+            dict[str, str]: Response containing the classification and answer
         """
-        # Step 1. Improve the user query with Gemini
-
-        # Build Context from response history
-        history_context = f"""
-        Also, here is a list of your previous {len(self.responder.client.chat_history)} chat responses to the user.
-        USE THIS CONTEXT TO HELP YOU INTERPRET AND REWRITE THE USER'S QUERY.
-        Response 1 is the most recent response, and its tokens should be weighted more heavily.
-        As the index of the response increases, its recency decreases, and the weight on its tokens should similarly decrease.
-        Here is the list:
+        response = await self._rag_flights.do(
+            coalescing_key(query, history), self.run_rag_pipeline, query, history
+        )
+        if response["classification"] == "ANSWER":
+            self._record_response(session, response["response"])
+        return dict(response)
+
+    async def run_rag_pipeline(self, query: str, history: str) -> dict[str, str]:
         """
-        for idx, chat in enumerate(self.responder.client.chat_history, start=1):
-            history_context += f"Response {idx}:\n{chat}\n\n"
-        query = history_context + query
+        Run the RAG pipeline for a query, without touching any session.
 
-        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-            "query_improvement", user_input=query
-        )
-        improved_query = self.query_improvement_router.route_query(
-            prompt=prompt, response_mime_type=mime_type, response_schema=schema
-        )
-        self.logger.info("Query improved", improved_query=improved_query)
+        Args:
+            query: User query
+            history: Rendered history of the session
 
-        # Step 2. Classify the user query.
-        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
-            "rag_router", user_input=improved_query
-        )
-        classification = self.query_router.route_query(
-            prompt=prompt, response_mime_type=mime_type, response_schema=schema
+        Returns:
+            dict[str, str]: Response containing the classification and answer
+        """
+        # Step 1. Improve and classify the user query with Gemini
+
+        # Let the model interpret the query in the context of the conversation.
+        query_input = query
+        if history:
+            query_input = (
+                f"{history}USE THIS CONTEXT TO HELP YOU INTERPRET AND REWRITE THE "
+                f"USER'S QUERY.\nUser query: {query}"
+            )
+
+        improved_query, classification, speculation = await self.improve_and_classify(
+            query_input
         )
-        self.logger.info("Query classified", classification=classification)
 
         if classification == "ANSWER":
-            # Step 3. Retrieve relevant documents.
-            retrieved_docs = self.retriever.hybrid_search(query)
+            # Step 2. Retrieve relevant documents for the improved query.
+            if speculation is not None:
+                retrieved_docs = await speculation
+                _speculative_retrievals.inc(outcome="used")
+            else:
+                with track_stage("retrieval"):
+                    retrieved_docs = await self.retriever.hybrid_search_async(
+                        improved_query
+                    )
+                    annotate(docs=len(retrieved_docs))
             self.logger.info("Documents retrieved")
 
-            # Step 4. Generate the final answer.
-            answer = self.responder.generate_response(query, retrieved_docs)
+            # Step 3. Generate the final answer.
+            with track_stage("response_generation", _model(self.responder)):
+                answer = await self.responder.generate_response_async(
+                    query, retrieved_docs, history
+                )
+                annotate(docs=len(retrieved_docs), answer_chars=len(answer))
             self.logger.info("Response generated", answer=answer)
             return {"classification": classification, "response": answer}
 
+        if speculation is not None:
+            self._discard_speculation(speculation, classification)
+
         # Map static responses for CLARIFY and REJECT.
         static_responses = {
             "CLARIFY": "Please provide additional context.",
@@ -222,40 +457,188 @@ class ChatRouter:
         self.logger.exception("RAG Routing failed")
         raise ValueError(classification)
 
-    async def handle_attestation(self, _: str) -> dict[str, str]:
+    async def improve_and_classify(
+        self, query: str
+    ) -> tuple[str, str, asyncio.Task[list[dict]] | None]:
+        """
+        Improve the user query and classify it.
+
+        Uses the fused router (a single model call) when configured, falling back
+        to the two-call query improvement + classification path if it is not
+        configured or its response cannot be used.
+
+        In the two-call path with speculative retrieval enabled, hybrid search on
+        the improved query is started concurrently with classification. The
+        caller owns the returned task and must await or discard it.
+
+        Args:
+            query: User query, prefixed with the chat history context
+
+        Returns:
+            tuple: The improved query, its classification, and the speculative
+                retrieval task (None if no speculation was started)
+        """
+        if self.fused_router is not None:
+            try:
+                prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+                    "query_improvement_router", user_input=query
+                )
+                with track_stage("query_routing", _model(self.fused_router)):
+                    annotate(prompt_chars=len(prompt))
+                    result = await self.fused_router.improve_and_route_async(
+                        prompt=prompt,
+                        response_mime_type=mime_type,
+                        response_schema=schema,
+                    )
+            except Exception as e:
+                self.logger.exception("fused_routing_failed", error=str(e))
+            else:
+                self.logger.info(
+                    "Query improved and classified",
+                    improved_query=result["improved_query"],
+                    classification=result["classification"],
+                )
+                return result["improved_query"], result["classification"], None
+
+        # Step 1a. Improve the user query with Gemini
+        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+            "query_improvement", user_input=query
+        )
+        with track_stage("query_improvement", _model(self.query_improvement_router)):
+            annotate(prompt_chars=len(prompt))
+            improved_query = await self.query_improvement_router.route_query_async(
+                prompt=prompt, response_mime_type=mime_type, response_schema=schema
+            )
+        self.logger.info("Query improved", improved_query=improved_query)
+
+        # Start retrieval while the query is being classified.
+        speculation = None
+        if self.retriever.retriever_config.speculative_retrieval:
+            speculation = asyncio.create_task(
+                self.retriever.hybrid_search_async(improved_query)
+            )
+
+        # Step 1b. Classify the user query.
+        prompt, mime_type, schema = self.prompts.get_formatted_prompt(
+            "rag_router", user_input=improved_query
+        )
+        try:
+            with track_stage("classification", _model(self.query_router)):
+                annotate(prompt_chars=len(prompt))
+                classification = await self.query_router.route_query_async(
+                    prompt=prompt, response_mime_type=mime_type, response_schema=schema
+                )
+        except BaseException:
+            if speculation is not None:
+                self._discard_speculation(speculation, "ERROR")
+            raise
+        self.logger.info("Query classified", classification=classification)
+
+        return improved_query, classification, speculation
+
+    def _discard_speculation(
+        self, speculation: asyncio.Task[list[dict]], classification: str
+    ) -> None:
+        """Cancel an unneeded speculative retrieval and record it as wasted."""
+        speculation.cancel()
+        # Retrieve the outcome so a failed search is not reported as unhandled.
+        speculation.add_done_callback(
+            lambda task: task.cancelled() or task.exception()
+        )
+        _speculative_retrievals.inc(outcome="wasted")
+        self.logger.info("speculative_retrieval_wasted", classification=classification)
+
+    async def handle_attestation(
+        self, _: str, session: Session, __: str
+    ) -> dict[str, str]:
         """
         Handle attestation requests.
 
         Args:
             _: Unused message parameter
+            session: Session that will send the attestation nonce next
+            __: Unused history parameter
 
         Returns:
             dict[str, str]: Response containing attestation request
         """
         prompt = self.prompts.get_formatted_prompt("request_attestation")[0]
-        request_attestation_response = self.ai.generate(prompt=prompt)
-        self.attestation.attestation_requested = True
+        with track_stage("attestation_request", _model(self.ai)):
+            request_attestation_response = await self.ai.generate_async(prompt=prompt)
+        session.attestation_requested = True
         return {"response": request_attestation_response.text}
 
-    async def handle_conversation(self, message: str) -> dict[str, str]:
+    async def handle_conversation(
+        self, message: str, session: Session, history: str
+    ) -> dict[str, str]:
         """
         Handle general conversation messages.
 
         Args:
             message: Message to process
+            session: Session of the client that sent the message
+            history: Rendered history of the session
 
         Returns:
             dict[str, str]: Response from AI provider
         """
-        response = self.ai.send_message(message)
+        with track_stage("conversation", _model(self.ai)):
+            annotate(prompt_chars=len(history) + len(message))
+            response = await self.ai.send_message_async(history + message)
+        self._record_response(session, response.text)
         return {"response": response.text}
+
+    def _record_response(self, session: Session, response: str) -> None:
+        """
+        Add a response to the session's history.
+
+        Responses dropped from the history are folded into the session summary
+        in the background, so summarization does not delay the reply.
+        """
+        dropped = session.add_response(
+            response, self.responder.responder_config.context_size
+        )
+        if dropped:
+            task = asyncio.create_task(self._summarize(session, dropped))
+            self._background_tasks.add(task)
+            task.add_done_callback(self._background_tasks.discard)
+
+    async def _summarize(self, session: Session, dropped: list[str]) -> None:
+        """
+        Update the session summary with dropped responses and persist it.
+
+        Only the summary and its usage are saved: the rest of the stored session
+        may have changed since the request that trimmed the history.
+        """
+        try:
+            async with self.history.summary_lock(session.session_id):
+                # The session may be a copy read before the last summary was saved.
+                await self.sessions.reload_summary(session)
+                with (
+                    track_request_usage() as usage,
+                    track_stage("history_summary", _model(self.history.summarizer)),
+                ):
+                    await self.history.summarize_async(session, dropped)
+                session.add_usage(
+                    usage.usage.prompt_tokens,
+                    usage.usage.output_tokens,
+                    usage.cost_usd,
+                )
+                await self.sessions.save_summary(session)
+        except Exception as e:
+            self.logger.exception("history_summary_failed", error=str(e))
     
-    async def handle_scrape(self, query: str) -> dict[str, str]:
+    async def handle_scrape(
+        self, query: str, _: Session, __: str
+    ) -> dict[str, str]:
         prompt = f"Find the ticker in the following query, return only the ticker: {query}"
-        ticker = self.ai.generate(prompt=prompt).text
-        data = scrape(ticker)
+        with track_stage("scrape_ticker", _model(self.ai)):
+            ticker = (await self.ai.generate_async(prompt=prompt)).text
+        with track_stage("scrape"):
+            data = await run_in_executor(scrape, ticker)
         ## Testing prompt works with data
         #data = [{'date': 'Mar 9, 2025', 'open': '86,186.64', 'high': '86,425.25', 'low': '82,257.23', 'close': '82,573.92', 'volume': '21,896,366,080'}, {'date': 'Mar 8, 2025', 'open': '86,742.66', 'high': '86,847.27', 'low': '85,247.48', 'close': '86,154.59', 'volume': '18,206,118,081'}, {'date': 'Mar 7, 2025', 'open': '89,963.28', 'high': '91,191.05', 'low': '84,717.68', 'close': '86,742.67', 'volume': '65,945,677,657'}, {'date': 'Mar 6, 2025', 'open': '90,622.36', 'high': '92,804.94', 'low': '87,852.14', 'close': '89,961.73', 'volume': '47,749,810,486'}, {'date': 'Mar 5, 2025', 'open': '87,222.95', 'high': '90,998.24', 'low': '86,379.77', 'close': '90,623.56', 'volume': '50,498,988,027'}, {'date': 'Mar 4, 2025', 'open': '86,064.07', 'high': '88,911.27', 'low': '81,529.24', 'close': '87,222.20', 'volume': '68,095,241,474'}, {'date': 'Mar 3, 2025', 'open': '94,248.42', 'high': '94,429.75', 'low': '85,081.30', 'close': '86,065.67', 'volume': '70,072,228,536'}, {'date': 'Mar 2, 2025', 'open': '86,036.26', 'high': '95,043.44', 'low': '85,040.21', 'close': '94,248.35', 'volume': '58,398,341,092'}, {'date': 'Mar 1, 2025', 'open': '84,373.87', 'high': '86,522.30', 'low': '83,794.23', 'close': '86,031.91', 'volume': '29,190,628,396'}, {'date': 'Feb 28, 2025', 'open': '84,705.63', 'high': '85,036.32', 'low': '78,248.91', 'close': '84,373.01', 'volume': '83,610,570,576'}, {'date': 'Feb 27, 2025', 'open': '84,076.86', 'high': '87,000.78', 'low': '83,144.96', 'close': '84,704.23', 'volume': '52,659,591,954'}, {'date': 'Feb 26, 2025', 'open': '88,638.89', 'high': '89,286.25', 'low': '82,131.90', 'close': '84,347.02', 'volume': '64,597,492,134'}, {'date': 'Feb 25, 2025', 'open': '91,437.12', 'high': '92,511.08', 'low': '86,008.23', 'close': '88,736.17', 'volume': '92,139,104,128'}, {'date': 'Feb 24, 2025', 'open': '96,277.96', 'high': '96,503.45', 'low': '91,371.74', 'close': '91,418.17', 'volume': '44,046,480,529'}, {'date': 'Feb 23, 2025', 'open': '96,577.80', 'high': '96,671.88', 'low': '95,270.45', 'close': '96,273.92', 'volume': '16,999,478,976'}]
         prompt = f"Summarize and generate insights for the data. Present it to the user in a clear and simple manner. Do not make up information. {data}"
-        response = self.ai.generate(prompt=prompt)
+        with track_stage("scrape_insights", _model(self.ai)):
+            response = await self.ai.generate_async(prompt=prompt)
         return {'response':response.text}
\ No newline at end of file
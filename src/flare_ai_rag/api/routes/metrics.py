@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from flare_ai_rag.metrics import CONTENT_TYPE, registry, render_prometheus
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Expose all registered metrics in the Prometheus text format."""
+    return PlainTextResponse(render_prometheus(registry), media_type=CONTENT_TYPE)
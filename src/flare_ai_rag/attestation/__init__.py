@@ -1,21 +1,44 @@
-from .vtpm_attestation import (
-    Vtpm,
-    VtpmAttestationError,
-)
-from .vtpm_validation import (
-    CertificateParsingError,
-    InvalidCertificateChainError,
-    SignatureValidationError,
-    VtpmValidation,
-    VtpmValidationError,
-)
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .cert_chains import CertificateChainCache, VerifiedChain
+    from .oidc_keys import OIDCKeyCache
+    from .vtpm_attestation import Vtpm, VtpmAttestationError
+    from .vtpm_validation import (
+        CertificateParsingError,
+        InvalidCertificateChainError,
+        SignatureValidationError,
+        VtpmValidation,
+        VtpmValidationError,
+    )
 
 __all__ = [
+    "CertificateChainCache",
     "CertificateParsingError",
     "InvalidCertificateChainError",
+    "OIDCKeyCache",
     "SignatureValidationError",
+    "VerifiedChain",
     "Vtpm",
     "VtpmAttestationError",
     "VtpmValidation",
     "VtpmValidationError",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".cert_chains": ["CertificateChainCache", "VerifiedChain"],
+        ".oidc_keys": ["OIDCKeyCache"],
+        ".vtpm_attestation": ["Vtpm", "VtpmAttestationError"],
+        ".vtpm_validation": [
+            "CertificateParsingError",
+            "InvalidCertificateChainError",
+            "SignatureValidationError",
+            "VtpmValidation",
+            "VtpmValidationError",
+        ],
+    },
+)
@@ -0,0 +1,114 @@
+"""
+Cache of verified PKI token certificate chains.
+
+The x5c certificate chain of PKI tokens is the same for every token signed with
+the same leaf certificate. Verifying it (decoding the three certificates,
+fetching the trusted root, building an OpenSSL store and verifying the chain)
+costs far more than checking a token's signature, so a verified chain is cached
+under the SHA-256 of its x5c header, with the leaf certificate's public key,
+until the earliest expiry of its certificates. Validating a token with a known
+chain then only checks its signature.
+
+Only verified chains are cached: a chain failing verification is verified again
+the next time it is seen.
+"""
+
+import datetime as dt
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import structlog
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from flare_ai_rag.metrics import registry
+
+logger = structlog.get_logger(__name__)
+
+_lookups = registry.counter(
+    "attestation_chain_cache_lookups_total",
+    "Verified certificate chain cache lookups, by outcome",
+    ("outcome",),
+)
+
+
+def chain_fingerprint(x5c: list[str]) -> str:
+    """SHA-256 of an x5c header's certificates, in order."""
+    digest = hashlib.sha256()
+    for cert in x5c:
+        digest.update(hashlib.sha256(cert.encode()).digest())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class VerifiedChain:
+    """
+    A certificate chain verified against the trusted root.
+
+    Attributes:
+        public_key: Public key of the leaf certificate, which signs the tokens
+        not_valid_after: Earliest expiry of the chain's certificates
+    """
+
+    public_key: rsa.RSAPublicKey
+    not_valid_after: dt.datetime
+
+
+class CertificateChainCache:
+    """
+    LRU cache of verified certificate chains, by x5c fingerprint.
+
+    Thread-safe: validations may run on several threads.
+    """
+
+    def __init__(self, max_chains: int = 1024) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_chains: Maximum number of chains kept
+        """
+        self.max_chains = max_chains
+        self._chains: OrderedDict[str, VerifiedChain] = OrderedDict()
+        self._lock = threading.Lock()
+        self.logger = logger.bind(service="cert_chains")
+
+    def __len__(self) -> int:
+        return len(self._chains)
+
+    def get(self, x5c: list[str], now: dt.datetime) -> VerifiedChain | None:
+        """
+        The verified chain of an x5c header, if cached and still valid.
+
+        Args:
+            x5c: The token's x5c header
+            now: Current time (timezone-aware)
+
+        Returns:
+            VerifiedChain | None: The chain, or None if it must be verified
+        """
+        fingerprint = chain_fingerprint(x5c)
+        with self._lock:
+            chain = self._chains.get(fingerprint)
+            if chain is not None and now > chain.not_valid_after:
+                del self._chains[fingerprint]
+                chain = None
+                outcome = "expired"
+            elif chain is None:
+                outcome = "miss"
+            else:
+                self._chains.move_to_end(fingerprint)
+                outcome = "hit"
+        _lookups.inc(outcome=outcome)
+        return chain
+
+    def put(self, x5c: list[str], chain: VerifiedChain) -> None:
+        """Cache a verified chain, evicting the least recently used if full."""
+        with self._lock:
+            self._chains[chain_fingerprint(x5c)] = chain
+            while len(self._chains) > self.max_chains:
+                self._chains.popitem(last=False)
+        self.logger.debug(
+            "chain_verified", not_valid_after=chain.not_valid_after.isoformat()
+        )
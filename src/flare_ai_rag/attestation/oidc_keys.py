@@ -0,0 +1,282 @@
+"""
+Cache of the OIDC token issuer's OpenID configuration and signing keys.
+
+Validating an OIDC token needs the issuer's public key for the token's key id
+(kid): the issuer's OpenID configuration names its JWKS URI, and the JWKS lists
+its keys. Both documents are cached for as long as their Cache-Control header
+allows (max-age, less the Age header), and the keys of a JWKS are converted to
+RSA public keys once, when it is fetched, so that validating a token in the
+steady state needs no network call.
+
+An expired document is still used during its stale-while-revalidate window (the
+directive's, or `stale_seconds`): it is returned at once while a background
+refresh replaces it. A key id missing from the cached JWKS (e.g. after a key
+rotation) triggers a single refresh of the JWKS, at most once every
+`min_refresh_interval` seconds, so that tokens with unknown key ids cannot make
+each validation fetch the JWKS. Concurrent fetches of a document are coalesced:
+one thread fetches it and the others wait for its result, so a cold or expired
+cache costs one request, however many validations are running.
+"""
+
+import base64
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any
+
+import requests
+import structlog
+from cryptography.hazmat.backends import default_backend
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from flare_ai_rag.concurrency import get_executor
+from flare_ai_rag.metrics import registry
+
+logger = structlog.get_logger(__name__)
+
+_lookups = registry.counter(
+    "oidc_document_cache_lookups_total",
+    "OIDC issuer document cache lookups, by document and outcome",
+    ("document", "outcome"),
+)
+
+
+def jwk_to_rsa_key(jwk: dict[str, str]) -> rsa.RSAPublicKey:
+    """
+    Convert a JSON Web Key (JWK) to an RSA public key.
+
+    Args:
+        jwk: Dictionary containing the JWK parameters, must include 'n' (modulus)
+            and 'e' (exponent) fields in base64url encoding
+
+    Returns:
+        RSAPublicKey: A cryptographic RSA public key object
+    """
+    n = int.from_bytes(base64.urlsafe_b64decode(jwk["n"] + "=="), "big")
+    e = int.from_bytes(base64.urlsafe_b64decode(jwk["e"] + "=="), "big")
+    return rsa.RSAPublicNumbers(e, n).public_key(backend=default_backend())
+
+
+def cache_lifetimes(
+    headers: dict[str, str] | Any, default_ttl: float, stale_seconds: float
+) -> tuple[float, float]:
+    """
+    How long a response stays fresh, and then usable while it is revalidated.
+
+    Args:
+        headers: Response headers (case-insensitive mapping)
+        default_ttl: Freshness lifetime without a max-age directive
+        stale_seconds: Stale-while-revalidate window without the directive
+
+    Returns:
+        tuple[float, float]: Freshness lifetime and stale-while-revalidate window
+            (seconds)
+    """
+    directives: dict[str, str] = {}
+    for directive in (headers.get("Cache-Control") or "").split(","):
+        name, _, value = directive.strip().partition("=")
+        directives[name.lower()] = value.strip('"')
+    if "no-store" in directives or "no-cache" in directives:
+        return 0.0, 0.0
+
+    def seconds(name: str, default: float) -> float:
+        try:
+            return max(float(directives[name]), 0.0)
+        except (KeyError, ValueError):
+            return default
+
+    try:
+        age = max(float(headers.get("Age") or 0), 0.0)
+    except ValueError:
+        age = 0.0
+    ttl = max(seconds("max-age", default_ttl) - age, 0.0)
+    return ttl, seconds("stale-while-revalidate", stale_seconds)
+
+
+@dataclass(frozen=True)
+class CachedDocument[T]:
+    """
+    A fetched document, parsed.
+
+    Attributes:
+        value: The parsed document
+        fresh_until: Time (monotonic) until which it is used as is
+        stale_until: Time (monotonic) until which it is used while refreshed
+    """
+
+    value: T
+    fresh_until: float
+    stale_until: float
+
+
+class OIDCKeyCache:
+    """
+    Signing keys of an OIDC token issuer, cached.
+
+    Thread-safe: validations may run on several threads.
+    """
+
+    def __init__(
+        self,
+        configuration_url: str,
+        *,
+        default_ttl: float = 300.0,
+        stale_seconds: float = 3600.0,
+        min_refresh_interval: float = 30.0,
+        timeout: float = 10.0,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            configuration_url: URL of the issuer's OpenID configuration
+            default_ttl: Freshness lifetime of documents without max-age (seconds)
+            stale_seconds: Stale-while-revalidate window of documents without the
+                directive (seconds)
+            min_refresh_interval: Minimum time between refreshes of the JWKS for
+                unknown key ids (seconds)
+            timeout: Timeout of a document request (seconds)
+        """
+        self.configuration_url = configuration_url
+        self.default_ttl = default_ttl
+        self.stale_seconds = stale_seconds
+        self.min_refresh_interval = min_refresh_interval
+        self.timeout = timeout
+        self._documents: dict[str, CachedDocument[Any]] = {}
+        self._refreshing: set[str] = set()
+        self._fetches: dict[str, Future[CachedDocument[Any]]] = {}
+        self._last_forced_refresh = float("-inf")
+        self._lock = threading.Lock()
+        self.logger = logger.bind(service="oidc_keys")
+
+    def get_key(self, kid: str) -> rsa.RSAPublicKey | None:
+        """
+        The issuer's public key with a key id.
+
+        Args:
+            kid: Key id of the token header
+
+        Returns:
+            RSAPublicKey | None: The key, or None if the issuer has no such key
+
+        Raises:
+            requests.exceptions.RequestException: If a document cannot be fetched
+        """
+        keys = self._keys()
+        if kid in keys:
+            return keys[kid]
+
+        now = time.monotonic()
+        with self._lock:
+            if now - self._last_forced_refresh < self.min_refresh_interval:
+                return None
+            self._last_forced_refresh = now
+        self.logger.info("jwks_unknown_kid", kid=kid)
+        return self._keys(force=True).get(kid)
+
+    def _keys(self, *, force: bool = False) -> dict[str, rsa.RSAPublicKey]:
+        """The issuer's keys by key id, refreshed if `force`."""
+        jwks_uri = self._get(
+            "configuration",
+            self.configuration_url,
+            lambda document: document["jwks_uri"],
+        )
+        return self._get(
+            "jwks",
+            jwks_uri,
+            lambda document: {
+                key["kid"]: jwk_to_rsa_key(key)
+                for key in document["keys"]
+                if "kid" in key and key.get("kty", "RSA") == "RSA"
+            },
+            force=force,
+        )
+
+    def _get[T](
+        self,
+        name: str,
+        url: str,
+        parse: Callable[[Any], T],
+        *,
+        force: bool = False,
+    ) -> T:
+        """A document, from the cache if it is fresh (or stale and refreshing)."""
+        document = self._documents.get(url)
+        now = time.monotonic()
+        if document is not None and not force:
+            if now < document.fresh_until:
+                _lookups.inc(document=name, outcome="hit")
+                return document.value
+            if now < document.stale_until:
+                _lookups.inc(document=name, outcome="stale")
+                self._revalidate(name, url, parse)
+                return document.value
+        _lookups.inc(document=name, outcome="refresh" if force else "miss")
+        return self._fetch(name, url, parse).value
+
+    def _fetch[T](
+        self, name: str, url: str, parse: Callable[[Any], T]
+    ) -> CachedDocument[T]:
+        """Fetch, parse and cache a document, sharing a fetch already running."""
+        with self._lock:
+            fetch = self._fetches.get(url)
+            leader = fetch is None
+            if fetch is None:
+                fetch = self._fetches[url] = Future()
+        if not leader:
+            return fetch.result()
+
+        try:
+            document = self._download(name, url, parse)
+        except BaseException as e:
+            fetch.set_exception(e)
+            raise
+        else:
+            fetch.set_result(document)
+            return document
+        finally:
+            with self._lock:
+                del self._fetches[url]
+
+    def _download[T](
+        self, name: str, url: str, parse: Callable[[Any], T]
+    ) -> CachedDocument[T]:
+        """Fetch, parse and cache a document."""
+        response = requests.get(url, timeout=self.timeout)
+        valid_status_code = 200
+        if response.status_code != valid_status_code:
+            msg = f"Failed to fetch {name}: {response.status_code}"
+            raise requests.exceptions.HTTPError(msg)
+        ttl, stale = cache_lifetimes(
+            response.headers, self.default_ttl, self.stale_seconds
+        )
+        now = time.monotonic()
+        document = CachedDocument(
+            value=parse(response.json()),
+            fresh_until=now + ttl,
+            stale_until=now + ttl + stale,
+        )
+        with self._lock:
+            self._documents[url] = document
+        self.logger.debug("oidc_document_fetched", document=name, ttl=ttl)
+        return document
+
+    def _revalidate[T](self, name: str, url: str, parse: Callable[[Any], T]) -> None:
+        """Refresh a stale document in the background, once at a time."""
+        with self._lock:
+            if url in self._refreshing:
+                return
+            self._refreshing.add(url)
+
+        def refresh() -> None:
+            try:
+                self._fetch(name, url, parse)
+            except Exception:
+                self.logger.exception("oidc_document_refresh_failed", document=name)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(url)
+
+        get_executor().submit(refresh)
@@ -5,20 +5,35 @@ This module provides a client to request attestation tokens from a local Unix do
 socket endpoint. It extends HTTPConnection to handle Unix socket communication and
 implements token request functionality with nonce validation.
 
+The async client keeps a small pool of keep-alive connections to the socket, so
+concurrent requests neither block the event loop nor each pay the connection
+setup, and bounds every request by a deadline.
+
 Classes:
     VtpmAttestationError: Exception for attestation service communication errors
     VtpmAttestation: Client for requesting attestation tokens
 """
 
+import asyncio
 import json
 import socket
-from http.client import HTTPConnection
+import time
+from http.client import HTTPConnection, HTTPException
 from pathlib import Path
 
+import httpx
 import structlog
 
+from flare_ai_rag.metrics import registry
+
 logger = structlog.get_logger(__name__)
 
+_token_duration = registry.histogram(
+    "attestation_token_duration_seconds",
+    "Duration of attestation token requests, by token type and outcome",
+    ("token_type", "outcome"),
+)
+
 
 def get_simulated_token() -> str:
     """Reads the first line from a given file path."""
@@ -47,16 +62,50 @@ class Vtpm:
         url: str = "http://localhost/v1/token",
         unix_socket_path: str = "/run/container_launcher/teeserver.sock",
         simulate: bool = False,  # noqa: FBT001, FBT002
+        *,
+        pool_size: int = 4,
+        timeout: float = 10.0,
     ) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            url: URL of the token endpoint
+            unix_socket_path: Socket of the attestation service
+            simulate: Return the simulated token instead of requesting one
+            pool_size: Maximum number of (keep-alive) connections of the async
+                client
+            timeout: Default deadline of a token request (seconds)
+        """
         self.url = url
         self.unix_socket_path = unix_socket_path
         self.simulate = simulate
-        self.attestation_requested: bool = False
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self._client: httpx.AsyncClient | None = None
         self.logger = logger.bind(router="vtpm")
         self.logger.debug(
             "vtpm", simulate=simulate, url=url, unix_socket_path=self.unix_socket_path
         )
 
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The async client's connection pool, created on first use."""
+        if self._client is None:
+            self._client = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(
+                    uds=self.unix_socket_path,
+                    limits=httpx.Limits(
+                        max_connections=self.pool_size,
+                        max_keepalive_connections=self.pool_size,
+                    ),
+                    # Reconnect once if the service restarted.
+                    retries=1,
+                ),
+                timeout=self.timeout,
+            )
+        return self._client
+
     def _check_nonce_length(self, nonces: list[str]) -> None:
         """
         Validate the byte length of provided nonces.
@@ -119,28 +168,111 @@ class Vtpm:
 
         # Connect to the socket
         client_socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
-        client_socket.connect(self.unix_socket_path)
+        client_socket.settimeout(self.timeout)
 
         # Create an HTTP connection object
-        conn = HTTPConnection("localhost", timeout=10)
+        conn = HTTPConnection("localhost", timeout=self.timeout)
         conn.sock = client_socket
+        try:
+            client_socket.connect(self.unix_socket_path)
 
-        # Send a POST request
-        headers = {"Content-Type": "application/json"}
-        body = json.dumps(
-            {"audience": audience, "token_type": token_type, "nonces": nonces}
-        )
-        conn.request("POST", self.url, body=body, headers=headers)
-
-        # Get and decode the response
-        res = conn.getresponse()
-        success_status = 200
-        if res.status != success_status:
-            msg = f"Failed to get attestation response: {res.status} {res.reason}"
-            raise VtpmAttestationError(msg)
-        token = res.read().decode()
+            # Send a POST request
+            headers = {"Content-Type": "application/json"}
+            body = json.dumps(
+                {"audience": audience, "token_type": token_type, "nonces": nonces}
+            )
+            conn.request("POST", self.url, body=body, headers=headers)
+
+            # Get and decode the response
+            res = conn.getresponse()
+            success_status = 200
+            if res.status != success_status:
+                msg = f"Failed to get attestation response: {res.status} {res.reason}"
+                raise VtpmAttestationError(msg)
+            token = res.read().decode()
+        except (OSError, HTTPException) as e:
+            msg = f"Failed to reach the attestation service: {e}"
+            raise VtpmAttestationError(msg) from e
+        finally:
+            # Close the connection
+            conn.close()
         self.logger.debug("token", token_type=token_type, token=token)
+        return token
+
+    async def get_token_async(
+        self,
+        nonces: list[str],
+        audience: str = "https://sts.google.com",
+        token_type: str = "OIDC",  # noqa: S107
+        *,
+        deadline: float | None = None,
+    ) -> str:
+        """
+        Request an attestation token without blocking the event loop.
 
-        # Close the connection
-        conn.close()
+        The request is sent on a pooled keep-alive connection to the Unix socket.
+
+        Args:
+            nonces: List of random nonce strings for replay protection
+            audience: Intended audience for the token (default: "https://sts.google.com")
+            token_type: Type of token, either "OIDC" or "PKI" (default: "OIDC")
+            deadline: Time budget of the request, including the wait for a pooled
+                connection (default: the client's timeout)
+
+        Returns:
+            str: The attestation token in JWT format
+
+        Raises:
+            VtpmAttestationError: If token request fails for any reason
+                (invalid nonces, service unavailable, deadline exceeded, etc.)
+        """
+        self._check_nonce_length(nonces)
+        if self.simulate:
+            self.logger.debug("sim_token", token=SIM_TOKEN)
+            return SIM_TOKEN
+
+        deadline = self.timeout if deadline is None else deadline
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            async with asyncio.timeout(deadline):
+                res = await self.client.post(
+                    self.url,
+                    json={
+                        "audience": audience,
+                        "token_type": token_type,
+                        "nonces": nonces,
+                    },
+                )
+            success_status = 200
+            if res.status_code != success_status:
+                msg = (
+                    "Failed to get attestation response: "
+                    f"{res.status_code} {res.reason_phrase}"
+                )
+                raise VtpmAttestationError(msg)
+            outcome = "ok"
+        except TimeoutError as e:
+            outcome = "timeout"
+            msg = f"Attestation request exceeded its {deadline:g}s deadline"
+            raise VtpmAttestationError(msg) from e
+        except httpx.TimeoutException as e:
+            outcome = "timeout"
+            msg = f"Attestation request timed out: {e!r}"
+            raise VtpmAttestationError(msg) from e
+        except httpx.HTTPError as e:
+            msg = f"Failed to reach the attestation service: {e!r}"
+            raise VtpmAttestationError(msg) from e
+        finally:
+            _token_duration.observe(
+                time.perf_counter() - started, token_type=token_type, outcome=outcome
+            )
+        token = res.text
+        self.logger.debug("token", token_type=token_type, token=token)
         return token
+
+    async def aclose(self) -> None:
+        """Close the async client's pooled connections."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
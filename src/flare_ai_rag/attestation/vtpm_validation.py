@@ -23,8 +23,10 @@ import base64
 import datetime
 import hashlib
 import re
+from collections.abc import Sequence
+from concurrent.futures import Executor
 from dataclasses import dataclass
-from typing import Any, Final
+from typing import Any, Final, cast
 
 import jwt
 import requests
@@ -37,6 +39,13 @@ from cryptography.hazmat.primitives.asymmetric import rsa
 from OpenSSL.crypto import X509, X509Store, X509StoreContext
 from OpenSSL.crypto import Error as OpenSSLError
 
+from flare_ai_rag.attestation.cert_chains import (
+    CertificateChainCache,
+    VerifiedChain,
+    chain_fingerprint,
+)
+from flare_ai_rag.attestation.oidc_keys import OIDCKeyCache
+
 logger = structlog.get_logger(__name__)
 
 
@@ -83,6 +92,59 @@ CERT_FINGERPRINT: Final[str] = (
 )
 
 
+def _verify_oidc_token(token: str, key: rsa.RSAPublicKey) -> dict[str, Any]:
+    """Verify an OIDC token's signature and claims with the issuer's key."""
+    try:
+        return jwt.decode(token, key, algorithms=[ALGO], options={"verify_aud": False})
+    except jwt.ExpiredSignatureError as e:
+        msg = "Token has expired"
+        logger.exception("token_expired", error=e)
+        raise SignatureValidationError(msg) from e
+    except jwt.InvalidTokenError as e:
+        msg = "Token is invalid"
+        logger.exception("invalid_token", error=e)
+        raise VtpmValidationError(msg) from e
+    except Exception as e:
+        msg = "Unexpected error during validation"
+        logger.exception("unexpected_error", error=e)
+        raise VtpmValidationError(msg) from e
+
+
+def _verify_pki_token(token: str, key: rsa.RSAPublicKey) -> dict[str, Any]:
+    """Verify a PKI token's signature and claims with its leaf certificate's key."""
+    try:
+        return jwt.decode(token, key=key, algorithms=[ALGO])
+    except (InvalidKey, jwt.InvalidTokenError) as e:
+        msg = f"Token signature validation failed: {e}"
+        raise VtpmValidationError(msg) from e
+    except Exception as e:
+        msg = f"Unexpected error during validation: {e}"
+        raise VtpmValidationError(msg) from e
+
+
+_VERIFIERS = {"OIDC": _verify_oidc_token, "PKI": _verify_pki_token}
+
+
+def _verify_tokens(
+    scheme: str, public_pem: bytes, tokens: list[str]
+) -> list[dict[str, Any] | VtpmValidationError]:
+    """
+    Verify tokens signed with the same key (in a worker of `validate_tokens`).
+
+    The key is passed as PEM, which, unlike key objects, can be sent to worker
+    processes.
+    """
+    key = cast("rsa.RSAPublicKey", serialization.load_pem_public_key(public_pem))
+    verify = _VERIFIERS[scheme]
+    results: list[dict[str, Any] | VtpmValidationError] = []
+    for token in tokens:
+        try:
+            results.append(verify(token, key))
+        except VtpmValidationError as e:
+            results.append(e)
+    return results
+
+
 class VtpmValidation:
     """
     Validates Confidential Space vTPM tokens through PKI or OIDC schemes.
@@ -97,6 +159,12 @@ class VtpmValidation:
             (default: /.well-known/openid-configuration)
         pki_endpoint: Path to root certificate
             (default: /.well-known/confidential_space_root.crt)
+        oidc_keys: Cache of the issuer's OIDC signing keys (default: a cache of
+            the issuer's configuration, see `OIDCKeyCache`)
+        chains: Cache of verified PKI certificate chains (default: a new cache,
+            see `CertificateChainCache`)
+        root_fingerprint: Expected SHA-1 fingerprint of the root certificate
+            (default: the Confidential Space root's)
 
     Usage:
         validator = VtpmValidation()
@@ -105,17 +173,29 @@ class VtpmValidation:
             # Claims contain verified token payload
         except VtpmValidationError as e:
             # Handle validation failure
+
+        # Batches: claims or errors, in order
+        with ProcessPoolExecutor() as executor:
+            results = validator.validate_tokens(tokens, executor)
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         expected_issuer: str = "https://confidentialcomputing.googleapis.com",
         oidc_endpoint: str = "/.well-known/openid-configuration",
         pki_endpoint: str = "/.well-known/confidential_space_root.crt",
+        *,
+        oidc_keys: OIDCKeyCache | None = None,
+        chains: CertificateChainCache | None = None,
+        root_fingerprint: str = CERT_FINGERPRINT,
     ) -> None:
         self.expected_issuer = expected_issuer
         self.oidc_endpoint = oidc_endpoint
         self.pki_endpoint = pki_endpoint
+        self.oidc_keys = oidc_keys or OIDCKeyCache(expected_issuer + oidc_endpoint)
+        self.chains = chains or CertificateChainCache()
+        self.root_fingerprint = root_fingerprint
+        self._root_cert: x509.Certificate | None = None
         self.logger = logger.bind(router="vtpm_validation")
 
     def validate_token(self, token: str) -> dict[str, Any]:
@@ -137,14 +217,9 @@ class VtpmValidation:
             SignatureValidationError: If the token signature is invalid
             CertificateParsingError: If certificates cannot be parsed
         """
-        unverified_header = jwt.get_unverified_header(token)
+        unverified_header = self._unverified_header(token)
         self.logger.info("token", unverified_header=unverified_header)
 
-        if unverified_header.get("alg") != ALGO:
-            msg = f"Invalid algorithm: got {unverified_header.get('alg')}, "
-            f"expected {ALGO}"
-            raise VtpmValidationError(msg)
-
         if unverified_header.get("x5c", None):
             # if x5c certs in header, token uses pki scheme
             self.logger.info("PKI_token", alg=unverified_header.get("alg"))
@@ -153,13 +228,140 @@ class VtpmValidation:
         self.logger.info("OIDC_token", alg=unverified_header.get("alg"))
         return self._decode_and_validate_oidc(token, unverified_header)
 
+    def validate_tokens(
+        self,
+        tokens: Sequence[str],
+        executor: Executor | None = None,
+        chunk_size: int = 256,
+    ) -> list[dict[str, Any] | VtpmValidationError]:
+        """
+        Validates a batch of vTPM tokens.
+
+        Tokens are grouped by scheme and signing key (the x5c certificate chain
+        or the OIDC key ID). The key of each group is looked up, or its chain
+        verified, once, through the same caches as `validate_token`; the
+        signatures are then checked in chunks of tokens on the executor. Token
+        parsing holds the GIL, so a ProcessPoolExecutor checks signatures on
+        several cores where a thread pool does not.
+
+        Args:
+            tokens: The JWT token strings to validate
+            executor: Executor checking the signatures (default: the calling
+                thread)
+            chunk_size: Number of tokens per executor task
+
+        Returns:
+            list: For each token, in order, its validated claims or the
+                VtpmValidationError it failed with
+        """
+        results: dict[int, dict[str, Any] | VtpmValidationError] = {}
+        schemes: list[str] = []
+        pems: list[bytes] = []
+        chunks: list[list[int]] = []
+        for (scheme, _), (header, indices) in self._group_tokens(
+            tokens, results
+        ).items():
+            try:
+                key = self._group_key(scheme, header)
+            except VtpmValidationError as e:
+                results.update(dict.fromkeys(indices, e))
+                continue
+            pem = key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo,
+            )
+            for start in range(0, len(indices), chunk_size):
+                schemes.append(scheme)
+                pems.append(pem)
+                chunks.append(indices[start : start + chunk_size])
+
+        verify = executor.map if executor is not None else map
+        outcomes = verify(
+            _verify_tokens,
+            schemes,
+            pems,
+            [[tokens[index] for index in chunk] for chunk in chunks],
+        )
+        for chunk, chunk_outcomes in zip(chunks, outcomes, strict=True):
+            results.update(zip(chunk, chunk_outcomes, strict=True))
+        self.logger.info("tokens_validated", tokens=len(tokens), keys=len(pems))
+        return [results[index] for index in range(len(tokens))]
+
+    def _group_tokens(
+        self,
+        tokens: Sequence[str],
+        errors: dict[int, dict[str, Any] | VtpmValidationError],
+    ) -> dict[tuple[str, str], tuple[dict[str, Any], list[int]]]:
+        """
+        Group tokens by scheme and signing key.
+
+        Tokens of the same issuer and key share their header segment, which is
+        parsed once.
+
+        Args:
+            tokens: The JWT token strings
+            errors: Where the errors of unparsable tokens are recorded, by index
+
+        Returns:
+            dict: For each scheme and key (x5c fingerprint or key ID), the header
+                of the group's first token and the indices of its tokens
+        """
+        headers: dict[str, dict[str, Any]] = {}
+        groups: dict[tuple[str, str], tuple[dict[str, Any], list[int]]] = {}
+        for index, token in enumerate(tokens):
+            segment = token.partition(".")[0]
+            header = headers.get(segment)
+            if header is None:
+                try:
+                    header = headers[segment] = self._unverified_header(token)
+                except jwt.InvalidTokenError as e:
+                    errors[index] = VtpmValidationError(f"Token is invalid: {e}")
+                    continue
+                except VtpmValidationError as e:
+                    errors[index] = e
+                    continue
+            if header.get("x5c"):
+                group = ("PKI", chain_fingerprint(header["x5c"]))
+            else:
+                group = ("OIDC", header.get("kid", ""))
+            groups.setdefault(group, (header, []))[1].append(index)
+        return groups
+
+    def _group_key(self, scheme: str, header: dict[str, Any]) -> rsa.RSAPublicKey:
+        """
+        The signing key of a group of tokens.
+
+        Raises:
+            VtpmValidationError: If the key cannot be found or its chain verified
+        """
+        try:
+            return self._pki_key(header) if scheme == "PKI" else self._oidc_key(header)
+        except requests.RequestException as e:
+            msg = f"Failed to fetch the issuer's keys: {e}"
+            raise VtpmValidationError(msg) from e
+
+    def _unverified_header(self, token: str) -> dict[str, Any]:
+        """
+        A token's header, checked for the expected algorithm.
+
+        Raises:
+            jwt.InvalidTokenError: If the token cannot be parsed
+            VtpmValidationError: If the token uses another algorithm
+        """
+        unverified_header = jwt.get_unverified_header(token)
+        if unverified_header.get("alg") != ALGO:
+            msg = f"Invalid algorithm: got {unverified_header.get('alg')}, "
+            f"expected {ALGO}"
+            raise VtpmValidationError(msg)
+        return unverified_header
+
     def _decode_and_validate_oidc(
         self, token: str, unverified_header: dict[str, str]
     ) -> dict[str, Any]:
         """
         Validates a token using OIDC JWKS-based validation.
 
-        Fetches the JWKS from the issuer's endpoint, finds the matching key by key ID,
+        Looks up the issuer's key with the header's key ID (see `OIDCKeyCache`),
         and validates the token signature.
 
         Args:
@@ -173,47 +375,31 @@ class VtpmValidation:
             VtpmValidationError: For any validation failure
             SignatureValidationError: If signature validation fails
         """
-        res = self._get_well_known_file(self.expected_issuer, self.oidc_endpoint).json()
-        jwks_uri = res["jwks_uri"]
+        rsa_key = self._oidc_key(unverified_header)
 
-        jwks = self._fetch_jwks(jwks_uri)
-        rsa_key = None
+        # Verify and decode the token using the public RSA key
+        validated_token = _verify_oidc_token(token, rsa_key)
+        self.logger.info(
+            "signature_match",
+            issuer=self.expected_issuer,
+            public_numbers=rsa_key.public_numbers,
+        )
+        return validated_token
+
+    def _oidc_key(self, unverified_header: dict[str, str]) -> rsa.RSAPublicKey:
+        """
+        The issuer's key for an OIDC token header.
 
+        Raises:
+            VtpmValidationError: If the issuer has no key with the header's key ID
+        """
         # Find the correct key based on the key ID (kid) in header
-        for key in jwks["keys"]:
-            if key.get("kid") == unverified_header["kid"]:
-                self.logger.info("kid_match", kid=key["kid"])
-                rsa_key = self._jwk_to_rsa_key(key)
-                break
-
+        rsa_key = self.oidc_keys.get_key(unverified_header.get("kid", ""))
         if rsa_key is None:
             msg = "Unable to find appropriate key id (kid) in header"
             raise VtpmValidationError(msg)
-
-        # Verify and decode the token using the public RSA key
-        try:
-            validated_token = jwt.decode(
-                token, rsa_key, algorithms=[ALGO], options={"verify_aud": False}
-            )
-            self.logger.info(
-                "signature_match",
-                issuer=self.expected_issuer,
-                public_numbers=rsa_key.public_numbers,
-            )
-        except jwt.ExpiredSignatureError as e:
-            msg = "Token has expired"
-            self.logger.exception("token_expired", error=e)
-            raise SignatureValidationError(msg) from e
-        except jwt.InvalidTokenError as e:
-            msg = "Token is invalid"
-            self.logger.exception("invalid_token", error=e)
-            raise VtpmValidationError(msg) from e
-        except Exception as e:
-            msg = "Unexpected error during validation"
-            self.logger.exception("unexpected_error", error=e)
-            raise VtpmValidationError(msg) from e
-        else:
-            return validated_token
+        self.logger.info("kid_match", kid=unverified_header["kid"])
+        return rsa_key
 
     def _decode_and_validate_pki(
         self, token: str, unverified_header: dict[str, str]
@@ -223,7 +409,9 @@ class VtpmValidation:
 
         Validates the certificate chain from the x5c header, verifies it
         against the trusted root certificate, and validates the token
-        signature using the leaf certificate.
+        signature using the leaf certificate. Verified chains are cached (see
+        `CertificateChainCache`), so a token with a known chain only has its
+        signature checked.
 
         Args:
             token: The JWT token string
@@ -236,15 +424,37 @@ class VtpmValidation:
             VtpmValidationError: For any validation failure
             InvalidCertificateChainError: If certificate chain validation fails
         """
-        res = self._get_well_known_file(self.expected_issuer, self.pki_endpoint).content
-        root_cert = x509.load_pem_x509_certificate(res, default_backend())
-        fingerprint = root_cert.fingerprint(hashes.SHA1())  # noqa: S303
-        calculated_fingerprint = ":".join(format(b, "02x") for b in fingerprint).upper()
+        return _verify_pki_token(token, self._pki_key(unverified_header))
 
-        if calculated_fingerprint != CERT_FINGERPRINT:
-            msg = "Root certificate fingerprint does not match expected fingerprint."
-            f"Expected: {CERT_FINGERPRINT}, Received: {calculated_fingerprint}"
-            raise VtpmValidationError(msg)
+    def _pki_key(self, unverified_header: dict[str, Any]) -> rsa.RSAPublicKey:
+        """
+        The leaf certificate's key for a PKI token header, once its certificate
+        chain is verified (or known to be).
+
+        Raises:
+            VtpmValidationError: If the chain fails verification
+        """
+        x5c = unverified_header["x5c"]
+        chain = self.chains.get(x5c, datetime.datetime.now(tz=datetime.UTC))
+        if chain is None:
+            chain = self._verify_chain(unverified_header)
+            self.chains.put(x5c, chain)
+        return chain.public_key
+
+    def _verify_chain(self, unverified_header: dict[str, str]) -> VerifiedChain:
+        """
+        Verify the certificate chain of a token header against the trusted root.
+
+        Args:
+            unverified_header: Pre-parsed token header containing x5c certificates
+
+        Returns:
+            VerifiedChain: The leaf certificate's public key and the chain's expiry
+
+        Raises:
+            VtpmValidationError: For any validation failure
+        """
+        root_cert = self._trusted_root_cert()
         try:
             certs = self._extract_and_validate_certificates(unverified_header)
             self._validate_leaf_certificate(certs.leaf_cert)
@@ -252,24 +462,46 @@ class VtpmValidation:
             self._check_certificate_validity(certs)
             self._verify_certificate_chain(certs)
 
-            public_key = certs.leaf_cert.public_key()
-            public_pem = public_key.public_bytes(
-                encoding=serialization.Encoding.PEM,
-                format=serialization.PublicFormat.SubjectPublicKeyInfo,
-            )
-
-            return jwt.decode(
-                token,
-                key=public_pem,
-                algorithms=[ALGO],
+            return VerifiedChain(
+                # An RSA key, checked by _validate_leaf_certificate
+                public_key=cast("rsa.RSAPublicKey", certs.leaf_cert.public_key()),
+                not_valid_after=min(
+                    cert.not_valid_after_utc
+                    for cert in (
+                        certs.leaf_cert,
+                        certs.intermediate_cert,
+                        certs.root_cert,
+                    )
+                ),
             )
-        except (InvalidKey, jwt.InvalidTokenError) as e:
-            msg = f"Token signature validation failed: {e}"
-            raise VtpmValidationError(msg) from e
         except Exception as e:
             msg = f"Unexpected error during validation: {e}"
             raise VtpmValidationError(msg) from e
 
+    def _trusted_root_cert(self) -> x509.Certificate:
+        """
+        The issuer's root certificate, fetched once and checked against the
+        expected fingerprint.
+
+        Raises:
+            VtpmValidationError: If the fingerprint does not match
+        """
+        now = datetime.datetime.now(tz=datetime.UTC)
+        if self._root_cert is not None and now <= self._root_cert.not_valid_after_utc:
+            return self._root_cert
+
+        res = self._get_well_known_file(self.expected_issuer, self.pki_endpoint).content
+        root_cert = x509.load_pem_x509_certificate(res, default_backend())
+        fingerprint = root_cert.fingerprint(hashes.SHA1())  # noqa: S303
+        calculated_fingerprint = ":".join(format(b, "02x") for b in fingerprint).upper()
+
+        if calculated_fingerprint != self.root_fingerprint:
+            msg = "Root certificate fingerprint does not match expected fingerprint."
+            f"Expected: {self.root_fingerprint}, Received: {calculated_fingerprint}"
+            raise VtpmValidationError(msg)
+        self._root_cert = root_cert
+        return root_cert
+
     @staticmethod
     def _get_well_known_file(
         expected_issuer: str, well_known_path: str
@@ -299,49 +531,6 @@ class VtpmValidation:
         msg = f"Failed to fetch well known file: {response.status_code}"
         raise requests.exceptions.HTTPError(msg)
 
-    @staticmethod
-    def _fetch_jwks(uri: str) -> JSONWebKeySet:
-        """
-        Fetch JSON Web Key Set (JWKS) from a remote endpoint.
-
-        This static method retrieves and parses the JWKS containing public keys
-        used for token validation.
-
-        Args:
-            uri: Full URL of the JWKS endpoint
-
-        Returns:
-            JWKSResponse: Parsed JWKS data containing public keys
-
-        Raises:
-            requests.exceptions.HTTPError: If the response status code is not 200
-        """
-        response = requests.get(uri, timeout=10)
-        valid_status_code = 200
-        if response.status_code == valid_status_code:
-            return response.json()
-        msg = f"Failed to fetch JWKS: {response.status_code}"
-        raise requests.exceptions.HTTPError(msg)
-
-    @staticmethod
-    def _jwk_to_rsa_key(jwk: dict[str, str]) -> rsa.RSAPublicKey:
-        """
-        Convert a JSON Web Key (JWK) to an RSA public key.
-
-        This static method converts a JWK dictionary into a cryptographic RSA public key
-        by extracting and decoding the modulus (n) and exponent (e) values.
-
-        Args:
-            jwk: Dictionary containing the JWK parameters, must include 'n' (modulus)
-                and 'e' (exponent) fields in base64url encoding
-
-        Returns:
-            RSAPublicKey: A cryptographic RSA public key object
-        """
-        n = int.from_bytes(base64.urlsafe_b64decode(jwk["n"] + "=="), "big")
-        e = int.from_bytes(base64.urlsafe_b64decode(jwk["e"] + "=="), "big")
-        return rsa.RSAPublicNumbers(e, n).public_key(backend=default_backend())
-
     def _extract_and_validate_certificates(
         self, headers: dict[str, Any]
     ) -> PKICertificates:
@@ -0,0 +1,169 @@
+"""
+Bounded executor for blocking calls made from async code.
+
+The SDKs used by the RAG pipeline (fastembed, qdrant-client, requests, the vTPM
+socket client) are synchronous. Calling them directly from an ``async def`` route
+handler blocks the event loop, so a single uvicorn worker can only serve one
+request at a time. This module owns a single process-wide thread pool, sized by
+``settings.executor_max_workers``, that such calls are offloaded to.
+
+It also provides single-flight coalescing: concurrent identical calls share one
+in-flight execution instead of each repeating the same work.
+"""
+
+import asyncio
+import contextvars
+import os
+import threading
+from collections.abc import Callable, Coroutine, Hashable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
+import structlog
+
+from flare_ai_rag.metrics import registry
+from flare_ai_rag.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+_flight_calls = registry.counter(
+    "singleflight_calls_total",
+    "Single-flight calls, by group and whether they led or joined a flight",
+    ("group", "outcome"),
+)
+
+_executor: ThreadPoolExecutor | None = None
+_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the shared executor, creating it on first use."""
+    global _executor  # noqa: PLW0603
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.executor_max_workers,
+                    thread_name_prefix="rag-blocking",
+                )
+                logger.debug(
+                    "executor_started", max_workers=settings.executor_max_workers
+                )
+    return _executor
+
+
+async def run_in_executor[**P, T](
+    func: Callable[P, T], *args: P.args, **kwargs: P.kwargs
+) -> T:
+    """
+    Run a blocking callable on the shared executor and await its result.
+
+    Context variables are copied into the worker thread, mirroring
+    ``asyncio.to_thread``.
+
+    Args:
+        func: The blocking callable.
+        *args: Positional arguments forwarded to ``func``.
+        **kwargs: Keyword arguments forwarded to ``func``.
+
+    Returns:
+        The return value of ``func``.
+    """
+    loop = asyncio.get_running_loop()
+    ctx = contextvars.copy_context()
+
+    def call() -> T:
+        return ctx.run(func, *args, **kwargs)
+
+    return await loop.run_in_executor(get_executor(), call)
+
+
+def shutdown_executor() -> None:
+    """Shut down the shared executor, waiting for in-flight calls to finish."""
+    global _executor  # noqa: PLW0603
+    with _lock:
+        if _executor is not None:
+            _executor.shutdown(wait=True)
+            _executor = None
+            logger.debug("executor_stopped")
+
+
+def _forget_executor() -> None:
+    """Drop the parent's executor in a forked child, whose threads did not fork."""
+    global _executor, _lock  # noqa: PLW0603
+    _executor = None
+    _lock = threading.Lock()
+
+
+os.register_at_fork(after_in_child=_forget_executor)
+
+
+class SingleFlight[K: Hashable, T]:
+    """
+    Coalesces concurrent calls with the same key into a single execution.
+
+    The first caller for a key (the leader) starts the call; callers arriving
+    while it is in flight await the same result (or exception). The key is
+    forgotten as soon as the call finishes, so this only dedupes concurrent work
+    and never serves stale results.
+
+    The call runs as its own task: if the leader is cancelled (e.g. its client
+    disconnected), the call keeps running for the callers still waiting on it.
+    """
+
+    def __init__(self, group: str) -> None:
+        """
+        Initialize the coalescer.
+
+        Args:
+            group: Name of the coalesced operation, used in logs and metrics
+        """
+        self.group = group
+        self._flights: dict[K, asyncio.Task[T]] = {}
+        self._waiters: dict[K, int] = {}
+        self.logger = logger.bind(service="singleflight", group=group)
+
+    def __len__(self) -> int:
+        """Number of calls currently in flight."""
+        return len(self._flights)
+
+    async def do(
+        self,
+        key: K,
+        func: Callable[..., Coroutine[Any, Any, T]],
+        *args: Any,
+    ) -> T:
+        """
+        Await ``func(*args)``, sharing an in-flight call with the same key.
+
+        Args:
+            key: Identity of the call; equal keys must produce equal results
+            func: Coroutine function performing the call
+            *args: Positional arguments forwarded to ``func``
+
+        Returns:
+            The result of the (possibly shared) call
+        """
+        flight = self._flights.get(key)
+        if flight is not None:
+            self._waiters[key] += 1
+            _flight_calls.inc(group=self.group, outcome="coalesced")
+            return await asyncio.shield(flight)
+
+        flight = asyncio.create_task(func(*args))
+        self._flights[key] = flight
+        self._waiters[key] = 0
+        flight.add_done_callback(lambda task: self._land(key, task))
+        _flight_calls.inc(group=self.group, outcome="leader")
+        return await asyncio.shield(flight)
+
+    def _land(self, key: K, flight: asyncio.Task[T]) -> None:
+        """Forget a finished call and report how many callers shared it."""
+        self._flights.pop(key, None)
+        waiters = self._waiters.pop(key, 0)
+        # Retrieve the outcome so a failure nobody awaits is not reported.
+        failed = not flight.cancelled() and flight.exception() is not None
+        if waiters:
+            self.logger.info(
+                "flight_coalesced", key=str(key)[:16], waiters=waiters, failed=failed
+            )
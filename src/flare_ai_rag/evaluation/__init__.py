@@ -0,0 +1,58 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .dataset import EvalQuery, load_eval_set, synthetic_eval_set
+    from .metrics import ndcg_at_k, recall_at_k, reciprocal_rank
+    from .sweep import (
+        EmbeddedQuery,
+        PointResult,
+        SweepConfig,
+        SweepPoint,
+        cheapest,
+        embed_queries,
+        evaluate_point,
+        format_table,
+        pareto_front,
+        run_sweep,
+    )
+
+__all__ = [
+    "EmbeddedQuery",
+    "EvalQuery",
+    "PointResult",
+    "SweepConfig",
+    "SweepPoint",
+    "cheapest",
+    "embed_queries",
+    "evaluate_point",
+    "format_table",
+    "load_eval_set",
+    "ndcg_at_k",
+    "pareto_front",
+    "recall_at_k",
+    "reciprocal_rank",
+    "run_sweep",
+    "synthetic_eval_set",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".dataset": ["EvalQuery", "load_eval_set", "synthetic_eval_set"],
+        ".metrics": ["ndcg_at_k", "recall_at_k", "reciprocal_rank"],
+        ".sweep": [
+            "EmbeddedQuery",
+            "PointResult",
+            "SweepConfig",
+            "SweepPoint",
+            "cheapest",
+            "embed_queries",
+            "evaluate_point",
+            "format_table",
+            "pareto_front",
+            "run_sweep",
+        ],
+    },
+)
@@ -0,0 +1,164 @@
+"""
+Retrieval quality-vs-latency evaluation.
+
+Usage:
+    python -m flare_ai_rag.evaluation --queries eval.jsonl --sweep sweep.json
+    python -m flare_ai_rag.evaluation --offline --docs 50 --min-recall 0.8
+
+Online, the collection configured in input_parameters.json (or at --qdrant-url)
+is evaluated with the configured embedding models. With --offline, the documents
+are indexed in an in-memory Qdrant with the benchmark's fake embeddings and, if
+no queries are given, evaluated on a synthetic query set; against a Qdrant
+server, in the benchmark's own collection rather than the configured one.
+In-memory Qdrant searches exhaustively, so HNSW ef and quantization only matter
+against a Qdrant server.
+
+The sweep file is a JSON object loaded with `SweepConfig.load`, e.g.
+{"prefetch_limit": [20, 50, 100], "fusion": ["rrf", "dbsf"], "limit": [5, 10],
+ "hnsw_ef": [null, 64, 128], "quantization": [null, "scalar"], "k": 5}
+"""
+
+import argparse
+import json
+import logging
+import sys
+from dataclasses import replace
+from pathlib import Path
+
+import structlog
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.ai import GeminiDenseEmbedding, ModelSparseEmbedding
+from flare_ai_rag.evaluation.dataset import load_eval_set, synthetic_eval_set
+from flare_ai_rag.evaluation.sweep import (
+    SweepConfig,
+    cheapest,
+    format_table,
+    run_sweep,
+)
+from flare_ai_rag.loadtest import (
+    LOADTEST_COLLECTION,
+    FakeDenseEmbedding,
+    FakeSparseEmbedding,
+    load_docs,
+)
+from flare_ai_rag.retriever import QdrantRetriever, RetrieverConfig, generate_collection
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m flare_ai_rag.evaluation",
+        description="Retrieval quality-vs-latency evaluation.",
+    )
+    parser.add_argument("--queries", type=Path, help="labelled JSONL query set")
+    parser.add_argument("--sweep", type=Path, help="JSON file of swept values")
+    parser.add_argument("--offline", action="store_true")
+    parser.add_argument("--qdrant-url", default="")
+    parser.add_argument(
+        "--docs", type=int, default=0, help="offline: documents indexed (0 for all)"
+    )
+    parser.add_argument("--metric", choices=["recall", "mrr", "ndcg"], default="ndcg")
+    parser.add_argument("--min-recall", type=float, default=0.0)
+    parser.add_argument("--min-ndcg", type=float, default=0.0)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    return parser.parse_args()
+
+
+def _retriever(
+    args: argparse.Namespace, retriever_config: RetrieverConfig
+) -> QdrantRetriever:
+    if args.offline:
+        retriever_config = replace(
+            retriever_config, collection_name=LOADTEST_COLLECTION
+        )
+        client = (
+            QdrantClient(url=args.qdrant_url)
+            if args.qdrant_url
+            else QdrantClient(":memory:")
+        )
+        dense = FakeDenseEmbedding(retriever_config.vector_size)
+        sparse = FakeSparseEmbedding()
+        generate_collection(
+            load_docs(args.docs),
+            client,
+            retriever_config,
+            dense_embedding_client=dense,
+            sparse_embedding_client=sparse,
+        )
+    else:
+        client = (
+            QdrantClient(url=args.qdrant_url)
+            if args.qdrant_url
+            else QdrantClient(host=retriever_config.host, port=retriever_config.port)
+        )
+        dense = GeminiDenseEmbedding(settings.gemini_api_key)
+        sparse = ModelSparseEmbedding(retriever_config.sparse_embedding_model)
+    return QdrantRetriever(
+        client=client,
+        retriever_config=retriever_config,
+        dense_embedding_client=dense,
+        sparse_embedding_client=sparse,
+    )
+
+
+def main() -> None:
+    args = _parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    input_config = load_json(settings.input_path / "input_parameters.json")
+    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
+    sweep = SweepConfig.load(load_json(args.sweep) if args.sweep else {})
+
+    if args.queries:
+        queries = load_eval_set(args.queries)
+    elif args.offline:
+        queries = synthetic_eval_set(load_docs(args.docs))
+    else:
+        sys.exit("--queries is required unless --offline is set")
+
+    if (
+        args.offline
+        and not args.qdrant_url
+        and (any(sweep.hnsw_ef) or any(sweep.quantization))
+    ):
+        print(  # noqa: T201
+            "warning: in-memory Qdrant searches exhaustively; "
+            "hnsw_ef and quantization have no effect without --qdrant-url",
+            file=sys.stderr,
+        )
+    results = run_sweep(_retriever(args, retriever_config), queries, sweep)
+    print(f"{len(queries)} queries, {len(results)} configurations")  # noqa: T201
+    print(format_table(results, sweep.k, args.metric))  # noqa: T201
+
+    best = cheapest(results, args.min_recall, args.min_ndcg)
+    if best is None:
+        print("\nNo configuration meets the quality bar.")  # noqa: T201
+    else:
+        print(  # noqa: T201
+            "\nCheapest configuration meeting the quality bar (retriever_config):\n"
+            + json.dumps(best.point.retriever_config())
+        )
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                [
+                    {
+                        **result.point.retriever_config(),
+                        "recall": result.recall,
+                        "mrr": result.mrr,
+                        "ndcg": result.ndcg,
+                        "p50_ms": result.p50_ms,
+                        "p95_ms": result.p95_ms,
+                    }
+                    for result in results
+                ],
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Labelled queries for retrieval evaluation.
+
+An evaluation set is a JSON Lines file with one query per line and the
+filenames of the documents relevant to it:
+
+    {"query": "How do I read FTSO prices?", "relevant": ["2-read-feeds.mdx"]}
+"""
+
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class EvalQuery:
+    """A query and the filenames of the documents relevant to it."""
+
+    query: str
+    relevant: frozenset[str]
+
+
+def load_eval_set(path: Path) -> list[EvalQuery]:
+    """
+    Load an evaluation set from a JSON Lines file.
+
+    Raises:
+        ValueError: If a line has no query or no relevant documents
+    """
+    queries = []
+    with path.open() as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if not item.get("query") or not item.get("relevant"):
+                msg = f"{path}:{number}: expected a query and relevant filenames"
+                raise ValueError(msg)
+            queries.append(EvalQuery(item["query"], frozenset(item["relevant"])))
+    return queries
+
+
+def synthetic_eval_set(df_docs: pd.DataFrame) -> list[EvalQuery]:
+    """
+    One query per document, naming the topic in its filename.
+
+    Useful for smoke-testing the harness offline; tuning decisions should be
+    based on a set labelled from real user questions.
+    """
+    queries = []
+    for filename, contents in zip(
+        df_docs["Filename"], df_docs["Contents"], strict=True
+    ):
+        if not isinstance(contents, str):
+            continue
+        topic = re.sub(r"^\d+-", "", Path(str(filename)).stem).replace("-", " ")
+        if topic:
+            queries.append(
+                EvalQuery(f"What is {topic} on Flare?", frozenset({str(filename)}))
+            )
+    return queries
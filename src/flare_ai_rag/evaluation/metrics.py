@@ -0,0 +1,41 @@
+"""
+Ranking quality metrics with binary relevance.
+
+All metrics take the filenames of the retrieved documents in rank order and the
+set of relevant filenames. Repeated filenames (e.g. chunks of one document) only
+count at their first rank.
+"""
+
+import math
+
+
+def _unique(ranked: list[str]) -> list[str]:
+    return list(dict.fromkeys(ranked))
+
+
+def recall_at_k(ranked: list[str], relevant: frozenset[str], k: int) -> float:
+    """Fraction of the relevant documents among the top k."""
+    if not relevant:
+        return 0.0
+    return len(relevant.intersection(_unique(ranked)[:k])) / len(relevant)
+
+
+def reciprocal_rank(ranked: list[str], relevant: frozenset[str], k: int) -> float:
+    """1 / rank of the first relevant document in the top k (0 if none)."""
+    for rank, filename in enumerate(_unique(ranked)[:k], start=1):
+        if filename in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(ranked: list[str], relevant: frozenset[str], k: int) -> float:
+    """Normalized discounted cumulative gain of the top k."""
+    dcg = sum(
+        1.0 / math.log2(rank + 1)
+        for rank, filename in enumerate(_unique(ranked)[:k], start=1)
+        if filename in relevant
+    )
+    ideal = sum(
+        1.0 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1)
+    )
+    return dcg / ideal if ideal else 0.0
@@ -0,0 +1,260 @@
+"""
+Parameter sweeps of the hybrid retriever.
+
+Every combination of the swept search parameters (prefetch limit, fusion method,
+final limit, HNSW ef, quantization) is evaluated on a labelled query set for
+ranking quality (recall@k, MRR, nDCG@k) and Qdrant query latency. Queries are
+embedded once up front, so latencies measure only what the parameters change.
+The results form a quality-vs-latency Pareto table, from which the cheapest
+configuration meeting a quality bar can be picked.
+"""
+
+import dataclasses
+import itertools
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import structlog
+
+from flare_ai_rag.evaluation.dataset import EvalQuery
+from flare_ai_rag.evaluation.metrics import ndcg_at_k, recall_at_k, reciprocal_rank
+from flare_ai_rag.retriever import QdrantRetriever, update_quantization
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class SweepPoint:
+    """One combination of retriever search parameters."""
+
+    prefetch_limit: int
+    fusion: str
+    limit: int
+    hnsw_ef: int | None
+    quantization: str | None
+
+    def retriever_config(self) -> dict[str, Any]:
+        """The point as "retriever_config" input parameters."""
+        return dataclasses.asdict(self)
+
+
+@dataclass(frozen=True)
+class SweepConfig:
+    """Values swept for each parameter, and the evaluation cutoff k."""
+
+    prefetch_limit: tuple[int, ...]
+    fusion: tuple[str, ...]
+    limit: tuple[int, ...]
+    hnsw_ef: tuple[int | None, ...]
+    quantization: tuple[str | None, ...]
+    k: int
+    repeats: int
+
+    @staticmethod
+    def load(sweep_config: dict[str, Any]) -> "SweepConfig":
+        return SweepConfig(
+            prefetch_limit=tuple(sweep_config.get("prefetch_limit", [20, 50, 100])),
+            fusion=tuple(sweep_config.get("fusion", ["rrf", "dbsf"])),
+            limit=tuple(sweep_config.get("limit", [5, 10, 50])),
+            hnsw_ef=tuple(sweep_config.get("hnsw_ef", [None])),
+            quantization=tuple(sweep_config.get("quantization", [None])),
+            k=sweep_config.get("k", 5),
+            repeats=sweep_config.get("repeats", 3),
+        )
+
+    def points(self) -> list[SweepPoint]:
+        """All parameter combinations, grouped by quantization."""
+        return [
+            SweepPoint(prefetch_limit, fusion, limit, hnsw_ef, quantization)
+            for quantization, hnsw_ef, prefetch_limit, fusion, limit in (
+                itertools.product(
+                    self.quantization,
+                    self.hnsw_ef,
+                    self.prefetch_limit,
+                    self.fusion,
+                    self.limit,
+                )
+            )
+        ]
+
+
+@dataclass(frozen=True)
+class PointResult:
+    """Quality and latency of one sweep point."""
+
+    point: SweepPoint
+    recall: float
+    mrr: float
+    ndcg: float
+    p50_ms: float
+    p95_ms: float
+
+    def quality(self, metric: str) -> float:
+        return getattr(self, metric)
+
+
+@dataclass(frozen=True)
+class EmbeddedQuery:
+    """A labelled query with its dense and sparse embeddings."""
+
+    query: EvalQuery
+    dense: list[float]
+    sparse_indices: list[int]
+    sparse_values: list[float]
+
+
+def embed_queries(
+    retriever: QdrantRetriever, queries: list[EvalQuery]
+) -> list[EmbeddedQuery]:
+    """Embed each query once with the retriever's embedding clients."""
+    embedded = []
+    for query in queries:
+        indices, values = retriever.keyword_search(query.query)
+        embedded.append(
+            EmbeddedQuery(
+                query, retriever.semantic_search(query.query), indices, values
+            )
+        )
+    return embedded
+
+
+def evaluate_point(
+    retriever: QdrantRetriever,
+    queries: list[EmbeddedQuery],
+    point: SweepPoint,
+    k: int,
+    repeats: int,
+) -> PointResult:
+    """Evaluate one parameter combination (its quantization must be applied)."""
+    point_retriever = QdrantRetriever(
+        client=retriever.client,
+        retriever_config=dataclasses.replace(
+            retriever.retriever_config, **point.retriever_config()
+        ),
+        dense_embedding_client=retriever.dense_embedding_client,
+        sparse_embedding_client=retriever.sparse_embedding_client,
+    )
+    recalls, ranks, ndcgs, latencies = [], [], [], []
+    for embedded in queries:
+        docs: list[dict] = []
+        # The first run warms caches; the following ones are timed.
+        for run in range(repeats + 1):
+            started = time.perf_counter()
+            docs = point_retriever.query_fused(
+                embedded.dense, embedded.sparse_indices, embedded.sparse_values
+            )
+            if run:
+                latencies.append(time.perf_counter() - started)
+        ranked = [str(doc.get("filename", "")) for doc in docs]
+        relevant = embedded.query.relevant
+        recalls.append(recall_at_k(ranked, relevant, k))
+        ranks.append(reciprocal_rank(ranked, relevant, k))
+        ndcgs.append(ndcg_at_k(ranked, relevant, k))
+    p50, p95 = np.percentile(latencies, [50, 95]) if latencies else (0.0, 0.0)
+    return PointResult(
+        point=point,
+        recall=float(np.mean(recalls)),
+        mrr=float(np.mean(ranks)),
+        ndcg=float(np.mean(ndcgs)),
+        p50_ms=float(p50) * 1000,
+        p95_ms=float(p95) * 1000,
+    )
+
+
+def run_sweep(
+    retriever: QdrantRetriever, queries: list[EvalQuery], config: SweepConfig
+) -> list[PointResult]:
+    """
+    Evaluate every point of a sweep.
+
+    The collection's quantization is changed as the sweep progresses and
+    restored to the retriever's configured quantization at the end.
+
+    Args:
+        retriever: Retriever over the collection to evaluate
+        queries: Labelled queries
+        config: Swept parameter values
+
+    Returns:
+        list[PointResult]: The result of each point, in sweep order
+    """
+    embedded = embed_queries(retriever, queries)
+    collection = retriever.retriever_config.collection_name
+    results = []
+    current = retriever.retriever_config.quantization
+    try:
+        for point in config.points():
+            if point.quantization != current:
+                update_quantization(retriever.client, collection, point.quantization)
+                current = point.quantization
+            result = evaluate_point(
+                retriever, embedded, point, config.k, config.repeats
+            )
+            logger.info("sweep_point_evaluated", **dataclasses.asdict(result))
+            results.append(result)
+    finally:
+        if current != retriever.retriever_config.quantization:
+            update_quantization(
+                retriever.client, collection, retriever.retriever_config.quantization
+            )
+    return results
+
+
+def pareto_front(results: list[PointResult], metric: str = "ndcg") -> list[PointResult]:
+    """
+    Results not dominated by another result.
+
+    A result dominates another if its quality is at least as high and its p95
+    latency at least as low, and it is strictly better in one of them.
+    """
+    return [
+        result
+        for result in results
+        if not any(
+            other.quality(metric) >= result.quality(metric)
+            and other.p95_ms <= result.p95_ms
+            and (
+                other.quality(metric) > result.quality(metric)
+                or other.p95_ms < result.p95_ms
+            )
+            for other in results
+        )
+    ]
+
+
+def cheapest(
+    results: list[PointResult], min_recall: float = 0.0, min_ndcg: float = 0.0
+) -> PointResult | None:
+    """The result with the lowest p95 latency meeting the quality bars, if any."""
+    eligible = [
+        result
+        for result in results
+        if result.recall >= min_recall and result.ndcg >= min_ndcg
+    ]
+    return min(eligible, key=lambda result: result.p95_ms, default=None)
+
+
+def format_table(results: list[PointResult], k: int, metric: str = "ndcg") -> str:
+    """
+    The results as a plain-text table sorted by p95 latency.
+
+    Pareto-optimal results (see `pareto_front`) are marked with "*".
+    """
+    front = {id(result) for result in pareto_front(results, metric)}
+    header = (
+        f"{'':2}{'quant':>8}{'ef':>6}{'fusion':>7}{'prefetch':>9}{'limit':>6}"
+        f"{f'recall@{k}':>10}{'MRR':>7}{f'nDCG@{k}':>9}{'p50 ms':>9}{'p95 ms':>9}"
+    )
+    lines = [header]
+    for result in sorted(results, key=lambda result: result.p95_ms):
+        point = result.point
+        lines.append(
+            f"{'*' if id(result) in front else '':2}"
+            f"{point.quantization or '-':>8}{point.hnsw_ef or '-':>6}"
+            f"{point.fusion:>7}{point.prefetch_limit:>9}{point.limit:>6}"
+            f"{result.recall:>10.3f}{result.mrr:>7.3f}{result.ndcg:>9.3f}"
+            f"{result.p50_ms:>9.2f}{result.p95_ms:>9.2f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,60 @@
+"""
+Lazy re-exports for package `__init__` modules.
+
+The subpackages re-export the public names of their modules, which used to mean
+that importing any of them imported every module of the subpackage and, through
+them, heavy dependencies (google.generativeai, fastembed and onnxruntime,
+qdrant-client, cryptography, ...) that the importer may never use. A command
+line tool replaying traffic, for example, paid for loading the embedding models'
+runtime before sending its first request.
+
+`lazy_exports` builds the module-level `__getattr__` (PEP 562) of a package, which
+imports the module defining a re-exported name on first access:
+
+    if TYPE_CHECKING:
+        from .gemini import GeminiProvider
+
+    __getattr__, __dir__ = lazy_exports(__name__, {".gemini": ["GeminiProvider"]})
+
+The `TYPE_CHECKING` imports keep the names visible to type checkers and editors.
+Names that are also submodule names (e.g. `flare_ai_rag.metrics.registry`) must
+be imported eagerly: importing the submodule would shadow the lazy attribute.
+"""
+
+import importlib
+import sys
+from collections.abc import Callable
+from typing import Any
+
+
+def lazy_exports(
+    package: str, exports: dict[str, list[str]]
+) -> tuple[Callable[[str], Any], Callable[[], list[str]]]:
+    """
+    Build the `__getattr__` and `__dir__` of a package with lazy re-exports.
+
+    Args:
+        package: Name of the package (its `__name__`)
+        exports: Names re-exported by the package, by the (relative) name of the
+            module defining them
+
+    Returns:
+        tuple: The package's `__getattr__` and `__dir__` functions
+    """
+    origins = {name: module for module, names in exports.items() for name in names}
+    namespace = vars(sys.modules[package])
+
+    def __getattr__(name: str) -> Any:  # noqa: N807
+        module = origins.get(name)
+        if module is None:
+            msg = f"module {package!r} has no attribute {name!r}"
+            raise AttributeError(msg)
+        value = getattr(importlib.import_module(module, package), name)
+        # Later accesses find the name in the namespace and skip __getattr__.
+        namespace[name] = value
+        return value
+
+    def __dir__() -> list[str]:  # noqa: N807
+        return sorted({*namespace, *origins})
+
+    return __getattr__, __dir__
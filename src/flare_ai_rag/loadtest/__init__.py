@@ -0,0 +1,114 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+# `replay` is also the name of its module, which would shadow a lazy attribute.
+from .replay import CapturedRequest, ReplayReport, load_capture, replay
+
+if TYPE_CHECKING:
+    from .app import (
+        LOADTEST_COLLECTION,
+        LoadTestConfig,
+        build_benchmark_app,
+        build_chat_router,
+        load_docs,
+        sample_queries,
+    )
+    from .fakes import (
+        FakeAIProvider,
+        FakeDenseEmbedding,
+        FakeProviderConfig,
+        FakeSparseEmbedding,
+        LatencyDistribution,
+        text_vector,
+    )
+    from .importtime import (
+        DEFAULT_BUDGETS,
+        HEAVY_DEPENDENCIES,
+        ImportBudget,
+        ImportProfile,
+        check_budget,
+        profile_import,
+    )
+    from .runner import LoadTestReport, LoopLagMonitor, StageRecorder, run_load
+    from .standin import StandinConfig, StandinModel, create_standin_app
+    from .tokens import (
+        TestIssuer,
+        TokenBenchmarkResult,
+        make_tokens,
+        run_token_benchmark,
+    )
+
+__all__ = [
+    "DEFAULT_BUDGETS",
+    "HEAVY_DEPENDENCIES",
+    "LOADTEST_COLLECTION",
+    "CapturedRequest",
+    "FakeAIProvider",
+    "FakeDenseEmbedding",
+    "FakeProviderConfig",
+    "FakeSparseEmbedding",
+    "ImportBudget",
+    "ImportProfile",
+    "LatencyDistribution",
+    "LoadTestConfig",
+    "LoadTestReport",
+    "LoopLagMonitor",
+    "ReplayReport",
+    "StageRecorder",
+    "StandinConfig",
+    "StandinModel",
+    "TestIssuer",
+    "TokenBenchmarkResult",
+    "build_benchmark_app",
+    "build_chat_router",
+    "check_budget",
+    "create_standin_app",
+    "load_capture",
+    "load_docs",
+    "make_tokens",
+    "profile_import",
+    "replay",
+    "run_load",
+    "run_token_benchmark",
+    "sample_queries",
+    "text_vector",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".app": [
+            "LOADTEST_COLLECTION",
+            "LoadTestConfig",
+            "build_benchmark_app",
+            "build_chat_router",
+            "load_docs",
+            "sample_queries",
+        ],
+        ".fakes": [
+            "FakeAIProvider",
+            "FakeDenseEmbedding",
+            "FakeProviderConfig",
+            "FakeSparseEmbedding",
+            "LatencyDistribution",
+            "text_vector",
+        ],
+        ".importtime": [
+            "DEFAULT_BUDGETS",
+            "HEAVY_DEPENDENCIES",
+            "ImportBudget",
+            "ImportProfile",
+            "check_budget",
+            "profile_import",
+        ],
+        ".runner": ["LoadTestReport", "LoopLagMonitor", "StageRecorder", "run_load"],
+        ".standin": ["StandinConfig", "StandinModel", "create_standin_app"],
+        ".tokens": [
+            "TestIssuer",
+            "TokenBenchmarkResult",
+            "make_tokens",
+            "run_token_benchmark",
+        ],
+    },
+)
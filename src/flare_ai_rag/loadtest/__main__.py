@@ -0,0 +1,83 @@
+"""
+Offline end-to-end benchmark of the chat pipeline.
+
+Usage:
+    python -m flare_ai_rag.loadtest --requests 500 --concurrency 32
+    python -m flare_ai_rag.loadtest --provider-config latencies.json --json out.json
+
+The provider config is a JSON object loaded with `FakeProviderConfig.load`, e.g.
+{"latencies": {"default": {"median_ms": 300, "sigma": 0.3}}}. Compare the JSON
+reports of two runs to spot regressions in the hot path.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.loadtest.app import (
+    LoadTestConfig,
+    build_benchmark_app,
+    load_docs,
+    sample_queries,
+)
+from flare_ai_rag.loadtest.fakes import FakeProviderConfig
+from flare_ai_rag.loadtest.runner import run_load
+from flare_ai_rag.utils import load_json
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m flare_ai_rag.loadtest",
+        description="Offline end-to-end benchmark of the chat pipeline.",
+    )
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--turns-per-session", type=int, default=3)
+    parser.add_argument("--docs", type=int, default=200, help="0 indexes all")
+    parser.add_argument("--qdrant-url", default="", help="default: in-memory")
+    parser.add_argument("--embedding-latency-ms", type=float, default=50.0)
+    parser.add_argument("--provider-config", type=Path, help="JSON file")
+    parser.add_argument("--json", type=Path, help="also write the report here")
+    parser.add_argument("--verbose", action="store_true", help="keep pipeline logs")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    provider_config = load_json(args.provider_config) if args.provider_config else {}
+    config = LoadTestConfig(
+        provider=FakeProviderConfig.load(provider_config),
+        embedding_latency=args.embedding_latency_ms / 1000,
+        num_docs=args.docs,
+        qdrant_url=args.qdrant_url,
+    )
+    if not args.verbose:
+        structlog.configure(
+            wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+        )
+
+    df_docs = load_docs(config.num_docs)
+    app = build_benchmark_app(config, df_docs)
+    report = asyncio.run(
+        run_load(
+            app,
+            sample_queries(df_docs, seed=config.provider.seed),
+            requests=args.requests,
+            concurrency=args.concurrency,
+            turns_per_session=args.turns_per_session,
+        )
+    )
+
+    print(report.format())  # noqa: T201
+    if args.json:
+        args.json.write_text(json.dumps(report.to_dict(), indent=2))
+    sys.exit(0 if report.statuses.get("200") == report.requests else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Offline construction of the full chat application for benchmarks.
+
+Builds the same FastAPI application as `flare_ai_rag.main.create_app` (routers,
+retriever, responder, sessions, admission control, metrics), but with the model
+providers and embeddings replaced by the deterministic fakes of
+`flare_ai_rag.loadtest.fakes` and the documents indexed in an in-memory Qdrant
+(or a local Qdrant server), so the hot path can be measured without network
+access or API keys. The documents go to a collection of their own, so that a
+benchmark against a Qdrant server leaves the application's index alone.
+"""
+
+import random
+import re
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+import pandas as pd
+import structlog
+from fastapi import APIRouter, FastAPI
+from qdrant_client import QdrantClient
+
+from flare_ai_rag.api import AdmissionController, ChatRouter
+from flare_ai_rag.attestation import Vtpm
+from flare_ai_rag.loadtest.fakes import (
+    FakeAIProvider,
+    FakeDenseEmbedding,
+    FakeProviderConfig,
+    FakeSparseEmbedding,
+)
+from flare_ai_rag.main import build_app, setup_history, setup_sessions
+from flare_ai_rag.metrics import UsageConfig, usage_meter
+from flare_ai_rag.prompts import PromptService
+from flare_ai_rag.responder import GeminiResponder, ResponderConfig
+from flare_ai_rag.retriever import QdrantRetriever, RetrieverConfig, generate_collection
+from flare_ai_rag.router import (
+    GeminiFusedRouter,
+    GeminiRouter,
+    QueryImprovementRouter,
+    RouterConfig,
+)
+from flare_ai_rag.settings import settings
+from flare_ai_rag.utils import load_json
+
+logger = structlog.get_logger(__name__)
+
+# Collection the fake-embedded documents are indexed in
+LOADTEST_COLLECTION = "loadtest_docs"
+
+
+@dataclass(frozen=True)
+class LoadTestConfig:
+    """
+    Configuration of the benchmarked application.
+
+    Attributes:
+        provider: Behaviour and latencies of the fake model provider
+        embedding_latency: Simulated latency of query embeddings (seconds)
+        num_docs: Number of documents indexed (0 for all)
+        qdrant_url: URL of a local Qdrant server; in-memory Qdrant if empty
+        input_parameters: Pipeline configuration (default: input_parameters.json)
+    """
+
+    provider: FakeProviderConfig = field(
+        default_factory=lambda: FakeProviderConfig.load({})
+    )
+    embedding_latency: float = 0.05
+    num_docs: int = 200
+    qdrant_url: str = ""
+    input_parameters: dict[str, Any] = field(
+        default_factory=lambda: load_json(settings.input_path / "input_parameters.json")
+    )
+
+
+def load_docs(num_docs: int, path: Path | None = None) -> pd.DataFrame:
+    """Load the first `num_docs` documents of the RAG data (0 for all)."""
+    df_docs = pd.read_csv(path or settings.data_path / "docs.txt", delimiter=",")
+    return df_docs.head(num_docs) if num_docs else df_docs
+
+
+def sample_queries(df_docs: pd.DataFrame, seed: int = 0) -> list[str]:
+    """
+    Questions about the indexed documents, in a reproducible random order.
+
+    Each question names the topic of a document, taken from its filename
+    (e.g. "2-getting-started.mdx" asks about "getting started").
+    """
+    topics = {
+        re.sub(r"^\d+-", "", Path(str(filename)).stem).replace("-", " ")
+        for filename in df_docs["Filename"]
+    }
+    queries = [f"What is {topic} on Flare?" for topic in sorted(topics) if topic]
+    random.Random(seed).shuffle(queries)  # noqa: S311
+    return queries or ["What is Flare?"]
+
+
+def build_chat_router(config: LoadTestConfig, df_docs: pd.DataFrame) -> ChatRouter:
+    """
+    Build the chat pipeline against the fakes and index the documents.
+
+    The local semantic router is left out: its embedding model is downloaded on
+    first use, and without it every message is routed by the (fake) provider.
+    """
+    input_config = config.input_parameters
+    usage_meter.configure(UsageConfig.load(input_config.get("usage", {})))
+    router_config = RouterConfig.load(input_config["router_model"])
+    responder_config = ResponderConfig.load(input_config["responder_model"])
+    retriever_config = replace(
+        RetrieverConfig.load(input_config["retriever_config"]),
+        collection_name=LOADTEST_COLLECTION,
+    )
+
+    router_ai = FakeAIProvider(
+        model=router_config.model.model_id, config=config.provider
+    )
+    responder_ai = FakeAIProvider(
+        model=responder_config.model.model_id, config=config.provider
+    )
+
+    qdrant_client = (
+        QdrantClient(url=config.qdrant_url)
+        if config.qdrant_url
+        else QdrantClient(":memory:")
+    )
+    dense_embedding_client = FakeDenseEmbedding(
+        retriever_config.vector_size, latency=config.embedding_latency
+    )
+    sparse_embedding_client = FakeSparseEmbedding()
+    generate_collection(
+        df_docs,
+        qdrant_client,
+        retriever_config,
+        dense_embedding_client=dense_embedding_client,
+        sparse_embedding_client=sparse_embedding_client,
+    )
+    retriever = QdrantRetriever(
+        client=qdrant_client,
+        retriever_config=retriever_config,
+        dense_embedding_client=dense_embedding_client,
+        sparse_embedding_client=sparse_embedding_client,
+    )
+    logger.info(
+        "Benchmark pipeline has been set up.",
+        num_docs=len(df_docs),
+        qdrant=config.qdrant_url or ":memory:",
+    )
+
+    return ChatRouter(
+        router=APIRouter(),
+        ai=router_ai,
+        query_router=GeminiRouter(router_ai, router_config),
+        query_improvement_router=QueryImprovementRouter(router_ai, router_config),
+        retriever=retriever,
+        responder=GeminiResponder(
+            client=responder_ai, responder_config=responder_config
+        ),
+        attestation=Vtpm(simulate=True),
+        prompts=PromptService(),
+        fused_router=(
+            GeminiFusedRouter(router_ai, router_config)
+            if router_config.fused_query_routing
+            else None
+        ),
+        sessions=setup_sessions(),
+        history=setup_history(input_config, router_ai, None),
+        admission=AdmissionController(
+            max_in_flight=settings.admission_max_in_flight,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+        ),
+    )
+
+
+def build_benchmark_app(
+    config: LoadTestConfig, df_docs: pd.DataFrame | None = None
+) -> FastAPI:
+    """
+    Build the full application against the fakes.
+
+    Args:
+        config: Configuration of the benchmarked application
+        df_docs: Documents to index (default: the first `config.num_docs` of the
+            RAG data)
+
+    Returns:
+        FastAPI: The application, serving /api/routes/chat and /metrics
+    """
+    if df_docs is None:
+        df_docs = load_docs(config.num_docs)
+    return build_app(build_chat_router(config, df_docs))
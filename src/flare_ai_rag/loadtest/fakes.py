@@ -0,0 +1,310 @@
+"""
+Deterministic stand-ins for the model providers, for offline benchmarks.
+
+FakeAIProvider answers every prompt of the pipeline with a well-formed response
+(semantic route, query classification, improved query, answer) after a latency
+drawn from a per-stage distribution, and reports token usage like a real
+provider. The fake embeddings derive vectors from the words of a text, so that
+texts sharing words get similar vectors and retrieval returns related documents.
+"""
+
+import asyncio
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import dataclass
+from enum import Enum
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, get_type_hints, override
+
+import numpy as np
+import numpy.typing as npt
+
+from flare_ai_rag.ai import (
+    EmbeddingTaskType,
+    GeminiDenseEmbedding,
+    ModelSparseEmbedding,
+)
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.metrics import TokenUsage, current_stage, record_usage
+
+if TYPE_CHECKING:
+    from fastembed import SparseEmbedding
+
+_WORD = re.compile(r"\w+")
+
+
+def prompt_words(text: str) -> list[str]:
+    """The lowercase words of a text."""
+    return _WORD.findall(text.lower())
+
+
+@dataclass(frozen=True)
+class LatencyDistribution:
+    """
+    Log-normal latency distribution.
+
+    Attributes:
+        median: Median latency in seconds
+        sigma: Standard deviation of the log latency (0 for a fixed latency)
+    """
+
+    median: float
+    sigma: float = 0.0
+
+    @staticmethod
+    def load(latency: dict[str, Any]) -> "LatencyDistribution":
+        return LatencyDistribution(
+            median=latency.get("median_ms", 0.0) / 1000,
+            sigma=latency.get("sigma", 0.0),
+        )
+
+    def sample(self, rng: random.Random) -> float:
+        if self.median <= 0:
+            return 0.0
+        return self.median * float(np.exp(rng.gauss(0.0, self.sigma)))
+
+
+@dataclass(frozen=True)
+class FakeProviderConfig:
+    """
+    Behaviour of the fake model provider.
+
+    Attributes:
+        latencies: Latency by pipeline stage; "default" applies to other stages
+        semantic_route: Route returned for semantic routing prompts
+        classification: Classification returned for query routing prompts
+        answer_words: Length of generated answers, in words
+        seed: Seed of the latency samples
+    """
+
+    latencies: dict[str, LatencyDistribution]
+    semantic_route: str
+    classification: str
+    answer_words: int
+    seed: int
+
+    @staticmethod
+    def load(provider_config: dict[str, Any]) -> "FakeProviderConfig":
+        latencies = provider_config.get(
+            "latencies",
+            {
+                "default": {"median_ms": 400, "sigma": 0.3},
+                "response_generation": {"median_ms": 1200, "sigma": 0.4},
+            },
+        )
+        return FakeProviderConfig(
+            latencies={
+                stage: LatencyDistribution.load(latency)
+                for stage, latency in latencies.items()
+            },
+            semantic_route=provider_config.get("semantic_route", "RagRouter"),
+            classification=provider_config.get("classification", "ANSWER"),
+            answer_words=provider_config.get("answer_words", 120),
+            seed=provider_config.get("seed", 0),
+        )
+
+    def latency(self, stage: str) -> LatencyDistribution:
+        return self.latencies.get(
+            stage, self.latencies.get("default", LatencyDistribution(0.0))
+        )
+
+
+class FakeAIProvider(BaseAIProvider):
+    """
+    Model provider returning canned responses after a simulated latency.
+
+    Responses depend only on the prompt, the requested response format and the
+    pipeline stage the call is made in (see `flare_ai_rag.metrics.track_stage`),
+    and latencies are sampled from that stage's distribution with a fixed seed,
+    so runs are reproducible.
+    """
+
+    def __init__(self, api_key: str = "", model: str = "fake", **kwargs: Any) -> None:
+        """
+        Initialize the provider.
+
+        Args:
+            api_key: Ignored
+            model: Model name reported in metadata and usage metrics
+            **kwargs: Optional "config" (FakeProviderConfig)
+        """
+        self.api_key = api_key
+        self.model = model
+        self.model_name = model
+        self.config: FakeProviderConfig = kwargs.get(
+            "config", FakeProviderConfig.load({})
+        )
+        self.calls = 0
+        self._rng = random.Random(self.config.seed)  # noqa: S311
+        self._lock = threading.Lock()
+
+    @override
+    def reset(self) -> None:
+        self.calls = 0
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        self.model = self.model_name = model
+
+    def _delay(self) -> float:
+        with self._lock:
+            self.calls += 1
+            return self.config.latency(current_stage.get()).sample(self._rng)
+
+    def _text(
+        self, prompt: str, response_mime_type: str | None, response_schema: Any | None
+    ) -> str:
+        if isinstance(response_schema, type) and issubclass(response_schema, Enum):
+            return self.config.semantic_route
+        if response_mime_type == "application/json" and response_schema is not None:
+            fields = get_type_hints(response_schema)
+            response = {
+                "classification": self.config.classification,
+                "improved_query": prompt_query(prompt),
+                "reason": "",
+            }
+            return json.dumps({k: v for k, v in response.items() if k in fields})
+        if current_stage.get() == "query_improvement":
+            return prompt_query(prompt)
+        words = prompt_words(prompt) or ["answer"]
+        return " ".join(words[i % len(words)] for i in range(self.config.answer_words))
+
+    def _response(
+        self, prompt: str, response_mime_type: str | None, response_schema: Any | None
+    ) -> ModelResponse:
+        text = self._text(prompt, response_mime_type, response_schema)
+        # Roughly 4 characters per token, like the history token estimates.
+        usage = TokenUsage(
+            prompt_tokens=len(prompt) // 4 + 1, output_tokens=len(text) // 4 + 1
+        )
+        record_usage(self.model_name, usage)
+        return ModelResponse(
+            text=text,
+            raw_response=None,
+            metadata={"model": self.model_name, "usage": usage.as_dict()},
+        )
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        time.sleep(self._delay())
+        return self._response(prompt, response_mime_type, response_schema)
+
+    @override
+    async def generate_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        await asyncio.sleep(self._delay())
+        return self._response(prompt, response_mime_type, response_schema)
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        return self.generate(msg)
+
+    @override
+    async def send_message_async(self, msg: str) -> ModelResponse:
+        return await self.generate_async(msg)
+
+
+def prompt_query(prompt: str) -> str:
+    """The user query of a routing prompt, which ends with the user input."""
+    line = prompt.strip().splitlines()[-1] if prompt.strip() else ""
+    for marker in ("User query:", "Input:"):
+        line = line.split(marker, 1)[-1]
+    return line.strip().strip('"') or "What is Flare?"
+
+
+@lru_cache(maxsize=65536)
+def _word_vector(word: str, dimensions: int) -> npt.NDArray[np.float32]:
+    rng = np.random.default_rng(zlib.crc32(word.encode()))
+    return rng.standard_normal(dimensions).astype(np.float32)
+
+
+def text_vector(text: str, dimensions: int) -> list[float]:
+    """
+    Deterministic embedding of a text: the normalized sum of fixed random vectors
+    of its words, so that texts sharing words get similar vectors.
+    """
+    vector = np.zeros(dimensions, dtype=np.float32)
+    for word in prompt_words(text):
+        vector += _word_vector(word, dimensions)
+    norm = float(np.linalg.norm(vector))
+    if norm:
+        vector /= norm
+    return vector.tolist()
+
+
+class FakeDenseEmbedding(GeminiDenseEmbedding):
+    """
+    Dense embedding client standing in for GeminiDenseEmbedding.
+
+    Vectors are computed with `text_vector`.
+    """
+
+    def __init__(self, dimensions: int = 768, latency: float = 0.0) -> None:
+        """
+        Initialize the client.
+
+        Args:
+            dimensions: Size of the vectors (the collection's vector size)
+            latency: Simulated latency of query embeddings (seconds)
+        """
+        self.dimensions = dimensions
+        self.latency = latency
+
+    @override
+    def embed_content(
+        self,
+        embedding_model: str,
+        contents: str,
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> list[float]:
+        return text_vector(contents, self.dimensions)
+
+    @override
+    async def embed_content_async(
+        self,
+        embedding_model: str,
+        contents: str,
+        task_type: EmbeddingTaskType,
+        title: str | None = None,
+    ) -> list[float]:
+        await asyncio.sleep(self.latency)
+        return text_vector(contents, self.dimensions)
+
+
+class FakeSparseEmbedding(ModelSparseEmbedding):
+    """
+    Sparse embedding client standing in for ModelSparseEmbedding.
+
+    Words are hashed into indices and weighted by their frequency in the text;
+    the collection's IDF modifier does the rest, like BM25.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the client (no model is loaded)."""
+
+    @override
+    def embed_content(self, contents: str) -> "SparseEmbedding":
+        from fastembed import SparseEmbedding
+
+        counts: dict[int, float] = {}
+        for word in prompt_words(contents):
+            index = zlib.crc32(word.encode()) & 0xFFFFF
+            counts[index] = counts.get(index, 0.0) + 1.0
+        return SparseEmbedding(
+            values=np.array(list(counts.values()), dtype=np.float32),
+            indices=np.array(list(counts.keys()), dtype=np.int64),
+        )
@@ -0,0 +1,287 @@
+"""
+Import-time profile of the package's entry points, with a regression budget.
+
+Usage:
+    python -m flare_ai_rag.loadtest.importtime
+    python -m flare_ai_rag.loadtest.importtime flare_ai_rag.main --repeats 10
+    python -m flare_ai_rag.loadtest.importtime --budget budgets.json --json out.json
+
+Each module is imported in a fresh interpreter with `python -X importtime`, and
+the cumulative import time of the module is compared with its budget. Budgets
+also list dependencies the module must not import: importing a subpackage should
+not load google.generativeai, fastembed (onnxruntime), qdrant-client or pandas
+(see `flare_ai_rag.lazy`), and the command line tools should only load what they
+use. The forbidden-module checks are exact and do not depend on the machine; the
+time budgets are generous and catch large regressions, e.g. an eager import of
+qdrant-client. The command exits with status 1 if a budget is exceeded.
+
+A budget file maps modules to budgets, replacing the defaults:
+
+    {"flare_ai_rag.main": {"max_ms": 6000, "forbidden": ["OpenSSL"]}}
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+HEAVY_DEPENDENCIES = (
+    "google.generativeai",
+    "fastembed",
+    "onnxruntime",
+    "qdrant_client",
+    "pandas",
+    "cryptography",
+    "OpenSSL",
+    "bs4",
+    "requests",
+)
+
+# Budgets of the entry points: roughly twice the times measured on a developer
+# machine, so that only regressions, not noise, fail the check.
+DEFAULT_BUDGETS: dict[str, dict[str, Any]] = {
+    "flare_ai_rag.settings": {"max_ms": 600},
+    "flare_ai_rag.metrics": {
+        "max_ms": 700,
+        "forbidden": [*HEAVY_DEPENDENCIES, "httpx"],
+    },
+    **{
+        f"flare_ai_rag.{package}": {"max_ms": 300}
+        for package in (
+            "ai",
+            "attestation",
+            "evaluation",
+            "responder",
+            "retriever",
+            "router",
+            "session",
+        )
+    },
+    # The API routers are FastAPI routers.
+    "flare_ai_rag.api": {"max_ms": 1000},
+    "flare_ai_rag.ai.gemini": {
+        "max_ms": 2000,
+        "forbidden": ["fastembed", "onnxruntime", "qdrant_client", "pandas"],
+    },
+    "flare_ai_rag.loadtest.replay": {"max_ms": 1500},
+    "flare_ai_rag.loadtest.standin": {
+        "max_ms": 2500,
+        "forbidden": ["fastembed", "onnxruntime", "qdrant_client", "pandas", "bs4"],
+    },
+    "flare_ai_rag.main": {"max_ms": 6000, "forbidden": ["OpenSSL"]},
+}
+
+
+@dataclass(frozen=True)
+class ImportBudget:
+    """
+    Import budget of a module.
+
+    Attributes:
+        module: Module imported
+        max_ms: Maximum cumulative import time (ms)
+        forbidden: Modules (and their submodules) the import must not load
+    """
+
+    module: str
+    max_ms: float
+    forbidden: tuple[str, ...] = HEAVY_DEPENDENCIES
+
+    @staticmethod
+    def load(module: str, budget: dict[str, Any]) -> "ImportBudget":
+        return ImportBudget(
+            module=module,
+            max_ms=budget.get("max_ms", 1000.0),
+            forbidden=tuple(budget.get("forbidden", HEAVY_DEPENDENCIES)),
+        )
+
+
+@dataclass(frozen=True)
+class ImportProfile:
+    """
+    Import times of a module.
+
+    Attributes:
+        module: Module imported
+        runs_ms: Cumulative import time of the module in each run (ms)
+        imported: Cumulative import time of every module it loaded in the last
+            run, not counting the interpreter's startup (ms)
+    """
+
+    module: str
+    runs_ms: list[float]
+    imported: dict[str, float]
+
+    @property
+    def median_ms(self) -> float:
+        return statistics.median(self.runs_ms)
+
+    def loads(self, module: str) -> bool:
+        """Whether the import loads a module or one of its submodules."""
+        return any(
+            name == module or name.startswith(f"{module}.") for name in self.imported
+        )
+
+    def heaviest(self, n: int = 3) -> list[tuple[str, float]]:
+        """The third-party packages taking the longest to import."""
+        packages = [
+            (name, duration)
+            for name, duration in self.imported.items()
+            if "." not in name
+            and name != "flare_ai_rag"
+            and name not in sys.stdlib_module_names
+        ]
+        return sorted(packages, key=lambda package: -package[1])[:n]
+
+
+def parse_importtime(output: str) -> dict[str, float]:
+    """
+    Parse `python -X importtime` output.
+
+    Returns:
+        dict[str, float]: Cumulative import time of each module (ms)
+    """
+    imported = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        try:
+            imported[name.strip()] = int(cumulative) / 1000
+        except ValueError:
+            continue  # header
+    return imported
+
+
+def profile_import(
+    module: str, repeats: int = 5, python: str = sys.executable
+) -> ImportProfile:
+    """
+    Import a module in fresh interpreters and record its import times.
+
+    A first, unrecorded run warms the bytecode and file system caches.
+
+    Args:
+        module: Module to import
+        repeats: Number of recorded runs
+        python: Interpreter to run
+
+    Returns:
+        ImportProfile: Import times of the module
+
+    Raises:
+        RuntimeError: If the module cannot be imported
+    """
+    startup = _importtime(python, "pass")
+    runs_ms: list[float] = []
+    imported: dict[str, float] = {}
+    for run in range(repeats + 1):
+        imported = _importtime(python, f"import {module}")
+        if run:
+            runs_ms.append(imported.get(module, 0.0))
+    return ImportProfile(
+        module=module,
+        runs_ms=runs_ms,
+        imported={
+            name: duration for name, duration in imported.items() if name not in startup
+        },
+    )
+
+
+def _importtime(python: str, command: str) -> dict[str, float]:
+    result = subprocess.run(  # noqa: S603
+        [python, "-X", "importtime", "-c", command],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        msg = f"{command!r} failed:\n{result.stderr[-2000:]}"
+        raise RuntimeError(msg)
+    return parse_importtime(result.stderr)
+
+
+def check_budget(profile: ImportProfile, budget: ImportBudget) -> list[str]:
+    """The ways a profile exceeds its budget (empty if within budget)."""
+    violations = [
+        f"{profile.module} imports {module}"
+        for module in budget.forbidden
+        if profile.loads(module)
+    ]
+    if profile.median_ms > budget.max_ms:
+        violations.append(
+            f"{profile.module} takes {profile.median_ms:.0f} ms to import "
+            f"(budget: {budget.max_ms:.0f} ms)"
+        )
+    return violations
+
+
+def format_table(results: list[tuple[ImportProfile, ImportBudget]]) -> str:
+    """The profiles as a plain-text table."""
+    lines = [f"{'module':34}{'median ms':>11}{'budget ms':>11}  heaviest imports"]
+    for profile, budget in results:
+        heaviest = ", ".join(
+            f"{name} {duration:.0f}" for name, duration in profile.heaviest()
+        )
+        lines.append(
+            f"{profile.module:34}{profile.median_ms:>11.0f}{budget.max_ms:>11.0f}"
+            f"  {heaviest or '-'}"
+        )
+    return "\n".join(lines)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m flare_ai_rag.loadtest.importtime",
+        description="Import-time profile of the package's entry points.",
+    )
+    parser.add_argument(
+        "modules", nargs="*", help="modules profiled (default: all budgeted)"
+    )
+    parser.add_argument("--budget", type=Path, help="JSON budget file")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    budgets = json.loads(args.budget.read_text()) if args.budget else DEFAULT_BUDGETS
+    results = []
+    for module in args.modules or list(budgets):
+        budget = ImportBudget.load(module, budgets.get(module, {}))
+        results.append((profile_import(module, args.repeats), budget))
+    violations = [
+        violation
+        for profile, budget in results
+        for violation in check_budget(profile, budget)
+    ]
+
+    print(format_table(results))  # noqa: T201
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                {
+                    profile.module: {
+                        "median_ms": round(profile.median_ms, 1),
+                        "runs_ms": profile.runs_ms,
+                        "max_ms": budget.max_ms,
+                        "violations": check_budget(profile, budget),
+                    }
+                    for profile, budget in results
+                },
+                indent=2,
+            )
+        )
+    if violations:
+        print("\nbudget exceeded:", *violations, sep="\n  ")  # noqa: T201
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,325 @@
+"""
+Replay of captured chat traffic against a running server.
+
+Usage:
+    python -m flare_ai_rag.loadtest.replay capture.jsonl --url http://localhost:8080
+    python -m flare_ai_rag.loadtest.replay capture.jsonl --speed 4
+    python -m flare_ai_rag.loadtest.replay capture.jsonl --concurrency 32
+
+Captures are written by the traffic capture middleware (see
+`flare_ai_rag.api.middleware.capture`). By default, requests are sent on the
+captured schedule, compressed by --speed, which reproduces the arrival pattern
+(bursts, idle periods) of the captured load. With --concurrency, the schedule is
+ignored and a fixed number of clients send requests back to back, which measures
+the server's capacity for the captured mix of messages.
+
+Either way, the turns of a captured session are sent in order within one new
+session: a turn waits until the previous turn of its session has been answered.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import httpx
+
+from flare_ai_rag.loadtest.runner import CHAT_PATH, percentiles
+
+
+@dataclass(frozen=True)
+class CapturedRequest:
+    """
+    A captured chat request.
+
+    Attributes:
+        timestamp: Arrival time (UNIX timestamp)
+        message: Anonymized message
+        session: Hash of the captured session ID, None if unknown
+        route: Semantic route the request took when captured
+    """
+
+    timestamp: float
+    message: str
+    session: str | None = None
+    route: str | None = None
+
+
+def load_capture(path: Path, limit: int = 0) -> list[CapturedRequest]:
+    """
+    Load a capture, in arrival order.
+
+    Args:
+        path: JSONL capture written by the traffic capture middleware
+        limit: Number of requests loaded (0 for all)
+
+    Returns:
+        list[CapturedRequest]: The captured requests, sorted by timestamp
+
+    Raises:
+        ValueError: If a line is not a valid capture record
+    """
+    captured = []
+    with path.open(encoding="utf-8") as f:
+        for number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                captured.append(
+                    CapturedRequest(
+                        timestamp=float(record["timestamp"]),
+                        message=str(record["message"]),
+                        session=record.get("session"),
+                        route=record.get("route"),
+                    )
+                )
+            except (ValueError, KeyError, TypeError) as e:
+                msg = f"{path}:{number}: invalid capture record ({e})"
+                raise ValueError(msg) from e
+    captured.sort(key=lambda request: request.timestamp)
+    return captured[:limit] if limit else captured
+
+
+@dataclass
+class ReplayReport:
+    """
+    Results of a replay.
+
+    Attributes:
+        mode: "speed=<factor>" or "concurrency=<clients>"
+        requests: Number of requests sent
+        duration: Wall-clock duration of the replay (seconds)
+        statuses: Number of responses by HTTP status ("error" for transport errors)
+        latency: End-to-end latency percentiles (ms)
+        routes: Latency percentiles by captured route (ms), with request counts
+        schedule_lag: How late requests were sent relative to the scaled
+            schedule (ms); a growing lag means the replayer could not keep up
+    """
+
+    mode: str
+    requests: int
+    duration: float
+    statuses: dict[str, int]
+    latency: dict[str, float]
+    routes: dict[str, dict[str, float]] = field(default_factory=dict)
+    schedule_lag: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second."""
+        return self.statuses.get("200", 0) / self.duration if self.duration else 0.0
+
+    @property
+    def error_rate(self) -> float:
+        """Fraction of requests not answered with 200."""
+        errors = sum(n for status, n in self.statuses.items() if status != "200")
+        return errors / self.requests if self.requests else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "mode": self.mode,
+            "requests": self.requests,
+            "duration_s": round(self.duration, 3),
+            "throughput_rps": round(self.throughput, 2),
+            "error_rate": round(self.error_rate, 4),
+            "statuses": self.statuses,
+            "latency_ms": self.latency,
+            "routes_ms": self.routes,
+            "schedule_lag_ms": self.schedule_lag,
+        }
+
+    def format(self) -> str:
+        """The report as a plain-text table."""
+        lines = [
+            (
+                f"replay ({self.mode})  requests: {self.requests}  "
+                f"duration: {self.duration:.2f}s  "
+                f"throughput: {self.throughput:.1f} req/s  "
+                f"error rate: {self.error_rate:.2%}"
+            ),
+            f"statuses: {dict(sorted(self.statuses.items()))}",
+            "",
+            f"{'':28}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        ]
+        rows = [
+            ("request (end to end)", {"count": self.requests, **self.latency}),
+            *((f"route {name}", row) for name, row in sorted(self.routes.items())),
+        ]
+        if self.schedule_lag:
+            rows.append(("schedule lag", {"count": 0, **self.schedule_lag}))
+        for name, row in rows:
+            count = str(int(row["count"])) if row["count"] else ""
+            quantiles = "".join(
+                f"{row[q]:>10.1f}" for q in ("p50", "p95", "p99", "max")
+            )
+            lines.append(f"{name:28}{count:>8}{quantiles}")
+        return "\n".join(lines)
+
+
+class _Replay:
+    """State of one replay: sessions issued by the server and measurements."""
+
+    def __init__(self, http: httpx.AsyncClient) -> None:
+        self.http = http
+        # Session hash -> session ID issued by the server, and its last turn sent
+        self.sessions: dict[str, str] = {}
+        self.previous_turns: dict[str, asyncio.Future[None]] = {}
+        self.latencies: list[float] = []
+        self.route_latencies: dict[str, list[float]] = defaultdict(list)
+        self.lags: list[float] = []
+        self.statuses: dict[str, int] = defaultdict(int)
+
+    async def send(self, request: CapturedRequest) -> None:
+        """Send a request once the previous turn of its session is answered."""
+        session = request.session
+        if session is None:
+            await self._post(request, None)
+            return
+        previous = self.previous_turns.get(session)
+        turn = asyncio.get_running_loop().create_future()
+        self.previous_turns[session] = turn
+        try:
+            if previous is not None:
+                await previous
+            await self._post(request, session)
+        finally:
+            turn.set_result(None)
+
+    async def _post(self, request: CapturedRequest, session: str | None) -> None:
+        body: dict[str, Any] = {"message": request.message}
+        if session in self.sessions:
+            body["session_id"] = self.sessions[session]
+        started = time.perf_counter()
+        try:
+            response = await self.http.post(CHAT_PATH, json=body)
+        except httpx.HTTPError:
+            self.statuses["error"] += 1
+            return
+        latency = time.perf_counter() - started
+        self.latencies.append(latency)
+        self.route_latencies[request.route or "unknown"].append(latency)
+        self.statuses[str(response.status_code)] += 1
+        if session is not None and response.status_code == 200:  # noqa: PLR2004
+            self.sessions[session] = response.json().get("session_id")
+
+    async def scheduled(self, request: CapturedRequest, due: float) -> None:
+        """Send a request at its due time (a `time.perf_counter` value)."""
+        await asyncio.sleep(max(due - time.perf_counter(), 0.0))
+        self.lags.append(max(time.perf_counter() - due, 0.0))
+        await self.send(request)
+
+    async def client(self, pending: "asyncio.Queue[CapturedRequest]") -> None:
+        """Send pending requests back to back."""
+        while not pending.empty():
+            await self.send(pending.get_nowait())
+
+
+async def replay(  # noqa: PLR0913
+    captured: list[CapturedRequest],
+    base_url: str,
+    *,
+    speed: float = 1.0,
+    concurrency: int = 0,
+    request_timeout: float = 120.0,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> ReplayReport:
+    """
+    Replay captured requests against a server.
+
+    Args:
+        captured: Requests to replay, in arrival order (see `load_capture`)
+        base_url: Base URL of the server, e.g. "http://localhost:8080"
+        speed: Factor the captured schedule is compressed by (2 sends twice as
+            fast); ignored if `concurrency` is set
+        concurrency: Number of clients sending requests back to back, ignoring
+            the schedule (0 to follow the schedule)
+        request_timeout: Timeout of a single request (seconds)
+        transport: Transport of the HTTP client (e.g. `httpx.ASGITransport` to
+            replay against an in-process application)
+
+    Returns:
+        ReplayReport: Throughput, error rate and latency percentiles of the replay
+    """
+    started = time.perf_counter()
+    async with httpx.AsyncClient(
+        base_url=base_url,
+        timeout=request_timeout,
+        transport=transport,
+        limits=httpx.Limits(max_connections=None, max_keepalive_connections=100),
+    ) as http:
+        run = _Replay(http)
+        if concurrency > 0:
+            pending: asyncio.Queue[CapturedRequest] = asyncio.Queue()
+            for request in captured:
+                pending.put_nowait(request)
+            await asyncio.gather(*(run.client(pending) for _ in range(concurrency)))
+        elif captured:
+            start = captured[0].timestamp
+            await asyncio.gather(
+                *(
+                    run.scheduled(
+                        request, started + (request.timestamp - start) / speed
+                    )
+                    for request in captured
+                )
+            )
+    duration = time.perf_counter() - started
+
+    return ReplayReport(
+        mode=f"concurrency={concurrency}" if concurrency > 0 else f"speed={speed:g}",
+        requests=len(captured),
+        duration=duration,
+        statuses=dict(run.statuses),
+        latency=percentiles(run.latencies),
+        routes={
+            route: {"count": len(values), **percentiles(values)}
+            for route, values in run.route_latencies.items()
+        },
+        schedule_lag=percentiles(run.lags) if run.lags else {},
+    )
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m flare_ai_rag.loadtest.replay",
+        description="Replay of captured chat traffic against a running server.",
+    )
+    parser.add_argument("capture", type=Path, help="JSONL capture")
+    parser.add_argument("--url", default="http://localhost:8080")
+    parser.add_argument("--speed", type=float, default=1.0, help="e.g. 2 for 2x")
+    parser.add_argument(
+        "--concurrency", type=int, default=0, help="ignore the schedule"
+    )
+    parser.add_argument("--limit", type=int, default=0, help="0 replays all")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", type=Path, help="also write the report here")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    if args.speed <= 0:
+        sys.exit("--speed must be positive")
+    captured = load_capture(args.capture, args.limit)
+    report = asyncio.run(
+        replay(
+            captured,
+            args.url,
+            speed=args.speed,
+            concurrency=args.concurrency,
+            request_timeout=args.timeout,
+        )
+    )
+    print(report.format())  # noqa: T201
+    if args.json:
+        args.json.write_text(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
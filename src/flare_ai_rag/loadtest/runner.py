@@ -0,0 +1,228 @@
+"""
+Concurrent load generation against the chat application.
+
+Requests are sent in-process through httpx's ASGI transport, so the application
+runs on the benchmark's event loop: the measured event-loop lag is the lag the
+pipeline itself causes, without network or server noise. Per-stage durations
+are taken from the request traces (see `flare_ai_rag.tracing`), which record
+every stage of every request exactly.
+"""
+
+import asyncio
+import itertools
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any
+
+import httpx
+import numpy as np
+from fastapi import FastAPI
+
+from flare_ai_rag.tracing import Span, set_exporter
+
+CHAT_PATH = "/api/routes/chat/"
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """p50, p95, p99 and max of a sample, in milliseconds."""
+    if not values:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p95, p99 = np.percentile(values, [50, 95, 99])
+    return {
+        "p50": round(float(p50) * 1000, 2),
+        "p95": round(float(p95) * 1000, 2),
+        "p99": round(float(p99) * 1000, 2),
+        "max": round(max(values) * 1000, 2),
+    }
+
+
+class LoopLagMonitor:
+    """
+    Measures event-loop lag: how late a periodic timer fires.
+
+    A loop blocked by synchronous work (e.g. CPU-bound embedding or a blocking
+    SDK call) delays every other request; the lag samples show by how much.
+    """
+
+    def __init__(self, interval: float = 0.01) -> None:
+        self.interval = interval
+        self.samples: list[float] = []
+        self._task: asyncio.Task[None] | None = None
+
+    async def _run(self) -> None:
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(time.perf_counter() - expected, 0.0))
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class StageRecorder:
+    """Span exporter collecting the durations of pipeline stages by name."""
+
+    def __init__(self) -> None:
+        self.durations: dict[str, list[float]] = defaultdict(list)
+
+    def export(self, root: Span) -> None:
+        for span in root.walk():
+            if span is not root and span.duration is not None:
+                self.durations[span.name].append(span.duration)
+
+    def shutdown(self) -> None:
+        """Nothing to flush: durations are kept in memory."""
+
+
+@dataclass
+class LoadTestReport:
+    """
+    Results of a load test.
+
+    Attributes:
+        requests: Number of requests sent
+        concurrency: Number of concurrent clients
+        duration: Wall-clock duration of the run (seconds)
+        statuses: Number of responses by HTTP status ("error" for transport errors)
+        latency: End-to-end latency percentiles (ms)
+        stages: Duration percentiles by pipeline stage (ms), with call counts
+        loop_lag: Event-loop lag percentiles (ms)
+    """
+
+    requests: int
+    concurrency: int
+    duration: float
+    statuses: dict[str, int]
+    latency: dict[str, float]
+    stages: dict[str, dict[str, float]] = field(default_factory=dict)
+    loop_lag: dict[str, float] = field(default_factory=dict)
+
+    @property
+    def throughput(self) -> float:
+        """Successful requests per second."""
+        return self.statuses.get("200", 0) / self.duration if self.duration else 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "concurrency": self.concurrency,
+            "duration_s": round(self.duration, 3),
+            "throughput_rps": round(self.throughput, 2),
+            "statuses": self.statuses,
+            "latency_ms": self.latency,
+            "stages_ms": self.stages,
+            "loop_lag_ms": self.loop_lag,
+        }
+
+    def format(self) -> str:
+        """The report as a plain-text table."""
+        lines = [
+            (
+                f"requests: {self.requests}  concurrency: {self.concurrency}  "
+                f"duration: {self.duration:.2f}s  "
+                f"throughput: {self.throughput:.1f} req/s"
+            ),
+            f"statuses: {dict(sorted(self.statuses.items()))}",
+            "",
+            f"{'':28}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}",
+        ]
+        rows = [
+            ("request (end to end)", {"count": self.requests, **self.latency}),
+            *sorted(self.stages.items()),
+            ("event loop lag", {"count": 0, **self.loop_lag}),
+        ]
+        for name, row in rows:
+            count = str(int(row["count"])) if row["count"] else ""
+            quantiles = "".join(
+                f"{row[q]:>10.1f}" for q in ("p50", "p95", "p99", "max")
+            )
+            lines.append(f"{name:28}{count:>8}{quantiles}")
+        return "\n".join(lines)
+
+
+async def run_load(  # noqa: PLR0913
+    app: FastAPI,
+    queries: list[str],
+    *,
+    requests: int = 200,
+    concurrency: int = 16,
+    turns_per_session: int = 3,
+    request_timeout: float = 120.0,
+) -> LoadTestReport:
+    """
+    Drive concurrent chat load against an application.
+
+    Each of the `concurrency` clients sends messages back to back, continuing its
+    session for `turns_per_session` messages before starting a new one, so that
+    history rendering and summarization are exercised as well.
+
+    Args:
+        app: Application to load (e.g. from `build_benchmark_app`)
+        queries: Messages to send, cycled through in order
+        requests: Total number of requests
+        concurrency: Number of concurrent clients
+        turns_per_session: Messages sent per session
+        request_timeout: Timeout of a single request (seconds)
+
+    Returns:
+        LoadTestReport: Throughput and latency percentiles of the run
+    """
+    recorder = StageRecorder()
+    set_exporter(recorder)
+    monitor = LoopLagMonitor()
+    messages = itertools.cycle(queries)
+    remaining = itertools.count()
+    latencies: list[float] = []
+    statuses: dict[str, int] = defaultdict(int)
+
+    async def client(http: httpx.AsyncClient) -> None:
+        session_id, turns = None, 0
+        while next(remaining) < requests:
+            body: dict[str, Any] = {"message": next(messages)}
+            if session_id is not None and turns < turns_per_session:
+                body["session_id"] = session_id
+            else:
+                turns = 0
+            started = time.perf_counter()
+            try:
+                response = await http.post(CHAT_PATH, json=body)
+            except httpx.HTTPError:
+                statuses["error"] += 1
+                continue
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] += 1
+            if response.status_code == 200:  # noqa: PLR2004
+                session_id = response.json().get("session_id")
+                turns += 1
+
+    transport = httpx.ASGITransport(app=app)
+    started = time.perf_counter()
+    monitor.start()
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://benchmark", timeout=request_timeout
+        ) as http:
+            await asyncio.gather(*(client(http) for _ in range(concurrency)))
+    finally:
+        await monitor.stop()
+        set_exporter(None)
+    duration = time.perf_counter() - started
+
+    return LoadTestReport(
+        requests=requests,
+        concurrency=concurrency,
+        duration=duration,
+        statuses=dict(statuses),
+        latency=percentiles(latencies),
+        stages={
+            name: {"count": len(durations), **percentiles(durations)}
+            for name, durations in recorder.durations.items()
+        },
+        loop_lag=percentiles(monitor.samples),
+    )
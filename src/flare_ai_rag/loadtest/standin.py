@@ -0,0 +1,491 @@
+"""
+Local stand-in for the Gemini and OpenRouter APIs, for hermetic load tests.
+
+Usage:
+    python -m flare_ai_rag.loadtest.standin --port 8900 --config standin.json
+
+Then point the application at it (any API key is accepted):
+    GEMINI_BASE_URL=http://localhost:8900
+    OPEN_ROUTER_BASE_URL=http://localhost:8900/api/v1
+
+The server implements the subset of the APIs the application uses:
+
+- Gemini REST: models/{model}:generateContent, :streamGenerateContent (JSON
+  array, or server-sent events with alt=sse), :embedContent and
+  :batchEmbedContents, under /v1beta and /v1
+- OpenRouter: /api/v1/chat/completions, streamed if "stream" is set
+
+Responses are well-formed for the application's prompts: enum and JSON response
+schemas are answered with a configured semantic route and classification,
+free-text prompts with words of the prompt. Embeddings are deterministic (see
+`flare_ai_rag.loadtest.fakes.text_vector`). Each response waits for a sampled
+time to first token, then generates tokens at a configured throughput; a
+configured fraction of requests fail with injected errors (e.g. 429, 503) in the
+provider's error format. Token counts are estimated at 4 characters per token,
+like the history token estimates.
+
+The config file is a JSON object loaded with `StandinConfig.load`, e.g.
+{"latency": {"median_ms": 400, "sigma": 0.3}, "tokens_per_second": 80,
+ "error_rate": 0.02, "error_statuses": [429, 503]}
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import uvicorn
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse, Response, StreamingResponse
+
+from flare_ai_rag.loadtest.fakes import (
+    LatencyDistribution,
+    prompt_query,
+    prompt_words,
+    text_vector,
+)
+from flare_ai_rag.utils import load_json
+
+# Gemini error statuses by HTTP status
+_GEMINI_STATUSES = {
+    400: "INVALID_ARGUMENT",
+    429: "RESOURCE_EXHAUSTED",
+    500: "INTERNAL",
+    503: "UNAVAILABLE",
+    504: "DEADLINE_EXCEEDED",
+}
+# Words per streamed chunk
+_CHUNK_WORDS = 8
+_ENUM_OPTIONS = re.compile(r"Respond with exactly one of: (.+)\s*$")
+
+
+@dataclass(frozen=True)
+class StandinConfig:
+    """
+    Behaviour of the stand-in server.
+
+    Attributes:
+        latency: Time to first token of generation requests
+        embedding_latency: Latency of embedding requests
+        tokens_per_second: Output throughput of generation (0 for instant)
+        error_rate: Fraction of requests failed with an injected error
+        error_statuses: HTTP statuses of injected errors, picked uniformly
+        semantic_route: Value returned for enum schemas, if allowed
+        classification: Classification returned for JSON schemas, if allowed
+        answer_tokens: Length of free-text answers, in words
+        embedding_dimensions: Size of the embedding vectors
+        seed: Seed of the latency and error samples
+    """
+
+    latency: LatencyDistribution = field(
+        default_factory=lambda: LatencyDistribution(0.3, 0.3)
+    )
+    embedding_latency: LatencyDistribution = field(
+        default_factory=lambda: LatencyDistribution(0.02, 0.2)
+    )
+    tokens_per_second: float = 150.0
+    error_rate: float = 0.0
+    error_statuses: tuple[int, ...] = (429, 500, 503)
+    semantic_route: str = "RagRouter"
+    classification: str = "ANSWER"
+    answer_tokens: int = 120
+    embedding_dimensions: int = 768
+    seed: int = 0
+
+    @staticmethod
+    def load(standin_config: dict[str, Any]) -> "StandinConfig":
+        return StandinConfig(
+            latency=LatencyDistribution.load(
+                standin_config.get("latency", {"median_ms": 300, "sigma": 0.3})
+            ),
+            embedding_latency=LatencyDistribution.load(
+                standin_config.get("embedding_latency", {"median_ms": 20, "sigma": 0.2})
+            ),
+            tokens_per_second=standin_config.get("tokens_per_second", 150.0),
+            error_rate=standin_config.get("error_rate", 0.0),
+            error_statuses=tuple(standin_config.get("error_statuses", [429, 500, 503])),
+            semantic_route=standin_config.get("semantic_route", "RagRouter"),
+            classification=standin_config.get("classification", "ANSWER"),
+            answer_tokens=standin_config.get("answer_tokens", 120),
+            embedding_dimensions=standin_config.get("embedding_dimensions", 768),
+            seed=standin_config.get("seed", 0),
+        )
+
+
+def _tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _pick(options: list[str], preferred: str) -> str:
+    """The preferred value if allowed (case-insensitively), else the first."""
+    for option in options:
+        if option.lower() == preferred.lower():
+            return option
+    return options[0] if options else preferred
+
+
+class StandinModel:
+    """Generates the stand-in's responses, latencies and injected errors."""
+
+    def __init__(self, config: StandinConfig) -> None:
+        self.config = config
+        self.requests: dict[str, int] = {}
+        self.errors: dict[str, int] = {}
+        self._rng = random.Random(config.seed)  # noqa: S311
+
+    def count(self, endpoint: str) -> int | None:
+        """Count a request, and return the status of its injected error, if any."""
+        self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+        if self.config.error_statuses and self._rng.random() < self.config.error_rate:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+            return self._rng.choice(self.config.error_statuses)
+        return None
+
+    def first_token_delay(self) -> float:
+        return self.config.latency.sample(self._rng)
+
+    def embedding_delay(self) -> float:
+        return self.config.embedding_latency.sample(self._rng)
+
+    def token_delay(self, tokens: int) -> float:
+        """Time to generate a number of tokens at the configured throughput."""
+        if self.config.tokens_per_second <= 0:
+            return 0.0
+        return tokens / self.config.tokens_per_second
+
+    def answer(self, prompt: str) -> str:
+        words = prompt_words(prompt) or ["answer"]
+        return " ".join(words[i % len(words)] for i in range(self.config.answer_tokens))
+
+    def structured(self, prompt: str, schema: dict[str, Any]) -> str:
+        """A JSON object with a value for each property of a response schema."""
+        response: dict[str, Any] = {}
+        for name, prop in (schema.get("properties") or {}).items():
+            if prop.get("enum"):
+                preferred = (
+                    self.config.classification
+                    if name == "classification"
+                    else self.config.semantic_route
+                )
+                response[name] = _pick(prop["enum"], preferred)
+            elif name == "classification":
+                response[name] = self.config.classification
+            elif "query" in name:
+                response[name] = prompt_query(prompt)
+            else:
+                response[name] = ""
+        return json.dumps(response)
+
+    def gemini_text(self, prompt: str, generation_config: dict[str, Any]) -> str:
+        mime_type = generation_config.get("responseMimeType") or generation_config.get(
+            "response_mime_type"
+        )
+        schema = (
+            generation_config.get("responseSchema")
+            or generation_config.get("response_schema")
+            or {}
+        )
+        if mime_type == "text/x.enum":
+            return _pick(list(schema.get("enum") or []), self.config.semantic_route)
+        if mime_type == "application/json":
+            return self.structured(prompt, schema)
+        return self.answer(prompt)
+
+    def openrouter_text(self, prompt: str, payload: dict[str, Any]) -> str:
+        options = _ENUM_OPTIONS.search(prompt)
+        if options:
+            values = [value.strip() for value in options.group(1).split(",")]
+            return _pick(values, self.config.semantic_route)
+        if (payload.get("response_format") or {}).get("type") == "json_object":
+            return json.dumps(
+                {
+                    "classification": self.config.classification,
+                    "improved_query": prompt_query(prompt),
+                    "reason": "",
+                }
+            )
+        return self.answer(prompt)
+
+
+def _chunks(text: str) -> list[str]:
+    words = text.split(" ")
+    return [
+        " ".join(words[i : i + _CHUNK_WORDS])
+        + (" " if i + _CHUNK_WORDS < len(words) else "")
+        for i in range(0, len(words), _CHUNK_WORDS)
+    ] or [""]
+
+
+def _gemini_prompt(body: dict[str, Any]) -> tuple[str, str]:
+    """The text of the contents and of the system instruction of a request."""
+
+    def text(content: dict[str, Any] | None) -> str:
+        parts = (content or {}).get("parts") or []
+        return "\n".join(str(part.get("text", "")) for part in parts)
+
+    contents = body.get("contents") or []
+    prompt = "\n".join(text(content) for content in contents)
+    system = text(body.get("systemInstruction") or body.get("system_instruction"))
+    return prompt, system
+
+
+def _gemini_response(
+    text: str, prompt_tokens: int, output_tokens: int, model: str, *, done: bool
+) -> dict[str, Any]:
+    candidate: dict[str, Any] = {
+        "content": {"parts": [{"text": text}], "role": "model"},
+        "index": 0,
+    }
+    if done:
+        candidate["finishReason"] = "STOP"
+    return {
+        "candidates": [candidate],
+        "usageMetadata": {
+            "promptTokenCount": prompt_tokens,
+            "candidatesTokenCount": output_tokens,
+            "totalTokenCount": prompt_tokens + output_tokens,
+        },
+        "modelVersion": model,
+    }
+
+
+def _gemini_error(status: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={
+            "error": {
+                "code": status,
+                "message": "Injected error of the stand-in server.",
+                "status": _GEMINI_STATUSES.get(status, "UNKNOWN"),
+            }
+        },
+        headers={"Retry-After": "1"} if status == 429 else None,  # noqa: PLR2004
+    )
+
+
+def _openrouter_error(status: int) -> JSONResponse:
+    return JSONResponse(
+        status_code=status,
+        content={
+            "error": {
+                "code": status,
+                "message": "Injected error of the stand-in server.",
+            }
+        },
+        headers={"Retry-After": "1"} if status == 429 else None,  # noqa: PLR2004
+    )
+
+
+async def _generate(
+    model: StandinModel, target: str, body: dict[str, Any], *, sse: bool
+) -> Response:
+    """Answer a generateContent or streamGenerateContent request."""
+    model_name, _, method = target.partition(":")
+    error = model.count(method)
+    prompt, system = _gemini_prompt(body)
+    prompt_tokens = _tokens(system) + _tokens(prompt)
+    text = model.gemini_text(prompt, body.get("generationConfig") or {})
+    await asyncio.sleep(model.first_token_delay())
+    if error is not None:
+        return _gemini_error(error)
+
+    if method == "generateContent":
+        await asyncio.sleep(model.token_delay(len(text.split())))
+        return JSONResponse(
+            _gemini_response(text, prompt_tokens, _tokens(text), model_name, done=True)
+        )
+
+    chunks = _chunks(text)
+
+    async def stream() -> AsyncIterator[str]:
+        output_tokens = 0
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(model.token_delay(len(chunk.split())))
+            output_tokens += _tokens(chunk)
+            response = json.dumps(
+                _gemini_response(
+                    chunk,
+                    prompt_tokens,
+                    output_tokens,
+                    model_name,
+                    done=i == len(chunks) - 1,
+                )
+            )
+            if sse:
+                yield f"data: {response}\r\n\r\n"
+            else:
+                yield ("[" if i == 0 else ",\r\n") + response
+        if not sse:
+            yield "]"
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream" if sse else "application/json"
+    )
+
+
+async def _embed(model: StandinModel, method: str, body: dict[str, Any]) -> Response:
+    """Answer an embedContent or batchEmbedContents request."""
+    error = model.count(method)
+    await asyncio.sleep(model.embedding_delay())
+    if error is not None:
+        return _gemini_error(error)
+
+    def values(request: dict[str, Any]) -> list[float]:
+        text = "\n".join(
+            str(part.get("text", ""))
+            for part in (request.get("content") or {}).get("parts") or []
+        )
+        return text_vector(
+            text,
+            request.get("outputDimensionality") or model.config.embedding_dimensions,
+        )
+
+    if method == "batchEmbedContents":
+        requests = body.get("requests") or []
+        return JSONResponse(
+            {"embeddings": [{"values": values(request)} for request in requests]}
+        )
+    return JSONResponse({"embedding": {"values": values(body)}})
+
+
+async def _chat_completion(model: StandinModel, payload: dict[str, Any]) -> Response:
+    """Answer an OpenRouter chat completion request."""
+    error = model.count("chat/completions")
+    messages = payload.get("messages") or []
+    prompt = "\n".join(
+        str(message.get("content", ""))
+        for message in messages
+        if message.get("role") != "system"
+    )
+    prompt_tokens = sum(
+        _tokens(str(message.get("content", ""))) for message in messages
+    )
+    text = model.openrouter_text(prompt, payload)
+    await asyncio.sleep(model.first_token_delay())
+    if error is not None:
+        return _openrouter_error(error)
+
+    completion: dict[str, Any] = {
+        "id": f"gen-standin-{model.requests['chat/completions']}",
+        "created": int(time.time()),
+        "model": payload.get("model", "standin"),
+    }
+    usage = {
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": _tokens(text),
+        "total_tokens": prompt_tokens + _tokens(text),
+    }
+    if not payload.get("stream"):
+        await asyncio.sleep(model.token_delay(len(text.split())))
+        return JSONResponse(
+            {
+                **completion,
+                "object": "chat.completion",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": {"role": "assistant", "content": text},
+                        "finish_reason": "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        )
+
+    chunks = _chunks(text)
+
+    async def stream() -> AsyncIterator[str]:
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(model.token_delay(len(chunk.split())))
+            last = i == len(chunks) - 1
+            event: dict[str, Any] = {
+                **completion,
+                "object": "chat.completion.chunk",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"role": "assistant", "content": chunk},
+                        "finish_reason": "stop" if last else None,
+                    }
+                ],
+            }
+            if last:
+                event["usage"] = usage
+            yield f"data: {json.dumps(event)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+def create_standin_app(config: StandinConfig) -> FastAPI:
+    """
+    Create the stand-in server.
+
+    Args:
+        config: Latencies, throughput, errors and responses of the server
+
+    Returns:
+        FastAPI: The application; GET /stats reports requests and injected
+            errors by endpoint
+    """
+    app = FastAPI(title="Gemini/OpenRouter stand-in", redirect_slashes=False)
+    model = StandinModel(config)
+    app.state.model = model
+
+    # Gemini REST API, e.g. /v1beta/models/gemini-2.0-flash:generateContent
+    @app.post("/v1beta/models/{target}")
+    @app.post("/v1/models/{target}")
+    async def models(  # pyright: ignore [reportUnusedFunction]
+        target: str, request: Request
+    ) -> Response:
+        body = await request.json()
+        method = target.partition(":")[2]
+        if method in ("generateContent", "streamGenerateContent"):
+            sse = request.query_params.get("alt") == "sse"
+            return await _generate(model, target, body, sse=sse)
+        if method in ("embedContent", "batchEmbedContents"):
+            return await _embed(model, method, body)
+        raise HTTPException(status_code=404, detail=f"Unsupported method '{method}'")
+
+    @app.post("/api/v1/chat/completions")
+    async def chat_completions(  # pyright: ignore [reportUnusedFunction]
+        request: Request,
+    ) -> Response:
+        return await _chat_completion(model, await request.json())
+
+    @app.get("/stats")
+    async def stats() -> dict[str, dict[str, int]]:  # pyright: ignore [reportUnusedFunction]
+        return {"requests": model.requests, "errors": model.errors}
+
+    return app
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m flare_ai_rag.loadtest.standin",
+        description="Local stand-in for the Gemini and OpenRouter APIs.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--config", type=Path, help="JSON file")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    config = StandinConfig.load(load_json(args.config) if args.config else {})
+    uvicorn.run(
+        create_standin_app(config), host=args.host, port=args.port, log_level="warning"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,382 @@
+"""
+Benchmark of attestation token validation, with a local test issuer.
+
+Usage:
+    python -m flare_ai_rag.loadtest.tokens
+    python -m flare_ai_rag.loadtest.tokens --tokens 20000 --workers 8 --json out.json
+
+A test issuer generates a CA chain (root, intermediate and leaf certificates) for
+PKI tokens and a JWKS for OIDC tokens, and serves its well-known documents on a
+local port, so that validation runs as against Confidential Space without
+network access. The same tokens are then validated one at a time with
+`VtpmValidation.validate_token` and as a batch with `validate_tokens`, in the
+calling thread and on thread and process pools. Keys and chains are cached
+before the timed runs, which measure the steady state: token parsing and
+signature checks.
+"""
+
+import argparse
+import base64
+import contextlib
+import datetime as dt
+import json
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from collections.abc import Callable, Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, override
+
+import jwt
+import structlog
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+from flare_ai_rag.attestation import VtpmValidation
+
+OIDC_ENDPOINT = "/.well-known/openid-configuration"
+JWKS_ENDPOINT = "/jwks"
+PKI_ENDPOINT = "/.well-known/confidential_space_root.crt"
+
+
+def _private_key() -> rsa.RSAPrivateKey:
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def _certificate(  # noqa: PLR0913
+    subject: str,
+    issuer: str,
+    public_key: rsa.RSAPublicKey,
+    signing_key: rsa.RSAPrivateKey,
+    days: int,
+    *,
+    ca: bool,
+) -> x509.Certificate:
+    now = dt.datetime.now(tz=dt.UTC)
+    builder = (
+        x509.CertificateBuilder()
+        .subject_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, subject)]))
+        .issuer_name(x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, issuer)]))
+        .public_key(public_key)
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - dt.timedelta(days=1))
+        .not_valid_after(now + dt.timedelta(days=days))
+        .add_extension(x509.BasicConstraints(ca=ca, path_length=None), critical=True)
+    )
+    if ca:
+        builder = builder.add_extension(
+            x509.KeyUsage(
+                digital_signature=True,
+                content_commitment=False,
+                key_encipherment=False,
+                data_encipherment=False,
+                key_agreement=False,
+                key_cert_sign=True,
+                crl_sign=True,
+                encipher_only=False,
+                decipher_only=False,
+            ),
+            critical=True,
+        )
+    return builder.sign(signing_key, hashes.SHA256())
+
+
+def _base64url_uint(value: int) -> str:
+    data = value.to_bytes((value.bit_length() + 7) // 8, "big")
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+class TestIssuer:
+    """
+    Issuer of PKI and OIDC test tokens, with its own CA and keys.
+
+    Attributes:
+        requests: Number of requests served, by path
+    """
+
+    def __init__(self, oidc_keys: int = 2) -> None:
+        """
+        Generate the issuer's CA chain and OIDC keys.
+
+        Args:
+            oidc_keys: Number of OIDC signing keys (key IDs) in the JWKS
+        """
+        root_key, intermediate_key = _private_key(), _private_key()
+        self.leaf_key = _private_key()
+        self.root = _certificate(
+            "Test Root", "Test Root", root_key.public_key(), root_key, 365, ca=True
+        )
+        intermediate = _certificate(
+            "Test Intermediate",
+            "Test Root",
+            intermediate_key.public_key(),
+            root_key,
+            180,
+            ca=True,
+        )
+        leaf = _certificate(
+            "Test Leaf",
+            "Test Intermediate",
+            self.leaf_key.public_key(),
+            intermediate_key,
+            30,
+            ca=False,
+        )
+        self.x5c = [
+            base64.b64encode(cert.public_bytes(serialization.Encoding.DER)).decode()
+            for cert in (leaf, intermediate, self.root)
+        ]
+        self.oidc_keys = {f"test-key-{i}": _private_key() for i in range(oidc_keys)}
+        self.requests: Counter[str] = Counter()
+
+    @property
+    def root_fingerprint(self) -> str:
+        """SHA-1 fingerprint of the root certificate, as VtpmValidation pins it."""
+        fingerprint = self.root.fingerprint(hashes.SHA1())  # noqa: S303
+        return ":".join(format(b, "02x") for b in fingerprint).upper()
+
+    def pki_token(self, claims: dict[str, Any]) -> str:
+        """A token signed by the leaf certificate, with the x5c chain."""
+        return jwt.encode(
+            claims, self.leaf_key, algorithm="RS256", headers={"x5c": self.x5c}
+        )
+
+    def oidc_token(self, claims: dict[str, Any], kid: str) -> str:
+        """A token signed by an OIDC key."""
+        return jwt.encode(
+            claims, self.oidc_keys[kid], algorithm="RS256", headers={"kid": kid}
+        )
+
+    def documents(self, base_url: str) -> dict[str, bytes]:
+        """The issuer's well-known documents, by path."""
+        jwks = {
+            "keys": [
+                {
+                    "kty": "RSA",
+                    "alg": "RS256",
+                    "use": "sig",
+                    "kid": kid,
+                    "n": _base64url_uint(key.public_key().public_numbers().n),
+                    "e": _base64url_uint(key.public_key().public_numbers().e),
+                }
+                for kid, key in self.oidc_keys.items()
+            ]
+        }
+        return {
+            OIDC_ENDPOINT: json.dumps({"jwks_uri": base_url + JWKS_ENDPOINT}).encode(),
+            JWKS_ENDPOINT: json.dumps(jwks).encode(),
+            PKI_ENDPOINT: self.root.public_bytes(serialization.Encoding.PEM),
+        }
+
+    @contextlib.contextmanager
+    def serve(
+        self, cache_control: str = "public, max-age=3600", delay: float = 0.0
+    ) -> Iterator[str]:
+        """
+        Serve the well-known documents on a local port; yields the base URL.
+
+        Args:
+            cache_control: Cache-Control header of the responses
+            delay: Time to wait before each response (seconds)
+        """
+        documents: dict[str, bytes] = {}
+        served = self.requests
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:  # noqa: N802
+                served[self.path] += 1
+                time.sleep(delay)
+                body = documents.get(self.path)
+                if body is None:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Cache-Control", cache_control)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            @override
+            def log_message(self, format: str, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        base_url = f"http://127.0.0.1:{server.server_address[1]}"
+        documents.update(self.documents(base_url))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield base_url
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+@dataclass(frozen=True)
+class TokenBenchmarkResult:
+    """
+    Throughput of one way of validating the tokens.
+
+    Attributes:
+        mode: How the tokens were validated
+        tokens: Number of tokens validated
+        invalid: Number of tokens that failed validation (0 expected)
+        seconds: Wall-clock time of the validation
+    """
+
+    mode: str
+    tokens: int
+    invalid: int
+    seconds: float
+
+    @property
+    def tokens_per_second(self) -> float:
+        return self.tokens / self.seconds if self.seconds else 0.0
+
+
+def make_tokens(issuer: TestIssuer, count: int, oidc_share: float) -> list[str]:
+    """Unique test tokens, a share of them OIDC (round-robin over the keys)."""
+    expiry = int(time.time()) + 3600
+    kids = list(issuer.oidc_keys)
+    oidc_every = round(1 / oidc_share) if oidc_share else 0
+    tokens = []
+    for i in range(count):
+        claims = {"iss": "test-issuer", "sub": f"workload-{i}", "exp": expiry}
+        if oidc_every and i % oidc_every == 0:
+            tokens.append(issuer.oidc_token(claims, kids[i % len(kids)]))
+        else:
+            tokens.append(issuer.pki_token(claims))
+    return tokens
+
+
+def _timed(
+    mode: str, tokens: list[str], validate: Callable[[list[str]], list[Any]]
+) -> TokenBenchmarkResult:
+    started = time.perf_counter()
+    results = validate(tokens)
+    seconds = time.perf_counter() - started
+    invalid = sum(isinstance(result, Exception) for result in results)
+    return TokenBenchmarkResult(mode, len(tokens), invalid, seconds)
+
+
+def _one_at_a_time(validator: VtpmValidation, tokens: list[str]) -> list[Any]:
+    results: list[Any] = []
+    for token in tokens:
+        try:
+            results.append(validator.validate_token(token))
+        except Exception as e:  # noqa: BLE001
+            results.append(e)
+    return results
+
+
+def run_token_benchmark(
+    tokens: int = 5000,
+    workers: int | None = None,
+    oidc_share: float = 0.5,
+    chunk_size: int = 256,
+) -> list[TokenBenchmarkResult]:
+    """
+    Validate test tokens in each mode, and measure the throughput.
+
+    Args:
+        tokens: Number of tokens validated in each mode
+        workers: Threads or processes of the pools (default: one per core)
+        oidc_share: Share of OIDC tokens, the others being PKI tokens
+        chunk_size: Tokens per task of `validate_tokens`
+
+    Returns:
+        list[TokenBenchmarkResult]: Throughput of each mode
+    """
+    workers = workers or os.cpu_count() or 1
+    issuer = TestIssuer()
+    batch = make_tokens(issuer, tokens, oidc_share)
+
+    def batched(executor: Executor | None) -> Callable[[list[str]], list[Any]]:
+        return lambda batch: validator.validate_tokens(batch, executor, chunk_size)
+
+    with issuer.serve() as base_url:
+        validator = VtpmValidation(
+            expected_issuer=base_url, root_fingerprint=issuer.root_fingerprint
+        )
+        # Fetch the keys and verify the chain, then measure the steady state.
+        validator.validate_tokens(batch[:chunk_size])
+        results = [
+            _timed(
+                "validate_token",
+                batch,
+                lambda batch: _one_at_a_time(validator, batch),
+            ),
+            _timed("validate_tokens", batch, batched(None)),
+        ]
+        with ThreadPoolExecutor(workers) as threads:
+            results.append(
+                _timed(f"validate_tokens, {workers} threads", batch, batched(threads))
+            )
+        # Worker processes are started before the timed run.
+        with ProcessPoolExecutor(
+            workers, mp_context=multiprocessing.get_context("forkserver")
+        ) as processes:
+            validator.validate_tokens(batch[: chunk_size * workers], processes)
+            results.append(
+                _timed(
+                    f"validate_tokens, {workers} processes", batch, batched(processes)
+                )
+            )
+    return results
+
+
+def format_results(results: list[TokenBenchmarkResult]) -> str:
+    """The results as a plain-text table."""
+    lines = [f"{'mode':36}{'tokens':>8}{'invalid':>9}{'seconds':>9}{'tokens/s':>10}"]
+    lines.extend(
+        f"{result.mode:36}{result.tokens:>8}{result.invalid:>9}"
+        f"{result.seconds:>9.2f}{result.tokens_per_second:>10.0f}"
+        for result in results
+    )
+    return "\n".join(lines)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="python -m flare_ai_rag.loadtest.tokens",
+        description="Benchmark of attestation token validation.",
+    )
+    parser.add_argument("--tokens", type=int, default=5000)
+    parser.add_argument("--workers", type=int, help="default: one per core")
+    parser.add_argument("--oidc-share", type=float, default=0.5)
+    parser.add_argument("--chunk-size", type=int, default=256)
+    parser.add_argument("--json", type=Path, help="also write the results here")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = _parse_args()
+    structlog.configure(
+        wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING)
+    )
+    results = run_token_benchmark(
+        args.tokens, args.workers, args.oidc_share, args.chunk_size
+    )
+    print(format_results(results))  # noqa: T201
+    if args.json:
+        args.json.write_text(
+            json.dumps(
+                [
+                    {**asdict(result), "tokens_per_second": result.tokens_per_second}
+                    for result in results
+                ],
+                indent=2,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,22 @@ RAG Knowledge API Main Application Module
 This module initializes and configures the FastAPI application for the RAG backend.
 It sets up CORS middleware, loads configuration and data, and wires together the
 Gemini-based Router, Retriever, and Responder components into a chat endpoint.
+
+With `settings.server_workers` other than 1, the application is served by several
+pre-forked worker processes (see `flare_ai_rag.prefork`): the read-only resources
+(configuration, local embedding models, exemplar embeddings) are loaded once by
+`load_resources` before the fork, and each worker creates its own clients and
+per-worker state in `create_app`.
 """
 
+import os
+import secrets
+import tempfile
+from collections.abc import AsyncIterator
+from contextlib import ExitStack, asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+
 import pandas as pd
 import structlog
 import uvicorn
@@ -13,27 +27,117 @@ from fastapi import APIRouter, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from qdrant_client import QdrantClient
 
-from flare_ai_rag.ai import GeminiDenseEmbedding, GeminiProvider, ModelSparseEmbedding
-from flare_ai_rag.api import ChatRouter
+from flare_ai_rag.ai import (
+    BaseAIProvider,
+    GeminiContextCacheBackend,
+    GeminiDenseEmbedding,
+    GeminiProvider,
+    ModelDenseEmbedding,
+    ModelSparseEmbedding,
+    OpenRouterProvider,
+    ProviderPool,
+    ProviderPoolConfig,
+)
+from flare_ai_rag.api import AdmissionController, ChatRouter, metrics_router
+from flare_ai_rag.api.middleware import CaptureMiddleware, TrafficCapture
 from flare_ai_rag.attestation import Vtpm
+from flare_ai_rag.concurrency import shutdown_executor
+from flare_ai_rag.metrics import SQLiteSpendLedger, UsageConfig, usage_meter
+from flare_ai_rag.prefork import PreforkServer, default_workers
 from flare_ai_rag.prompts import PromptService
 from flare_ai_rag.responder import GeminiResponder, ResponderConfig
 from flare_ai_rag.retriever import QdrantRetriever, RetrieverConfig, generate_collection
 from flare_ai_rag.router import (
     BaseQueryRouter,
+    GeminiFusedRouter,
     GeminiRouter,
+    LocalSemanticRouter,
     QueryImprovementRouter,
     RouterConfig,
+    SemanticRouterConfig,
+)
+from flare_ai_rag.session import (
+    HistoryConfig,
+    HistoryManager,
+    SessionStore,
+    SQLiteSessionBackend,
 )
 from flare_ai_rag.settings import settings
+from flare_ai_rag.tracing import OTLPExporter, set_exporter, shutdown_tracing
 from flare_ai_rag.utils import load_json
 
 logger = structlog.get_logger(__name__)
 
 
-def setup_router(
-    input_config: dict, router_model: type[BaseQueryRouter]
-) -> tuple[GeminiProvider, BaseQueryRouter]:
+@dataclass(frozen=True)
+class SharedResources:
+    """
+    Read-only resources of the application, shared by the server's workers.
+
+    Attributes:
+        input_config: Pipeline configuration (input_parameters.json)
+        sparse_embedding_client: Local sparse embedding model of the retriever
+        local_router: Local semantic router (with its embedding model), if enabled
+        prompts: Prompt library
+        session_db_path: Session database; empty for in-memory sessions
+        shared_sessions: Whether several workers share the session database
+    """
+
+    input_config: dict
+    sparse_embedding_client: ModelSparseEmbedding
+    local_router: LocalSemanticRouter | None
+    prompts: PromptService
+    session_db_path: str
+    shared_sessions: bool
+
+
+def setup_context_cache(
+    provider: GeminiProvider, prefixes: list[str] | None = None
+) -> None:
+    """Enable Gemini context caching for a provider, if configured."""
+    if not settings.gemini_context_cache:
+        return
+    provider.enable_context_cache(
+        GeminiContextCacheBackend(),
+        prefixes=prefixes,
+        ttl_seconds=settings.gemini_context_cache_ttl_seconds,
+        min_tokens=settings.gemini_context_cache_min_tokens,
+    )
+
+
+def setup_provider_pool(
+    input_config: dict, name: str, gemini_provider: GeminiProvider
+) -> BaseAIProvider:
+    """Pool a Gemini provider with an OpenRouter fallback, if configured."""
+    pool_config = ProviderPoolConfig.load(input_config.get("provider_pool", {}))
+    if not pool_config.enabled:
+        return gemini_provider
+    if not settings.open_router_api_key:
+        logger.warning("Provider pool is enabled, but no OpenRouter API key is set.")
+        return gemini_provider
+
+    openrouter_provider = OpenRouterProvider(
+        api_key=settings.open_router_api_key,
+        model=pool_config.openrouter_model,
+        system_instruction=gemini_provider.system_instruction,
+        base_url=settings.open_router_base_url,
+    )
+    logger.info(
+        "Provider pool has been set up.",
+        pool=name,
+        openrouter_model=pool_config.openrouter_model,
+        hedging=pool_config.hedging,
+    )
+    return ProviderPool(
+        name,
+        [("gemini", gemini_provider), ("openrouter", openrouter_provider)],
+        pool_config,
+    )
+
+
+def setup_router[R: BaseQueryRouter](
+    input_config: dict, router_model: type[R]
+) -> tuple[BaseAIProvider, R]:
     """Initialize a Gemini Provider for routing."""
     # Setup router config
     router_model_config = input_config["router_model"]
@@ -44,26 +148,35 @@ def setup_router(
     gemini_provider = GeminiProvider(
         api_key=settings.gemini_api_key, model=router_config.model.model_id
     )
-    gemini_router = router_model(client=gemini_provider, config=router_config)
+    setup_context_cache(gemini_provider, PromptService().get_static_prefixes())
+    provider = setup_provider_pool(input_config, "router", gemini_provider)
+    gemini_router = router_model(client=provider, config=router_config)
 
-    return gemini_provider, gemini_router
+    return provider, gemini_router
 
 
-def setup_retriever(
+def setup_local_router(input_config: dict) -> LocalSemanticRouter | None:
+    """Initialize the local embedding-based semantic router, if enabled."""
+    if "semantic_router" not in input_config:
+        return None
+    semantic_router_config = SemanticRouterConfig.load(input_config["semantic_router"])
+    if not semantic_router_config.enabled:
+        return None
+
+    embedding_client = ModelDenseEmbedding(semantic_router_config.embedding_model)
+    return LocalSemanticRouter(embedding_client, semantic_router_config)
+
+
+def setup_collection(
     qdrant_client: QdrantClient,
     input_config: dict,
     df_docs: pd.DataFrame,
-) -> QdrantRetriever:
-    """Initialize the Qdrant retriever."""
-    # Set up Qdrant config
+    sparse_embedding_client: ModelSparseEmbedding,
+    transport: str | None = None,
+) -> None:
+    """(Re)generate the Qdrant collection of the RAG data."""
     retriever_config = RetrieverConfig.load(input_config["retriever_config"])
-
-    # Set up Gemini Embedding client
-    dense_embedding_client = GeminiDenseEmbedding(settings.gemini_api_key)
-    sparse_embedding_client = ModelSparseEmbedding(
-        retriever_config.sparse_embedding_model
-    )
-    # (Re)generate qdrant collection
+    dense_embedding_client = GeminiDenseEmbedding(settings.gemini_api_key, transport)
     generate_collection(
         df_docs,
         qdrant_client,
@@ -75,7 +188,19 @@ def setup_retriever(
         "The Qdrant collection has been generated.",
         collection_name=retriever_config.collection_name,
     )
-    # Return retriever
+
+
+def setup_retriever(
+    qdrant_client: QdrantClient,
+    input_config: dict,
+    sparse_embedding_client: ModelSparseEmbedding,
+) -> QdrantRetriever:
+    """Initialize the Qdrant retriever."""
+    # Set up Qdrant config
+    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
+
+    # Set up Gemini Embedding client
+    dense_embedding_client = GeminiDenseEmbedding(settings.gemini_api_key)
     return QdrantRetriever(
         client=qdrant_client,
         retriever_config=retriever_config,
@@ -106,25 +231,99 @@ def setup_responder(input_config: dict) -> GeminiResponder:
         model=responder_config.model.model_id,
         system_instruction=responder_config.system_prompt,
     )
-    return GeminiResponder(client=gemini_provider, responder_config=responder_config)
+    setup_context_cache(gemini_provider)
+    provider = setup_provider_pool(input_config, "responder", gemini_provider)
+    return GeminiResponder(client=provider, responder_config=responder_config)
 
 
-def create_app() -> FastAPI:
+def setup_sessions(db_path: str | None = None, *, shared: bool = False) -> SessionStore:
     """
-    Create and configure the FastAPI application instance.
+    Initialize the chat session store, persisted if a database path is set.
 
-    This function:
-      1. Creates a new FastAPI instance with optional CORS middleware.
-      2. Loads configuration.
-      3. Sets up the Gemini Router, Qdrant Retriever, and Gemini Responder.
-      4. Loads RAG data and (re)generates the Qdrant collection.
-      5. Initializes a ChatRouter that wraps the RAG pipeline.
-      6. Registers the chat endpoint under the /chat prefix.
+    Args:
+        db_path (str | None): Session database (default: settings.session_db_path)
+        shared (bool): Whether other workers share the database
+    """
+    db_path = settings.session_db_path if db_path is None else db_path
+    backend = SQLiteSessionBackend(Path(db_path)) if db_path else None
+    logger.info(
+        "Session store has been set up.",
+        persisted=backend is not None,
+        shared=shared,
+        max_sessions=settings.session_max_sessions,
+    )
+    return SessionStore(
+        max_sessions=settings.session_max_sessions,
+        ttl_seconds=settings.session_ttl_seconds,
+        max_memory_bytes=settings.session_max_memory_bytes,
+        backend=backend,
+        shared=shared,
+    )
+
+
+def setup_history(
+    input_config: dict,
+    summarizer: BaseAIProvider,
+    local_router: LocalSemanticRouter | None,
+) -> HistoryManager:
+    """Initialize the conversation history manager."""
+    history_config = HistoryConfig.load(input_config.get("history", {}))
+    # Relevance selection reuses the local semantic router's embedding model.
+    embedding_client = local_router.embedding_client if local_router else None
+    if history_config.relevant_turns and embedding_client is None:
+        logger.warning("History relevance selection needs the local semantic router.")
+    return HistoryManager(
+        history_config, summarizer=summarizer, embedding_client=embedding_client
+    )
+
+
+def setup_tracing() -> None:
+    """Export request traces to an OTLP collector, if an endpoint is set."""
+    if not settings.otlp_endpoint:
+        return
+    set_exporter(
+        OTLPExporter(settings.otlp_endpoint, sample_rate=settings.otlp_sample_rate)
+    )
+    logger.info("Trace export has been set up.", endpoint=settings.otlp_endpoint)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Release the session store, spend ledger, attestation client, traffic
+    capture, trace exporter and executor on shutdown.
+    """
+    yield
+    app.state.sessions.close()
+    usage_meter.close()
+    await app.state.attestation.aclose()
+    if app.state.capture is not None:
+        app.state.capture.shutdown()
+    shutdown_tracing()
+    shutdown_executor()
+
+
+def build_app(chat_router: ChatRouter) -> FastAPI:
+    """
+    Create the FastAPI application serving a chat router.
+
+    Registers the chat endpoint under /api/routes/chat and the Prometheus
+    metrics endpoint under /metrics, with optional CORS middleware and traffic
+    capture (see `flare_ai_rag.api.middleware.capture`). Used by
+    `create_app` and by the offline benchmark (see `flare_ai_rag.loadtest`).
+
+    Args:
+        chat_router (ChatRouter): Chat router wrapping the RAG pipeline
 
     Returns:
-        FastAPI: The configured FastAPI application instance.
+        FastAPI: The application instance
     """
-    app = FastAPI(title="RAG Knowledge API", version="1.0", redirect_slashes=False)
+    app = FastAPI(
+        title="RAG Knowledge API",
+        version="1.0",
+        redirect_slashes=False,
+        lifespan=lifespan,
+    )
 
     # Optional: configure CORS middleware using settings.
     app.add_middleware(
@@ -135,6 +334,45 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # Optional: capture chat traffic for replay.
+    app.state.capture = None
+    if settings.capture_path:
+        app.state.capture = TrafficCapture(
+            Path(settings.capture_path),
+            sample_rate=settings.capture_sample_rate,
+            salt=settings.capture_salt,
+        )
+        app.add_middleware(CaptureMiddleware, capture=app.state.capture)
+
+    app.state.sessions = chat_router.sessions
+    app.state.attestation = chat_router.attestation
+    app.include_router(chat_router.router, prefix="/api/routes/chat", tags=["chat"])
+    app.include_router(metrics_router, tags=["metrics"])
+    return app
+
+
+def load_resources(
+    workers: int = 1, session_db_path: str | None = None
+) -> SharedResources:
+    """
+    Load the application's read-only resources.
+
+    This function:
+      1. Loads configuration.
+      2. Loads RAG data and (re)generates the Qdrant collection.
+      3. Loads the local embedding models (retriever, semantic router).
+      4. Chooses the session database: with several workers, sessions are
+         shared through it.
+
+    Args:
+        workers (int): Number of worker processes the resources are shared by;
+            with several, the process forks and must not use gRPC
+        session_db_path (str | None): Session database (default:
+            settings.session_db_path); required with several workers
+
+    Returns:
+        SharedResources: The loaded resources
+    """
     # Load input configuration.
     input_config = load_json(settings.input_path / "input_parameters.json")
 
@@ -143,6 +381,69 @@ def create_app() -> FastAPI:
     print(df_docs)
     logger.info("Loaded CSV Data.", num_rows=len(df_docs))
 
+    # (Re)generate the Qdrant collection with a client of its own.
+    retriever_config = RetrieverConfig.load(input_config["retriever_config"])
+    sparse_embedding_client = ModelSparseEmbedding(
+        retriever_config.sparse_embedding_model
+    )
+    qdrant_client = setup_qdrant(input_config)
+    setup_collection(
+        qdrant_client,
+        input_config,
+        df_docs,
+        sparse_embedding_client,
+        transport="rest" if workers > 1 else None,
+    )
+    qdrant_client.close()
+
+    if session_db_path is None:
+        session_db_path = settings.session_db_path
+    if workers > 1 and not session_db_path:
+        msg = "Workers share sessions through a database: set a session_db_path."
+        raise ValueError(msg)
+    return SharedResources(
+        input_config=input_config,
+        sparse_embedding_client=sparse_embedding_client,
+        local_router=setup_local_router(input_config),
+        prompts=PromptService(),
+        session_db_path=session_db_path,
+        shared_sessions=workers > 1,
+    )
+
+
+def create_app(resources: SharedResources | None = None) -> FastAPI:
+    """
+    Create and configure the FastAPI application instance.
+
+    This function:
+      1. Loads the read-only resources, unless given (see `load_resources`).
+      2. Sets up the Gemini Router, Qdrant Retriever, and Gemini Responder.
+      3. Sets up the per-client session store and history manager.
+      4. Initializes a ChatRouter that wraps the RAG pipeline.
+      5. Builds the application around it (see `build_app`).
+
+    Args:
+        resources (SharedResources | None): Resources loaded before forking
+            the server's workers
+
+    Returns:
+        FastAPI: The configured FastAPI application instance.
+    """
+    # Export request traces, if configured.
+    setup_tracing()
+
+    if resources is None:
+        resources = load_resources()
+    input_config = resources.input_config
+
+    # Price model calls and watch the daily budget, shared by the workers.
+    usage_meter.configure(
+        UsageConfig.load(input_config.get("usage", {})),
+        ledger=SQLiteSpendLedger(Path(resources.session_db_path))
+        if resources.shared_sessions
+        else None,
+    )
+
     # Set up the RAG components: 1a. Gemini Provider
     base_ai, gemini_router = setup_router(input_config, GeminiRouter)
 
@@ -151,15 +452,31 @@ def create_app() -> FastAPI:
         input_config, QueryImprovementRouter
     )
 
+    # 1c. Fused Query Improvement + Classification Router (single call)
+    fused_router = None
+    if RouterConfig.load(input_config["router_model"]).fused_query_routing:
+        _, fused_router = setup_router(input_config, GeminiFusedRouter)
+
+    # 1d. Local Semantic Router (embedding fast path)
+    local_router = resources.local_router
+
     # 2a. Set up Qdrant client.
     qdrant_client = setup_qdrant(input_config)
 
     # 2b. Set up the Retriever.
-    retriever_component = setup_retriever(qdrant_client, input_config, df_docs)
+    retriever_component = setup_retriever(
+        qdrant_client, input_config, resources.sparse_embedding_client
+    )
 
     # 3. Set up the Responder.
     responder_component = setup_responder(input_config)
 
+    # 4. Set up the per-client session store and history manager.
+    sessions = setup_sessions(
+        resources.session_db_path, shared=resources.shared_sessions
+    )
+    history = setup_history(input_config, base_ai, local_router)
+
     # Create an APIRouter for chat endpoints and initialize ChatRouter.
     chat_router = ChatRouter(
         router=APIRouter(),
@@ -168,22 +485,58 @@ def create_app() -> FastAPI:
         query_improvement_router=query_improvement_router,
         retriever=retriever_component,
         responder=responder_component,
-        attestation=Vtpm(simulate=settings.simulate_attestation),
-        prompts=PromptService(),
+        attestation=Vtpm(
+            simulate=settings.simulate_attestation,
+            pool_size=settings.attestation_pool_size,
+            timeout=settings.attestation_timeout_seconds,
+        ),
+        prompts=resources.prompts,
+        fused_router=fused_router,
+        local_router=local_router,
+        sessions=sessions,
+        history=history,
+        admission=AdmissionController(
+            max_in_flight=settings.admission_max_in_flight,
+            max_queue=settings.admission_max_queue,
+            queue_timeout=settings.admission_queue_timeout_seconds,
+        ),
     )
-    app.include_router(chat_router.router, prefix="/api/routes/chat", tags=["chat"])
-
-    return app
-
-
-app = create_app()
+    return build_app(chat_router)
 
 
 def start() -> None:
     """
     Start the FastAPI application server.
+
+    With several workers, each runs the local embedding models on one thread:
+    ONNX Runtime's and the tokenizers' thread pools do not survive a fork, and
+    the workers already use every core. The workers share sessions through the
+    configured session database, or through a temporary one removed when the
+    server stops. Captured traffic is hashed with one salt across the workers,
+    so that a session's turns stay together whichever worker served them.
     """
-    uvicorn.run(app, host="0.0.0.0", port=8080)  # noqa: S104
+    workers = settings.server_workers or default_workers()
+    if workers == 1:
+        uvicorn.run(create_app(), host="0.0.0.0", port=8080)  # noqa: S104
+        return
+
+    settings.embedding_threads = settings.embedding_threads or 1
+    settings.capture_salt = settings.capture_salt or secrets.token_hex(16)
+    os.environ.setdefault("TOKENIZERS_PARALLELISM", "false")
+    with ExitStack() as stack:
+        session_db_path = settings.session_db_path
+        if not session_db_path:
+            temp_dir = stack.enter_context(
+                tempfile.TemporaryDirectory(prefix="flare-ai-rag-")
+            )
+            session_db_path = str(Path(temp_dir) / "sessions.db")
+        PreforkServer(
+            lambda: load_resources(workers, session_db_path),
+            create_app,
+            host="0.0.0.0",  # noqa: S104
+            port=8080,
+            workers=workers,
+        ).run()
 
 
 if __name__ == "__main__":
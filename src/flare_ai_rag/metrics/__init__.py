@@ -0,0 +1,54 @@
+from .exposition import CONTENT_TYPE, render_prometheus
+from .registry import (
+    DEFAULT_BUCKETS,
+    Counter,
+    Gauge,
+    Histogram,
+    HistogramSample,
+    Metric,
+    MetricsRegistry,
+    registry,
+)
+from .stages import current_route, current_stage, track_stage
+from .usage import (
+    TOKEN_BUCKETS,
+    ModelPrice,
+    RequestUsage,
+    SpendLedger,
+    SQLiteSpendLedger,
+    TokenUsage,
+    UsageConfig,
+    UsageMeter,
+    current_request_usage,
+    record_usage,
+    track_request_usage,
+    usage_meter,
+)
+
+__all__ = [
+    "CONTENT_TYPE",
+    "DEFAULT_BUCKETS",
+    "TOKEN_BUCKETS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "HistogramSample",
+    "Metric",
+    "MetricsRegistry",
+    "ModelPrice",
+    "RequestUsage",
+    "SQLiteSpendLedger",
+    "SpendLedger",
+    "TokenUsage",
+    "UsageConfig",
+    "UsageMeter",
+    "current_request_usage",
+    "current_route",
+    "current_stage",
+    "record_usage",
+    "registry",
+    "render_prometheus",
+    "track_request_usage",
+    "track_stage",
+    "usage_meter",
+]
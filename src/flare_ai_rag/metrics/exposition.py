@@ -0,0 +1,73 @@
+"""
+Prometheus text exposition of the metrics registry.
+
+Renders all registered metrics in the Prometheus text format (version 0.0.4), so
+the `/metrics` endpoint can be scraped without the prometheus_client dependency.
+"""
+
+from flare_ai_rag.metrics.registry import Histogram, Metric, MetricsRegistry
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names: tuple[str, ...], values: tuple[str, ...]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(value)}"' for name, value in zip(names, values, strict=True)
+    )
+    return f"{{{pairs}}}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(float(bound))
+
+
+def _render_histogram(metric: Histogram) -> list[str]:
+    lines = []
+    bounds = [*metric.buckets, float("inf")]
+    names = (*metric.labelnames, "le")
+    for values, sample in sorted(metric.samples().items()):
+        cumulative = 0
+        for bound, count in zip(bounds, sample.buckets, strict=True):
+            cumulative += count
+            labels = _labels(names, (*values, _format_bound(bound)))
+            lines.append(f"{metric.name}_bucket{labels} {cumulative}")
+        labels = _labels(metric.labelnames, values)
+        lines.append(f"{metric.name}_sum{labels} {sample.sum!r}")
+        lines.append(f"{metric.name}_count{labels} {sample.count}")
+    return lines
+
+
+def _render(metric: Metric) -> list[str]:
+    lines = [
+        f"# HELP {metric.name} {_escape(metric.description)}",
+        f"# TYPE {metric.name} {metric.kind}",
+    ]
+    if isinstance(metric, Histogram):
+        return lines + _render_histogram(metric)
+    lines.extend(
+        f"{metric.name}{_labels(metric.labelnames, values)} {value!r}"
+        for values, value in sorted(metric.samples().items())
+    )
+    return lines
+
+
+def render_prometheus(metrics_registry: MetricsRegistry) -> str:
+    """
+    Render all metrics of a registry in the Prometheus text format.
+
+    Args:
+        metrics_registry: Registry to render
+
+    Returns:
+        str: The exposition, one sample per line
+    """
+    lines = []
+    for metric in sorted(metrics_registry.metrics(), key=lambda m: m.name):
+        lines.extend(_render(metric))
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,336 @@
+"""
+In-process metrics registry for Flare AI RAG.
+
+This module provides a small, dependency-free set of metric types that pipeline
+components use to record operational counters (e.g. how often speculative
+retrieval was wasted), current levels (gauges) and distributions of observed
+values (histograms). Metrics are identified by name and a fixed set of label
+names; each distinct combination of label values is tracked as its own series.
+
+All metric updates are thread-safe, since they may be recorded both from the
+event loop and from executor threads.
+"""
+
+import bisect
+import threading
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from typing import Final
+
+import structlog
+
+logger = structlog.get_logger(__name__)
+
+type LabelValues = tuple[str, ...]
+
+# Upper bounds (in seconds) suited to request and model call latencies
+DEFAULT_BUCKETS: Final = (
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+class _Metric:
+    """
+    Base of all metric types: name, description and label handling.
+
+    Attributes:
+        name (str): Metric name, e.g. "rag_speculative_retrievals_total"
+        description (str): Human-readable description of the metric
+        labelnames (tuple[str, ...]): Names of the labels partitioning the series
+    """
+
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, description: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        """Order label values by the declared label names."""
+        if set(labels) != set(self.labelnames):
+            msg = f"Metric '{self.name}' expects labels {self.labelnames}"
+            raise ValueError(msg)
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    """A monotonically increasing counter, optionally partitioned by labels."""
+
+    kind = "counter"
+
+    def __init__(
+        self, name: str, description: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increment the counter.
+
+        Args:
+            amount (float): Non-negative amount to add
+            **labels (str): Label values for the series to increment
+
+        Raises:
+            ValueError: If the amount is negative or the labels do not match
+        """
+        if amount < 0:
+            msg = "Counters can only be incremented by non-negative amounts"
+            raise ValueError(msg)
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        """Return the current value of a series (0 if never incremented)."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        """Return a snapshot of all series."""
+        with self._lock:
+            return dict(self._values)
+
+
+class Gauge(_Metric):
+    """A value that can go up and down, e.g. the number of queued requests."""
+
+    kind = "gauge"
+
+    def __init__(
+        self, name: str, description: str, labelnames: tuple[str, ...] = ()
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self._values: dict[LabelValues, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        """Set a series to the given value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        """Add to a series (subtract with a negative amount)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        """Subtract from a series."""
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        """Return the current value of a series (0 if never set)."""
+        key = self._key(labels)
+        with self._lock:
+            return self._values.get(key, 0.0)
+
+    def samples(self) -> dict[LabelValues, float]:
+        """Return a snapshot of all series."""
+        with self._lock:
+            return dict(self._values)
+
+
+@dataclass
+class HistogramSample:
+    """
+    Snapshot of a histogram series.
+
+    Attributes:
+        buckets: Number of observations in each bucket (not cumulative); the
+            last entry counts observations above the largest upper bound
+        sum: Sum of all observed values
+        count: Number of observations
+    """
+
+    buckets: list[int] = field(default_factory=list)
+    sum: float = 0.0
+    count: int = 0
+
+
+class Histogram(_Metric):
+    """
+    Distribution of observed values (e.g. latencies) over fixed buckets.
+
+    Attributes:
+        buckets (tuple[float, ...]): Sorted upper bounds of the buckets
+    """
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        super().__init__(name, description, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: dict[LabelValues, HistogramSample] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        """Record an observation."""
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            sample = self._values.get(key)
+            if sample is None:
+                sample = HistogramSample(buckets=[0] * (len(self.buckets) + 1))
+                self._values[key] = sample
+            sample.buckets[index] += 1
+            sample.sum += value
+            sample.count += 1
+
+    def samples(self) -> dict[LabelValues, HistogramSample]:
+        """Return a snapshot of all series."""
+        with self._lock:
+            return {
+                key: HistogramSample(list(s.buckets), s.sum, s.count)
+                for key, s in self._values.items()
+            }
+
+
+type Metric = Counter | Gauge | Histogram
+
+
+class MetricsRegistry:
+    """
+    Registry holding all metrics of the process, keyed by metric name.
+
+    Metrics are created on first request and shared afterwards, so modules can
+    declare the metrics they use at import time without coordinating.
+    """
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create[M: Metric](
+        self,
+        metric_type: type[M],
+        name: str,
+        labelnames: tuple[str, ...],
+        factory: Callable[[], M],
+    ) -> M:
+        """
+        Return the metric registered under a name, creating it if needed.
+
+        Raises:
+            ValueError: If a metric with the same name but a different type or
+                label names is already registered
+        """
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = factory()
+                self._metrics[name] = metric
+                logger.debug("metric_registered", name=name, type=metric.kind)
+            elif not isinstance(metric, metric_type):
+                msg = f"Metric '{name}' already registered as a {metric.kind}"
+                raise ValueError(msg)
+            elif metric.labelnames != labelnames:
+                msg = f"Metric '{name}' already registered with other labels"
+                raise ValueError(msg)
+            return metric
+
+    def counter(
+        self, name: str, description: str, labelnames: tuple[str, ...] = ()
+    ) -> Counter:
+        """
+        Get or create a counter.
+
+        Args:
+            name (str): Metric name
+            description (str): Human-readable description
+            labelnames (tuple[str, ...]): Label names partitioning the series
+
+        Returns:
+            Counter: The registered counter
+
+        Raises:
+            ValueError: If a metric with the same name but a different type or
+                label names is already registered
+        """
+        return self._get_or_create(
+            Counter, name, labelnames, lambda: Counter(name, description, labelnames)
+        )
+
+    def gauge(
+        self, name: str, description: str, labelnames: tuple[str, ...] = ()
+    ) -> Gauge:
+        """
+        Get or create a gauge.
+
+        Args:
+            name (str): Metric name
+            description (str): Human-readable description
+            labelnames (tuple[str, ...]): Label names partitioning the series
+
+        Returns:
+            Gauge: The registered gauge
+
+        Raises:
+            ValueError: If a metric with the same name but a different type or
+                label names is already registered
+        """
+        return self._get_or_create(
+            Gauge, name, labelnames, lambda: Gauge(name, description, labelnames)
+        )
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        """
+        Get or create a histogram.
+
+        Args:
+            name (str): Metric name
+            description (str): Human-readable description
+            labelnames (tuple[str, ...]): Label names partitioning the series
+            buckets (tuple[float, ...]): Upper bounds of the buckets
+
+        Returns:
+            Histogram: The registered histogram
+
+        Raises:
+            ValueError: If a metric with the same name but a different type or
+                label names is already registered
+        """
+        return self._get_or_create(
+            Histogram,
+            name,
+            labelnames,
+            lambda: Histogram(name, description, labelnames, buckets),
+        )
+
+    def metrics(self) -> list[Metric]:
+        """Return all registered metrics."""
+        with self._lock:
+            return list(self._metrics.values())
+
+
+# Create a global registry instance
+registry = MetricsRegistry()
@@ -0,0 +1,77 @@
+"""
+Per-stage latency tracking for the RAG pipeline.
+
+Each pipeline stage (semantic routing, query improvement, classification, dense
+and sparse embedding, the Qdrant query, response generation) is wrapped in
+`track_stage`, which records its duration in a histogram labelled by stage,
+semantic route, model and outcome, and counts the stage's calls in flight. Each
+stage is also recorded as a span of the request's trace.
+
+The semantic route of the request being processed and the innermost running
+stage are kept in context variables, so stages and model calls deep in the
+pipeline (including those offloaded to the shared executor, which copies the
+context) are labelled without passing them around.
+"""
+
+import asyncio
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from flare_ai_rag.metrics.registry import registry
+from flare_ai_rag.tracing import span
+
+_stage_duration = registry.histogram(
+    "rag_stage_duration_seconds",
+    "Duration of RAG pipeline stages, by stage, semantic route, model and outcome",
+    ("stage", "route", "model", "outcome"),
+)
+_stages_in_flight = registry.gauge(
+    "rag_stage_in_flight",
+    "RAG pipeline stages currently running, by stage",
+    ("stage",),
+)
+
+# Semantic route of the request being processed ("unrouted" before routing).
+current_route: ContextVar[str] = ContextVar("current_route", default="unrouted")
+# Innermost pipeline stage running in the current context.
+current_stage: ContextVar[str] = ContextVar("current_stage", default="unstaged")
+
+
+@contextmanager
+def track_stage(stage: str, model: str = "") -> Iterator[None]:
+    """
+    Time a pipeline stage.
+
+    Works around both blocking code and awaits. The outcome is "success",
+    "error" (an exception escaped the stage) or "cancelled". Attributes added
+    with `flare_ai_rag.tracing.annotate` inside the stage go to its span.
+
+    Args:
+        stage: Stage name, e.g. "query_improvement"
+        model: Model serving the stage, if any
+    """
+    _stages_in_flight.inc(stage=stage)
+    stage_token = current_stage.set(stage)
+    started = time.perf_counter()
+    outcome = "success"
+    try:
+        with span(stage, model=model or None):
+            yield
+    except asyncio.CancelledError:
+        outcome = "cancelled"
+        raise
+    except BaseException:
+        outcome = "error"
+        raise
+    finally:
+        _stage_duration.observe(
+            time.perf_counter() - started,
+            stage=stage,
+            route=current_route.get(),
+            model=model,
+            outcome=outcome,
+        )
+        current_stage.reset(stage_token)
+        _stages_in_flight.dec(stage=stage)
@@ -0,0 +1,402 @@
+"""
+Token and cost accounting for model calls.
+
+Providers normalize the usage reported by their API (Gemini `usage_metadata`,
+OpenRouter `usage`) into a TokenUsage, put it in `ModelResponse.metadata["usage"]`
+and pass it to `record_usage`, which:
+
+- counts tokens and estimated cost by pipeline stage, semantic route and model,
+- adds them to the usage of the request being processed (see
+  `track_request_usage`), which the chat endpoint reports in debug headers and
+  adds to the session's totals,
+- adds the cost to today's spend and logs an alarm when the spend crosses a
+  configured fraction of the daily budget.
+
+Server workers share today's spend through a SpendLedger (a SQLite table next to
+the sessions), so that the budget applies to the server rather than to each
+worker.
+
+Costs are estimated from a per-model price table (USD per million tokens) in the
+"usage" section of the input parameters; models without a price count as free.
+"""
+
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime
+from pathlib import Path
+from typing import Any, Protocol
+
+import structlog
+
+from flare_ai_rag.metrics.registry import registry
+from flare_ai_rag.metrics.stages import current_route, current_stage
+from flare_ai_rag.tracing import annotate
+
+logger = structlog.get_logger(__name__)
+
+# Upper bounds (in tokens) suited to the tokens spent on a single request
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+_tokens = registry.counter(
+    "llm_tokens_total",
+    "Model tokens by stage, semantic route, model and kind (prompt, cached, output)",
+    ("stage", "route", "model", "kind"),
+)
+_cost = registry.counter(
+    "llm_cost_usd_total",
+    "Estimated model cost in USD, by stage, semantic route and model",
+    ("stage", "route", "model"),
+)
+_daily_cost = registry.gauge(
+    "llm_daily_cost_usd", "Estimated model cost in USD since midnight UTC"
+)
+_budget_alarms = registry.counter(
+    "llm_budget_alarms_total",
+    "Daily budget thresholds crossed, by fraction of the budget",
+    ("threshold",),
+)
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """
+    Token counts of one or more model calls.
+
+    Attributes:
+        prompt_tokens: Input tokens, including cached ones
+        output_tokens: Generated tokens
+        cached_tokens: Input tokens served from a context cache
+    """
+
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cached_tokens: int = 0
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.output_tokens
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            prompt_tokens=self.prompt_tokens + other.prompt_tokens,
+            output_tokens=self.output_tokens + other.output_tokens,
+            cached_tokens=self.cached_tokens + other.cached_tokens,
+        )
+
+    def as_dict(self) -> dict[str, int]:
+        """The usage in the normalized `ModelResponse.metadata["usage"]` format."""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "output_tokens": self.output_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": self.total_tokens,
+        }
+
+
+@dataclass(frozen=True)
+class ModelPrice:
+    """Price of a model in USD per million tokens."""
+
+    input: float
+    output: float
+    cached_input: float
+
+    @staticmethod
+    def load(price: dict[str, Any]) -> "ModelPrice":
+        return ModelPrice(
+            input=price.get("input", 0.0),
+            output=price.get("output", 0.0),
+            cached_input=price.get("cached_input", price.get("input", 0.0)),
+        )
+
+    def cost(self, usage: TokenUsage) -> float:
+        """Estimated cost of the usage in USD."""
+        uncached = max(usage.prompt_tokens - usage.cached_tokens, 0)
+        return (
+            uncached * self.input
+            + usage.cached_tokens * self.cached_input
+            + usage.output_tokens * self.output
+        ) / 1_000_000
+
+
+@dataclass(frozen=True)
+class UsageConfig:
+    daily_budget_usd: float
+    alarm_thresholds: tuple[float, ...]
+    debug_headers: bool
+    pricing: dict[str, ModelPrice]
+
+    @staticmethod
+    def load(usage_config: dict[str, Any]) -> "UsageConfig":
+        """Loads the usage config (a budget of 0 disables the alarms)."""
+        return UsageConfig(
+            daily_budget_usd=usage_config.get("daily_budget_usd", 0.0),
+            alarm_thresholds=tuple(
+                sorted(usage_config.get("alarm_thresholds", [0.5, 0.8, 1.0]))
+            ),
+            debug_headers=usage_config.get("debug_headers", False),
+            pricing={
+                model: ModelPrice.load(price)
+                for model, price in usage_config.get("pricing", {}).items()
+            },
+        )
+
+    def price(self, model: str) -> ModelPrice | None:
+        """
+        Price of a model, matched by the longest priced name it starts with.
+
+        Provider prefixes are ignored, so "models/gemini-2.0-flash" and
+        "google/gemini-2.0-flash-001" both match "gemini-2.0-flash".
+        """
+        name = model.rsplit("/", 1)[-1]
+        matches = [priced for priced in self.pricing if name.startswith(priced)]
+        return self.pricing[max(matches, key=len)] if matches else None
+
+
+@dataclass
+class RequestUsage:
+    """
+    Token usage and estimated cost of the model calls made for one request.
+
+    Attributes:
+        calls: Number of model calls
+        usage: Tokens of all calls
+        cost_usd: Estimated cost of all calls
+        stages: Tokens by pipeline stage
+    """
+
+    calls: int = 0
+    usage: TokenUsage = field(default_factory=TokenUsage)
+    cost_usd: float = 0.0
+    stages: dict[str, TokenUsage] = field(default_factory=dict)
+
+    def add(self, stage: str, usage: TokenUsage, cost: float) -> None:
+        self.calls += 1
+        self.usage += usage
+        self.cost_usd += cost
+        self.stages[stage] = self.stages.get(stage, TokenUsage()) + usage
+
+    def headers(self) -> dict[str, str]:
+        """Summary of the usage as HTTP debug headers."""
+        return {
+            "X-LLM-Usage": (
+                f"calls={self.calls}; prompt_tokens={self.usage.prompt_tokens}; "
+                f"cached_tokens={self.usage.cached_tokens}; "
+                f"output_tokens={self.usage.output_tokens}; "
+                f"cost_usd={self.cost_usd:.6f}"
+            ),
+            # Server-Timing-like list, e.g. "classification;prompt=812;output=4"
+            "X-LLM-Usage-Stages": ", ".join(
+                f"{stage};prompt={usage.prompt_tokens};output={usage.output_tokens}"
+                for stage, usage in self.stages.items()
+            ),
+        }
+
+
+_request_usage: ContextVar[RequestUsage | None] = ContextVar(
+    "request_usage", default=None
+)
+
+_SPEND_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_spend (
+    day TEXT PRIMARY KEY,
+    cost_usd REAL NOT NULL
+)
+"""
+
+
+class SpendLedger(Protocol):
+    """Daily spend shared by several processes (e.g. SQLiteSpendLedger)."""
+
+    def add(self, day: date, cost: float) -> float: ...
+
+    def total(self, day: date) -> float: ...
+
+    def close(self) -> None: ...
+
+
+class SQLiteSpendLedger:
+    """
+    Daily spend kept in a SQLite table, shared by the server's workers.
+
+    A cost is added with a single statement returning the day's new total, so
+    that exactly one worker sees the total cross each alarm threshold.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Open (and create, if needed) the spend table.
+
+        Args:
+            db_path (Path): Location of the SQLite database file
+        """
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=5.0, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SPEND_SCHEMA)
+
+    def add(self, day: date, cost: float) -> float:
+        """Add a cost to a day's spend, returning the day's new total."""
+        with self._lock, self._conn:
+            (total,) = self._conn.execute(
+                "INSERT INTO daily_spend (day, cost_usd) VALUES (?, ?) "
+                "ON CONFLICT(day) DO UPDATE "
+                "SET cost_usd = cost_usd + excluded.cost_usd "
+                "RETURNING cost_usd",
+                (day.isoformat(), cost),
+            ).fetchone()
+        return total
+
+    def total(self, day: date) -> float:
+        """A day's spend."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cost_usd FROM daily_spend WHERE day = ?", (day.isoformat(),)
+            ).fetchone()
+        return 0.0 if row is None else row[0]
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class UsageMeter:
+    """Records model usage into metrics, request usage and today's spend."""
+
+    def __init__(
+        self, config: UsageConfig | None = None, ledger: SpendLedger | None = None
+    ) -> None:
+        self.config = config or UsageConfig.load({})
+        self.ledger = ledger
+        self._lock = threading.Lock()
+        self._day = datetime.now(UTC).date()
+        self._spent = 0.0
+        self._unpriced: set[str] = set()
+        self.logger = logger.bind(service="usage")
+
+    def configure(self, config: UsageConfig, ledger: SpendLedger | None = None) -> None:
+        """Replace the price table and budget, and the ledger sharing the spend."""
+        self.config = config
+        self.ledger = ledger
+
+    def close(self) -> None:
+        """Close the ledger, if any."""
+        if self.ledger is not None:
+            self.ledger.close()
+
+    @property
+    def spent_today(self) -> float:
+        """Estimated cost in USD since midnight UTC."""
+        with self._lock:
+            day = self._roll_over()
+            if self.ledger is None:
+                return self._spent
+        return self.ledger.total(day)
+
+    def record(self, model: str, usage: TokenUsage) -> float:
+        """
+        Record the usage of a model call made in the current context.
+
+        Args:
+            model: Model that served the call
+            usage: Tokens of the call
+
+        Returns:
+            float: Estimated cost of the call in USD
+        """
+        price = self.config.price(model)
+        if price is None and model not in self._unpriced:
+            self._unpriced.add(model)
+            self.logger.warning("model_price_unknown", model=model)
+        cost = price.cost(usage) if price else 0.0
+
+        stage, route = current_stage.get(), current_route.get()
+        for kind, tokens in (
+            ("prompt", usage.prompt_tokens),
+            ("cached", usage.cached_tokens),
+            ("output", usage.output_tokens),
+        ):
+            _tokens.inc(tokens, stage=stage, route=route, model=model, kind=kind)
+        _cost.inc(cost, stage=stage, route=route, model=model)
+        annotate(
+            prompt_tokens=usage.prompt_tokens,
+            output_tokens=usage.output_tokens,
+            cached_tokens=usage.cached_tokens,
+            cost_usd=cost,
+        )
+        request = _request_usage.get()
+        if request is not None:
+            request.add(stage, usage, cost)
+        self._spend(cost)
+        return cost
+
+    def _roll_over(self) -> date:
+        today = datetime.now(UTC).date()
+        if today != self._day:
+            self._day, self._spent = today, 0.0
+        return today
+
+    def _spend(self, cost: float) -> None:
+        if cost <= 0:
+            return
+        budget = self.config.daily_budget_usd
+        with self._lock:
+            day = self._roll_over()
+            self._spent += cost
+            spent = self._spent
+        if self.ledger is not None:
+            spent = self.ledger.add(day, cost)
+        # The call whose cost crosses a threshold raises its alarm.
+        crossed = [
+            threshold
+            for threshold in self.config.alarm_thresholds
+            if budget > 0 and spent - cost < threshold * budget <= spent
+        ]
+        _daily_cost.set(spent)
+        for threshold in crossed:
+            _budget_alarms.inc(threshold=f"{threshold:g}")
+            self.logger.error(
+                "daily_budget_alarm",
+                threshold=threshold,
+                spent_usd=round(spent, 4),
+                budget_usd=budget,
+            )
+
+
+usage_meter = UsageMeter()
+
+
+def record_usage(model: str, usage: TokenUsage) -> float:
+    """Record the usage of a model call with the global usage meter."""
+    return usage_meter.record(model, usage)
+
+
+def current_request_usage() -> RequestUsage | None:
+    """The usage of the request being processed, None outside a request."""
+    return _request_usage.get()
+
+
+@contextmanager
+def track_request_usage() -> Iterator[RequestUsage]:
+    """
+    Collect the usage of the model calls made for a request.
+
+    Calls made in tasks and executor threads started within the context (which
+    copy it) are included, e.g. the pipeline run shared by coalesced requests is
+    accounted to the request that started it.
+
+    Yields:
+        RequestUsage: The request's usage, updated as calls complete
+    """
+    request = RequestUsage()
+    token = _request_usage.set(request)
+    try:
+        yield request
+    finally:
+        _request_usage.reset(token)
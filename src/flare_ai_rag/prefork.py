@@ -0,0 +1,153 @@
+"""
+Pre-fork serving: one application process per CPU core.
+
+A single uvicorn process runs the CPU-bound parts of the pipeline (sparse
+encoding, JSON parsing, prompt building) on one core. `PreforkServer` runs
+several worker processes accepting connections on one listening socket instead.
+The parent process loads the read-only resources once (models, exemplar
+embeddings, prompts), then forks the workers, which share the resources' memory pages
+copy-on-write; each worker then creates its own clients, executor and event
+loop, which must not cross a fork.
+
+Following the `gc` module's advice for fork without exec, the parent disables
+the garbage collector while loading and freezes the loaded objects before
+forking, so that collections in the workers do not write to (and copy) their
+pages. Workers that die are replaced; SIGTERM or SIGINT to the parent shuts the
+workers down gracefully.
+"""
+
+import contextlib
+import gc
+import os
+import signal
+import socket
+import threading
+import time
+from collections.abc import Callable
+from types import FrameType
+
+import structlog
+import uvicorn
+from fastapi import FastAPI
+
+logger = structlog.get_logger(__name__)
+
+# A worker exiting sooner after its start is restarted after a delay, so that a
+# worker failing at startup does not fork in a loop.
+MIN_WORKER_LIFETIME_SECONDS = 5.0
+
+
+def default_workers() -> int:
+    """Number of CPU cores available to the process."""
+    return len(os.sched_getaffinity(0))
+
+
+def _exit_with_parent(parent: int) -> None:
+    """Stop the worker if the parent process dies (and it is re-parented)."""
+    while os.getppid() == parent:
+        time.sleep(1.0)
+    os.kill(os.getpid(), signal.SIGTERM)
+
+
+class PreforkServer[R]:
+    """Parent process of the pre-forked workers."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        load: Callable[[], R],
+        create_app: Callable[[R], FastAPI],
+        *,
+        host: str,
+        port: int,
+        workers: int,
+        backlog: int = 2048,
+    ) -> None:
+        """
+        Initialize the server.
+
+        Args:
+            load: Loads the resources shared by the workers (in the parent)
+            create_app: Creates a worker's application from the shared
+                resources (in the worker)
+            host: Address the server listens on
+            port: Port the server listens on
+            workers: Number of worker processes
+            backlog: Size of the listening socket's connection queue
+        """
+        self.load = load
+        self.create_app = create_app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.backlog = backlog
+        self._children: dict[int, float] = {}
+        self._stopping = False
+        self.logger = logger.bind(service="prefork", workers=workers)
+
+    def run(self) -> None:
+        """Load the shared resources, fork the workers and supervise them."""
+        gc.disable()
+        resources = self.load()
+        sock = socket.create_server((self.host, self.port), backlog=self.backlog)
+        gc.freeze()
+        self.logger.info(
+            "prefork_resources_loaded", frozen_objects=gc.get_freeze_count()
+        )
+
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self._stop)
+        for _ in range(self.workers):
+            self._spawn(resources, sock)
+
+        while self._children:
+            pid, status = os.wait()
+            started = self._children.pop(pid, None)
+            if started is None or self._stopping:
+                continue
+            lifetime = time.monotonic() - started
+            self.logger.warning(
+                "worker_died",
+                pid=pid,
+                exit_code=os.waitstatus_to_exitcode(status),
+                lifetime_seconds=round(lifetime, 1),
+            )
+            if lifetime < MIN_WORKER_LIFETIME_SECONDS:
+                time.sleep(MIN_WORKER_LIFETIME_SECONDS)
+            if not self._stopping:
+                self._spawn(resources, sock)
+        sock.close()
+        self.logger.info("prefork_stopped")
+
+    def _stop(self, signum: int, _frame: FrameType | None) -> None:
+        """Shut the workers down gracefully."""
+        self._stopping = True
+        self.logger.info("prefork_stopping", signal=signal.Signals(signum).name)
+        for pid in self._children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+
+    def _spawn(self, resources: R, sock: socket.socket) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = time.monotonic()
+            return
+
+        # Worker: never returns to the parent's supervision loop.
+        exit_code = 1
+        try:
+            # Signals reach the worker through the parent only, once.
+            os.setpgid(0, 0)
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            gc.enable()
+            threading.Thread(
+                target=_exit_with_parent, args=(os.getppid(),), daemon=True
+            ).start()
+            app = self.create_app(resources)
+            self.logger.info("worker_started", pid=os.getpid())
+            uvicorn.Server(uvicorn.Config(app)).run(sockets=[sock])
+            exit_code = 0
+        except BaseException:
+            self.logger.exception("worker_failed", pid=os.getpid())
+        finally:
+            os._exit(exit_code)
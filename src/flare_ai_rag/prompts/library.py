@@ -15,12 +15,15 @@ import structlog
 
 from flare_ai_rag.prompts.schemas import (
     Prompt,
+    QueryImprovementRouterResponse,
     RAGRouterResponse,
     SemanticRouterResponse,
 )
 from flare_ai_rag.prompts.templates import (
     CONVERSATIONAL,
+    HISTORY_SUMMARY,
     QUERY_IMPROVEMENT,
+    QUERY_IMPROVEMENT_ROUTER,
     RAG_RESPONDER,
     RAG_ROUTER,
     REMOTE_ATTESTATION,
@@ -66,6 +69,8 @@ class PromptLibrary:
         - conversational: For general user interactions
         - request_attestation: For remote attestation requests
         - tx_confirmation: For transaction confirmation
+        - query_improvement_router: For fused query improvement and RAG routing
+        - history_summary: For the rolling conversation summary
 
         This method is called automatically during instance initialization.
         """
@@ -74,7 +79,7 @@ class PromptLibrary:
                 name="semantic_router",
                 description="Route user query based on user input",
                 template=SEMANTIC_ROUTER,
-                required_inputs=["user_input"],
+                required_inputs=["user_input", "history_context"],
                 response_mime_type="text/x.enum",
                 response_schema=SemanticRouterResponse,
                 category="router",
@@ -124,6 +129,24 @@ class PromptLibrary:
                 response_mime_type=None,
                 category="conversational",
             ),
+            Prompt(
+                name="query_improvement_router",
+                description="Improve the user's query and classify it in one call",
+                template=QUERY_IMPROVEMENT_ROUTER,
+                required_inputs=["user_input"],
+                response_mime_type="application/json",
+                response_schema=QueryImprovementRouterResponse,
+                category="rag-router",
+            ),
+            Prompt(
+                name="history_summary",
+                description="Fold old responses into the rolling history summary",
+                template=HISTORY_SUMMARY,
+                required_inputs=["summary", "responses", "max_words"],
+                response_schema=None,
+                response_mime_type=None,
+                category="history",
+            ),
         ]
 
         for prompt in default_prompts:
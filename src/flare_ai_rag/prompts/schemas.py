@@ -50,6 +50,24 @@ class RAGRouterResponse(TypedDict):
     classification: str
 
 
+class QueryImprovementRouterResponse(TypedDict):
+    """
+    Type definition for the fused query improvement and RAG router response.
+
+    Combines the output of the query improvement and RAG router prompts so both
+    can be obtained with a single model call.
+
+    Attributes:
+        improved_query (str): The rewritten query used for retrieval
+        classification (str): The response class
+        reason (str): Why the classification was chosen (only for CLARIFY)
+    """
+
+    improved_query: str
+    classification: str
+    reason: str
+
+
 class PromptInputs(TypedDict, total=False):
     """
     Type definition for various types of prompt inputs.
@@ -114,6 +132,19 @@ class Prompt:
     category: str | None = None
     version: str = "1.0"
 
+    @property
+    def static_prefix(self) -> str:
+        """
+        The part of the template before its first placeholder.
+
+        Every prompt formatted from this template starts with this text, so it can
+        be cached by the model provider and reused across requests. Templates keep
+        their placeholders at the end to make this prefix as long as possible.
+        """
+        if not self.required_inputs:
+            return self.template
+        return self.template.split("$", 1)[0]
+
     def format(self, **kwargs: str | PromptInputs) -> str:
         """
         Format the prompt template with provided input values.
@@ -83,3 +83,16 @@ class PromptService:
             raise
         else:
             return (formatted, prompt.response_mime_type, prompt.response_schema)
+
+    def get_static_prefixes(self) -> list[str]:
+        """
+        Get the static prefixes of all prompt templates that take inputs.
+
+        Returns:
+            list[str]: Non-empty template prefixes, suitable for context caching
+        """
+        return [
+            prompt.static_prefix
+            for prompt in self.library.prompts.values()
+            if prompt.required_inputs and prompt.static_prefix.strip()
+        ]
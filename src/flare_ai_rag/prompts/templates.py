@@ -27,14 +27,16 @@ Categories (in order of precedence):
    • General questions, greetings, or unclear requests
    • Any ambiguous or multi-category inputs
 
-Input: ${user_input}
-
 Instructions:
 - Choose ONE category only from the list "RAG_ROUTER", "SCRAPE", "REQUEST_ATTESTATION", "CONVERSATIONAL"
 - Select most specific matching category
 - Default to CONVERSATIONAL if unclear
 - Ignore politeness phrases or extra context
 - Focus on core intent of request
+
+${history_context}
+
+Input: ${user_input}
 """
 
 RAG_ROUTER: Final = """
@@ -49,8 +51,6 @@ options:
     out of scope. Reject the query if it is not related at all to the Flare Network
     or not related to blockchains.
 
-Input: ${user_input}
-
 Response format:
 {
   "classification": "<UPPERCASE_CATEGORY>",
@@ -70,6 +70,8 @@ Examples:
 - "What is the average block time?" → {"classification": "CLARIFY", "reason": "No specific chain is mentioned."}
 - "How secure is it?" → {"classification": "CLARIFY", "reason": "What does \"it\" refer to?"}
 - "Tell me about Flare." → {"classification": "CLARIFY", "reason": "The query is too vague."}
+
+Input: ${user_input}
 """
 
 SCRAPE: Final = """
@@ -142,11 +144,7 @@ clear to the user:
 """
 
 QUERY_IMPROVEMENT: Final = """
-The user provided the following query regarding the Flare blockchain technology:
-
-"${user_input}"
-
-${history_context}
+The user will provide a query regarding the Flare blockchain technology.
 
 Follow these rules:
 - Adapt the user input to fit the context of the chat history, if necessary.
@@ -158,4 +156,69 @@ Follow these rules:
 MAKE SURE YOU ONLY INCLUDE THE IMPROVED QUERY IN THE FINAL RESPONSE.
 DO NOT INCLUDE ANY EXTRA INFORMATION OR YOUR OWN THOUGHTS.
 KEEP THE QUERY AS A QUESTION.
+
+The user provided the following query:
+
+"${user_input}"
+"""
+
+QUERY_IMPROVEMENT_ROUTER: Final = """
+You prepare user queries regarding the Flare blockchain technology for document
+retrieval. Perform BOTH of the following tasks and return a single JSON object.
+
+Task 1 - Improve the query:
+- Adapt the user input to fit the context of the chat history, if necessary.
+- Rewrite and expand this query to improve retrieval quality of a vector embedding.
+- Make sure to add new, relevant keywords.
+- Limit your improved query to less than 300 characters.
+- Do not distort the query's original meaning too much.
+- Keep the improved query as a question.
+
+Task 2 - Classify the improved query into EXACTLY ONE category:
+
+    1. ANSWER: Use this if the query is clear, specific, and can be answered with
+    factual information. Relevant queries must have at least some vague link to
+    the Flare Network blockchain.
+    2. CLARIFY: Use this if the query is ambiguous, vague, or needs additional context.
+    3. REJECT: Use this if the query is inappropriate, harmful, or completely
+    out of scope. Reject the query if it is not related at all to the Flare Network
+    or not related to blockchains.
+
+Response format:
+{
+  "improved_query": "<IMPROVED QUERY>",
+  "classification": "<UPPERCASE_CATEGORY>",
+  "reason": "<REASON FOR CLASSIFICATION>"
+}
+
+Processing rules:
+- The classification should be exactly one of the three categories
+- DO NOT infer missing values
+- Normalize the classification to uppercase
+- The reason should explain why the classification was chosen if and only if
+  the classification is "CLARIFY"
+- The improved query must only contain the rewritten question, without extra
+  information or your own thoughts
+
+Input: ${user_input}
+"""
+
+HISTORY_SUMMARY: Final = """
+You maintain a running summary of a conversation between a user and an AI assistant
+about the Flare blockchain technology. Update the current summary with the older
+assistant responses listed below, which are being removed from the conversation.
+
+Follow these rules:
+- Keep facts, names, numbers and topics the user may refer back to.
+- Drop greetings, formatting and information that is already in the summary.
+- Write in the third person, e.g. "The assistant explained ...".
+- Return ONLY the updated summary, without any extra text.
+
+Current summary:
+${summary}
+
+Responses to add, oldest first:
+${responses}
+
+Limit the updated summary to less than ${max_words} words.
 """
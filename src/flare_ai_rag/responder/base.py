@@ -1,9 +1,25 @@
 from abc import ABC, abstractmethod
 
+from flare_ai_rag.concurrency import run_in_executor
+
 
 class BaseResponder(ABC):
     @abstractmethod
-    def generate_response(self, query: str, retrieved_documents: list[dict]) -> str:
+    def generate_response(
+        self, query: str, retrieved_documents: list[dict], history_context: str = ""
+    ) -> str:
         """
         Generate a final answer given the query and a list of retrieved documents.
+
+        `history_context` is the rendered history of the caller's session, if any.
+        """
+
+    async def generate_response_async(
+        self, query: str, retrieved_documents: list[dict], history_context: str = ""
+    ) -> str:
+        """
+        Asynchronous counterpart of `generate_response`.
         """
+        return await run_in_executor(
+            self.generate_response, query, retrieved_documents, history_context
+        )
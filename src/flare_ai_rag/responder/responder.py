@@ -1,16 +1,17 @@
 from typing import Any, override
 
-from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
+from flare_ai_rag.ai import BaseAIProvider, OpenRouterClient
 from flare_ai_rag.responder import BaseResponder, ResponderConfig
+from flare_ai_rag.tracing import annotate
 from flare_ai_rag.utils import parse_chat_response
 
 
 class GeminiResponder(BaseResponder):
     def __init__(
-        self, client: GeminiProvider, responder_config: ResponderConfig
+        self, client: BaseAIProvider, responder_config: ResponderConfig
     ) -> None:
         """
-        Initialize the responder with a GeminiProvider.
+        Initialize the responder with an AI provider (Gemini or a provider pool).
 
         :param client: An instance of OpenRouterClient.
         :param model: The model identifier to be used by the API.
@@ -19,18 +20,57 @@ class GeminiResponder(BaseResponder):
         self.responder_config = responder_config
 
     @override
-    def generate_response(self, query: str, retrieved_documents: list[dict]) -> str:
+    def generate_response(
+        self, query: str, retrieved_documents: list[dict], history_context: str = ""
+    ) -> str:
         """
         Generate a final answer using the query and the retrieved context.
 
         :param query: The input query.
         :param retrieved_documents: A list of dictionaries containing retrieved docs.
+        :param history_context: The rendered history of the user's session.
         :return: The generated answer as a string.
         """
 
-        # Build Context from response history
-        history_context = self.client.history_context()
+        prompt = self._build_prompt(query, retrieved_documents, history_context)
+        annotate(prompt_chars=len(prompt))
 
+        # Use the generate method of the provider to obtain a response.
+        response = self.client.generate(
+            prompt,
+            response_mime_type=None,
+            response_schema=None,
+        )
+
+        return response.text
+
+    @override
+    async def generate_response_async(
+        self, query: str, retrieved_documents: list[dict], history_context: str = ""
+    ) -> str:
+        """
+        Generate a final answer using Gemini's async client.
+
+        :param query: The input query.
+        :param retrieved_documents: A list of dictionaries containing retrieved docs.
+        :param history_context: The rendered history of the user's session.
+        :return: The generated answer as a string.
+        """
+        prompt = self._build_prompt(query, retrieved_documents, history_context)
+        annotate(prompt_chars=len(prompt))
+
+        response = await self.client.generate_async(
+            prompt,
+            response_mime_type=None,
+            response_schema=None,
+        )
+
+        return response.text
+
+    def _build_prompt(
+        self, query: str, retrieved_documents: list[dict], history_context: str
+    ) -> str:
+        """Compose the responder prompt from history, documents and the query."""
         # Build context from the retrieved documents.
         doc_context = "List of retrieved documents:\n"
 
@@ -39,26 +79,13 @@ class GeminiResponder(BaseResponder):
             doc_context += f"Document {identifier}:\n{doc.get('text', '')}\n\n"
 
         # Compose the prompt
-        prompt = (
+        return (
             history_context
             + doc_context
             + f"User query: {query}\n"
             + self.responder_config.query_prompt
         )
 
-        # Use the generate method of GeminiProvider to obtain a response.
-        response = self.client.generate(
-            prompt,
-            response_mime_type=None,
-            response_schema=None,
-        )
-
-        self.client.chat_history.append(response.text)
-        if len(self.client.chat_history) > self.responder_config.context_size:
-            self.client.chat_history = self.client.chat_history[1:]
-
-        return response.text
-
 
 class OpenRouterResponder(BaseResponder):
     def __init__(
@@ -74,16 +101,19 @@ class OpenRouterResponder(BaseResponder):
         self.responder_config = responder_config
 
     @override
-    def generate_response(self, query: str, retrieved_documents: list[dict]) -> str:
+    def generate_response(
+        self, query: str, retrieved_documents: list[dict], history_context: str = ""
+    ) -> str:
         """
         Generate a final answer using the query and the retrieved context,
         and include citations.
 
         :param query: The input query.
         :param retrieved_documents: A list of dictionaries containing retrieved docs.
+        :param history_context: The rendered history of the user's session.
         :return: The generated answer as a string.
         """
-        context = "List of retrieved documents:\n"
+        context = history_context + "List of retrieved documents:\n"
 
         # Build context from the retrieved documents.
         for idx, doc in enumerate(retrieved_documents, start=1):
@@ -1,6 +1,27 @@
-from .base import BaseRetriever
-from .config import RetrieverConfig
-from .qdrant_collection import generate_collection
-from .qdrant_retriever import QdrantRetriever
+from typing import TYPE_CHECKING
 
-__all__ = ["BaseRetriever", "QdrantRetriever", "RetrieverConfig", "generate_collection"]
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import BaseRetriever
+    from .config import RetrieverConfig
+    from .qdrant_collection import generate_collection, update_quantization
+    from .qdrant_retriever import QdrantRetriever
+
+__all__ = [
+    "BaseRetriever",
+    "QdrantRetriever",
+    "RetrieverConfig",
+    "generate_collection",
+    "update_quantization",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".base": ["BaseRetriever"],
+        ".config": ["RetrieverConfig"],
+        ".qdrant_collection": ["generate_collection", "update_quantization"],
+        ".qdrant_retriever": ["QdrantRetriever"],
+    },
+)
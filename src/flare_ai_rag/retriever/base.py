@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from flare_ai_rag.concurrency import run_in_executor
+
 
 class BaseRetriever(ABC):
     @abstractmethod
@@ -13,3 +15,7 @@ class BaseRetriever(ABC):
     @abstractmethod
     def hybrid_search(self, query: str, top_k: int = 5) -> list[dict]:
         """Perform hybrid search by combining multiple search types."""
+
+    async def hybrid_search_async(self, query: str, top_k: int = 5) -> list[dict]:
+        """Perform hybrid search without blocking the event loop."""
+        return await run_in_executor(self.hybrid_search, query, top_k)
@@ -4,7 +4,12 @@ from typing import Any
 
 @dataclass(frozen=True)
 class RetrieverConfig:
-    """Configuration for the embedding model used in the retriever."""
+    """
+    Configuration for the embedding model used in the retriever.
+
+    The search parameters (prefetch_limit, limit, fusion, hnsw_ef, quantization)
+    can be tuned with the retrieval evaluation harness (`flare_ai_rag.evaluation`).
+    """
 
     dense_embedding_model: str
     sparse_embedding_model: str
@@ -13,6 +18,17 @@ class RetrieverConfig:
     vector_size: int
     host: str
     port: int
+    speculative_retrieval: bool
+    # Candidates fetched by each of the dense and sparse searches
+    prefetch_limit: int
+    # Documents returned after fusion
+    limit: int
+    # Fusion of the dense and sparse results: "rrf" or "dbsf"
+    fusion: str
+    # HNSW search beam width (None: Qdrant's default)
+    hnsw_ef: int | None
+    # Dense vector quantization: "scalar", "binary" or None
+    quantization: str | None
 
     @staticmethod
     def load(retriever_config: dict[str, Any]) -> "RetrieverConfig":
@@ -24,4 +40,10 @@ class RetrieverConfig:
             vector_size=retriever_config["vector_size"],
             host=retriever_config["host"],
             port=retriever_config["port"],
+            speculative_retrieval=retriever_config.get("speculative_retrieval", False),
+            prefetch_limit=retriever_config.get("prefetch_limit", 100),
+            limit=retriever_config.get("limit", 50),
+            fusion=retriever_config.get("fusion", "rrf"),
+            hnsw_ef=retriever_config.get("hnsw_ef"),
+            quantization=retriever_config.get("quantization"),
         )
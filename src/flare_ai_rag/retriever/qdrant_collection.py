@@ -1,14 +1,25 @@
+import time
+
 import google.api_core.exceptions
 import pandas as pd
 import structlog
 from qdrant_client import QdrantClient
 from qdrant_client.models import (
+    BinaryQuantization,
+    BinaryQuantizationConfig,
+    CollectionStatus,
+    Disabled,
     Distance,
     Modifier,
     PointStruct,
+    QuantizationConfig,
+    ScalarQuantization,
+    ScalarQuantizationConfig,
+    ScalarType,
     SparseVector,
     SparseVectorParams,
     VectorParams,
+    VectorParamsDiff,
 )
 from tqdm import tqdm
 
@@ -22,18 +33,77 @@ from flare_ai_rag.retriever.config import RetrieverConfig
 logger = structlog.get_logger(__name__)
 
 
+def quantization_config(quantization: str | None) -> QuantizationConfig | None:
+    """
+    Qdrant quantization of the dense vectors, kept in RAM for fast scoring.
+
+    :param quantization: "scalar" (int8), "binary" or None (no quantization).
+    """
+    if quantization is None:
+        return None
+    if quantization == "scalar":
+        return ScalarQuantization(
+            scalar=ScalarQuantizationConfig(type=ScalarType.INT8, always_ram=True)
+        )
+    if quantization == "binary":
+        return BinaryQuantization(binary=BinaryQuantizationConfig(always_ram=True))
+    msg = f"Unknown quantization '{quantization}' (expected 'scalar' or 'binary')"
+    raise ValueError(msg)
+
+
+def update_quantization(
+    client: QdrantClient,
+    collection_name: str,
+    quantization: str | None,
+    timeout: float = 300.0,
+) -> None:
+    """
+    Change the quantization of an existing collection's dense vectors.
+
+    Waits until Qdrant has rebuilt the affected segments, so that subsequent
+    queries are served with the new quantization.
+    :param client: Qdrant client.
+    :param collection_name: Name of the collection.
+    :param quantization: "scalar", "binary" or None (no quantization).
+    :param timeout: Maximum time to wait for the rebuild (seconds).
+    """
+    client.update_collection(
+        collection_name=collection_name,
+        vectors_config={
+            "dense": VectorParamsDiff(
+                quantization_config=quantization_config(quantization)
+                or Disabled.DISABLED
+            )
+        },
+    )
+    deadline = time.monotonic() + timeout
+    while client.get_collection(collection_name).status != CollectionStatus.GREEN:
+        if time.monotonic() > deadline:
+            msg = f"Collection '{collection_name}' was not rebuilt within {timeout}s"
+            raise TimeoutError(msg)
+        time.sleep(0.5)
+
+
 def _create_collection(
-    client: QdrantClient, collection_name: str, vector_size: int
+    client: QdrantClient,
+    collection_name: str,
+    vector_size: int,
+    quantization: str | None = None,
 ) -> None:
     """
     Creates a Qdrant collection with the given parameters.
     :param collection_name: Name of the collection.
     :param vector_size: Dimension of the vectors.
+    :param quantization: Quantization of the dense vectors, if any.
     """
     client.recreate_collection(
         collection_name=collection_name,
         vectors_config={
-            "dense": VectorParams(size=vector_size, distance=Distance.COSINE),
+            "dense": VectorParams(
+                size=vector_size,
+                distance=Distance.COSINE,
+                quantization_config=quantization_config(quantization),
+            ),
         },
         sparse_vectors_config={
             "sparse": SparseVectorParams(modifier=Modifier.IDF),
@@ -51,7 +121,10 @@ def generate_collection(
 ) -> None:
     """Routine for generating a Qdrant collection for a specific CSV file type."""
     _create_collection(
-        qdrant_client, retriever_config.collection_name, retriever_config.vector_size
+        qdrant_client,
+        retriever_config.collection_name,
+        retriever_config.vector_size,
+        retriever_config.quantization,
     )
     logger.info(
         "Created the collection.", collection_name=retriever_config.collection_name
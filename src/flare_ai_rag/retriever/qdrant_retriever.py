@@ -1,15 +1,26 @@
+import asyncio
 from typing import override
 
 from qdrant_client import QdrantClient
-from qdrant_client.models import Fusion, FusionQuery, Prefetch, SparseVector
+from qdrant_client.models import (
+    Fusion,
+    FusionQuery,
+    Prefetch,
+    QuantizationSearchParams,
+    SearchParams,
+    SparseVector,
+)
 
 from flare_ai_rag.ai import (
     EmbeddingTaskType,
     GeminiDenseEmbedding,
     ModelSparseEmbedding,
 )
+from flare_ai_rag.concurrency import run_in_executor
+from flare_ai_rag.metrics import track_stage
 from flare_ai_rag.retriever.base import BaseRetriever
 from flare_ai_rag.retriever.config import RetrieverConfig
+from flare_ai_rag.tracing import annotate
 
 
 class QdrantRetriever(BaseRetriever):
@@ -37,11 +48,13 @@ class QdrantRetriever(BaseRetriever):
         :return: The dense vector.
         """
         # Convert the query into a vector embedding using Gemini
-        query_vector = self.dense_embedding_client.embed_content(
-            embedding_model=self.retriever_config.dense_embedding_model,
-            contents=query,
-            task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
-        )
+        model = self.retriever_config.dense_embedding_model
+        with track_stage("dense_embedding", model):
+            query_vector = self.dense_embedding_client.embed_content(
+                embedding_model=model,
+                contents=query,
+                task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
+            )
 
         return query_vector
 
@@ -56,47 +69,139 @@ class QdrantRetriever(BaseRetriever):
         :return: The sparse vector
         """
         # Convert the query into a vector embedding using Gemini
-        query_vector = self.sparse_embedding_client.embed_content(
-            contents=query,
-        )
+        with track_stage(
+            "sparse_embedding", self.retriever_config.sparse_embedding_model
+        ):
+            query_vector = self.sparse_embedding_client.embed_content(
+                contents=query,
+            )
 
         return query_vector.indices.tolist(), query_vector.values.tolist()
 
     @override
-    def hybrid_search(self, query: str, top_k: int = 100, limit: int = 50) -> list[dict]:
+    def hybrid_search(
+        self, query: str, top_k: int | None = None, limit: int | None = None
+    ) -> list[dict]:
         """
-        Perform hybrid search by combining dense and sparse embeddings with RRF.
+        Perform hybrid search by fusing dense and sparse search results.
 
         :param query: The input query
-        :param top_k: Number of top results to return for semantic and keyword searches
-        :param limit: Number of top results to return
+        :param top_k: Number of candidates fetched by the semantic and keyword
+            searches (default: the configured prefetch_limit)
+        :param limit: Number of top results to return (default: the configured
+            limit)
 
         :return: A list of dictionaries, each representing a retrieved document.
         """
         semantic_vector = self.semantic_search(query)
         keyword_indices, keyword_values = self.keyword_search(query)
+
+        return self.query_fused(
+            semantic_vector, keyword_indices, keyword_values, top_k, limit
+        )
+
+    @override
+    async def hybrid_search_async(
+        self, query: str, top_k: int | None = None, limit: int | None = None
+    ) -> list[dict]:
+        """
+        Perform hybrid search without blocking the event loop.
+
+        The dense embedding uses Gemini's async client, while the CPU-bound sparse
+        embedding runs on the shared executor concurrently with it. The Qdrant
+        query itself is then offloaded to the executor as well.
+
+        :param query: The input query
+        :param top_k: Number of candidates fetched by the semantic and keyword
+            searches (default: the configured prefetch_limit)
+        :param limit: Number of top results to return (default: the configured
+            limit)
+
+        :return: A list of dictionaries, each representing a retrieved document.
+        """
+        semantic_vector, (keyword_indices, keyword_values) = await asyncio.gather(
+            self._semantic_search_async(query),
+            run_in_executor(self.keyword_search, query),
+        )
+
+        return await run_in_executor(
+            self.query_fused,
+            semantic_vector,
+            keyword_indices,
+            keyword_values,
+            top_k,
+            limit,
+        )
+
+    async def _semantic_search_async(self, query: str) -> list[float]:
+        """Embed the query with Gemini's async client."""
+        model = self.retriever_config.dense_embedding_model
+        with track_stage("dense_embedding", model):
+            return await self.dense_embedding_client.embed_content_async(
+                embedding_model=model,
+                contents=query,
+                task_type=EmbeddingTaskType.RETRIEVAL_QUERY,
+            )
+
+    def query_fused(
+        self,
+        semantic_vector: list[float],
+        keyword_indices: list[int],
+        keyword_values: list[float],
+        top_k: int | None = None,
+        limit: int | None = None,
+    ) -> list[dict]:
+        """
+        Run the fused dense + sparse query against Qdrant for embedded vectors.
+
+        The fusion method, HNSW beam width and quantization rescoring follow the
+        retriever config.
+
+        :param semantic_vector: Dense embedding of the query
+        :param keyword_indices: Indices of the sparse embedding of the query
+        :param keyword_values: Values of the sparse embedding of the query
+        :param top_k: Number of candidates fetched by each search (default: the
+            configured prefetch_limit)
+        :param limit: Number of top results to return (default: the configured
+            limit)
+
+        :return: The payloads of the retrieved documents, best first.
+        """
+        config = self.retriever_config
         keyword_vector = SparseVector(
             indices=keyword_indices,
             values=keyword_values,
         )
+        params = None
+        if config.hnsw_ef is not None or config.quantization:
+            params = SearchParams(
+                hnsw_ef=config.hnsw_ef,
+                quantization=(
+                    QuantizationSearchParams(rescore=True)
+                    if config.quantization
+                    else None
+                ),
+            )
+        prefetch_limit = top_k or config.prefetch_limit
 
         prefetch = [
             Prefetch(
                 query=semantic_vector,
                 using="dense",
-                limit=top_k,
+                limit=prefetch_limit,
+                params=params,
             ),
-            Prefetch(query=keyword_vector, using="sparse", limit=top_k),
+            Prefetch(query=keyword_vector, using="sparse", limit=prefetch_limit),
         ]
 
-        results = self.client.query_points(
-            collection_name=self.retriever_config.collection_name,
-            prefetch=prefetch,
-            query=FusionQuery(
-                fusion=Fusion.RRF,
-            ),
-            with_payload=True,
-            limit=top_k,
-        )
-
-        return [point.model_dump()["payload"] for point in results.points][:limit]
+        with track_stage("qdrant_query"):
+            results = self.client.query_points(
+                collection_name=config.collection_name,
+                prefetch=prefetch,
+                query=FusionQuery(fusion=Fusion(config.fusion)),
+                with_payload=True,
+                limit=limit or config.limit,
+            )
+            annotate(points=len(results.points))
+
+        return [point.payload or {} for point in results.points]
@@ -1,14 +1,45 @@
-from .base import BaseQueryRouter
-from .config import RouterConfig
-from .prompts import ROUTER_INSTRUCTION, ROUTER_PROMPT
-from .router import GeminiRouter, QueryImprovementRouter, QueryRouter
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .base import BaseQueryRouter
+    from .config import RouterConfig, SemanticRouterConfig
+    from .prompts import ROUTER_INSTRUCTION, ROUTER_PROMPT
+    from .router import (
+        GeminiFusedRouter,
+        GeminiRouter,
+        QueryImprovementRouter,
+        QueryRouter,
+    )
+    from .semantic import LocalRouteMatch, LocalSemanticRouter
 
 __all__ = [
     "ROUTER_INSTRUCTION",
     "ROUTER_PROMPT",
     "BaseQueryRouter",
+    "GeminiFusedRouter",
     "GeminiRouter",
+    "LocalRouteMatch",
+    "LocalSemanticRouter",
     "QueryImprovementRouter",
     "QueryRouter",
     "RouterConfig",
+    "SemanticRouterConfig",
 ]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".base": ["BaseQueryRouter"],
+        ".config": ["RouterConfig", "SemanticRouterConfig"],
+        ".prompts": ["ROUTER_INSTRUCTION", "ROUTER_PROMPT"],
+        ".router": [
+            "GeminiFusedRouter",
+            "GeminiRouter",
+            "QueryImprovementRouter",
+            "QueryRouter",
+        ],
+        ".semantic": ["LocalRouteMatch", "LocalSemanticRouter"],
+    },
+)
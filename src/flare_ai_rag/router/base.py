@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from typing import Any
 
 from flare_ai_rag.ai import BaseAIProvider, BaseClient
+from flare_ai_rag.concurrency import run_in_executor
 
 from .config import RouterConfig
 
@@ -29,3 +30,19 @@ class BaseQueryRouter(ABC):
         """
         Determine the type of the query: ANSWER, CLARIFY, or REJECT.
         """
+
+    async def route_query_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> str:
+        """
+        Asynchronous counterpart of `route_query`.
+
+        Routers backed by a synchronous client run `route_query` on the
+        shared executor.
+        """
+        return await run_in_executor(
+            self.route_query, prompt, response_mime_type, response_schema
+        )
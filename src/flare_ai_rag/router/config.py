@@ -13,6 +13,7 @@ class RouterConfig:
     answer_option: str
     clarify_option: str
     reject_option: str
+    fused_query_routing: bool
 
     @staticmethod
     def load(model_config: dict[str, Any]) -> "RouterConfig":
@@ -30,4 +31,25 @@ class RouterConfig:
             answer_option="ANSWER",
             clarify_option="CLARIFY",
             reject_option="REJECT",
+            fused_query_routing=model_config.get("fused_query_routing", False),
+        )
+
+
+@dataclass(frozen=True)
+class SemanticRouterConfig:
+    enabled: bool
+    embedding_model: str
+    confidence_threshold: float
+    margin_threshold: float
+    shadow_sample_rate: float
+
+    @staticmethod
+    def load(semantic_router_config: dict[str, Any]) -> "SemanticRouterConfig":
+        """Loads the local semantic router config."""
+        return SemanticRouterConfig(
+            enabled=semantic_router_config.get("enabled", True),
+            embedding_model=semantic_router_config["embedding_model"],
+            confidence_threshold=semantic_router_config["confidence_threshold"],
+            margin_threshold=semantic_router_config["margin_threshold"],
+            shadow_sample_rate=semantic_router_config.get("shadow_sample_rate", 0.0),
         )
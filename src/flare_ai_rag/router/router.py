@@ -2,7 +2,9 @@ from typing import Any, override
 
 import structlog
 
-from flare_ai_rag.ai import GeminiProvider, OpenRouterClient
+from flare_ai_rag.ai import BaseAIProvider, OpenRouterClient
+from flare_ai_rag.ai.base import ModelResponse
+from flare_ai_rag.prompts import QueryImprovementRouterResponse
 from flare_ai_rag.router import BaseQueryRouter
 from flare_ai_rag.router.config import RouterConfig
 from flare_ai_rag.utils import (
@@ -19,9 +21,9 @@ class GeminiRouter(BaseQueryRouter):
     to classify a query as ANSWER, CLARIFY, or REJECT.
     """
 
-    def __init__(self, client: GeminiProvider, config: RouterConfig) -> None:
+    def __init__(self, client: BaseAIProvider, config: RouterConfig) -> None:
         """
-        Initialize the router with a GeminiProvider instance.
+        Initialize the router with an AI provider (Gemini or a provider pool).
         """
         self.router_config = config
         self.client = client
@@ -37,15 +39,37 @@ class GeminiRouter(BaseQueryRouter):
         Analyze the query using the configured prompt and classify it.
         """
         logger.debug("Sending prompt...", prompt=prompt)
-        # Use the generate method of GeminiProvider to obtain a response.
+        # Use the generate method of the provider to obtain a response.
         response = self.client.generate(
             prompt=prompt,
             response_mime_type=response_mime_type,
             response_schema=response_schema,
         )
+        return self._parse_classification(response)
+
+    @override
+    async def route_query_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> str:
+        """
+        Analyze the query using Gemini's async client and classify it.
+        """
+        logger.debug("Sending prompt...", prompt=prompt)
+        response = await self.client.generate_async(
+            prompt=prompt,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+        )
+        return self._parse_classification(response)
+
+    def _parse_classification(self, response: ModelResponse) -> str:
+        """Extract and validate the classification from a Gemini response."""
         # Parse the response to extract classification.
         classification = (
-            parse_gemini_response_as_json(response.raw_response)
+            parse_gemini_response_as_json(response)
             .get("classification", "")
             .upper()
         )
@@ -131,7 +155,7 @@ class QueryImprovementRouter(BaseQueryRouter):
     A simple router that uses GCloud's Gemini to improve user query quality.
     """
 
-    def __init__(self, client: GeminiProvider, config: RouterConfig) -> None:
+    def __init__(self, client: BaseAIProvider, config: RouterConfig) -> None:
         """
         Initialize the router with an API key and model name.
         :param api_key: Your OpenRouter API key.
@@ -153,7 +177,7 @@ class QueryImprovementRouter(BaseQueryRouter):
         """
         logger.debug("Sending prompt...", prompt=prompt)
 
-        # Use the generate method of GeminiProvider to obtain a response.
+        # Use the generate method of the provider to obtain a response.
         response = self.client.generate(
             prompt=prompt,
             response_mime_type=response_mime_type,
@@ -161,3 +185,133 @@ class QueryImprovementRouter(BaseQueryRouter):
         )
 
         return response.text
+
+    @override
+    async def route_query_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> str:
+        """
+        Improve the query using Gemini's async client.
+        """
+        logger.debug("Sending prompt...", prompt=prompt)
+        response = await self.client.generate_async(
+            prompt=prompt,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+        )
+
+        return response.text
+
+
+class GeminiFusedRouter(BaseQueryRouter):
+    """
+    A router that uses GCloud's Gemini to improve the user query and classify it
+    as ANSWER, CLARIFY, or REJECT in a single structured call.
+
+    It replaces the QueryImprovementRouter + GeminiRouter pair, halving the number
+    of model round trips made before retrieval starts.
+    """
+
+    def __init__(self, client: BaseAIProvider, config: RouterConfig) -> None:
+        """
+        Initialize the router with an AI provider (Gemini or a provider pool).
+        """
+        self.router_config = config
+        self.client = client
+
+    @override
+    def route_query(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> str:
+        """
+        Classify the query, discarding the improved query.
+        """
+        return self.improve_and_route(
+            prompt, response_mime_type, response_schema
+        )["classification"]
+
+    @override
+    async def route_query_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> str:
+        """
+        Classify the query using Gemini's async client, discarding the improved query.
+        """
+        result = await self.improve_and_route_async(
+            prompt, response_mime_type, response_schema
+        )
+        return result["classification"]
+
+    def improve_and_route(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> QueryImprovementRouterResponse:
+        """
+        Improve and classify the query with a single Gemini call.
+        """
+        logger.debug("Sending prompt...", prompt=prompt)
+        response = self.client.generate(
+            prompt=prompt,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+        )
+        return self._parse_response(response)
+
+    async def improve_and_route_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> QueryImprovementRouterResponse:
+        """
+        Improve and classify the query with a single async Gemini call.
+        """
+        logger.debug("Sending prompt...", prompt=prompt)
+        response = await self.client.generate_async(
+            prompt=prompt,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+        )
+        return self._parse_response(response)
+
+    def _parse_response(
+        self, response: ModelResponse
+    ) -> QueryImprovementRouterResponse:
+        """
+        Extract the improved query and a validated classification.
+
+        Raises:
+            ValueError: If the response does not contain an improved query.
+        """
+        parsed = parse_gemini_response_as_json(response)
+        improved_query = str(parsed.get("improved_query", "")).strip()
+        if not improved_query:
+            msg = "Fused router response is missing the improved query"
+            raise ValueError(msg)
+
+        classification = str(parsed.get("classification", "")).upper()
+        valid_options = {
+            self.router_config.answer_option,
+            self.router_config.clarify_option,
+            self.router_config.reject_option,
+        }
+        if classification not in valid_options:
+            classification = self.router_config.clarify_option
+            logger.debug("\nNo classificaion found\n")
+
+        return QueryImprovementRouterResponse(
+            improved_query=improved_query,
+            classification=classification,
+            reason=str(parsed.get("reason", "")),
+        )
@@ -0,0 +1,218 @@
+"""
+Local Semantic Router Module
+
+This module implements an embedding-based fast path for the semantic router.
+Incoming messages are embedded with a small local model and compared against
+labelled exemplar messages for each semantic route. Confident matches are routed
+without calling the LLM; low-margin cases fall back to the LLM semantic router,
+and the agreement between both routers is recorded so the thresholds can be tuned.
+"""
+
+import random
+from dataclasses import dataclass
+from typing import Any, Final
+
+import numpy as np
+import numpy.typing as npt
+import structlog
+
+from flare_ai_rag.ai import ModelDenseEmbedding
+from flare_ai_rag.concurrency import run_in_executor
+from flare_ai_rag.metrics import registry
+from flare_ai_rag.prompts import SemanticRouterResponse
+from flare_ai_rag.router.config import SemanticRouterConfig
+
+logger = structlog.get_logger(__name__)
+
+SEMANTIC_ROUTE_EXEMPLARS: Final[dict[SemanticRouterResponse, list[str]]] = {
+    SemanticRouterResponse.RAG_ROUTER: [
+        "What is the Flare Time Series Oracle?",
+        "How does the Flare Data Connector work?",
+        "What is the block time on Flare?",
+        "How do I stake FLR?",
+        "How do I deploy a smart contract on Flare?",
+        "What consensus mechanism does Flare use?",
+        "How much gas does a transaction cost on Songbird?",
+        "How do I run a Flare validator node?",
+        "What are FAssets?",
+        "How do I read FTSO price feeds from a contract?",
+        "Can you explain more about that?",
+        "How does it compare to other oracles?",
+    ],
+    SemanticRouterResponse.SCRAPE: [
+        "What is the price of BTC?",
+        "Find price data for ETH",
+        "Scrape the latest FLR price history",
+        "Show me the historical prices for the BTC-USD ticker",
+        "Get me the trading volume of XRP over the last weeks",
+        "How has the price of SOL changed recently?",
+        "Find data on the DOGE ticker",
+        "Give me insights on the price of bitcoin this month",
+    ],
+    SemanticRouterResponse.REQUEST_ATTESTATION: [
+        "I want to request a remote attestation",
+        "Can you prove you are running in a TEE?",
+        "Verify the enclave",
+        "Give me an attestation token",
+        "How can I check that this service runs in a trusted execution environment?",
+        "Prove that your code has not been tampered with",
+        "Perform a vTPM attestation",
+        "Check enclave integrity",
+    ],
+    SemanticRouterResponse.CONVERSATIONAL: [
+        "Hi",
+        "Hello there!",
+        "Thanks, that was helpful",
+        "Who are you?",
+        "Good morning",
+        "What can you do?",
+        "Tell me a joke",
+        "Bye",
+        "How are you today?",
+        "Nice to meet you",
+    ],
+}
+
+_decisions = registry.counter(
+    "semantic_router_decisions_total",
+    "Semantic routing decisions, by the router that made them",
+    ("source", "route"),
+)
+_agreement = registry.counter(
+    "semantic_router_agreement_total",
+    "Local vs LLM semantic router comparisons, by local route and agreement",
+    ("mode", "local_route", "agree"),
+)
+
+
+@dataclass(frozen=True)
+class LocalRouteMatch:
+    """
+    Result of classifying a message with the local semantic router.
+
+    Attributes:
+        route: Best matching semantic route
+        score: Cosine similarity between the message and the closest exemplar
+            of the best route
+        margin: Difference between the best and second best route scores
+        confident: Whether the match clears both configured thresholds
+    """
+
+    route: SemanticRouterResponse
+    score: float
+    margin: float
+    confident: bool
+
+
+class LocalSemanticRouter:
+    """
+    Embedding-based semantic router used ahead of the LLM semantic router.
+
+    Each route is scored by the cosine similarity of the message to its nearest
+    labelled exemplar. A match is confident when its score reaches
+    `confidence_threshold` and it beats the runner-up route by `margin_threshold`.
+    """
+
+    def __init__(
+        self,
+        embedding_client: ModelDenseEmbedding,
+        config: SemanticRouterConfig,
+        exemplars: dict[SemanticRouterResponse, list[str]] | None = None,
+    ) -> None:
+        """
+        Initialize the router and embed the exemplars.
+
+        Args:
+            embedding_client: Local embedding model
+            config: Thresholds and sampling configuration
+            exemplars: Labelled exemplar messages per route
+                (default: SEMANTIC_ROUTE_EXEMPLARS)
+        """
+        self.embedding_client = embedding_client
+        self.config = config
+        exemplars = exemplars or SEMANTIC_ROUTE_EXEMPLARS
+
+        self.routes = list(exemplars)
+        texts = [text for route in self.routes for text in exemplars[route]]
+        self._labels = np.array(
+            [idx for idx, route in enumerate(self.routes) for _ in exemplars[route]]
+        )
+        self._exemplars = self._normalize(
+            np.vstack(self.embedding_client.embed_content(texts))
+        )
+        logger.info(
+            "local_semantic_router_ready",
+            routes=len(self.routes),
+            exemplars=len(texts),
+        )
+
+    @staticmethod
+    def _normalize(vectors: npt.NDArray[Any]) -> npt.NDArray[Any]:
+        """Scale vectors to unit length so dot products are cosine similarities."""
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    def classify(self, message: str) -> LocalRouteMatch:
+        """
+        Classify a message against the labelled exemplars.
+
+        Args:
+            message: The user message
+
+        Returns:
+            LocalRouteMatch: Best route with its score, margin and confidence
+        """
+        embedding = self._normalize(self.embedding_client.embed_content([message])[0])
+        similarities = self._exemplars @ embedding
+
+        route_scores = np.full(len(self.routes), -1.0)
+        np.maximum.at(route_scores, self._labels, similarities)
+        ranked = np.argsort(route_scores)[::-1]
+        score = float(route_scores[ranked[0]])
+        margin = score - float(route_scores[ranked[1]])
+
+        return LocalRouteMatch(
+            route=self.routes[ranked[0]],
+            score=score,
+            margin=margin,
+            confident=score >= self.config.confidence_threshold
+            and margin >= self.config.margin_threshold,
+        )
+
+    async def classify_async(self, message: str) -> LocalRouteMatch:
+        """Classify a message on the shared executor."""
+        return await run_in_executor(self.classify, message)
+
+    def should_shadow(self) -> bool:
+        """Whether a confident match should still be verified by the LLM router."""
+        return random.random() < self.config.shadow_sample_rate  # noqa: S311
+
+    @staticmethod
+    def record_decision(source: str, route: SemanticRouterResponse) -> None:
+        """Count a routing decision made by the local or the LLM router."""
+        _decisions.inc(source=source, route=route.value)
+
+    @staticmethod
+    def record_agreement(
+        match: LocalRouteMatch, llm_route: SemanticRouterResponse
+    ) -> None:
+        """
+        Record whether the local router agreed with the LLM router.
+
+        Confident matches verified by the LLM are recorded under mode "shadow",
+        low-margin matches that fell back to the LLM under mode "fallback".
+        """
+        agree = match.route == llm_route
+        _agreement.inc(
+            mode="shadow" if match.confident else "fallback",
+            local_route=match.route.value,
+            agree=str(agree).lower(),
+        )
+        logger.debug(
+            "semantic_router_agreement",
+            local_route=match.route,
+            llm_route=llm_route,
+            score=match.score,
+            margin=match.margin,
+            agree=agree,
+        )
@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+if TYPE_CHECKING:
+    from .config import HistoryConfig
+    from .history import HistoryManager
+    from .persistence import SQLiteSessionBackend
+    from .store import Session, SessionStore
+
+__all__ = [
+    "HistoryConfig",
+    "HistoryManager",
+    "SQLiteSessionBackend",
+    "Session",
+    "SessionStore",
+]
+
+__getattr__, __dir__ = lazy_exports(
+    __name__,
+    {
+        ".config": ["HistoryConfig"],
+        ".history": ["HistoryManager"],
+        ".persistence": ["SQLiteSessionBackend"],
+        ".store": ["Session", "SessionStore"],
+    },
+)
@@ -0,0 +1,24 @@
+from dataclasses import dataclass
+from typing import Any
+
+
+@dataclass(frozen=True)
+class HistoryConfig:
+    recent_turns: int
+    relevant_turns: int
+    token_budget: int
+    max_turn_tokens: int
+    summary_tokens: int
+    summarize: bool
+
+    @staticmethod
+    def load(history_config: dict[str, Any]) -> "HistoryConfig":
+        """Loads the conversation history config."""
+        return HistoryConfig(
+            recent_turns=history_config.get("recent_turns", 2),
+            relevant_turns=history_config.get("relevant_turns", 0),
+            token_budget=history_config.get("token_budget", 1500),
+            max_turn_tokens=history_config.get("max_turn_tokens", 400),
+            summary_tokens=history_config.get("summary_tokens", 300),
+            summarize=history_config.get("summarize", False),
+        )
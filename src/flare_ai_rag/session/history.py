@@ -0,0 +1,245 @@
+"""
+Conversation history rendering for prompts.
+
+RAG answers are long, so pasting every stored response into each prompt makes the
+prompts grow quickly. The HistoryManager renders a session's history into a
+compact block within a token budget instead:
+
+- a rolling summary of the responses that no longer fit in the session,
+- the most recent responses,
+- optionally, older stored responses selected by embedding similarity to the
+  current message (otherwise older responses are added by recency).
+
+The block is rendered once per request and shared by all pipeline stages.
+"""
+
+import asyncio
+import hashlib
+import re
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any
+
+import numpy as np
+import numpy.typing as npt
+import structlog
+
+from flare_ai_rag.ai import BaseAIProvider, ModelDenseEmbedding
+from flare_ai_rag.ai.context_cache import CHARS_PER_TOKEN
+from flare_ai_rag.concurrency import run_in_executor
+from flare_ai_rag.prompts import PromptService
+from flare_ai_rag.session.config import HistoryConfig
+from flare_ai_rag.session.store import Session
+
+logger = structlog.get_logger(__name__)
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text."""
+    return len(text) // CHARS_PER_TOKEN
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut a text to roughly `max_tokens` tokens, marking the cut."""
+    max_chars = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rsplit(" ", 1)[0] + " ..."
+
+
+class HistoryManager:
+    """
+    Renders session history into prompts and maintains the rolling summary.
+
+    Responses dropped from a session's history are folded into its summary,
+    either by the summarizer model or, without one, by keeping the first
+    sentence of each response. Summaries of a session are updated one at a
+    time, under its `summary_lock`, so that each folds into the previous one.
+    """
+
+    def __init__(
+        self,
+        config: HistoryConfig,
+        summarizer: BaseAIProvider | None = None,
+        embedding_client: ModelDenseEmbedding | None = None,
+        prompts: PromptService | None = None,
+        embedding_cache_size: int = 4096,
+    ) -> None:
+        """
+        Initialize the manager.
+
+        Args:
+            config: Budget and selection settings
+            summarizer: Model used to update the rolling summary
+            embedding_client: Local embedding model for relevance selection
+            prompts: Prompt service providing the summary prompt
+            embedding_cache_size: Number of response embeddings kept in memory
+        """
+        self.config = config
+        self.summarizer = summarizer if config.summarize else None
+        self.embedding_client = embedding_client if config.relevant_turns else None
+        self.prompts = prompts or PromptService()
+        self.embedding_cache_size = embedding_cache_size
+        self._embeddings: OrderedDict[str, npt.NDArray[Any]] = OrderedDict()
+        self._embeddings_lock = threading.Lock()
+        self._summary_locks: weakref.WeakValueDictionary[str, asyncio.Lock] = (
+            weakref.WeakValueDictionary()
+        )
+        self.logger = logger.bind(service="history")
+
+    def render(self, session: Session, message: str) -> str:
+        """
+        Render a session's history for inclusion in prompts.
+
+        May embed the message and older responses; see `render_async`.
+
+        Args:
+            session: Session of the client that sent the message
+            message: The current user message
+
+        Returns:
+            str: The history block, or an empty string if there is no history
+        """
+        if not session.history and not session.summary:
+            return ""
+
+        budget = self.config.token_budget
+        history_context = ""
+        if session.summary:
+            summary = truncate_tokens(session.summary, self.config.summary_tokens)
+            budget -= estimate_tokens(summary)
+            history_context += f"Summary of earlier responses:\n{summary}\n\n"
+
+        # Rank 1 is the most recent response.
+        ranked = [
+            (rank, truncate_tokens(text, self.config.max_turn_tokens))
+            for rank, text in enumerate(reversed(session.history), start=1)
+        ]
+        recent = ranked[: self.config.recent_turns]
+        older = ranked[self.config.recent_turns :]
+        if older and self.embedding_client is not None:
+            older = self._by_relevance(message, older)[: self.config.relevant_turns]
+
+        selected = []
+        for rank, text in recent + older:
+            tokens = estimate_tokens(text)
+            if tokens > budget:
+                break
+            budget -= tokens
+            selected.append((rank, text))
+        selected.sort()
+
+        if selected:
+            history_context += f"""List of {len(selected)} previous responses.
+Response 1 is the most recent response, and its tokens should be weighted more heavily.
+As the index of the response increases, its recency decreases, and the weight on its tokens should similarly decrease.
+Here is the list:
+"""  # noqa: E501
+            for rank, text in selected:
+                history_context += f"Response {rank}:\n{text}\n\n"
+
+        self.logger.debug(
+            "history_rendered",
+            stored=len(session.history),
+            selected=len(selected),
+            tokens=self.config.token_budget - budget,
+        )
+        return history_context
+
+    async def render_async(self, session: Session, message: str) -> str:
+        """Render a session's history, embedding on the shared executor."""
+        if self.embedding_client is None:
+            return self.render(session, message)
+        return await run_in_executor(self.render, session, message)
+
+    def _by_relevance(
+        self, message: str, turns: list[tuple[int, str]]
+    ) -> list[tuple[int, str]]:
+        """Order responses by cosine similarity to the message, best first."""
+        assert self.embedding_client is not None  # noqa: S101
+        query = self.embedding_client.embed_content([message])[0]
+        vectors = np.vstack([self._embed(text) for _, text in turns])
+        scores = (
+            vectors
+            @ query
+            / np.maximum(np.linalg.norm(vectors, axis=1) * np.linalg.norm(query), 1e-12)
+        )
+        return [turns[idx] for idx in np.argsort(scores)[::-1]]
+
+    def _embed(self, text: str) -> npt.NDArray[Any]:
+        """Embed a response, reusing the embedding of identical text."""
+        key = hashlib.sha256(text.encode()).hexdigest()
+        # Renders run on several executor threads at once.
+        with self._embeddings_lock:
+            vector = self._embeddings.get(key)
+            if vector is not None:
+                self._embeddings.move_to_end(key)
+                return vector
+        assert self.embedding_client is not None  # noqa: S101
+        vector = self.embedding_client.embed_content([text])[0]
+        with self._embeddings_lock:
+            self._embeddings[key] = vector
+            if len(self._embeddings) > self.embedding_cache_size:
+                self._embeddings.popitem(last=False)
+        return vector
+
+    def summary_lock(self, session_id: str) -> asyncio.Lock:
+        """
+        The lock serializing summary updates of a session.
+
+        Held from reading the session's summary until the updated summary is
+        saved, so that overlapping updates do not overwrite each other.
+        """
+        lock = self._summary_locks.get(session_id)
+        if lock is None:
+            lock = self._summary_locks[session_id] = asyncio.Lock()
+        return lock
+
+    async def summarize_async(self, session: Session, dropped: list[str]) -> None:
+        """
+        Fold responses dropped from the session's history into its summary.
+
+        Callers hold the session's `summary_lock` until the summary is saved.
+
+        Args:
+            session: Session whose history was trimmed
+            dropped: Dropped responses, oldest first
+        """
+        if not dropped:
+            return
+        if self.summarizer is not None:
+            responses = "\n\n".join(
+                truncate_tokens(text, self.config.max_turn_tokens) for text in dropped
+            )
+            prompt = self.prompts.get_formatted_prompt(
+                "history_summary",
+                summary=session.summary or "(empty)",
+                responses=responses,
+                max_words=str(self.config.summary_tokens * 3 // 4),
+            )[0]
+            try:
+                response = await self.summarizer.generate_async(prompt)
+            except Exception as e:
+                self.logger.exception("summarization_failed", error=str(e))
+            else:
+                session.summary = truncate_tokens(
+                    response.text.strip(), self.config.summary_tokens
+                )
+                return
+        session.summary = self._fold(session.summary, dropped)
+
+    def _fold(self, summary: str, dropped: list[str]) -> str:
+        """Append the first sentence of each response, keeping the newest text."""
+        leads = [
+            truncate_tokens(_SENTENCE_END.split(text.strip(), maxsplit=1)[0], 50)
+            for text in dropped
+            if text.strip()
+        ]
+        summary = " ".join([summary, *leads]).strip()
+        max_chars = self.config.summary_tokens * CHARS_PER_TOKEN
+        if len(summary) > max_chars:
+            summary = summary[-max_chars:].split(" ", 1)[-1]
+        return summary
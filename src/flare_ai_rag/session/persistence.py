@@ -0,0 +1,174 @@
+"""
+SQLite persistence for chat sessions.
+
+Sessions evicted from memory (or lost on restart) are reloaded from a local SQLite
+database when the client sends their session id again. The database runs in WAL
+mode so that several processes can share it.
+"""
+
+import json
+import sqlite3
+import threading
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.session.store import Session
+
+logger = structlog.get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    history TEXT NOT NULL,
+    summary TEXT NOT NULL DEFAULT '',
+    attestation_requested INTEGER NOT NULL,
+    prompt_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL
+)
+"""
+
+
+class SQLiteSessionBackend:
+    """
+    Stores sessions as rows of a SQLite table.
+
+    All methods are blocking; the SessionStore calls them on the shared executor.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        """
+        Open (and create, if needed) the session database.
+
+        Args:
+            db_path (Path): Location of the SQLite database file
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+        logger.debug("session_db_opened", db_path=str(db_path))
+
+    def load(self, session_id: str) -> Session | None:
+        """Load a session by id, returning None if it is not stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT history, summary, attestation_requested, prompt_tokens, "
+                "output_tokens, cost_usd, created_at, last_access "
+                "FROM sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        (
+            history,
+            summary,
+            attestation_requested,
+            prompt_tokens,
+            output_tokens,
+            cost_usd,
+            created_at,
+            last_access,
+        ) = row
+        return Session(
+            session_id=session_id,
+            history=json.loads(history),
+            summary=summary,
+            attestation_requested=bool(attestation_requested),
+            prompt_tokens=prompt_tokens,
+            output_tokens=output_tokens,
+            cost_usd=cost_usd,
+            created_at=created_at,
+            last_access=last_access,
+        )
+
+    def save(self, session: Session, usage: tuple[int, int, float]) -> None:
+        """
+        Insert or update a session.
+
+        An existing session keeps its stored summary, and its token and cost
+        totals are increased by `usage`.
+
+        Args:
+            session (Session): The session
+            usage (tuple[int, int, float]): Prompt tokens, output tokens and cost
+                added since the session was last saved
+        """
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sessions (session_id, history, summary, "
+                "attestation_requested, prompt_tokens, output_tokens, cost_usd, "
+                "created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(session_id) DO UPDATE SET history = excluded.history, "
+                "attestation_requested = excluded.attestation_requested, "
+                "prompt_tokens = prompt_tokens + ?, "
+                "output_tokens = output_tokens + ?, "
+                "cost_usd = cost_usd + ?, "
+                "last_access = excluded.last_access",
+                (
+                    session.session_id,
+                    json.dumps(session.history),
+                    session.summary,
+                    int(session.attestation_requested),
+                    session.prompt_tokens,
+                    session.output_tokens,
+                    session.cost_usd,
+                    session.created_at,
+                    session.last_access,
+                    *usage,
+                ),
+            )
+
+    def load_summary(self, session_id: str) -> str | None:
+        """Load a session's summary, returning None if it is not stored."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT summary FROM sessions WHERE session_id = ?", (session_id,)
+            ).fetchone()
+        return None if row is None else row[0]
+
+    def save_summary(
+        self, session_id: str, summary: str, usage: tuple[int, int, float]
+    ) -> None:
+        """Update a stored session's summary, and increase its usage totals."""
+        prompt_tokens, output_tokens, cost_usd = usage
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sessions SET summary = ?, "
+                "prompt_tokens = prompt_tokens + ?, "
+                "output_tokens = output_tokens + ?, "
+                "cost_usd = cost_usd + ? "
+                "WHERE session_id = ?",
+                (summary, prompt_tokens, output_tokens, cost_usd, session_id),
+            )
+
+    def delete(self, session_id: str) -> None:
+        """Delete a session, if stored."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+            )
+
+    def purge_expired(self, cutoff: float) -> int:
+        """
+        Delete sessions last accessed before `cutoff`.
+
+        Returns:
+            int: Number of deleted sessions
+        """
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM sessions WHERE last_access < ?", (cutoff,)
+            )
+        return cursor.rowcount
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
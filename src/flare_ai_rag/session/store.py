@@ -0,0 +1,320 @@
+"""
+Per-session conversation state for the chat API.
+
+Each client sends a session id with its messages; the SessionStore maps that id
+to the conversation history and attestation state of that client only. Sessions
+are kept in memory with LRU eviction bounded by a session count, a total memory
+budget and an idle TTL, and can optionally be persisted so that evicted sessions
+are restored on their next request.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Protocol
+
+import structlog
+
+from flare_ai_rag.concurrency import run_in_executor
+
+logger = structlog.get_logger(__name__)
+
+# Rough per-session overhead (object headers, id, flags) used for memory accounting
+SESSION_OVERHEAD_BYTES = 512
+
+
+@dataclass
+class Session:
+    """
+    Conversation state of a single client.
+
+    Attributes:
+        session_id (str): Identifier sent by the client
+        history (list[str]): Previous responses, oldest first
+        summary (str): Rolling summary of responses dropped from the history
+        attestation_requested (bool): Whether the next message is an
+            attestation nonce
+        prompt_tokens (int): Model input tokens spent on the session's requests
+        output_tokens (int): Model output tokens spent on the session's requests
+        cost_usd (float): Estimated model cost of the session's requests
+        created_at (float): Creation time (UNIX timestamp)
+        last_access (float): Last access time (UNIX timestamp)
+        unsaved_usage (tuple[int, int, float]): Tokens and cost added since the
+            session was last saved, persisted as increments
+    """
+
+    session_id: str
+    history: list[str] = field(default_factory=list)
+    summary: str = ""
+    attestation_requested: bool = False
+    prompt_tokens: int = 0
+    output_tokens: int = 0
+    cost_usd: float = 0.0
+    created_at: float = field(default_factory=time.time)
+    last_access: float = field(default_factory=time.time)
+    unsaved_usage: tuple[int, int, float] = (0, 0, 0.0)
+
+    def add_response(self, response: str, max_items: int) -> list[str]:
+        """
+        Append a response, keeping only the `max_items` most recent ones (none
+        if `max_items` is 0 or less).
+
+        Returns:
+            list[str]: The responses dropped from the history, oldest first
+        """
+        self.history.append(response)
+        keep = len(self.history) - max(max_items, 0)
+        dropped = self.history[:keep]
+        if dropped:
+            self.history = self.history[keep:]
+        return dropped
+
+    def add_usage(
+        self, prompt_tokens: int, output_tokens: int, cost_usd: float
+    ) -> None:
+        """Add the model usage of a request to the session's totals."""
+        self.prompt_tokens += prompt_tokens
+        self.output_tokens += output_tokens
+        self.cost_usd += cost_usd
+        unsaved_prompt, unsaved_output, unsaved_cost = self.unsaved_usage
+        self.unsaved_usage = (
+            unsaved_prompt + prompt_tokens,
+            unsaved_output + output_tokens,
+            unsaved_cost + cost_usd,
+        )
+
+    def take_unsaved_usage(self) -> tuple[int, int, float]:
+        """Return the usage added since the last call, and reset it."""
+        usage, self.unsaved_usage = self.unsaved_usage, (0, 0, 0.0)
+        return usage
+
+    def size_bytes(self) -> int:
+        """Approximate memory held by the session."""
+        return (
+            SESSION_OVERHEAD_BYTES
+            + len(self.summary)
+            + sum(len(item) for item in self.history)
+        )
+
+
+class SessionBackend(Protocol):
+    """Persistence backend for sessions (e.g. SQLiteSessionBackend)."""
+
+    def load(self, session_id: str) -> Session | None: ...
+
+    def save(self, session: Session, usage: tuple[int, int, float]) -> None: ...
+
+    def load_summary(self, session_id: str) -> str | None: ...
+
+    def save_summary(
+        self, session_id: str, summary: str, usage: tuple[int, int, float]
+    ) -> None: ...
+
+    def delete(self, session_id: str) -> None: ...
+
+    def purge_expired(self, cutoff: float) -> int: ...
+
+    def close(self) -> None: ...
+
+
+class SessionStore:
+    """
+    In-memory LRU store of chat sessions with optional persistence.
+
+    Sessions idle for longer than `ttl_seconds` expire. When the store holds more
+    than `max_sessions` sessions or `max_memory_bytes` of history, the least
+    recently used sessions are evicted from memory; with a backend configured they
+    remain persisted and are reloaded on their next access.
+
+    A store `shared` with other processes (server workers using the same
+    backend) reads sessions through the backend at every access, since another
+    process may have updated them; its memory holds no more than a cache.
+
+    The backend only stores a session's summary through `save_summary`, and
+    its token and cost totals as increments, so that saving a stale copy of a
+    session does not undo a summary or usage recorded in the meantime.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = 10_000,
+        ttl_seconds: float = 3600.0,
+        max_memory_bytes: int = 64 * 1024 * 1024,
+        backend: SessionBackend | None = None,
+        *,
+        shared: bool = False,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            max_sessions (int): Maximum number of sessions kept in memory
+            ttl_seconds (float): Idle time after which a session expires
+            max_memory_bytes (int): Approximate memory budget for all sessions
+            backend (SessionBackend | None): Optional persistence backend
+            shared (bool): Whether other processes share the backend
+
+        Raises:
+            ValueError: If the store is shared without a backend
+        """
+        if shared and backend is None:
+            msg = "A shared session store needs a persistence backend."
+            raise ValueError(msg)
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self.backend = backend
+        self.shared = shared
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._memory_bytes = 0
+        self._last_purge = time.time()
+        self.logger = logger.bind(service="sessions")
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the in-memory sessions."""
+        return self._memory_bytes
+
+    def _is_expired(self, session: Session, now: float) -> bool:
+        return now - session.last_access > self.ttl_seconds
+
+    async def get(self, session_id: str | None) -> Session:
+        """
+        Return the session with the given id, creating it if needed.
+
+        A missing, unknown or expired id yields a new, empty session; a new id is
+        generated if none is given.
+
+        Args:
+            session_id (str | None): Session id sent by the client
+
+        Returns:
+            Session: The session, marked as accessed now
+        """
+        now = time.time()
+        session_id = session_id or uuid.uuid4().hex
+        session = None if self.shared else self._sessions.get(session_id)
+
+        if session is None and self.backend is not None:
+            session = await run_in_executor(self.backend.load, session_id)
+            if session is not None:
+                self._track(session)
+
+        if session is not None and self._is_expired(session, now):
+            self.logger.debug("session_expired", session_id=session_id)
+            await self._remove(session_id, persisted=True)
+            session = None
+
+        if session is None:
+            session = Session(session_id=session_id, created_at=now)
+            self._track(session)
+
+        session.last_access = now
+        self._sessions.move_to_end(session_id)
+        return session
+
+    async def save(self, session: Session) -> None:
+        """
+        Record changes to a session and enforce the store's bounds.
+
+        Args:
+            session (Session): The session returned by `get`
+        """
+        session.last_access = time.time()
+        self._track(session)
+        if self.backend is not None:
+            await run_in_executor(
+                self.backend.save, session, session.take_unsaved_usage()
+            )
+        await self._evict()
+
+    async def reload_summary(self, session: Session) -> None:
+        """
+        Refresh a session's summary from a shared backend.
+
+        Another request may have updated the summary since the session was read;
+        stores that are not shared always hold the current summary.
+
+        Args:
+            session (Session): The session returned by `get`
+        """
+        if not self.shared:
+            return
+        assert self.backend is not None  # noqa: S101
+        summary = await run_in_executor(self.backend.load_summary, session.session_id)
+        if summary is not None:
+            session.summary = summary
+
+    async def save_summary(self, session: Session) -> None:
+        """
+        Record a session's new summary and the usage added since its last save.
+
+        Unlike `save`, the rest of the stored session is left as is, since other
+        requests may have updated it while the summary was written.
+
+        Args:
+            session (Session): The session returned by `get`
+        """
+        if self._sessions.get(session.session_id) is session:
+            self._track(session)
+        if self.backend is not None:
+            await run_in_executor(
+                self.backend.save_summary,
+                session.session_id,
+                session.summary,
+                session.take_unsaved_usage(),
+            )
+
+    def _track(self, session: Session) -> None:
+        """Add or refresh a session's memory accounting and LRU position."""
+        size = session.size_bytes()
+        self._memory_bytes += size - self._sizes.get(session.session_id, 0)
+        self._sizes[session.session_id] = size
+        self._sessions[session.session_id] = session
+        self._sessions.move_to_end(session.session_id)
+
+    async def _remove(self, session_id: str, *, persisted: bool) -> None:
+        """Drop a session from memory and, if `persisted`, from the backend."""
+        self._sessions.pop(session_id, None)
+        self._memory_bytes -= self._sizes.pop(session_id, 0)
+        if persisted and self.backend is not None:
+            await run_in_executor(self.backend.delete, session_id)
+
+    async def _evict(self) -> None:
+        """Expire idle sessions, then evict LRU sessions until within bounds."""
+        now = time.time()
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if not self._is_expired(session, now):
+                break
+            await self._remove(session_id, persisted=True)
+
+        evicted = 0
+        while len(self._sessions) > 1 and (
+            len(self._sessions) > self.max_sessions
+            or self._memory_bytes > self.max_memory_bytes
+        ):
+            session_id = next(iter(self._sessions))
+            await self._remove(session_id, persisted=False)
+            evicted += 1
+        if evicted:
+            self.logger.debug(
+                "sessions_evicted", evicted=evicted, memory_bytes=self._memory_bytes
+            )
+
+        if self.backend is not None and now - self._last_purge > self.ttl_seconds:
+            self._last_purge = now
+            purged = await run_in_executor(
+                self.backend.purge_expired, now - self.ttl_seconds
+            )
+            self.logger.debug("sessions_purged", purged=purged)
+
+    def close(self) -> None:
+        """Close the persistence backend, if any."""
+        if self.backend is not None:
+            self.backend.close()
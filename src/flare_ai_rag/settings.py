@@ -6,11 +6,14 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 logger = structlog.get_logger(__name__)
 
 
-def create_path(folder_name: str) -> Path:
-    """Creates and returns a path for storing data or logs."""
-    path = Path(__file__).parent.resolve().parent / f"{folder_name}"
-    path.mkdir(exist_ok=True)
-    return path
+def package_path(folder_name: str) -> Path:
+    """
+    Returns the path of a folder next to the package.
+
+    The folder is not created: importing the settings has no side effects on the
+    file system (it may be read-only, e.g. in a container image).
+    """
+    return Path(__file__).parent.resolve().parent / folder_name
 
 
 class Settings(BaseSettings):
@@ -24,17 +27,88 @@ class Settings(BaseSettings):
 
     # Gemini Settings
     gemini_api_key: str = ""
+    # Base URL of a Gemini-compatible REST endpoint, e.g. the local stand-in
+    # server (python -m flare_ai_rag.loadtest.standin) at "http://localhost:8900";
+    # Google's endpoint if empty
+    gemini_base_url: str = ""
+
+    # Gemini explicit context caching of system instructions and prompt prefixes.
+    # Prefixes shorter than the model's minimum cached content size are sent as
+    # plain prompts.
+    gemini_context_cache: bool = True
+    gemini_context_cache_ttl_seconds: float = 3600.0
+    gemini_context_cache_min_tokens: int = 4096
 
     # OpenRouter Settings
     open_router_base_url: str = "https://openrouter.ai/api/v1"
     open_router_api_key: str = ""
 
+    # Retries and circuit breaking for model provider calls
+    provider_max_attempts: int = 4
+    provider_backoff_base_seconds: float = 0.5
+    provider_backoff_max_seconds: float = 8.0
+    provider_deadline_seconds: float = 60.0
+    provider_attempt_timeout_seconds: float = 30.0
+    circuit_breaker_failure_threshold: int = 5
+    circuit_breaker_reset_seconds: float = 30.0
+
     # Restrict backend listener to specific IPs
     cors_origins: list[str] = ["*"]
 
+    # Size of the thread pool used to offload blocking SDK calls
+    executor_max_workers: int = 32
+
+    # Chat session store: LRU/TTL bounds and optional SQLite persistence
+    session_max_sessions: int = 10_000
+    session_ttl_seconds: float = 3600.0
+    session_max_memory_bytes: int = 64 * 1024 * 1024
+    session_db_path: str = ""
+
+    # Request tracing: requests slower than the threshold log their span tree
+    # (sampled); traces are exported to an OTLP/HTTP collector if an endpoint
+    # (e.g. "http://localhost:4318") is set.
+    trace_slow_request_seconds: float = 5.0
+    trace_slow_request_sample_rate: float = 1.0
+    otlp_endpoint: str = ""
+    otlp_sample_rate: float = 1.0
+
+    # Admission control of chat requests (see flare_ai_rag.api.admission)
+    admission_max_in_flight: int = 64
+    admission_max_queue: int = 128
+    admission_queue_timeout_seconds: float = 10.0
+
+    # vTPM attestation client: keep-alive connections to the attestation
+    # service's socket, and deadline of a token request
+    attestation_pool_size: int = 4
+    attestation_timeout_seconds: float = 10.0
+
+    # Traffic capture: a sample of the chat requests is appended, anonymized, to
+    # a JSONL file if a path is set (see flare_ai_rag.api.middleware.capture).
+    # Captures are replayed with `python -m flare_ai_rag.loadtest.replay`.
+    capture_path: str = ""
+    capture_sample_rate: float = 1.0
+    capture_salt: str = ""
+
+    # Local (fastembed) embedding models: directory the models are downloaded
+    # to, filled when the Docker image is built (fastembed's temporary directory
+    # if empty); ONNX Runtime threads per model (0 for one per core); use of the
+    # int8-quantized variants built with `python -m flare_ai_rag.ai.local_models
+    # --quantize`; and a warm-up inference when a model is loaded.
+    embedding_cache_dir: str = ""
+    embedding_threads: int = 0
+    embedding_quantized: bool = False
+    embedding_warm_up: bool = True
+
+    # Server worker processes, sharing the models loaded before they are forked
+    # (see flare_ai_rag.prefork); 0 for one per core. With several workers,
+    # sessions are shared through the session database (a temporary one if no
+    # path is set), and admission limits, usage budgets and metrics are per
+    # worker.
+    server_workers: int = 1
+
     # Path Settings
-    data_path: Path = create_path("data")
-    input_path: Path = create_path("flare_ai_rag")
+    data_path: Path = package_path("data")
+    input_path: Path = package_path("flare_ai_rag")
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -0,0 +1,31 @@
+from typing import TYPE_CHECKING
+
+from flare_ai_rag.lazy import lazy_exports
+
+from .spans import (
+    Span,
+    SpanExporter,
+    annotate,
+    current_span,
+    set_exporter,
+    shutdown_tracing,
+    span,
+    trace,
+)
+
+if TYPE_CHECKING:
+    from .otlp import OTLPExporter
+
+__all__ = [
+    "OTLPExporter",
+    "Span",
+    "SpanExporter",
+    "annotate",
+    "current_span",
+    "set_exporter",
+    "shutdown_tracing",
+    "span",
+    "trace",
+]
+
+__getattr__, __dir__ = lazy_exports(__name__, {".otlp": ["OTLPExporter"]})
@@ -0,0 +1,172 @@
+"""
+OTLP/HTTP export of traces.
+
+Sends finished traces to an OpenTelemetry collector (e.g. a local collector on
+port 4318) using the OTLP/HTTP JSON encoding, so traces can be inspected in any
+OTLP-compatible backend without adding the OpenTelemetry SDK as a dependency.
+
+Traces are sampled, queued and sent in batches from a background thread; when
+the queue is full, new traces are dropped rather than slowing requests down.
+"""
+
+import queue
+import random
+import threading
+from typing import Any
+
+import httpx
+import structlog
+
+from flare_ai_rag.tracing.spans import Span
+
+logger = structlog.get_logger(__name__)
+
+# OTLP status codes
+_STATUS_OK = 1
+_STATUS_ERROR = 2
+# OTLP span kinds
+_KIND_INTERNAL = 1
+_KIND_SERVER = 2
+
+
+def _value(value: Any) -> dict[str, Any]:
+    """Encode an attribute value as an OTLP AnyValue."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def encode_span(span: Span) -> dict[str, Any]:
+    """Encode a single span in the OTLP JSON format."""
+    start = int(span.start_time * 1e9)
+    encoded: dict[str, Any] = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name,
+        "kind": _KIND_SERVER if span.parent_id is None else _KIND_INTERNAL,
+        "startTimeUnixNano": str(start),
+        "endTimeUnixNano": str(start + int((span.duration or 0.0) * 1e9)),
+        "attributes": _attributes(span.attributes),
+        "status": {"code": _STATUS_OK if span.status == "ok" else _STATUS_ERROR},
+    }
+    if span.parent_id is not None:
+        encoded["parentSpanId"] = span.parent_id
+    return encoded
+
+
+class OTLPExporter:
+    """Exports sampled traces to an OTLP/HTTP collector in the background."""
+
+    def __init__(  # noqa: PLR0913
+        self,
+        endpoint: str,
+        *,
+        service_name: str = "flare-ai-rag",
+        sample_rate: float = 1.0,
+        max_queue: int = 1000,
+        batch_size: int = 64,
+        flush_interval: float = 2.0,
+        timeout: float = 5.0,
+    ) -> None:
+        """
+        Initialize the exporter and start its background thread.
+
+        Args:
+            endpoint: Collector base URL, e.g. "http://localhost:4318"
+            service_name: Service name reported to the collector
+            sample_rate: Fraction of traces exported
+            max_queue: Maximum number of traces waiting to be sent
+            batch_size: Maximum number of traces sent per request
+            flush_interval: Maximum delay before queued traces are sent (seconds)
+            timeout: Timeout of a request to the collector (seconds)
+        """
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.sample_rate = sample_rate
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue: queue.Queue[Span | None] = queue.Queue(maxsize=max_queue)
+        self._client = httpx.Client(timeout=timeout)
+        self.logger = logger.bind(service="otlp_exporter", url=self.url)
+        self._thread = threading.Thread(
+            target=self._run, name="otlp-exporter", daemon=True
+        )
+        self._thread.start()
+
+    def export(self, root: Span) -> None:
+        """Queue a finished trace, if it is sampled and the queue has room."""
+        if random.random() >= self.sample_rate:  # noqa: S311
+            return
+        try:
+            self._queue.put_nowait(root)
+        except queue.Full:
+            self.dropped += 1
+
+    def payload(self, roots: list[Span]) -> dict[str, Any]:
+        """Build the OTLP request body for a batch of traces."""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": _attributes({"service.name": self.service_name})
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": "flare_ai_rag"},
+                            "spans": [
+                                encode_span(span)
+                                for root in roots
+                                for span in root.walk()
+                            ],
+                        }
+                    ],
+                }
+            ]
+        }
+
+    def _send(self, roots: list[Span]) -> None:
+        try:
+            response = self._client.post(self.url, json=self.payload(roots))
+            response.raise_for_status()
+        except httpx.HTTPError as e:
+            self.dropped += len(roots)
+            self.logger.warning("otlp_export_failed", error=str(e), traces=len(roots))
+
+    def _run(self) -> None:
+        """Send queued traces in batches until shut down."""
+        stopping = False
+        while not stopping:
+            batch: list[Span] = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+                while True:
+                    if item is None:
+                        stopping = True
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                    item = self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            if batch:
+                self._send(batch)
+
+    def shutdown(self) -> None:
+        """Send the remaining queued traces and stop the background thread."""
+        self._queue.put(None)
+        self._thread.join(timeout=self.flush_interval + 10)
+        self._client.close()
@@ -0,0 +1,203 @@
+"""
+Lightweight request tracing.
+
+A trace is a tree of spans: the root span covers a whole request, child spans
+cover pipeline stages, provider calls and retriever calls. The active span is
+kept in a context variable, so spans opened in tasks and in the shared executor
+(which copies the context) attach to the right parent without passing it around.
+
+Spans opened outside a trace (e.g. while the collection is built at startup) are
+not recorded. When a trace ends, requests slower than the configured threshold
+log their span tree as a sampled "slow_request" event, and the trace is handed to
+the configured exporter (see `flare_ai_rag.tracing.otlp`), if any.
+"""
+
+import asyncio
+import random
+import secrets
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Protocol
+
+import structlog
+
+from flare_ai_rag.settings import settings
+
+logger = structlog.get_logger(__name__)
+
+
+@dataclass
+class Span:
+    """
+    A timed operation within a trace.
+
+    Attributes:
+        name: Operation name, e.g. "query_improvement"
+        trace_id: ID shared by all spans of the trace (32 hex digits)
+        span_id: ID of the span (16 hex digits)
+        parent_id: ID of the parent span, None for the root span
+        start_time: Start time (UNIX timestamp)
+        duration: Duration in seconds, None while the span is open
+        status: "ok", "error" or "cancelled"
+        attributes: Details of the operation (prompt chars, docs, tokens, ...)
+        children: Spans opened while this span was active
+    """
+
+    name: str
+    trace_id: str
+    span_id: str = field(default_factory=lambda: secrets.token_hex(8))
+    parent_id: str | None = None
+    start_time: float = field(default_factory=time.time)
+    duration: float | None = None
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+    children: list["Span"] = field(default_factory=list)
+    _started: float = field(default_factory=time.perf_counter, repr=False)
+
+    def set(self, **attributes: Any) -> None:
+        """Add attributes to the span."""
+        self.attributes.update(attributes)
+
+    def end(self) -> None:
+        self.duration = time.perf_counter() - self._started
+
+    def walk(self) -> Iterator["Span"]:
+        """Iterate over the span and all its descendants, depth first."""
+        yield self
+        for child in list(self.children):
+            yield from child.walk()
+
+    def to_dict(self) -> dict[str, Any]:
+        """The span tree as nested dicts, for logging."""
+        tree: dict[str, Any] = {
+            "name": self.name,
+            "duration_ms": round((self.duration or 0.0) * 1000, 1),
+            "status": self.status,
+        }
+        if self.attributes:
+            tree["attributes"] = self.attributes
+        if self.children:
+            tree["children"] = [
+                child.to_dict()
+                for child in sorted(self.children, key=lambda c: c.start_time)
+            ]
+        return tree
+
+
+class SpanExporter(Protocol):
+    """Receives finished traces (root spans with their descendants)."""
+
+    def export(self, root: Span) -> None: ...
+
+    def shutdown(self) -> None: ...
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_exporter: SpanExporter | None = None
+
+
+def set_exporter(exporter: SpanExporter | None) -> None:
+    """Set the exporter finished traces are handed to (None to disable)."""
+    global _exporter  # noqa: PLW0603
+    _exporter = exporter
+
+
+def shutdown_tracing() -> None:
+    """Flush and stop the exporter, if any."""
+    if _exporter is not None:
+        _exporter.shutdown()
+        set_exporter(None)
+
+
+def current_span() -> Span | None:
+    """The active span, None outside a trace."""
+    return _current_span.get()
+
+
+def annotate(**attributes: Any) -> None:
+    """Add attributes to the active span, if any."""
+    active = _current_span.get()
+    if active is not None:
+        active.set(**attributes)
+
+
+@contextmanager
+def _activate(active: Span) -> Iterator[Span]:
+    token = _current_span.set(active)
+    try:
+        yield active
+    except asyncio.CancelledError:
+        active.status = "cancelled"
+        raise
+    except BaseException as e:
+        active.status = "error"
+        active.attributes["error"] = type(e).__name__
+        raise
+    finally:
+        active.end()
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: Any) -> Iterator[Span | None]:
+    """
+    Open a child span of the active span.
+
+    Attributes set to None are left out.
+
+    Yields:
+        Span | None: The new span, or None outside a trace (nothing is recorded)
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = Span(
+        name=name,
+        trace_id=parent.trace_id,
+        parent_id=parent.span_id,
+        attributes={k: v for k, v in attributes.items() if v is not None},
+    )
+    parent.children.append(child)
+    with _activate(child):
+        yield child
+
+
+@contextmanager
+def trace(name: str, **attributes: Any) -> Iterator[Span]:
+    """
+    Open the root span of a new trace, e.g. for a request.
+
+    When the trace ends it is logged if it was slow, and exported.
+
+    Yields:
+        Span: The root span
+    """
+    root = Span(name=name, trace_id=secrets.token_hex(16), attributes=attributes)
+    try:
+        with _activate(root):
+            yield root
+    finally:
+        _finish(root)
+
+
+def _finish(root: Span) -> None:
+    duration = root.duration or 0.0
+    if (
+        duration >= settings.trace_slow_request_seconds
+        and random.random() < settings.trace_slow_request_sample_rate  # noqa: S311
+    ):
+        logger.warning(
+            "slow_request",
+            trace_id=root.trace_id,
+            duration_ms=round(duration * 1000, 1),
+            spans=root.to_dict(),
+        )
+    if _exporter is not None:
+        try:
+            _exporter.export(root)
+        except Exception as e:  # noqa: BLE001
+            logger.warning("trace_export_failed", error=str(e))
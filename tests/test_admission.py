@@ -0,0 +1,117 @@
+import asyncio
+
+import structlog
+
+from flare_ai_rag.api.admission import AdmissionController, AdmissionRejectedError
+
+logger = structlog.get_logger(__name__)
+
+
+async def _hold(controller: AdmissionController, release: asyncio.Event) -> None:
+    async with controller.admit():
+        await release.wait()
+
+
+async def _rejection(controller: AdmissionController) -> AdmissionRejectedError:
+    try:
+        async with controller.admit():
+            pass
+    except AdmissionRejectedError as e:
+        return e
+    msg = "The request was admitted"
+    raise AssertionError(msg)
+
+
+def test_queue_full_and_timeout() -> None:
+    async def run() -> None:
+        controller = AdmissionController(
+            max_in_flight=1, max_queue=1, queue_timeout=0.05
+        )
+        release = asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, release))
+        await asyncio.sleep(0)
+        assert controller.in_flight == 1
+
+        # One request waits in the queue; the next one finds it full.
+        queued = asyncio.create_task(_rejection(controller))
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+        full = await _rejection(controller)
+        assert full.status_code == 429  # noqa: PLR2004
+        assert full.retry_after >= 1
+
+        # The queued request's deadline passes before the slot frees up.
+        timed_out = await queued
+        assert timed_out.status_code == 503  # noqa: PLR2004
+        assert controller.queued == 0
+
+        release.set()
+        await holder
+        assert controller.in_flight == 0
+
+    asyncio.run(run())
+    logger.info("Excess requests rejected with 429 and 503.")
+
+
+def test_slot_handoff() -> None:
+    async def run() -> None:
+        controller = AdmissionController(max_in_flight=1, max_queue=2)
+        first, second = asyncio.Event(), asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, first))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(_hold(controller, second))
+        await asyncio.sleep(0)
+        assert controller.queued == 1
+
+        # The released slot goes to the waiter, never above the limit.
+        first.set()
+        await holder
+        await asyncio.sleep(0)
+        assert controller.in_flight == 1
+        assert controller.queued == 0
+        second.set()
+        await waiter
+        assert controller.in_flight == 0
+
+    asyncio.run(run())
+
+
+def test_cancelled_waiter_passes_slot_on() -> None:
+    async def run() -> None:
+        controller = AdmissionController(max_in_flight=1, max_queue=2)
+        first, last = asyncio.Event(), asyncio.Event()
+        holder = asyncio.create_task(_hold(controller, first))
+        await asyncio.sleep(0)
+        gone = asyncio.create_task(_hold(controller, asyncio.Event()))
+        waiter = asyncio.create_task(_hold(controller, last))
+        await asyncio.sleep(0)
+        assert controller.queued == 2  # noqa: PLR2004
+
+        # The slot is handed to a client that disconnects before it runs.
+        first.set()
+        await asyncio.sleep(0)
+        assert holder.done()
+        gone.cancel()
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+        assert gone.cancelled()
+        assert controller.in_flight == 1
+        assert controller.queued == 0
+
+        # The next waiter got the slot.
+        last.set()
+        await waiter
+        assert controller.in_flight == 0
+
+    asyncio.run(run())
+    logger.info("Slot handed over past a cancelled waiter.")
+
+
+def main() -> None:
+    test_queue_full_and_timeout()
+    test_slot_handoff()
+    test_cancelled_waiter_passes_slot_on()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+import datetime as dt
+import multiprocessing
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any
+
+import jwt
+import structlog
+
+from flare_ai_rag.attestation import VtpmValidation, VtpmValidationError
+from flare_ai_rag.attestation.cert_chains import CertificateChainCache, VerifiedChain
+from flare_ai_rag.attestation.oidc_keys import OIDCKeyCache, cache_lifetimes
+from flare_ai_rag.loadtest import tokens
+
+logger = structlog.get_logger(__name__)
+
+
+def _wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            msg = "Timed out"
+            raise TimeoutError(msg)
+        time.sleep(0.01)
+
+
+def test_cache_lifetimes() -> None:
+    assert cache_lifetimes({"Cache-Control": "public, max-age=600"}, 300, 60) == (
+        600,
+        60,
+    )
+    # The Age header counts against max-age.
+    assert cache_lifetimes(
+        {"Cache-Control": "max-age=600, stale-while-revalidate=30", "Age": "100"},
+        300,
+        60,
+    ) == (500, 30)
+    assert cache_lifetimes({"Cache-Control": "no-store"}, 300, 60) == (0, 0)
+    assert cache_lifetimes({}, 300, 60) == (300, 60)
+    assert cache_lifetimes({"Cache-Control": "max-age=abc"}, 300, 60) == (300, 60)
+
+
+def test_fresh_keys_are_cached() -> None:
+    issuer = tokens.TestIssuer()
+    with issuer.serve() as base_url:
+        keys = OIDCKeyCache(base_url + tokens.OIDC_ENDPOINT)
+        for _ in range(20):
+            for kid in issuer.oidc_keys:
+                assert keys.get_key(kid) is not None
+    assert issuer.requests[tokens.OIDC_ENDPOINT] == 1
+    assert issuer.requests[tokens.JWKS_ENDPOINT] == 1
+    logger.info("Keys fetched once.", requests=dict(issuer.requests))
+
+
+def test_stale_keys_are_revalidated() -> None:
+    issuer = tokens.TestIssuer(oidc_keys=1)
+    kid = next(iter(issuer.oidc_keys))
+    with issuer.serve("max-age=0, stale-while-revalidate=60") as base_url:
+        keys = OIDCKeyCache(base_url + tokens.OIDC_ENDPOINT)
+        assert keys.get_key(kid) is not None
+        # Expired but within the stale window: served from the cache at once,
+        # and refreshed in the background.
+        assert keys.get_key(kid) is not None
+        _wait_for(lambda: issuer.requests[tokens.JWKS_ENDPOINT] == 2)  # noqa: PLR2004
+    assert issuer.requests[tokens.OIDC_ENDPOINT] == 2  # noqa: PLR2004
+
+    # Documents that may not be cached are fetched at every use.
+    issuer.requests.clear()
+    with issuer.serve("no-cache") as base_url:
+        keys = OIDCKeyCache(base_url + tokens.OIDC_ENDPOINT)
+        for _ in range(3):
+            assert keys.get_key(kid) is not None
+    assert issuer.requests[tokens.JWKS_ENDPOINT] == 3  # noqa: PLR2004
+
+
+def test_unknown_kid_refresh_is_rate_limited() -> None:
+    issuer = tokens.TestIssuer(oidc_keys=1)
+    with issuer.serve() as base_url:
+        keys = OIDCKeyCache(base_url + tokens.OIDC_ENDPOINT, min_refresh_interval=0.2)
+        # The first unknown kid refreshes the JWKS; the next ones do not.
+        for _ in range(10):
+            assert keys.get_key("unknown") is None
+        assert issuer.requests[tokens.JWKS_ENDPOINT] == 2  # noqa: PLR2004
+        # After the interval, another refresh is allowed.
+        time.sleep(0.25)
+        assert keys.get_key("unknown") is None
+        assert issuer.requests[tokens.JWKS_ENDPOINT] == 3  # noqa: PLR2004
+    logger.info("Unknown kid refreshes rate-limited.")
+
+
+def test_concurrent_misses_are_coalesced() -> None:
+    issuer = tokens.TestIssuer(oidc_keys=1)
+    kid = next(iter(issuer.oidc_keys))
+
+    def validations(keys: OIDCKeyCache) -> list[object]:
+        with ThreadPoolExecutor(16) as threads:
+            return list(threads.map(lambda _: keys.get_key(kid), range(16)))
+
+    # Cold cache: one fetch of each document serves every waiting validation.
+    with issuer.serve(delay=0.2) as base_url:
+        keys = OIDCKeyCache(base_url + tokens.OIDC_ENDPOINT)
+        assert all(validations(keys))
+    assert issuer.requests[tokens.OIDC_ENDPOINT] == 1
+    assert issuer.requests[tokens.JWKS_ENDPOINT] == 1
+
+    # Past the stale window, the same holds for the refetch.
+    issuer.requests.clear()
+    with issuer.serve("no-cache", delay=0.2) as base_url:
+        keys = OIDCKeyCache(base_url + tokens.OIDC_ENDPOINT)
+        assert all(validations(keys))
+    assert issuer.requests[tokens.OIDC_ENDPOINT] == 1
+    assert issuer.requests[tokens.JWKS_ENDPOINT] == 1
+    logger.info("Concurrent misses coalesced.", requests=dict(issuer.requests))
+
+
+def _claims(subject: str = "workload", expires_in: int = 3600) -> dict[str, object]:
+    return {"iss": "test", "sub": subject, "exp": int(time.time()) + expires_in}
+
+
+def test_chain_expiry_and_eviction() -> None:
+    issuer = tokens.TestIssuer(oidc_keys=0)
+    key = issuer.leaf_key.public_key()
+    now = dt.datetime.now(tz=dt.UTC)
+    chains = CertificateChainCache(max_chains=2)
+
+    x5c = issuer.x5c
+    chains.put(x5c, VerifiedChain(key, now + dt.timedelta(hours=1)))
+    assert chains.get(x5c, now) is not None
+    # Past the earliest certificate expiry, the chain is dropped.
+    assert chains.get(x5c, now + dt.timedelta(hours=2)) is None
+    assert len(chains) == 0
+
+    # The least recently used chain is evicted.
+    others = [[f"cert-{i}", *x5c[1:]] for i in range(3)]
+    for other in others[:2]:
+        chains.put(other, VerifiedChain(key, now + dt.timedelta(hours=1)))
+    assert chains.get(others[0], now) is not None
+    chains.put(others[2], VerifiedChain(key, now + dt.timedelta(hours=1)))
+    assert len(chains) == 2  # noqa: PLR2004
+    assert chains.get(others[1], now) is None
+    assert chains.get(others[0], now) is not None
+
+
+def test_verified_chains_are_cached() -> None:
+    issuer, untrusted = tokens.TestIssuer(oidc_keys=0), tokens.TestIssuer(oidc_keys=0)
+    with issuer.serve() as base_url:
+        validator = VtpmValidation(
+            expected_issuer=base_url, root_fingerprint=issuer.root_fingerprint
+        )
+        for i in range(10):
+            claims = validator.validate_token(issuer.pki_token(_claims(f"w{i}")))
+            assert claims["sub"] == f"w{i}"
+        assert len(validator.chains) == 1
+        assert issuer.requests[tokens.PKI_ENDPOINT] == 1
+
+        # A chain failing verification is not cached.
+        for _ in range(2):
+            try:
+                validator.validate_token(untrusted.pki_token(_claims()))
+            except VtpmValidationError:
+                pass
+            else:
+                msg = "An untrusted chain was accepted"
+                raise AssertionError(msg)
+        assert len(validator.chains) == 1
+    logger.info("Verified chain cached.")
+
+
+def _mixed_batch(issuer: tokens.TestIssuer, other: tokens.TestIssuer) -> list[str]:
+    kid = next(iter(issuer.oidc_keys))
+    other_key = next(iter(other.oidc_keys.values()))
+    return [
+        issuer.pki_token(_claims("pki")),
+        issuer.oidc_token(_claims("oidc"), kid),
+        issuer.pki_token(_claims("expired pki", expires_in=-60)),
+        issuer.oidc_token(_claims("expired oidc", expires_in=-60), kid),
+        # Signed with another key than the header names.
+        jwt.encode(_claims(), other_key, algorithm="RS256", headers={"kid": kid}),
+        jwt.encode(
+            _claims(), other.leaf_key, algorithm="RS256", headers={"x5c": issuer.x5c}
+        ),
+        other.pki_token(_claims("untrusted chain")),
+        jwt.encode(_claims(), other_key, algorithm="RS256", headers={"kid": "unknown"}),
+        jwt.encode(
+            _claims(), "a shared secret of at least 32 bytes", algorithm="HS256"
+        ),
+        "not-a-token",
+        issuer.pki_token(_claims("pki 2")),
+        issuer.oidc_token(_claims("oidc 2"), kid),
+    ]
+
+
+def _one_at_a_time(validator: VtpmValidation, batch: list[str]) -> list[Any]:
+    results: list[Any] = []
+    for token in batch:
+        try:
+            results.append(validator.validate_token(token))
+        except Exception as e:  # noqa: BLE001
+            results.append(e)
+    return results
+
+
+def _check_batch(
+    validator: VtpmValidation,
+    batch: list[str],
+    expected: list[Any],
+    executor: Executor | None,
+) -> None:
+    results = validator.validate_tokens(batch, executor, chunk_size=2)
+    assert len(results) == len(batch)
+    for result, one in zip(results, expected, strict=True):
+        if isinstance(one, Exception):
+            assert isinstance(result, VtpmValidationError), (one, result)
+        else:
+            assert result == one
+
+
+def test_validate_tokens_matches_validate_token() -> None:
+    issuer, other = tokens.TestIssuer(), tokens.TestIssuer(oidc_keys=1)
+    batch = _mixed_batch(issuer, other)
+    with issuer.serve() as base_url:
+        validator = VtpmValidation(
+            expected_issuer=base_url, root_fingerprint=issuer.root_fingerprint
+        )
+        expected = _one_at_a_time(validator, batch)
+        valid = [one["sub"] for one in expected if not isinstance(one, Exception)]
+        assert valid == ["pki", "oidc", "pki 2", "oidc 2"]
+
+        _check_batch(validator, batch, expected, None)
+        with ThreadPoolExecutor(2) as threads:
+            _check_batch(validator, batch, expected, threads)
+        with ProcessPoolExecutor(
+            2, mp_context=multiprocessing.get_context("forkserver")
+        ) as processes:
+            _check_batch(validator, batch, expected, processes)
+        assert validator.validate_tokens([]) == []
+    logger.info("Batch results match single validations.", tokens=len(batch))
+
+
+def main() -> None:
+    test_cache_lifetimes()
+    test_fresh_keys_are_cached()
+    test_stale_keys_are_revalidated()
+    test_unknown_kid_refresh_is_rate_limited()
+    test_concurrent_misses_are_coalesced()
+    test_chain_expiry_and_eviction()
+    test_verified_chains_are_cached()
+    test_validate_tokens_matches_validate_token()
+
+
+if __name__ == "__main__":
+    main()
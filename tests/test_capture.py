@@ -0,0 +1,52 @@
+import json
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.api.middleware import TrafficCapture
+
+logger = structlog.get_logger(__name__)
+
+RECORDS = 500
+
+
+def _capture(path: Path, worker: int) -> None:
+    capture = TrafficCapture(path, salt="shared")
+    for i in range(RECORDS):
+        capture.record(
+            {
+                "message": f"worker {worker} " + "x" * 3000,
+                "session": capture.session_key("session"),
+                "index": i,
+            }
+        )
+    capture.shutdown()
+
+
+def test_workers_share_a_capture_file() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = Path(temp_dir) / "capture.jsonl"
+        context = multiprocessing.get_context("forkserver")
+        workers = [
+            context.Process(target=_capture, args=(path, worker)) for worker in range(4)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        # Every line is a whole record, whichever worker wrote it.
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert len(records) == len(workers) * RECORDS
+    # With a shared salt, a session hashes the same in every worker.
+    assert len({record["session"] for record in records}) == 1
+    logger.info("Workers appended whole records.", records=len(records))
+
+
+def main() -> None:
+    test_workers_share_a_capture_file()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+import threading
+import time
+from typing import override
+
+import structlog
+
+from flare_ai_rag.ai import ContextCacheManager, InMemoryContextCacheBackend
+from flare_ai_rag.ai.context_cache import CachedPrefix
+from flare_ai_rag.ai.gemini import SYSTEM_INSTRUCTION
+from flare_ai_rag.prompts import PromptService
+
+logger = structlog.get_logger(__name__)
+
+
+class GatedBackend(InMemoryContextCacheBackend):
+    """In-memory backend whose creations of one prefix wait for a gate."""
+
+    def __init__(self, gated_prefix: str) -> None:
+        super().__init__()
+        self.gated_prefix = gated_prefix
+        self.started = threading.Event()
+        self.gate = threading.Event()
+
+    @override
+    def create(
+        self,
+        model: str,
+        system_instruction: str | None,
+        prefix: str,
+        ttl_seconds: float,
+    ) -> CachedPrefix:
+        if prefix == self.gated_prefix:
+            self.started.set()
+            self.gate.wait(5)
+        return super().create(model, system_instruction, prefix, ttl_seconds)
+
+
+def _prefixes() -> list[str]:
+    prefixes = PromptService().get_static_prefixes()
+    logger.info("Loaded template prefixes.", count=len(prefixes))
+    return prefixes
+
+
+def test_cache_reuse_and_refresh() -> None:
+    prefixes = _prefixes()
+    backend = InMemoryContextCacheBackend()
+    cache = ContextCacheManager(
+        backend,
+        model="gemini-2.0-flash",
+        system_instruction=SYSTEM_INSTRUCTION,
+        prefixes=prefixes,
+        ttl_seconds=0.2,
+        refresh_margin_seconds=0.1,
+    )
+
+    prompt = prefixes[0] + "What is the FTSO?"
+    first = cache.lookup(prompt)
+    second = cache.lookup(prompt)
+    assert first is not None
+    assert first == second
+    assert first.prefix == prefixes[0]
+    logger.info("Prefix cached and reused.", name=first.name, creates=backend.creates)
+
+    # Within the refresh margin the entry is extended, not recreated.
+    time.sleep(0.15)
+    refreshed = cache.lookup(prompt)
+    assert refreshed is not None
+    assert refreshed.name == first.name
+    logger.info("Entry refreshed.", refreshes=backend.refreshes)
+
+    # Once expired, a new entry is created.
+    time.sleep(0.25)
+    recreated = cache.lookup(prompt)
+    assert recreated is not None
+    assert recreated.name != first.name
+    logger.info("Expired entry recreated.", creates=backend.creates)
+
+    # Prompts without a registered prefix use the system instruction cache.
+    other = cache.lookup("Hello!")
+    assert other is not None
+    assert not other.prefix
+
+
+def test_fallback_when_unavailable() -> None:
+    prefixes = _prefixes()
+    # The stand-in rejects everything, like a model below its minimum size.
+    backend = InMemoryContextCacheBackend(min_tokens=1_000_000)
+    cache = ContextCacheManager(
+        backend,
+        model="gemini-2.0-flash",
+        system_instruction=SYSTEM_INSTRUCTION,
+        prefixes=prefixes,
+    )
+    prompt = prefixes[0] + "What is the FTSO?"
+    assert cache.lookup(prompt) is None
+    assert cache.lookup(prompt) is None
+    logger.info("Fell back to plain prompts.", creates=backend.creates)
+
+    # Prefixes below the configured minimum are never sent to the API.
+    small = ContextCacheManager(
+        backend,
+        model="gemini-2.0-flash",
+        system_instruction=SYSTEM_INSTRUCTION,
+        prefixes=prefixes,
+        min_tokens=1_000_000,
+    )
+    assert small.lookup(prompt) is None
+    assert not small.registered_prefixes
+
+
+def test_slow_creation_does_not_block_lookups() -> None:
+    prefixes = _prefixes()
+    backend = GatedBackend(prefixes[0])
+    cache = ContextCacheManager(
+        backend,
+        model="gemini-2.0-flash",
+        system_instruction=SYSTEM_INSTRUCTION,
+        prefixes=prefixes,
+    )
+    prompt = prefixes[0] + "What is the FTSO?"
+    results: list[CachedPrefix | None] = []
+    creator = threading.Thread(target=lambda: results.append(cache.lookup(prompt)))
+    creator.start()
+    assert backend.started.wait(5)
+
+    # While the entry is being created, the same prefix is served without a
+    # cache and other prefixes are cached as usual.
+    assert cache.lookup(prompt) is None
+    other = cache.lookup("Hello!")
+    assert other is not None
+    assert not other.prefix
+    backend.gate.set()
+    creator.join()
+
+    assert results[0] is not None
+    assert cache.lookup(prompt) == results[0]
+    assert backend.creates == 2  # noqa: PLR2004
+    logger.info("Lookups went on during a slow creation.", creates=backend.creates)
+
+
+def main() -> None:
+    test_cache_reuse_and_refresh()
+    test_fallback_when_unavailable()
+    test_slow_creation_does_not_block_lookups()
+
+
+if __name__ == "__main__":
+    main()
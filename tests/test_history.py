@@ -0,0 +1,131 @@
+import asyncio
+import threading
+from typing import Any, override
+
+import numpy as np
+import numpy.typing as npt
+import structlog
+
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.session import HistoryConfig, HistoryManager, Session
+
+logger = structlog.get_logger(__name__)
+
+
+class StubSummarizer(BaseAIProvider):
+    """Summarizer answering "summary <n>" after a delay, recording its prompts."""
+
+    def __init__(self, delay: float = 0.05, **kwargs: Any) -> None:
+        self.api_key = ""
+        self.model = "stub"
+        self.delay = delay
+        self.prompts: list[str] = []
+
+    @override
+    def reset(self) -> None:
+        self.prompts.clear()
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        self.model = model
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        self.prompts.append(prompt)
+        text = f"summary {len(self.prompts)}"
+        return ModelResponse(text=text, raw_response=None, metadata={})
+
+    @override
+    async def generate_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        await asyncio.sleep(self.delay)
+        return self.generate(prompt)
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        return self.generate(msg)
+
+
+class StubEmbedding:
+    """Embeds a text as the counts of its first letters."""
+
+    def embed_content(self, contents: list[str], **kwargs: Any) -> list[Any]:
+        vectors: list[npt.NDArray[Any]] = []
+        for text in contents:
+            vector = np.ones(26)
+            for word in text.lower().split():
+                if "a" <= word[0] <= "z":
+                    vector[ord(word[0]) - ord("a")] += 1
+            vectors.append(vector)
+        return vectors
+
+
+def test_overlapping_summaries_are_serialized() -> None:
+    summarizer = StubSummarizer()
+    history = HistoryManager(HistoryConfig.load({"summarize": True}), summarizer)
+    session = Session(session_id="s")
+
+    async def summarize(dropped: list[str]) -> None:
+        async with history.summary_lock(session.session_id):
+            await history.summarize_async(session, dropped)
+
+    async def overlapping() -> None:
+        await asyncio.gather(
+            summarize(["First dropped response."]),
+            summarize(["Second dropped response."]),
+        )
+
+    asyncio.run(overlapping())
+    # The second update folded its responses into the first one's summary.
+    assert len(summarizer.prompts) == 2  # noqa: PLR2004
+    assert "summary 1" in summarizer.prompts[1]
+    assert session.summary == "summary 2"
+    logger.info("Overlapping summaries serialized.", summary=session.summary)
+
+
+def test_concurrent_renders_share_embeddings() -> None:
+    config = HistoryConfig.load({"recent_turns": 1, "relevant_turns": 3})
+    history = HistoryManager(
+        config,
+        embedding_client=StubEmbedding(),  # type: ignore[arg-type]
+        embedding_cache_size=4,
+    )
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf"]
+    errors: list[BaseException] = []
+
+    def render(offset: int) -> None:
+        try:
+            for i in range(200):
+                session = Session(
+                    session_id=f"s{offset}",
+                    history=[f"{words[(i + j) % len(words)]} answer" for j in range(6)],
+                )
+                history.render(session, words[(offset + i) % len(words)])
+        except BaseException as e:  # noqa: BLE001
+            errors.append(e)
+
+    threads = [threading.Thread(target=render, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert not errors, errors
+    logger.info("Concurrent renders completed.")
+
+
+def main() -> None:
+    test_overlapping_summaries_are_serialized()
+    test_concurrent_renders_share_embeddings()
+
+
+if __name__ == "__main__":
+    main()
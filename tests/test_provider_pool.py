@@ -0,0 +1,167 @@
+import asyncio
+import time
+from typing import Any, override
+
+import structlog
+
+from flare_ai_rag.ai import ProviderPool, ProviderPoolConfig
+from flare_ai_rag.ai.base import BaseAIProvider, ModelResponse
+from flare_ai_rag.ai.resilience import (
+    CircuitState,
+    ProviderHTTPError,
+    call_with_retry_async,
+    get_circuit_breaker,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+class StubProvider(BaseAIProvider):
+    """Provider answering with its name after a fixed delay, or failing."""
+
+    def __init__(
+        self, name: str, delay: float = 0.0, *, fail: bool = False, **kwargs: Any
+    ) -> None:
+        self.api_key = ""
+        self.model = self.model_name = self.provider_name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    @override
+    def reset(self) -> None:
+        self.calls = 0
+
+    @override
+    def reset_model(self, model: str, **kwargs: str) -> None:
+        self.model = model
+
+    def _respond(self) -> ModelResponse:
+        self.calls += 1
+        if self.fail:
+            msg = "Bad Request"
+            raise ProviderHTTPError(msg, 400)
+        return ModelResponse(text=self.provider_name, raw_response=None, metadata={})
+
+    @override
+    def generate(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        time.sleep(self.delay)
+        return self._respond()
+
+    @override
+    async def generate_async(
+        self,
+        prompt: str,
+        response_mime_type: str | None = None,
+        response_schema: Any | None = None,
+    ) -> ModelResponse:
+        async def call() -> ModelResponse:
+            await asyncio.sleep(self.delay)
+            return self._respond()
+
+        return await call_with_retry_async(self.provider_name, call)
+
+    @override
+    def send_message(self, msg: str) -> ModelResponse:
+        return self.generate(msg)
+
+
+def _config(**overrides: Any) -> ProviderPoolConfig:
+    return ProviderPoolConfig.load(
+        {
+            "enabled": True,
+            "hedging": True,
+            "min_samples": 5,
+            "hedge_min_delay_ms": 20,
+            "exploration_rate": 0.0,
+            **overrides,
+        }
+    )
+
+
+def test_failover() -> None:
+    failing, backup = StubProvider("pool-failing", fail=True), StubProvider("pool-ok")
+    pool = ProviderPool("test", [("failing", failing), ("backup", backup)], _config())
+    response = pool.generate("Hello")
+    assert response.text == "pool-ok"
+    assert response.metadata["pool_member"] == "backup"
+    assert failing.calls == backup.calls == 1
+
+    # A member that only failed is tried last.
+    for _ in range(5):
+        pool.generate("Hello")
+    assert [m.name for m in pool.ranked()] == ["backup", "failing"]
+    assert failing.calls == 1
+    assert backup.calls == 6  # noqa: PLR2004
+    logger.info("Failed over to the backup member.", stats=pool.stats())
+
+
+def test_half_open_member_is_unhealthy() -> None:
+    provider = StubProvider("pool-half-open")
+    pool = ProviderPool("test", [("member", provider)], _config())
+    member = pool.members[0]
+    breaker = get_circuit_breaker("pool-half-open")
+    breaker.failure_threshold, breaker.reset_timeout = 1, 0.05
+    breaker.record_failure()
+    time.sleep(0.06)
+    assert breaker.before_call() is True
+    assert not pool.healthy(member)
+    breaker.record_success()
+    assert pool.healthy(member)
+
+
+def test_hedge_loser_releases_probe() -> None:
+    slow = StubProvider("pool-slow-probe", delay=10.0)
+    fast = StubProvider("pool-fast", delay=0.0)
+    pool = ProviderPool("test", [("slow", slow), ("fast", fast)], _config())
+    slow_member, fast_member = pool.members
+    for _ in range(5):
+        slow_member.tracker.record(0.01, ok=True)
+        # Both members are unhealthy, so the slow one stays first in line.
+        fast_member.tracker.record(0.01, ok=False)
+
+    # The slow member's next call is its circuit breaker's probe.
+    breaker = get_circuit_breaker("pool-slow-probe")
+    breaker.failure_threshold, breaker.reset_timeout = 1, 0.05
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    async def hedged() -> None:
+        response = await pool.generate_async("Hello")
+        assert response.metadata["pool_member"] == "fast"
+        # The cancelled probe has released the circuit by the time we return.
+        assert breaker.state == CircuitState.OPEN
+
+    asyncio.run(hedged())
+    assert slow.calls == 0
+    assert fast.calls == 1
+    logger.info("Hedge won and the cancelled probe reopened the circuit.")
+
+    # After the cool-down the slow member is probed again.
+    slow.delay = 0.0
+    time.sleep(0.06)
+    assert asyncio.run(pool.generate_async("Hello")).text == "pool-slow-probe"
+    assert breaker.state == CircuitState.CLOSED
+
+
+def test_reset_model_is_a_no_op() -> None:
+    provider = StubProvider("pool-reset")
+    pool = ProviderPool("test", [("member", provider)], _config())
+    pool.reset_model("other-model")
+    assert provider.model == "pool-reset"
+
+
+def main() -> None:
+    test_failover()
+    test_half_open_member_is_unhealthy()
+    test_hedge_loser_releases_probe()
+    test_reset_model_is_a_no_op()
+
+
+if __name__ == "__main__":
+    main()
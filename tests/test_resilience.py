@@ -0,0 +1,154 @@
+import asyncio
+import time
+
+import structlog
+
+from flare_ai_rag.ai.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    CircuitState,
+    ProviderHTTPError,
+    call_with_retry,
+    call_with_retry_async,
+    get_circuit_breaker,
+)
+
+logger = structlog.get_logger(__name__)
+
+
+def _breaker(provider: str, reset_timeout: float = 0.1) -> CircuitBreaker:
+    breaker = get_circuit_breaker(provider)
+    breaker.failure_threshold = 1
+    breaker.reset_timeout = reset_timeout
+    return breaker
+
+
+def _open(breaker: CircuitBreaker) -> None:
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+
+def _rejected(breaker: CircuitBreaker) -> bool:
+    try:
+        breaker.before_call()
+    except CircuitOpenError:
+        return True
+    return False
+
+
+def test_breaker_state_machine() -> None:
+    breaker = CircuitBreaker("test-states", failure_threshold=2, reset_timeout=0.1)
+    assert breaker.before_call() is False
+    breaker.record_failure()
+    assert breaker.state == CircuitState.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+    assert _rejected(breaker)
+
+    # After the cool-down a single probe goes through; its failure reopens.
+    time.sleep(0.12)
+    assert breaker.before_call() is True
+    assert breaker.state == CircuitState.HALF_OPEN
+    assert _rejected(breaker)
+    breaker.record_failure()
+    assert breaker.state == CircuitState.OPEN
+
+    # A successful probe closes the circuit.
+    time.sleep(0.12)
+    assert breaker.before_call() is True
+    breaker.record_success()
+    assert breaker.state == CircuitState.CLOSED
+    assert breaker.before_call() is False
+    logger.info("Breaker opened, probed and closed.")
+
+
+def test_stuck_probe_expires() -> None:
+    breaker = CircuitBreaker("test-stuck", failure_threshold=1, reset_timeout=0.1)
+    _open(breaker)
+    time.sleep(0.12)
+    assert breaker.before_call() is True
+
+    # The probe never reports back: the circuit reopens, then probes again.
+    time.sleep(0.12)
+    assert _rejected(breaker)
+    assert breaker.state == CircuitState.OPEN
+    time.sleep(0.12)
+    assert breaker.before_call() is True
+    logger.info("Stuck probe given up.")
+
+
+def test_cancelled_probe_releases_circuit() -> None:
+    breaker = _breaker("test-cancel")
+    _open(breaker)
+    time.sleep(0.12)
+
+    async def hang() -> str:
+        await asyncio.sleep(10)
+        return "late"
+
+    async def ok() -> str:
+        return "ok"
+
+    async def cancel_probe() -> None:
+        probe = asyncio.create_task(call_with_retry_async("test-cancel", hang))
+        await asyncio.sleep(0.01)
+        assert breaker.state == CircuitState.HALF_OPEN
+        probe.cancel()
+        try:
+            await probe
+        except asyncio.CancelledError:
+            pass
+        else:
+            msg = "The probe was not cancelled"
+            raise AssertionError(msg)
+
+    asyncio.run(cancel_probe())
+    assert breaker.state == CircuitState.OPEN
+
+    # The next probe after the cool-down goes through and closes the circuit.
+    time.sleep(0.12)
+    assert asyncio.run(call_with_retry_async("test-cancel", ok)) == "ok"
+    assert breaker.state == CircuitState.CLOSED
+    logger.info("Cancelled probe released the circuit.")
+
+
+def test_retries() -> None:
+    attempts: list[int] = []
+
+    def flaky() -> str:
+        attempts.append(1)
+        if len(attempts) == 1:
+            msg = "Too Many Requests"
+            raise ProviderHTTPError(msg, 429, retry_after=0.0)
+        return "ok"
+
+    assert call_with_retry("test-retries", flaky) == "ok"
+    assert len(attempts) == 2  # noqa: PLR2004
+
+    # Non-transient errors are raised at once and leave the circuit closed.
+    def bad_request() -> str:
+        attempts.append(1)
+        msg = "Bad Request"
+        raise ProviderHTTPError(msg, 400)
+
+    attempts.clear()
+    status_codes: list[int] = []
+    try:
+        call_with_retry("test-retries", bad_request)
+    except ProviderHTTPError as e:
+        status_codes.append(e.status_code)
+    assert status_codes == [400]
+    assert len(attempts) == 1
+    assert get_circuit_breaker("test-retries").state == CircuitState.CLOSED
+    logger.info("Transient errors retried, others raised.")
+
+
+def main() -> None:
+    test_breaker_state_machine()
+    test_stuck_probe_expires()
+    test_cancelled_probe_releases_circuit()
+    test_retries()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import asyncio
+import tempfile
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.session import Session, SessionStore, SQLiteSessionBackend
+
+logger = structlog.get_logger(__name__)
+
+
+async def _lru_eviction() -> None:
+    store = SessionStore(max_sessions=2)
+    for session_id in ("a", "b", "c"):
+        session = await store.get(session_id)
+        session.history.append(f"response to {session_id}")
+        await store.save(session)
+    # "a" was the least recently used: evicted, and new when requested again.
+    assert len(store) == 2  # noqa: PLR2004
+    assert (await store.get("a")).history == []
+    assert (await store.get("c")).history == ["response to c"]
+
+
+def test_lru_eviction() -> None:
+    asyncio.run(_lru_eviction())
+
+
+async def _memory_and_ttl_eviction() -> None:
+    store = SessionStore(max_memory_bytes=4096, ttl_seconds=0.1)
+    for i in range(4):
+        session = await store.get(f"s{i}")
+        session.history.append("x" * 1500)
+        await store.save(session)
+    assert store.memory_bytes <= store.max_memory_bytes
+    assert len(store) == 2  # noqa: PLR2004
+
+    # Idle sessions expire.
+    await asyncio.sleep(0.15)
+    assert (await store.get("s3")).history == []
+    await store.save(await store.get("fresh"))
+    assert len(store) == 2  # noqa: PLR2004
+
+
+def test_memory_and_ttl_eviction() -> None:
+    asyncio.run(_memory_and_ttl_eviction())
+
+
+async def _reload_from_backend(db_path: Path) -> None:
+    store = SessionStore(max_sessions=1, backend=SQLiteSessionBackend(db_path))
+    session = await store.get("evicted")
+    session.history.append("first response")
+    session.summary = "summary"
+    session.add_usage(10, 5, 0.1)
+    await store.save(session)
+    await store.save(await store.get("other"))
+    assert len(store) == 1
+
+    # The evicted session is restored from the backend.
+    restored = await store.get("evicted")
+    assert restored is not session
+    assert restored.history == ["first response"]
+    assert restored.summary == "summary"
+    assert restored.prompt_tokens == 10  # noqa: PLR2004
+    store.close()
+
+    # And so after a restart.
+    restarted = SessionStore(backend=SQLiteSessionBackend(db_path))
+    assert (await restarted.get("evicted")).history == ["first response"]
+    restarted.close()
+
+
+def test_reload_from_backend() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asyncio.run(_reload_from_backend(Path(temp_dir) / "sessions.db"))
+    logger.info("Evicted session reloaded from the backend.")
+
+
+def _shared_store(db_path: Path) -> SessionStore:
+    return SessionStore(backend=SQLiteSessionBackend(db_path), shared=True)
+
+
+async def _shared_summary(db_path: Path) -> None:
+    # Two workers sharing the session database.
+    worker, other_worker = _shared_store(db_path), _shared_store(db_path)
+    session = await worker.get("shared")
+    session.history = ["first"]
+    session.add_usage(10, 5, 0.1)
+    await worker.save(session)
+
+    # A summary starts from a copy of the session, which another worker then
+    # updates before the summary is saved.
+    stale = await worker.get("shared")
+    fresh = await other_worker.get("shared")
+    fresh.history.append("second")
+    fresh.attestation_requested = True
+    fresh.add_usage(1, 1, 0.01)
+    await other_worker.save(fresh)
+
+    await worker.reload_summary(stale)
+    stale.summary = "summary of earlier responses"
+    stale.add_usage(3, 3, 0.03)
+    await worker.save_summary(stale)
+
+    stored = await other_worker.get("shared")
+    assert stored.history == ["first", "second"]
+    assert stored.attestation_requested
+    assert stored.summary == "summary of earlier responses"
+    assert (stored.prompt_tokens, stored.output_tokens) == (14, 9)
+    assert abs(stored.cost_usd - 0.14) < 1e-9  # noqa: PLR2004
+
+    # Saving a copy read before the summary does not undo it.
+    fresh.history.append("third")
+    await other_worker.save(fresh)
+    stored = await worker.get("shared")
+    assert stored.summary == "summary of earlier responses"
+    assert stored.history == ["first", "second", "third"]
+    assert stored.prompt_tokens == 14  # noqa: PLR2004
+
+    # A copy's summary is refreshed before it is summarized again.
+    fresh.summary = ""
+    await other_worker.reload_summary(fresh)
+    assert fresh.summary == "summary of earlier responses"
+    worker.close()
+    other_worker.close()
+
+
+def test_shared_summary_keeps_other_updates() -> None:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        asyncio.run(_shared_summary(Path(temp_dir) / "sessions.db"))
+    logger.info("Summary saved without overwriting other updates.")
+
+
+def test_history_is_bounded() -> None:
+    session = Session(session_id="s")
+    for i in range(3):
+        session.add_response(f"response {i}", 2)
+    assert session.add_response("response 3", 2) == ["response 1"]
+    assert session.history == ["response 2", "response 3"]
+
+    # A zero context size keeps no history at all.
+    assert session.add_response("response 4", 0) == [
+        "response 2",
+        "response 3",
+        "response 4",
+    ]
+    assert session.history == []
+    assert session.add_response("response 5", -1) == ["response 5"]
+    assert session.history == []
+
+
+def main() -> None:
+    test_history_is_bounded()
+    test_lru_eviction()
+    test_memory_and_ttl_eviction()
+    test_reload_from_backend()
+    test_shared_summary_keeps_other_updates()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+import asyncio
+
+import structlog
+
+from flare_ai_rag.concurrency import SingleFlight
+
+logger = structlog.get_logger(__name__)
+
+
+class CountingCall:
+    """Coroutine function returning its argument after a delay, counting calls."""
+
+    def __init__(self, delay: float = 0.05, error: Exception | None = None) -> None:
+        self.delay = delay
+        self.error = error
+        self.calls = 0
+
+    async def __call__(self, value: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.error is not None:
+            raise self.error
+        return value
+
+
+def test_concurrent_calls_are_coalesced() -> None:
+    flights: SingleFlight[str, str] = SingleFlight("test")
+    call = CountingCall()
+
+    async def run() -> list[str]:
+        results = await asyncio.gather(
+            *(flights.do("same", call, "result") for _ in range(5)),
+            flights.do("other", call, "other result"),
+        )
+        assert len(flights) == 0
+        return results
+
+    results = asyncio.run(run())
+    assert results == ["result"] * 5 + ["other result"]
+    assert call.calls == 2  # noqa: PLR2004
+    logger.info("Concurrent calls coalesced.", calls=call.calls)
+
+
+def test_leader_cancellation_keeps_waiters() -> None:
+    flights: SingleFlight[str, str] = SingleFlight("test")
+    call = CountingCall()
+
+    async def run() -> None:
+        leader = asyncio.create_task(flights.do("key", call, "result"))
+        await asyncio.sleep(0.01)
+        waiters = [
+            asyncio.create_task(flights.do("key", call, "result")) for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        # The leader's client goes away; the others still get the result.
+        leader.cancel()
+        assert await asyncio.gather(*waiters) == ["result"] * 3
+        assert leader.cancelled()
+
+    asyncio.run(run())
+    assert call.calls == 1
+    logger.info("Leader cancelled, waiters served.")
+
+
+def test_errors_are_shared_and_not_cached() -> None:
+    flights: SingleFlight[str, str] = SingleFlight("test")
+    call = CountingCall(error=ValueError("failed"))
+
+    async def run() -> list[str | BaseException]:
+        return await asyncio.gather(
+            *(flights.do("key", call, "result") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in results)
+    assert call.calls == 1
+
+    # The failed call is forgotten: the next one runs again.
+    call.error = None
+    assert asyncio.run(flights.do("key", call, "result")) == "result"
+    assert call.calls == 2  # noqa: PLR2004
+
+
+def main() -> None:
+    test_concurrent_calls_are_coalesced()
+    test_leader_cancellation_keeps_waiters()
+    test_errors_are_shared_and_not_cached()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+import tempfile
+from pathlib import Path
+
+import structlog
+
+from flare_ai_rag.metrics import (
+    SQLiteSpendLedger,
+    TokenUsage,
+    UsageConfig,
+    UsageMeter,
+    registry,
+)
+
+logger = structlog.get_logger(__name__)
+
+# One million output tokens cost 1 USD.
+CONFIG = UsageConfig.load(
+    {
+        "daily_budget_usd": 1.0,
+        "alarm_thresholds": [0.5, 1.0],
+        "pricing": {"test-model": {"input": 0.0, "output": 1.0}},
+    }
+)
+
+
+def _alarms(threshold: str) -> float:
+    return registry.counter(
+        "llm_budget_alarms_total",
+        "Daily budget thresholds crossed, by fraction of the budget",
+        ("threshold",),
+    ).value(threshold=threshold)
+
+
+def test_workers_share_the_daily_budget() -> None:
+    before = _alarms("0.5"), _alarms("1")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = Path(temp_dir) / "sessions.db"
+        workers = [UsageMeter(CONFIG, SQLiteSpendLedger(db_path)) for _ in range(3)]
+        # Each worker spends 0.4 USD: 1.2 USD in all.
+        for _ in range(4):
+            for worker in workers:
+                worker.record("test-model", TokenUsage(output_tokens=100_000))
+        for worker in workers:
+            assert abs(worker.spent_today - 1.2) < 1e-9  # noqa: PLR2004
+            worker.close()
+    # Each threshold alarmed once, although no worker spent half the budget.
+    assert (_alarms("0.5"), _alarms("1")) == (before[0] + 1, before[1] + 1)
+    logger.info("Daily budget shared by the workers.")
+
+
+def test_single_process_budget() -> None:
+    before = _alarms("0.5")
+    meter = UsageMeter(CONFIG)
+    meter.record("test-model", TokenUsage(output_tokens=600_000))
+    meter.record("test-model", TokenUsage(output_tokens=100_000))
+    assert abs(meter.spent_today - 0.7) < 1e-9  # noqa: PLR2004
+    assert _alarms("0.5") == before + 1
+
+
+def main() -> None:
+    test_workers_share_the_daily_budget()
+    test_single_process_budget()
+
+
+if __name__ == "__main__":
+    main()